@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module LorentzBoost:
+====================
+
+  Lorentz boosts and rotations of 4-vectors held as numpy arrays.  A
+  4-vector is a row (E, px, py, pz); a set of N 4-vectors is an (N,4) array.
+  Boost follows the conventions of ROOT's TLorentzVector::Boost so results
+  agree with those of the TLorentzVector code it replaces.  No ROOT import
+  is needed.
+
+  Dependencies:
+   - numpy
+
+  Module methods:
+  ---------------
+    BoostVector  : Velocity (beta vector) of 4-vector(s) P; returns
+                   P[..., 1:]/P[..., 0], shape (3,) or (N,3)
+    Boost        : Boosts 4-vector(s) P, shape (4,) or (N,4), by the
+                   velocity b, shape (3,) or (N,3).  Returns the boosted
+                   4-vector(s), same shape as P
+    RotationZ    : Rotation matrices (N,3,3) (or (3,3)) about z by angle(s)
+    RotationY    : Rotation matrices (N,3,3) (or (3,3)) about y by angle(s)
+    Rotate       : Applies rotation matrix R, (3,3) or (N,3,3), to the
+                   3-momentum of 4-vector(s) P.  Returns the rotated
+                   4-vector(s)
+    to4Vector    : Converts the [E, array(px, py, pz)] list used by the
+                   decay classes to a (4,) array
+    from4Vector  : Converts a (4,) array back to [E, array(px, py, pz)]
+
+Created on Sun 18Oct26: Version history:
+----------------------------------------------
+ 1.0: 18Oct26: First implementation
+
+@author: PaulKyberd
+"""
+
+import numpy as np
+
+def BoostVector(P):
+    P = np.asarray(P, dtype=float)
+    return P[..., 1:] / P[..., 0:1]
+
+def Boost(P, b):
+    P = np.asarray(P, dtype=float)
+    b = np.asarray(b, dtype=float)
+    b2 = np.sum(b*b, axis=-1)
+    gamma = 1. / np.sqrt(1. - b2)
+    bp = np.sum(b*P[..., 1:], axis=-1)
+    gamma2 = np.where(b2 > 0., (gamma - 1.) / np.where(b2 > 0., b2, 1.), 0.)
+
+    Pb = np.empty(np.broadcast_shapes(P.shape, b.shape[:-1] + (4,)))
+    Pb[..., 0]  = gamma*(P[..., 0] + bp)
+    Pb[..., 1:] = P[..., 1:] + (gamma2*bp + gamma*P[..., 0])[..., np.newaxis]*b
+    return Pb
+
+def RotationZ(angle):
+    angle = np.asarray(angle, dtype=float)
+    c = np.cos(angle)
+    s = np.sin(angle)
+    R = np.zeros(angle.shape + (3, 3))
+    R[..., 0, 0] = c
+    R[..., 0, 1] = -s
+    R[..., 1, 0] = s
+    R[..., 1, 1] = c
+    R[..., 2, 2] = 1.
+    return R
+
+def RotationY(angle):
+    angle = np.asarray(angle, dtype=float)
+    c = np.cos(angle)
+    s = np.sin(angle)
+    R = np.zeros(angle.shape + (3, 3))
+    R[..., 0, 0] = c
+    R[..., 0, 2] = s
+    R[..., 1, 1] = 1.
+    R[..., 2, 0] = -s
+    R[..., 2, 2] = c
+    return R
+
+def Rotate(P, R):
+    P = np.asarray(P, dtype=float)
+    R = np.asarray(R, dtype=float)
+    p3 = np.einsum('...ij,...j->...i', R, P[..., 1:])
+    Pr = np.empty(np.broadcast_shapes(P.shape, p3.shape[:-1] + (4,)))
+    Pr[..., 0]  = P[..., 0]
+    Pr[..., 1:] = p3
+    return Pr
+
+def to4Vector(v):
+    return np.array([v[0], v[1][0], v[1][1], v[1][2]], dtype=float)
+
+def from4Vector(P):
+    return [P[0], np.array(P[1:])]
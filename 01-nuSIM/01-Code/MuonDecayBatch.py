@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Class MuonDecayBatch:
+=====================
+
+  Generates the decay distributions for muon decay at rest for a whole
+  array of decays in one call.  The physics is that of MuonDecay; the
+  quantities are returned as numpy arrays, one row per decay.
+
+  The scaled electron energy, f_e, is the inverse of 2f^3 - f^4 and is taken
+  from an inverse-cdf table (built once, in the variable u^(1/3) in which it
+  is close to linear) refined by two Newton steps.  The scaled
+  electron-neutrino energy, f_nue, is the inverse of 3f^2 - 2f^3, which has
+  the closed form 1/2 - sin(asin(1 - 2C)/3).  With the lower limit Alpha used
+  in MuonDecay.GenerateScldE, f_nue >= 1 - f_e by construction so no
+  rejection loop is needed.
+
+  Citations:
+   - G4 manual
+
+  Dependencies:
+   - numpy, math, MuonConst
+
+  Class attributes:
+  -----------------
+  __nTable : Number of points in the f_e inverse-cdf table
+
+  Instance attributes:
+  --------------------
+  _rng     : numpy random Generator used for all the sampling
+  _wTable  : Table abscissa, u^(1/3) on a uniform grid in [0, 1]
+  _feTable : f_e at the abscissa
+
+  Methods:
+  --------
+  Built-in methods __init__, __repr__ and __str__.
+      __init__ : Creates the generator and the f_e table
+                 Optional keyword argument rng -- numpy random Generator
+      __repr__ : One liner with call.
+      __str__  : Dump of table size
+
+  Get/set methods:
+    getfeTable : Returns the (u^(1/3), f_e) table
+    setRng(rng): Sets the generator, e.g. the RandomStream.eventDraws of a batch
+
+  Muon-decay methods:
+    GenerateLifetime: Generates n lifetimes.  Returns an array (s)
+                      Optional keyword argument Tmax -- cut off lifetime at Tmax
+    decaymuon       : Generates n muon decays; calls each of the following
+                      methods in turn.  Returns three (n,4) arrays, v_e,
+                      v_nue, v_numu, rows (E, px, py, pz) (units MeV), and two
+                      arrays, costheta, cosphi
+    GenerateScldE   : Generates scaled energies of electron, nu_e, and nu_mu.
+                      Returns three arrays (f_e, f_nue, f_numu).  Units m_mu/2.
+    get3vectors     : Generates 3-vector momenta, electron direction taken as
+                      positive z direction.  Returns three (n,3) arrays,
+                      p_e, p_nue, p_numu, and two arrays, costheta and cosphi
+    ranCoor         : Applies a random 3D rotation, Rz(alpha).Ry(beta).Rz(gamma)
+                      as in MuonDecay.ranCoor, built as a stack of (n,3,3)
+                      matrices.  Returns the three rotated (n,3) arrays
+
+Created on Sun 18Oct26: Version history:
+----------------------------------------------
+ 1.1: 18Oct26: setRng
+ 1.0: 18Oct26: First implementation
+
+@author: PaulKyberd
+"""
+
+import math as mth
+import numpy as np
+import MuonConst as muConst
+
+muCnst = muConst.MuonConst()
+
+class MuonDecayBatch:
+
+    __nTable = 4097
+
+    __Debug = False
+
+#--------  "Built-in methods":
+    def __init__(self, **kwargs):
+
+        rng = kwargs.get('rng', None)
+        self._rng = np.random.default_rng() if rng is None else rng
+
+#.. f_e table: f^3 (2 - f) = w^3 solved by bisection on a uniform grid in w
+        self._wTable = np.linspace(0., 1., MuonDecayBatch.__nTable)
+        u  = self._wTable**3
+        lo = np.zeros(MuonDecayBatch.__nTable)
+        hi = np.ones(MuonDecayBatch.__nTable)
+        for i in range(60):
+            mid = 0.5*(lo + hi)
+            below = 2.*mid**3 - mid**4 < u
+            lo = np.where(below, mid, lo)
+            hi = np.where(below, hi, mid)
+        self._feTable = 0.5*(lo + hi)
+
+        return
+
+    def __repr__(self):
+        return "MuonDecayBatch()"
+
+    def __str__(self):
+        return "MuonDecayBatch: f_e inverse-cdf table with %i points" % (len(self._wTable))
+
+    def setRng(self, rng):
+        self._rng = rng
+
+#--------  "Dynamic methods"; lifetimes, energies, and angles for n decays
+    def GenerateLifetime(self, n, **kwargs):
+        Tmax = kwargs.get('Tmax', float('inf'))
+        Gmx = 1. - mth.exp( -Tmax / muCnst.lifetime() )
+        ran = self._rng.random(n) * Gmx
+        return -np.log(1.-ran) * muCnst.lifetime()
+
+    def GenerateScldE(self, n):
+#.. fractional electron energy: table then Newton on 2f^3 - f^4 = Ge
+        Ge  = self._rng.random(n)
+        f_e = np.interp(np.cbrt(Ge), self._wTable, self._feTable)
+        for i in range(2):
+            dG  = 6.*f_e**2 - 4.*f_e**3
+            f_e = np.where(dG > 0., f_e - (2.*f_e**3 - f_e**4 - Ge)/np.where(dG > 0., dG, 1.), f_e)
+        f_e = np.clip(f_e, 0., 1.)
+
+#.. fractional electron-neutrino energy: 3f^2 - 2f^3 = Gnue (1 - Alpha) + Alpha
+        Alpha = (1. - f_e)**2 * (1. + 2.*f_e)
+        C     = self._rng.random(n) * (1. - Alpha) + Alpha
+        f_nue = 0.5 - np.sin(np.arcsin(1. - 2.*C)/3.)
+        f_nue = np.clip(f_nue, 1. - f_e, 1.)
+
+        f_numu = 2. - f_e - f_nue
+
+        return f_e, f_nue, f_numu
+
+    def get3vectors(self, f_e, f_nue, f_numu):
+#.. electron neutrino
+        costheta = np.clip(1. - 2.*( 1./f_e + 1./f_nue - 1./(f_e*f_nue) ), -1., 1.)
+        sintheta = np.sqrt(1. - costheta**2)
+
+#.. muon neutrino
+        cosphi = -(f_e + f_nue*costheta) / f_numu
+        sinphi = -f_nue*sintheta / f_numu
+
+#.. Three vectors:
+        zero   = np.zeros(len(f_e))
+        p_e    = np.stack((zero,           zero, f_e           ), axis=1)
+        p_nue  = np.stack((f_nue*sintheta, zero, f_nue*costheta), axis=1)
+        p_numu = np.stack((f_numu*sinphi,  zero, f_numu*cosphi ), axis=1)
+
+        return p_e, p_nue, p_numu, costheta, cosphi
+
+    def ranCoor(self, p_e, p_nue, p_numu):
+        n = len(p_e)
+#.. Rotation angles
+        alpha  = self._rng.random(n) * 2.*mth.pi
+        calpha = np.cos(alpha)
+        salpha = np.sin(alpha)
+
+        cbeta = -1. + 2.*self._rng.random(n)
+        sbeta = np.sqrt(1. - cbeta**2)
+
+        gamma  = self._rng.random(n) * 2.*mth.pi
+        cgamma = np.cos(gamma)
+        sgamma = np.sin(gamma)
+
+#.. Rr = Ra.Rb.Rc, one matrix per decay
+        Rr = np.empty((n, 3, 3))
+        Rr[:, 0, 0] =  calpha*cbeta*cgamma - salpha*sgamma
+        Rr[:, 0, 1] = -calpha*cbeta*sgamma - salpha*cgamma
+        Rr[:, 0, 2] = -calpha*sbeta
+        Rr[:, 1, 0] =  salpha*cbeta*cgamma + calpha*sgamma
+        Rr[:, 1, 1] = -salpha*cbeta*sgamma + calpha*cgamma
+        Rr[:, 1, 2] = -salpha*sbeta
+        Rr[:, 2, 0] =  sbeta*cgamma
+        Rr[:, 2, 1] = -sbeta*sgamma
+        Rr[:, 2, 2] =  cbeta
+
+#.. Do rotation:
+        p_e1    = np.einsum('nij,nj->ni', Rr, p_e)
+        p_nue1  = np.einsum('nij,nj->ni', Rr, p_nue)
+        p_numu1 = np.einsum('nij,nj->ni', Rr, p_numu)
+
+        return p_e1, p_nue1, p_numu1
+
+    def decaymuon(self, n):
+#.. Get scaled muon energies:
+        f_e, f_nue, f_numu = self.GenerateScldE(n)
+
+#.. Get scaled 3-vectors:
+        s_e, s_nue, s_numu, costheta, cosphi = self.get3vectors(f_e, f_nue, f_numu)
+
+#.. Rotate to arbitrary axis orientation:
+        p_e, p_nue, p_numu = self.ranCoor(s_e, s_nue, s_numu)
+
+#.. Scale to MeV and make 4-vectors:
+        mo2 = muCnst.mass() / 2.
+
+        v_e    = np.empty((n, 4))
+        v_nue  = np.empty((n, 4))
+        v_numu = np.empty((n, 4))
+        for v, f, p in ((v_e, f_e, p_e), (v_nue, f_nue, p_nue), (v_numu, f_numu, p_numu)):
+            v[:, 0]  = f * mo2
+            v[:, 1:] = p * mo2
+
+        return v_e, v_nue, v_numu, costheta, cosphi
+
+#--------  "Get methods" only
+    def getfeTable(self):
+        return self._wTable.copy(), self._feTable.copy()
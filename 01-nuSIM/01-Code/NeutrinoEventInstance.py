@@ -10,10 +10,17 @@ Class NeutrinoEventInstance:
   Class attributes:
   -----------------
   __MuonDecay: muon decay class
+  __Geometry : nuSTORMGeometry instances by production straight file name,
+               built for instances created without a geometry and used by
+               later ones given the same file name
+  __Acceptance: ringAcceptance for the central muon momentum of the last
+               call to Absorption
 
 
   Instance attributes:
   --------------------
+  _geometry : nuSTORMGeometry instance; optional i/p argument, build it once
+              per run and pass it to every instance
   _pmu      : Muon momentum; i/p argument at instance creation
   _ct       : Decay time * speed-of-light
   _TrcSpcCrd: Trace space (s, x, y, z, x', y') in numpy array at
@@ -59,13 +66,21 @@ Class NeutrinoEventInstance:
                            of beam momentum and angle of beam wrt z axis at
                            decay.  Returns:
                            [R[3][3]], [Rinv[3][3]], [Pos. of decay], theta
+                           Taken from the nuSTORMGeometry instance
     Boost2nuSTORM        : Boost to nuSTORM rest frame -- i.e. boost to pmuGen.
-                           Uses TLorentVector class from ROOT.  Returns:
+                           Uses the LorentzBoost module.  Returns:
                            [P_e], [P_nue], [P_numu]
 
 
 Created on Sat 16Jan21;02:26: Version history:
 ----------------------------------------------
+ 1.10: 18Oct26: PK: Geometries kept by production straight file name
+ 1.9: 18Oct26: PK: Absorption uses ringAcceptance, its constants computed
+                   once per central muon momentum
+ 1.8: 18Oct26: PK: Take the lattice geometry from a nuSTORMGeometry instance
+                   built once per run (geometry keyword argument)
+ 1.7: 18Oct26: PK: Boost2nuSTORM uses the numpy LorentzBoost module in place
+                   of ROOT's TLorentzVector
  1.6: 28Jun22: PK: Remove the cut to include only backward going muons
  1.5: 27Jun22: MP: Add correct dynamical (momentum) acceptance to Absorption
                    and add muon production s & z to muon trace space calculation
@@ -83,10 +98,12 @@ Created on Sat 16Jan21;02:26: Version history:
 
 from copy import deepcopy
 
-from ROOT import TLorentzVector as T4V
+import LorentzBoost as LB
 
 import nuSTORMPrdStrght as nuPrdStrt
 import nuSTORMConst
+import nuSTORMGeometry as nuGeom
+import ringAcceptance as ringAcc
 import MuonDecay as MuonDecay
 import MuonConst as MuonConst
 import numpy as np
@@ -95,22 +112,25 @@ import math
 muCnst = MuonConst.MuonConst()
 nuSTRMCnst = nuSTORMConst.nuSTORMConst()
 
-tlCmplxLength = nuSTRMCnst.TrfLineCmplxLen()
-tlCmplxAngle = nuSTRMCnst.TrfLineCmplxAng()
-
 class NeutrinoEventInstance:
 
     __mumass = muCnst.mass()/1000.
     __sol    = muCnst.SoL()
 
+    __Geometry = {}
+    __Acceptance = None
+
     __Debug  = False
 
 #--------  "Built-in methods":
-    def __init__(self, pmu=5., muProdTSC=[0.,0.,0.,0.,0.,0.], filename=None):
+    def __init__(self, pmu=5., muProdTSC=[0.,0.,0.,0.,0.,0.], filename=None, geometry=None):
 
-        nuStrt = nuPrdStrt.nuSTORMPrdStrght(filename)
-
-        self._tlAngle = tlCmplxAngle * math.pi / 180.
+        if geometry is None:
+            if filename not in NeutrinoEventInstance.__Geometry:
+                NeutrinoEventInstance.__Geometry[filename] = \
+                    nuGeom.nuSTORMGeometry(nuSTRMCnst, nuPrdStrt.nuSTORMPrdStrght(filename))
+            geometry = NeutrinoEventInstance.__Geometry[filename]
+        self._geometry = geometry
 
         self._pmu = pmu
         self._muProdTSC = muProdTSC
@@ -118,7 +138,7 @@ class NeutrinoEventInstance:
             print(f"    ----> neutrinoEvent Instance muProdTSC {self._muProdTSC}")
         self._ct, self._TrcSpcCrd, self._pmuGen, self._pmuDirCos,  \
             self._P_e, self._P_nue, self._P_numu \
-                = self.CreateNeutrinos(nuStrt)
+                = self.CreateNeutrinos(geometry.prdStrght())
 
         return
 
@@ -141,22 +161,13 @@ class NeutrinoEventInstance:
 #--------  Generation of neutrino-creation event:
 #.. Manager:
     def CreateNeutrinos(self, nuStrt):
-        PrdStrghtLngth = nuSTRMCnst.ProdStrghtLen()
-        Circumference  = nuSTRMCnst.Circumference()
-        ArcLen         = nuSTRMCnst.ArcLen()
-        ArcRad         = ArcLen / math.pi
-
         if NeutrinoEventInstance.__Debug:
            print("    ----> CreateNeutrinos: entered")
 
         #.. Prepare--get neutrino decay instance in muon rest frame:
-        z = 2.* PrdStrghtLngth
-        Dcy = 0
         if NeutrinoEventInstance.__Debug:
             print("    ----> CreateNeutrinos: Find valid decay")
 
-        if isinstance(Dcy, MuonDecay.MuonDecay):
-            del Dcy
         Dcy = MuonDecay.MuonDecay()
         if NeutrinoEventInstance.__Debug:
             print(f"    ----> CreateNeutrinos: Dcy is {Dcy}")
@@ -181,9 +192,6 @@ class NeutrinoEventInstance:
             
 
 
-        # if z > (PrdStrghtLngth+ArcRad+1.):
-        #     print("     ----> !!!! CreateNeutrinos Alarm:", z)
-
         if NeutrinoEventInstance.__Debug:
             print("    ----> CreateNeutrinos: Muon production at s =", self._muProdTSC[0])
             print("    ----> CreateNeutrinos: Muon decay at s =", s)
@@ -268,81 +276,7 @@ class NeutrinoEventInstance:
 #.. Beam position, direction and corresponding rotation operator:
 
     def BeamDir(self, s, Pmu):
-        PrdStrghtLngth = nuSTRMCnst.ProdStrghtLen()
-        Circumference  = nuSTRMCnst.Circumference()
-        ArcLen         = nuSTRMCnst.ArcLen()
-
-        #s_ring takes into account that s = 0. at target and s=z for production straight entrance
-        s_ring         = s-tlCmplxLength
-        if NeutrinoEventInstance.__Debug:
-            print(f"         ----> BeamDir: the muon decays at s_ring {s_ring}")
-
-        #where corresponds to location within the ring
-        if (s_ring <= 0.):
-            where      = s_ring
-        else:
-            where      = s_ring%Circumference
-        ArcRad         = ArcLen/math.pi
-        if NeutrinoEventInstance.__Debug:
-            print(f"         ----> BeamDir: at s_ring%Circumference {where}")
-
-        if ( 0. >= where):
-            if NeutrinoEventInstance.__Debug:
-                print("         ----> BeamDir: the muon decays in the transfer line complex")
-
-            theta         =  self._tlAngle          #Angle with respect to Z axis
-            z             =  math.cos(theta)*where
-            x             = -math.sin(theta)*where
-            y             = 0.
-            BeamPos       = [x, y, z]
-
-        elif ( PrdStrghtLngth >= where > 0.):
-            if NeutrinoEventInstance.__Debug:
-                print("         ----> BeamDir: the muon decays in the production straight")
-
-            theta         = 0.     #Angle with respect to Z axis
-            BeamPos       = [0., 0., where]
-
-        elif (PrdStrghtLngth+ArcLen >= where > PrdStrghtLngth):
-            if NeutrinoEventInstance.__Debug:
-                print("         ----> BeamDir: the muon decays in the first arc")
-
-            ArcLenCovered = where - PrdStrghtLngth
-            theta         = math.pi*ArcLenCovered/ArcLen
-            BeamPos       = [ \
-                              (ArcRad-ArcRad* math.cos(theta)),       \
-                              0.,                                     \
-                              PrdStrghtLngth+ArcRad*math.sin(theta)]
-
-        elif (2*PrdStrghtLngth+ArcLen >= where > PrdStrghtLngth+ArcLen):
-            if NeutrinoEventInstance.__Debug:
-                print("         ----> BeamDir: the muon decays in the return straight")
-
-            theta         = math.pi
-            BeamPos       = [2.*ArcRad, \
-                             0., \
-                             PrdStrghtLngth-(where-ArcLen-PrdStrghtLngth)]
-
-        elif (2*PrdStrghtLngth+2*ArcLen>=where>=2*PrdStrghtLngth+ArcLen):
-            if NeutrinoEventInstance.__Debug:
-                print("         ----> BeamDir: the muon decays in the second/return arc")
-
-            ArcLenCovered = where - 2*PrdStrghtLngth - ArcLen
-            theta         = math.pi + math.pi*ArcLenCovered/ArcLen
-            BeamPos       = [ \
-                              (ArcRad-ArcRad*math.cos(theta)), \
-                              0., \
-                              ArcRad*math.sin(theta)]
-
-        # R=rotation with respect to y axis through theta angle
-        R    = np.array([ \
-                          [math.cos(theta),  0., math.sin(theta)], \
-                          [0.,               1., 0.],              \
-                          [-math.sin(theta), 0., math.cos(theta)]])
-        Rinv = np.array([ \
-                          [math.cos(theta),  0.,-math.sin(theta)], \
-                          [0.,               1., 0.],              \
-                          [math.sin(theta),  0., math.cos(theta)]])
+        R, Rinv, BeamPos, theta = self._geometry.BeamDir(s)
 
         if NeutrinoEventInstance.__Debug:
             print('         ----> BeamDir: theta, s:', theta, s)
@@ -355,146 +289,44 @@ class NeutrinoEventInstance:
 
         Emu = np.sqrt(Pmu**2 + NeutrinoEventInstance.__mumass**2)
         pB  = Pmu*DirCos
-        mu4v = T4V.TLorentzVector(pB[0], pB[1], pB[2], Emu)
-        b    = mu4v.BoostVector()
-
+        b    = pB/Emu
 
         if NeutrinoEventInstance.__Debug:
             print("        ----> Boost2nuSTORM: boost parameters:")
             print("            ----> Pmu, Emu, boost:", Pmu, Emu, \
                   "; ", b[0], b[1], b[2])
 
-        # Treat decay components:
-        P_e    = Dcy.get4ve()
-        P_e[0] = P_e[0]/1000.
-        P_e[1] = P_e[1]/1000.
-
-        P_e4v  = T4V.TLorentzVector(P_e[1][0], \
-                                    P_e[1][1], \
-                                    P_e[1][2], \
-                                    P_e[0] )
-        if NeutrinoEventInstance.__Debug:
-            print("            ----> Rest frame P_e4v (GeV):",
-                  P_e4v.E(), P_e4v.Px(), P_e4v.Py(), P_e4v.Pz())
-
-        P_e4v.Boost(b)
-
-        if NeutrinoEventInstance.__Debug:
-            print("            ----> nuSTORM frame P_e4v (GeV):",
-                  P_e4v.E(), P_e4v.Px(), P_e4v.Py(), P_e4v.Pz())
-
-        P_nue     = Dcy.get4vnue()
-        P_nue[0]  = P_nue[0]/1000.
-        P_nue[1]  = P_nue[1]/1000.
-
-        P_nue4v   = T4V.TLorentzVector(P_nue[1][0], \
-                                       P_nue[1][1], \
-                                       P_nue[1][2], \
-                                       P_nue[0] )
-
-        if NeutrinoEventInstance.__Debug:
-            print("            ----> Rest frame P_nue4v (GeV):",
-                  P_nue4v.E(), P_nue4v.Px(), P_nue4v.Py(), P_nue4v.Pz())
-
-            if (P_nue4v.E() > 0.05282856990628295):
-                print("Enue in RF higher than theory cutoff: ",P_nue4v.E())
-
-        P_nue4v.Boost(b)
-
+        # Treat decay components, rest frame (MeV) to nuSTORM frame (GeV) in one boost:
+        P = np.stack((LB.to4Vector(Dcy.get4ve()),   \
+                      LB.to4Vector(Dcy.get4vnue()), \
+                      LB.to4Vector(Dcy.get4vnumu())))/1000.
         if NeutrinoEventInstance.__Debug:
-            print("            ----> nuSTORM frame P_nue4v (GeV):",
-                  P_nue4v.E(), P_nue4v.Px(), P_nue4v.Py(), P_nue4v.Pz())
+            print("            ----> Rest frame P_e, P_nue, P_numu (GeV):", P[0], P[1], P[2])
+            if (P[1][0] > 0.05282856990628295):
+                print("Enue in RF higher than theory cutoff: ",P[1][0])
+            if (P[2][0] > 0.05282856990628295):
+                print("Enumu in RF higher than theory cutoff: ",P[2][0])
 
-        P_numu    = Dcy.get4vnumu()
-        P_numu[0] = P_numu[0]/1000.
-        P_numu[1] = P_numu[1]/1000.
-
-        P_numu4v  = T4V.TLorentzVector(P_numu[1][0], \
-                                       P_numu[1][1], \
-                                       P_numu[1][2], \
-                                       P_numu[0] )
+        P = LB.Boost(P, b)
 
         if NeutrinoEventInstance.__Debug:
-            print("            ----> Rest frame P_numu4v (GeV):",
-                  P_numu4v.E(), P_numu4v.Px(), P_numu4v.Py(), P_numu4v.Pz())
-
-            if (P_numu4v.E() > 0.05282856990628295):
-                print("Enumu in RF higher than theory cutoff: ",P_numu4v.E())
-
-        P_numu4v.Boost(b)
-
-        if NeutrinoEventInstance.__Debug:
-            print("            ----> nuSTORM frame P_numu4v (GeV):",
-                  P_numu4v.E(), P_numu4v.Px(), P_numu4v.Py(), P_numu4v.Pz())
-
-        P_e[0]    = P_e4v.E()
-        P_e[1][0] = P_e4v.Px()
-        P_e[1][1] = P_e4v.Py()
-        P_e[1][2] = P_e4v.Pz()
-
-        P_nue[0]    = P_nue4v.E()
-        P_nue[1][0] = P_nue4v.Px()
-        P_nue[1][1] = P_nue4v.Py()
-        P_nue[1][2] = P_nue4v.Pz()
+            print("            ----> nuSTORM frame P_e, P_nue, P_numu (GeV):", P[0], P[1], P[2])
 
-        P_numu[0]    = P_numu4v.E()
-        P_numu[1][0] = P_numu4v.Px()
-        P_numu[1][1] = P_numu4v.Py()
-        P_numu[1][2] = P_numu4v.Pz()
+        P_e    = LB.from4Vector(P[0])
+        P_nue  = LB.from4Vector(P[1])
+        P_numu = LB.from4Vector(P[2])
 
         return P_e, P_nue, P_numu
 
     def Absorption(self, piTraceSpaceCoord, mu4mmtm, mucostheta, mup0):
-      #take care of physical acceptance
-      n = 4.8 #how much rounded
-
-      x0 = 0 # graph translation
-      y0 = 0
-      Mup = np.sqrt(mu4mmtm[1][0]**2+mu4mmtm[1][1]**2+mu4mmtm[1][2]**2)
-      Mup_spread = abs(Mup-mup0)/mup0
-      Mux = piTraceSpaceCoord[1]         #Pion decay transverse position coordinates = Muon Decay transverse position coordinates
-      Muy = piTraceSpaceCoord[2]
-      Muxp= mu4mmtm[1][0]/mu4mmtm[1][2]  #xp and yp from generated muon momentum
-      Muyp= mu4mmtm[1][1]/mu4mmtm[1][2]
-      muy = Muy
-      muyp= Muyp
-      Muy = Muy*2.5/0.15
-      Muyp= Muyp*2./0.006
-      def k(i):
-        return (2*math.pi*i)/3
-      def g(t):
-        return (abs(t-(1./3.)))**n
-      def f(x,y):
-        return 0.1*g(-(x+x0)*math.cos(k(1))-(y+y0)*math.sin(k(1)))+0.1*g(-(x+x0)*math.cos(k(2))-(y+y0)*math.sin(k(2)))+0.1*g(-(x+x0)*math.cos(k(3))-(y+y0)*math.sin(k(3)))
-
-      #take care of dynamical acceptance
-      muAcc = nuSTRMCnst.muAcc()
-      #muon dynamical acceptance as a function of momentum spread (i.e. x = abs(p-p0)/p0)
-      def epsilon(x):
-          epsilon_max = 0.001 #[m]
-          beta_sept = 8.03 #[m]
-          D_sept = 1.36 #[m]
-          epsilon_kink = muAcc-np.sqrt(epsilon_max*beta_sept)/D_sept # percent momentum spread
-          #for second part - linear function: epsilon = epsilon0 - a*x
-          a = epsilon_max/(muAcc-epsilon_kink)
-          epsilon0 = a*muAcc
-          return np.heaviside(x,1)*np.heaviside(epsilon_kink-x,0)*epsilon_max+np.heaviside(x-epsilon_kink,1)*np.heaviside(muAcc-x,1)*(epsilon0-a*x)
-      def emittance(x,xp,beta):
-          return x*x/beta+beta*xp*xp
-
-      noDynAccCutFlag = False
-      if mup0 == 0.:
-          noDynAccCutFlag = True
-
-      betaX_quad = 19.98 #[m]
-      betaY_quad = 22.96 #[m]
-      #cut on previous calculations
-      if ((Mux*Mux/(0.05*0.05))+(Muxp*Muxp/(0.004*0.004)) < 1.) and (f(Muy, Muyp) < 1.0) and ((noDynAccCutFlag) or ((emittance(Mux,Muxp,betaX_quad) <= epsilon(Mup_spread)) and (emittance(muy,muyp,betaY_quad) <= epsilon(Mup_spread)))):
-            Absorbed = False
-      else:
-            Absorbed = True
-
-      return Absorbed
+      #physical and dynamical acceptance; constants computed once per central momentum
+      if (NeutrinoEventInstance.__Acceptance is None) or \
+         (NeutrinoEventInstance.__Acceptance.mup0() != mup0):
+          NeutrinoEventInstance.__Acceptance = ringAcc.ringAcceptance(nuSTRMCnst.muAcc(), mup0)
+
+      #Pion decay transverse position coordinates = Muon Decay transverse position coordinates
+      return NeutrinoEventInstance.__Acceptance.isAbsorbed(piTraceSpaceCoord[1], piTraceSpaceCoord[2], \
+                                                           mu4mmtm[1][0], mu4mmtm[1][1], mu4mmtm[1][2])
 
 
 #--------  get/set methods:
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Class ParticleBlock:
+====================
+
+  Many particles held as one numpy structured array, so each quantity is a
+  contiguous column.  The columns are those of an eventHistory branch:
+  runNumber, eventNumber, pdgCode, x, y, z, s, px, py, pz, t, eventWeight
+  and mass.  Single particles can be moved in and out as particle instances.
+
+  Module attributes:
+  ------------------
+  particleDtype : numpy dtype of one particle, same order as the leaf list
+                  of the eventHistory branches
+
+  Instance attributes:
+  --------------------
+  _records : structured array (dtype particleDtype), one row per particle
+
+  Methods:
+  --------
+  Built-in methods __init__, __len__, __getitem__, __repr__ and __str__.
+      __init__    : Either n (block of n zeroed particles) or records (an
+                    existing array of dtype particleDtype, not copied)
+      __len__     : Number of particles
+      __getitem__ : Integer index returns a particle instance; a slice or
+                    mask returns a ParticleBlock
+      __repr__    : One liner with call.
+      __str__     : Number of particles and first entry
+
+  Get/set methods:
+      records : The structured array
+      run, event, pdgCode, s, x, y, z, px, py, pz, t, weight, mass:
+                the column, as a numpy array view (no copy)
+      E, xp, yp : Energy and x', y' calculated from the columns
+      setParticle(i, par): Copies particle instance par into row i
+
+  General methods:
+      fromParticles : (static) ParticleBlock from a list of particle instances
+
+Created on Sun 18Oct26: Version history:
+----------------------------------------------
+ 1.0: 18Oct26: First implementation
+
+@author: PaulKyberd
+"""
+
+import numpy as np
+import particle as particle
+
+particleDtype = np.dtype([("runNumber", np.int32), ("eventNumber", np.int32), ("pdgCode", np.int32),
+                          ("x", np.float64), ("y", np.float64), ("z", np.float64), ("s", np.float64),
+                          ("px", np.float64), ("py", np.float64), ("pz", np.float64), ("t", np.float64),
+                          ("eventWeight", np.float64), ("mass", np.float64)])
+
+class ParticleBlock:
+
+    __Debug  = False
+
+#--------  "Built-in methods":
+    def __init__(self, n=0, records=None):
+        if records is None:
+            self._records = np.zeros(n, dtype=particleDtype)
+        else:
+            if records.dtype != particleDtype:
+                raise Exception("ParticleBlock: records must have dtype particleDtype")
+            self._records = records
+        return
+
+    def __len__(self):
+        return len(self._records)
+
+    def __getitem__(self, i):
+        if isinstance(i, (int, np.integer)):
+            r = self._records[i]
+            return particle.particle(int(r["runNumber"]), int(r["eventNumber"]), float(r["s"]), float(r["x"]),
+                                     float(r["y"]), float(r["z"]), float(r["px"]), float(r["py"]), float(r["pz"]),
+                                     float(r["t"]), float(r["eventWeight"]), int(r["pdgCode"]))
+        return ParticleBlock(records=self._records[i])
+
+    def __repr__(self):
+        return "ParticleBlock(n)"
+
+    def __str__(self):
+        if len(self._records) == 0:
+            return "ParticleBlock: empty"
+        return "ParticleBlock: %i particles, first: %s" % (len(self._records), self._records[0])
+
+#--------  get/set methods:
+    def records(self):
+        return self._records
+
+    def run(self):
+        return self._records["runNumber"]
+
+    def event(self):
+        return self._records["eventNumber"]
+
+    def pdgCode(self):
+        return self._records["pdgCode"]
+
+    def s(self):
+        return self._records["s"]
+
+    def x(self):
+        return self._records["x"]
+
+    def y(self):
+        return self._records["y"]
+
+    def z(self):
+        return self._records["z"]
+
+    def px(self):
+        return self._records["px"]
+
+    def py(self):
+        return self._records["py"]
+
+    def pz(self):
+        return self._records["pz"]
+
+    def t(self):
+        return self._records["t"]
+
+    def weight(self):
+        return self._records["eventWeight"]
+
+    def mass(self):
+        return self._records["mass"]
+
+    def E(self):
+        r = self._records
+        return np.sqrt(r["px"]**2 + r["py"]**2 + r["pz"]**2 + r["mass"]**2)
+
+    def xp(self):
+        return self._records["px"]/self._records["pz"]
+
+    def yp(self):
+        return self._records["py"]/self._records["pz"]
+
+    def setParticle(self, i, par):
+        self._records[i] = (par.run(), par.event(), par.pdgCode(), par.x(), par.y(), par.z(), par.s(),
+                            par.px(), par.py(), par.pz(), par.t(), par.weight(), par.mass())
+
+#--------  General methods:
+    @staticmethod
+    def fromParticles(particles):
+        block = ParticleBlock(len(particles))
+        for i, par in enumerate(particles):
+            block.setParticle(i, par)
+        return block
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Class PionDecayBatch:
+=====================
+
+  Generates the decay distributions for pion decay at rest for a whole array
+  of decays in one call.  The physics is that of PionDecay; the quantities
+  are returned as contiguous numpy arrays, one row per decay.
+
+  Two-body kinematics fixes the muon and neutrino energies in the pion rest
+  frame, so these are computed once.  The random orientation,
+  Rz(phi).Ry(theta) applied to the muon along +z as in PionDecay.ranCoor, is
+  written out directly in terms of cos(theta) and phi.
+
+  Dependencies:
+   - numpy, math, PionConst, MuonConst
+
+  Class attributes:
+  -----------------
+  __pStar  : Momentum of the muon and neutrino in the pion rest frame (MeV)
+  __E_mu   : Muon energy in the pion rest frame (MeV)
+  __E_numu : Muon-neutrino energy in the pion rest frame (MeV)
+
+  Instance attributes:
+  --------------------
+  _rng : numpy random Generator used for all the sampling
+
+  Methods:
+  --------
+  Built-in methods __init__, __repr__ and __str__.
+      __init__ : Creates the generator
+                 Optional keyword argument rng -- numpy random Generator
+      __repr__ : One liner with call.
+      __str__  : Dump of the rest-frame kinematics
+
+  Get/set methods:
+    getpStar   : Returns momentum of the decay products in the rest frame (MeV)
+    getEmu     : Returns muon energy in the rest frame (MeV)
+    getEnumu   : Returns muon-neutrino energy in the rest frame (MeV)
+    setRng(rng): Sets the generator, e.g. the RandomStream.eventDraws of a batch
+
+  Pion-decay methods:
+    GenerateLifetime: Generates n lifetimes.  Returns an array (s)
+                      Optional keyword argument Tmax -- cut off lifetime at Tmax
+    GenerateForcedLifetime(tMin, tMax): Generates one lifetime per element of
+                      the arrays tMin, tMax from the exponential restricted to
+                      [tMin, tMax].  Returns the lifetimes (s) and the weights,
+                      the probability exp(-tMin/tau) - exp(-tMax/tau) of a
+                      decay in the window
+    decaypion       : Generates n pion decays.  Returns two (n,4) arrays,
+                      v_mu, v_numu, rows (E, px, py, pz) (units MeV), and two
+                      arrays, costheta and phi
+    ranCoor         : Generates n random orientations.  Returns the (n,3)
+                      muon direction and the arrays costheta and phi
+
+Created on Sun 18Oct26: Version history:
+----------------------------------------------
+ 1.2: 18Oct26: setRng
+ 1.1: 18Oct26: GenerateForcedLifetime for decays forced into a window
+ 1.0: 18Oct26: First implementation
+
+@author: PaulKyberd
+"""
+
+import math as mth
+import numpy as np
+import PionConst as pC
+import MuonConst as mC
+
+piCnst = pC.PionConst()
+muCnst = mC.MuonConst()
+
+class PionDecayBatch:
+
+    __pStar  = 29.7923147
+    __E_mu   = mth.sqrt(muCnst.mass()**2 + __pStar**2)
+    __E_numu = __pStar
+
+    __Debug = False
+
+#--------  "Built-in methods":
+    def __init__(self, **kwargs):
+
+        rng = kwargs.get('rng', None)
+        self._rng = np.random.default_rng() if rng is None else rng
+
+        if self.__Debug:
+            print("PionDecayBatch: Emu + Enumu - mpi = ", \
+                  PionDecayBatch.__E_mu + PionDecayBatch.__E_numu - piCnst.mass())
+
+        return
+
+    def __repr__(self):
+        return "PionDecayBatch()"
+
+    def __str__(self):
+        return "PionDecayBatch: p* = %g MeV, E_mu = %g MeV, E_numu = %g MeV" % \
+               (PionDecayBatch.__pStar, PionDecayBatch.__E_mu, PionDecayBatch.__E_numu)
+
+    def setRng(self, rng):
+        self._rng = rng
+
+#--------  "Dynamic methods"; lifetimes and angles for n decays
+    def GenerateLifetime(self, n, **kwargs):
+        Tmax = kwargs.get('Tmax', float('inf'))
+        Gmx = 1. - mth.exp( -Tmax / piCnst.lifetime() )
+        ran = self._rng.random(n) * Gmx
+        return -np.log(1.-ran) * piCnst.lifetime()
+
+    def GenerateForcedLifetime(self, tMin, tMax):
+        tau = piCnst.lifetime()
+        gMin = np.exp(-np.asarray(tMin, dtype=float)/tau)
+        gMax = np.exp(-np.asarray(tMax, dtype=float)/tau)
+        weight = gMin - gMax
+        ran = self._rng.random(len(weight))
+        return -np.log(gMin - ran*weight) * tau, weight
+
+#--------  Random orientation flat in phi and cos Theta
+    def ranCoor(self, n):
+        phi = self._rng.random(n) * 2.*mth.pi
+        cTheta = -1. + 2.*self._rng.random(n)
+        sTheta = np.sqrt(1. - cTheta**2)
+
+#.. Rz(phi).Ry(theta) applied to the z axis
+        u = np.empty((n, 3))
+        u[:, 0] = -np.cos(phi)*sTheta
+        u[:, 1] = -np.sin(phi)*sTheta
+        u[:, 2] = cTheta
+
+        return u, cTheta, phi
+
+    def decaypion(self, n):
+        u, cosTheta, phi = self.ranCoor(n)
+
+        v_mu = np.empty((n, 4))
+        v_mu[:, 0]  = PionDecayBatch.__E_mu
+        v_mu[:, 1:] = u * PionDecayBatch.__pStar
+
+        v_numu = np.empty((n, 4))
+        v_numu[:, 0]  = PionDecayBatch.__E_numu
+        v_numu[:, 1:] = -v_mu[:, 1:]
+
+        return v_mu, v_numu, cosTheta, phi
+
+#--------  "Get methods" only
+    def getpStar(self):
+        return PionDecayBatch.__pStar
+
+    def getEmu(self):
+        return PionDecayBatch.__E_mu
+
+    def getEnumu(self):
+        return PionDecayBatch.__E_numu
@@ -11,9 +11,13 @@ Class PionEventInstance:
   -----------------
   __PionDecay: pion decay class
   --np       : numpy class
+  __Geometry : nuSTORMGeometry built by the first instance created without
+               one; used by later instances that are not given a geometry
 
   Instance attributes:
   --------------------
+  _geometry     : nuSTORMGeometry instance; optional i/p argument (geometry=),
+                  build it once per run and pass it to every instance
   _ppi          : Pion momentum: i/p argument at instance creation
   _pmu          : Muon momentum;
   _TrcSpcCrd    : Trace space (s, x, y, z, x', y') in numpy array at
@@ -67,13 +71,20 @@ Created on Tue 30Mar21;02:26: Version history:
  1.3: 06Jun22: Output two trace spaces, one at pion generation (Coord, _LclTrcSpcCrd) and one at pion decay
                (DcyCoord, _TrcSpcCrd) and get nuSTORM constants from nuSTORMConst.py
  @author: MarvinPfaff
+
+ 1.4: 18Oct26: Boost2nuSTORM uses the numpy LorentzBoost module in place of ROOT's TLorentzVector
+ @author: PaulKyberd
+
+ 1.5: 18Oct26: BeamDir from the section table of nuSTORMGeometry (geometry keyword argument)
+ @author: PaulKyberd
 """
 
 from copy import deepcopy
-from ROOT import TLorentzVector as T4V
+import LorentzBoost as LB
 import nuSTORMPrdStrght as nuPrdStrt
 #import nuSTORMTrfLineCmplx as nuTrf
 import nuSTORMConst
+import nuSTORMGeometry as nuGeom
 import PionDecay as PionDecay
 import MuonConst as MuonConst
 import PionConst as PionConst
@@ -97,11 +108,20 @@ class PionEventInstance:
     __pimass = piCnst.mass()/1000.
     __sol    = muCnst.SoL()
 
+    __Geometry = None
+
     __Debug  = False
 
 #--------  "Built-in methods":
     def __init__(self, ppi=6., **kwargs):
 
+        geometry = kwargs.get('geometry')
+        if geometry is None:
+            if PionEventInstance.__Geometry is None:
+                PionEventInstance.__Geometry = nuGeom.nuSTORMGeometry(nuSTRMCnst, nuStrt)
+            geometry = PionEventInstance.__Geometry
+        self._geometry = geometry
+
         self._pion = kwargs.get('particleTar')
         self._pionLcl = kwargs.get('particleTarLocal')
         if self._pion != None:
@@ -280,81 +300,7 @@ class PionEventInstance:
 #.. Beam position, direction and corresponding rotation operator:
 
     def BeamDir(self, s, Ppi):
-        PrdStrghtLngth = nuSTRMCnst.ProdStrghtLen()
-        Circumference  = nuSTRMCnst.Circumference()
-        ArcLen         = nuSTRMCnst.ArcLen()
-
-        #s_ring takes into account that s = 0. at target and s_ring=z for production straight
-        s_ring         = s-tlCmplxLength
-        #where corresponds to location within the ring
-        if (s_ring <= 0.):
-            where      = s_ring
-        else:
-            where      = s_ring%Circumference
-        ArcRad         = ArcLen/math.pi
-
-        if ( 0. >= where):
-            if PionEventInstance.__Debug:
-                print("         ---->", \
-                      "BeamDir: the pion decays in the transfer line complex")
-
-            theta         =  self._tlAngle          #Angle with respect to Z axis
-            z             =  math.cos(theta)*where
-            x             = -math.sin(theta)*where
-            y             = 0.
-            BeamPos       = [x, y, z]
-
-        elif ( PrdStrghtLngth >= where > 0.):
-            if PionEventInstance.__Debug:
-                print("         ---->", \
-                      "BeamDir: the pion decays in the production straight")
-
-            theta         = 0.     #Angle with respect to Z axis
-            BeamPos       = [0., 0., where]
-
-        elif (PrdStrghtLngth+ArcLen >= where > PrdStrghtLngth):
-            if PionEventInstance.__Debug:
-                print("         ---->", \
-                      "BeamDir: the pion decays in the first arc")
-
-            ArcLenCovered = where - PrdStrghtLngth
-            theta         = math.pi*ArcLenCovered/ArcLen
-            BeamPos       = [ \
-                              (ArcRad-ArcRad* math.cos(theta)),       \
-                              0.,                                     \
-                              PrdStrghtLngth+ArcRad*math.sin(theta)]
-
-        elif (2*PrdStrghtLngth+ArcLen >= where > PrdStrghtLngth+ArcLen):
-            if PionEventInstance.__Debug:
-                print("         ---->", \
-                      "BeamDir: the pion decays in the return straight")
-
-            theta         = math.pi
-            BeamPos       = [2.*ArcRad, \
-                             0., \
-                             PrdStrghtLngth-(where-ArcLen-PrdStrghtLngth)]
-
-        elif (2*PrdStrghtLngth+2*ArcLen>=where>=2*PrdStrghtLngth+ArcLen):
-            if PionEventInstance.__Debug:
-                print("         ---->", \
-                      "BeamDir: the pion decays in the second/return arc")
-
-            ArcLenCovered = where - 2*PrdStrghtLngth - ArcLen
-            theta         = math.pi + math.pi*ArcLenCovered/ArcLen
-            BeamPos       = [ \
-                              (ArcRad-ArcRad*math.cos(theta)), \
-                              0., \
-                              ArcRad*math.sin(theta)]
-
-        # R=rotation with respect to y axis through theta angle
-        R    = np.array([ \
-                          [math.cos(theta),  0., math.sin(theta)], \
-                          [0.,               1., 0.],              \
-                          [-math.sin(theta), 0., math.cos(theta)]])
-        Rinv = np.array([ \
-                          [math.cos(theta),  0.,-math.sin(theta)], \
-                          [0.,               1., 0.],              \
-                          [math.sin(theta),  0., math.cos(theta)]])
+        R, Rinv, BeamPos, theta = self._geometry.BeamDir(s)
 
         if PionEventInstance.__Debug:
             print('               ----> theta, s:', theta, s)
@@ -372,64 +318,24 @@ class PionEventInstance:
 
         EPi = np.sqrt(PPi**2 + PionEventInstance.__pimass**2)
         pB  = PPi*DirCos
-        pi4v = T4V.TLorentzVector(pB[0], pB[1], pB[2], EPi)
-        b    = pi4v.BoostVector()
-
-        #beta   = PPi / EPi
-        #gamma  = EPi / PionEventInstance.__pimass
+        b    = pB/EPi
 
-        #R    = np.array([[1., 0., 0.], [0., 1., 0.], [0., 0., 1.]])
-        #Rinv = np.array([[1., 0., 0.], [0., 1., 0.], [0., 0., 1.]])
         if PionEventInstance.__Debug:
             print("PionEventInstance.Boost2nuSTORM: boost parameters:")
             print("----> PPi, EPi, boost:", PPi, EPi, "; ", b[0], b[1], b[2])    # OK with P_mu=8
 
-        # Treat decay components:
-        P_mu    = Dcy.get4vmu()
-        P_mu[0] = P_mu[0]/1000.
-        P_mu[1] = P_mu[1]/1000.
-
-        P_mu4v  = T4V.TLorentzVector(P_mu[1][0], \
-                                    P_mu[1][1], \
-                                    P_mu[1][2], \
-                                    P_mu[0] )
-        if PionEventInstance.__Debug:
-            print("            ----> Rest frame P_mu4v (GeV):",
-                  P_mu4v.E(), P_mu4v.Px(), P_mu4v.Py(), P_mu4v.Pz())
-
-        P_mu4v.Boost(b)
-
+        # Treat decay components, rest frame (MeV) to nuSTORM frame (GeV) in one boost:
+        P = np.stack((LB.to4Vector(Dcy.get4vmu()), LB.to4Vector(Dcy.get4vnumu())))/1000.
         if PionEventInstance.__Debug:
-            print("            ----> nuSTORM frame P_mu4v (GeV):",
-                  P_mu4v.E(), P_mu4v.Px(), P_mu4v.Py(), P_mu4v.Pz())
+            print("            ----> Rest frame P_mu, P_numu (GeV):", P[0], P[1])
 
-        P_numu    = Dcy.get4vnumu()
-        P_numu[0] = P_numu[0]/1000.
-        P_numu[1] = P_numu[1]/1000.
-        P_numu4v  = T4V.TLorentzVector(P_numu[1][0], \
-                                       P_numu[1][1], \
-                                       P_numu[1][2], \
-                                       P_numu[0] )
+        P = LB.Boost(P, b)
 
         if PionEventInstance.__Debug:
-            print("            ----> Rest frame P_numu4v (GeV):",
-                  P_numu4v.E(), P_numu4v.Px(), P_numu4v.Py(), P_numu4v.Pz())
-
-        P_numu4v.Boost(b)
+            print("            ----> nuSTORM frame P_mu, P_numu (GeV):", P[0], P[1])
 
-        if PionEventInstance.__Debug:
-            print("            ----> nuSTORM frame P_numu4v (GeV):",
-                  P_numu4v.E(), P_numu4v.Px(), P_numu4v.Py(), P_numu4v.Pz())
-
-        P_mu[0]    = P_mu4v.E()
-        P_mu[1][0] = P_mu4v.Px()
-        P_mu[1][1] = P_mu4v.Py()
-        P_mu[1][2] = P_mu4v.Pz()
-
-        P_numu[0]    = P_numu4v.E()
-        P_numu[1][0] = P_numu4v.Px()
-        P_numu[1][1] = P_numu4v.Py()
-        P_numu[1][2] = P_numu4v.Pz()
+        P_mu   = LB.from4Vector(P[0])
+        P_numu = LB.from4Vector(P[1])
 
  #       print ("End boost to nuStorm")
 
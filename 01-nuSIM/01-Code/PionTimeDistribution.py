@@ -7,6 +7,12 @@ Class PionTimeDistribution:
 
   Generates time distributions for pion at target.
 
+  The pions arrive uniformly in time within the bunches of the extraction:
+  bunch k covers [k(tb+ts), k(tb+ts)+tb) and the extraction ends at tx, so
+  the last bunch may be cut short.  A uniform u over the total bunch time,
+  A = nFull*tb + lastLen, is mapped directly to a bunch index k = u//tb and
+  an offset u - k tb in the bunch; no draws are rejected.
+
   Dependencies:
    - numpy, Simulation, math, deepcopy
 
@@ -15,6 +21,10 @@ Class PionTimeDistribution:
   _tb : bunch length
   _ts : bunch spacing, i.e. time between bunches
   _tx : duration of extraction
+  _period  : tb + ts
+  _nFull   : number of bunches complete within the extraction
+  _lastLen : length of the bunch cut by the end of the extraction (may be 0)
+  _accepted: total bunch time in the extraction, nFull*tb + lastLen
 
   Methods:
   --------
@@ -34,10 +44,16 @@ Class PionTimeDistribution:
   PionTimeDistribution methods:
     GenerateTime: Generates time of pion at target with respect to first pion.
                   Returns time (float). Units s
+    GenerateTimes: Generates n times.  Returns an array.  Units s
+                  Optional argument rng -- numpy Generator, default that of
+                  the Simulation RandomStream
+    mapTimes    : Maps uniforms in [0, 1) to times in the bunches.  Units s
 
 Created on Mon 22Nov21: Version history:
 ----------------------------------------------
  1.0: 22Nov21: First implementation
+ 1.1: 18Oct26: Sample the bunch and the offset in it directly instead of rejecting
+               times between bunches; add GenerateTimes and mapTimes
 
 @author: MarvinPfaff
 """
@@ -56,6 +72,11 @@ class PionTimeDistribution:
         self._ts = t_spacing * 10**(-9)
         self._tx = t_extraction * 10**(-6)
 
+        self._period   = self._tb + self._ts
+        self._nFull    = int(self._tx // self._period)
+        self._lastLen  = min(self._tb, max(self._tx - self._nFull*self._period, 0.))
+        self._accepted = self._nFull*self._tb + self._lastLen
+
         return
 
     def __repr__(self):
@@ -71,14 +92,16 @@ class PionTimeDistribution:
 
 #--------  "Dynamic methods"; individual time
     def GenerateTime(self, **kwargs):
-        check = False
-        while not check:
-            t = Simu.getRandom() * self._tx
-            t_mod = math.fmod(t,self._tb+self._ts)
-            if t_mod < self._tb:
-                check = True
-        #print("time within bunch ", t_mod*1E9)
-        return t
+        return float(self.mapTimes(Simu.getRandom()))
+
+    def GenerateTimes(self, n, rng=None):
+        rng = Simu.getRandomStream().generator() if rng is None else rng
+        return self.mapTimes(rng.random(n))
+
+    def mapTimes(self, u):
+        a = np.asarray(u, dtype=float) * self._accepted
+        k = np.minimum(np.floor(a / self._tb), self._nFull)
+        return k*self._period + (a - k*self._tb)
 
 #--------  "Get methods" only; version, reference, and constants
 #.. Methods believed to be self documenting(!)
@@ -6,6 +6,16 @@ Class RandomGenerator
 
   Class to generate random numbers according to a histogram.
 
+  The bin contents of the histograms are read once and turned into
+  cumulative tables; random numbers are then drawn from the tables with
+  np.searchsorted, as many as wanted per call.  The sampling follows
+  TH1::GetRandom (bin by binary search of the cumulative integral, position
+  in the bin by linear interpolation of the same uniform) and
+  TH2::GetRandom2 (cell by binary search, x interpolated as for 1D, y flat
+  in the cell from a second uniform).  The tables are cached in a .npz file
+  next to the ROOT file; while the cache is newer than the ROOT file, ROOT
+  is not needed.
+
   Class attributes:
   -----------------
   __instance : Set on creation of first (and only) instance.
@@ -15,26 +25,44 @@ Class RandomGenerator
   _rootfilename = Filename, including path, to ROOT file containing
                   histgrams that should be used to generate random
                   numbers.
-  _hist         = 1D histogram containing e.g. absolute momentum distribution
-  _hist2Dx      = 2D histogram containing phase space distribution in x
-  _hist2Dy      = 2D histogram containing phase space distribution in y
+  _cachefilename= Filename of the .npz cache of the tables
+  _table        = table (edges, cdf) of the 1D histogram containing e.g.
+                  absolute momentum distribution
+  _table2Dx     = table (xEdges, yEdges, cdf) of the 2D histogram containing
+                  phase space distribution in x
+  _table2Dy     = table (xEdges, yEdges, cdf) of the 2D histogram containing
+                  phase space distribution in y
 
   Methods:
   --------
   Built-in methods __new__, __repr__ and __str__.
       __new__ : Creates singleton class and prints version, PDG
                 reference, and values of constants used.
+                Optional argument useCache (default True)
       __repr__: One liner with call.
       __str__ : Dump of contents
 
   Get/set methods:
       CdVrsn()       : Returns code version number.
       getRootFilename: Returns filename of ROOT file, including path.
+      getCacheFilename: Returns filename of the .npz cache of the tables.
 
   Simulation methods:
       getRandom    : Generates one random number  according to a 1D histogram
       getRandom2Dx : Generates two random numbers according to a 2D histogram (in x)
       getRandom2Dy : Generates two random numbers according to a 2D histogram (in y)
+      getRandomArray(n, rng)   : getRandom for n events, returns an array
+      getRandom2DxArray(n, rng): getRandom2Dx for n events, returns two arrays
+      getRandom2DyArray(n, rng): getRandom2Dy for n events, returns two arrays
+                     rng is a numpy Generator, default that of the Simulation
+                     RandomStream; the scalar methods use Simulation.getRandom
+
+  Module methods (numpy only):
+      table1D(edges, contents)          : cumulative table of a 1D histogram
+      table2D(xEdges, yEdges, contents) : cumulative table of a 2D histogram,
+                                          contents[ix, iy]
+      sample1D(table, r)        : values for the uniforms r
+      sample2D(table, r1, r2)   : (x, y) values for the uniforms r1, r2
 
 Created on Mon 27Dec21: Version history:
 ----------------------------------------------
@@ -43,34 +71,91 @@ Created on Mon 27Dec21: Version history:
  1.1: 22Jun21: Implemented differentiation of x and y to be able to generate phase space
                in the two different coordinates from two different histograms
 
+ 1.2: 18Oct26: Sample from cumulative tables of the bin contents with np.searchsorted
+               rather than TH1/TH2 GetRandom; add the array methods and the .npz
+               cache of the tables.  Random numbers come from the RandomStream.
+
 @author: MarvinPfaff
 """
 
 #--------  Module dependencies
 import os
-import ctypes
-import ROOT
+import numpy as np
+import Simulation as Simu
+
+#--------  Module methods
+def table1D(edges, contents):
+    cdf = np.concatenate(([0.], np.cumsum(np.asarray(contents, dtype=float))))
+    if cdf[-1] <= 0.:
+        raise ValueError("RandomGenerator.table1D: histogram is empty")
+    return np.asarray(edges, dtype=float), cdf/cdf[-1]
+
+def table2D(xEdges, yEdges, contents):
+#.. cells ordered as in TH2::GetRandom2: x varies fastest
+    contents = np.asarray(contents, dtype=float)
+    cdf = np.concatenate(([0.], np.cumsum(contents.T.ravel())))
+    if cdf[-1] <= 0.:
+        raise ValueError("RandomGenerator.table2D: histogram is empty")
+    return np.asarray(xEdges, dtype=float), np.asarray(yEdges, dtype=float), cdf/cdf[-1]
+
+def _interpolate(edges, cdf, ibin, r):
+    width = cdf[ibin+1] - cdf[ibin]
+    frac  = np.where(width > 0., (r - cdf[ibin])/np.where(width > 0., width, 1.), 0.)
+    return edges[ibin] + (edges[ibin+1] - edges[ibin])*frac
+
+def sample1D(table, r):
+    edges, cdf = table
+    r = np.asarray(r, dtype=float)
+    ibin = np.clip(np.searchsorted(cdf, r, side='right') - 1, 0, len(edges) - 2)
+    return _interpolate(edges, cdf, ibin, r)
+
+def sample2D(table, r1, r2):
+    xEdges, yEdges, cdf = table
+    r1 = np.asarray(r1, dtype=float)
+    r2 = np.asarray(r2, dtype=float)
+    nx = len(xEdges) - 1
+    icell = np.clip(np.searchsorted(cdf, r1, side='right') - 1, 0, len(cdf) - 2)
+    iy, ix = np.divmod(icell, nx)
+    width = cdf[icell+1] - cdf[icell]
+    frac  = np.where(width > 0., (r1 - cdf[icell])/np.where(width > 0., width, 1.), 0.)
+    x = xEdges[ix] + (xEdges[ix+1] - xEdges[ix])*frac
+    y = yEdges[iy] + (yEdges[iy+1] - yEdges[iy])*r2
+    return x, y
 
 class RandomGenerator(object):
 
     __instance = None
 
 #--------  "Built-in methods":
-    def __new__(cls, rootfilename, histname, histname2Dx, histname2Dy):
+    def __new__(cls, rootfilename, histname, histname2Dx, histname2Dy, useCache=True):
         if cls.__instance is None:
             print('RandomGenerator.__new__: creating the RandomGenerator object')
             print('-------------------')
             cls.__instance = super(RandomGenerator, cls).__new__(cls)
 
-            cls._rootfilename = rootfilename
-            rootFile = ROOT.TFile(cls._rootfilename, 'READ', 'ROOT file with Histograms')
-            cls._hist = rootFile.Get(histname)
-            cls._hist.SetDirectory(0)
-            cls._hist2Dx = rootFile.Get(histname2Dx)
-            cls._hist2Dx.SetDirectory(0)
-            cls._hist2Dy = rootFile.Get(histname2Dy)
-            cls._hist2Dy.SetDirectory(0)
-            rootFile.Close()
+            cls._rootfilename  = rootfilename
+            cls._cachefilename = os.path.splitext(rootfilename)[0] + "_" + histname + "_" + \
+                                 histname2Dx + "_" + histname2Dy + ".npz"
+
+            if (useCache and os.path.exists(cls._cachefilename) and
+                (not os.path.exists(rootfilename) or
+                 os.path.getmtime(cls._cachefilename) >= os.path.getmtime(rootfilename))):
+                with np.load(cls._cachefilename) as cache:
+                    cls._table   = (cache["pEdges"], cache["pCdf"])
+                    cls._table2Dx = (cache["xxEdges"], cache["xyEdges"], cache["xCdf"])
+                    cls._table2Dy = (cache["yxEdges"], cache["yyEdges"], cache["yCdf"])
+            else:
+                import ROOT
+                rootFile = ROOT.TFile(cls._rootfilename, 'READ', 'ROOT file with Histograms')
+                cls._table   = cls.histTable(rootFile.Get(histname))
+                cls._table2Dx = cls.histTable(rootFile.Get(histname2Dx))
+                cls._table2Dy = cls.histTable(rootFile.Get(histname2Dy))
+                rootFile.Close()
+                if useCache:
+                    np.savez(cls._cachefilename,
+                             pEdges=cls._table[0], pCdf=cls._table[1],
+                             xxEdges=cls._table2Dx[0], xyEdges=cls._table2Dx[1], xCdf=cls._table2Dx[2],
+                             yxEdges=cls._table2Dy[0], yyEdges=cls._table2Dy[1], yCdf=cls._table2Dy[2])
 
             # Summarise initialisation
             cls.print(cls)
@@ -84,39 +169,59 @@ class RandomGenerator(object):
         self.__repr__()
         self.print()
 
+#.. bin edges and contents (no under/overflow) of a TH1 or TH2
+    @staticmethod
+    def histTable(hist):
+        xAxis = hist.GetXaxis()
+        nx = hist.GetNbinsX()
+        xEdges = np.array([xAxis.GetBinLowEdge(i) for i in range(1, nx+2)])
+        if hist.GetDimension() == 1:
+            contents = np.array([hist.GetBinContent(i) for i in range(1, nx+1)])
+            return table1D(xEdges, contents)
+        yAxis = hist.GetYaxis()
+        ny = hist.GetNbinsY()
+        yEdges = np.array([yAxis.GetBinLowEdge(j) for j in range(1, ny+2)])
+        contents = np.array([[hist.GetBinContent(i, j) for j in range(1, ny+1)] for i in range(1, nx+1)])
+        return table2D(xEdges, yEdges, contents)
+
     #--------  Module methods
     def getRandom(self):
-        #rootFile = ROOT.TFile(self._rootfilename, 'READ', 'ROOT file with Histograms')
-        #hist = rootFile.Get(histname)
-        x = self._hist.GetRandom()
-        return x
+        return float(sample1D(self._table, Simu.getRandom()))
 
     def getRandom2Dx(self):
-        x = ctypes.c_double(0.0)
-        y = ctypes.c_double(0.0)
-        #rootFile = ROOT.TFile(self._rootfilename, 'READ', 'ROOT file with Histograms')
-        #hist2D = rootFile.Get(histname)
-        self._hist2Dx.GetRandom2(x,y)
-        return x.value, y.value
+        x, y = sample2D(self._table2Dx, Simu.getRandom(), Simu.getRandom())
+        return float(x), float(y)
 
     def getRandom2Dy(self):
-        x = ctypes.c_double(0.0)
-        y = ctypes.c_double(0.0)
-        #rootFile = ROOT.TFile(self._rootfilename, 'READ', 'ROOT file with Histograms')
-        #hist2D = rootFile.Get(histname)
-        self._hist2Dy.GetRandom2(x,y)
-        return x.value, y.value
+        x, y = sample2D(self._table2Dy, Simu.getRandom(), Simu.getRandom())
+        return float(x), float(y)
+
+    def getRandomArray(self, n, rng=None):
+        rng = Simu.getRandomStream().generator() if rng is None else rng
+        return sample1D(self._table, rng.random(n))
+
+    def getRandom2DxArray(self, n, rng=None):
+        rng = Simu.getRandomStream().generator() if rng is None else rng
+        return sample2D(self._table2Dx, rng.random(n), rng.random(n))
+
+    def getRandom2DyArray(self, n, rng=None):
+        rng = Simu.getRandomStream().generator() if rng is None else rng
+        return sample2D(self._table2Dy, rng.random(n), rng.random(n))
 
 #--------  "Get methods" only; version, reference, and constants
 #.. Methods believed to be self documenting(!)
 
     def CdVrsn(self):
-        return 1.1
+        return 1.2
 
     def getRootFilename(self):
         return self._rootfilename
 
+    def getCacheFilename(self):
+        return self._cachefilename
+
 #--------  Utilities:
     def print(self):
         print("    RandomGenerator.print: version:", self.CdVrsn(self))
         print("    ROOT filename for histogram input  :", self._rootfilename)
+        print("    cache of the cumulative tables     :", self._cachefilename)
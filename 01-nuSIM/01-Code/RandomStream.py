@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Class RandomStream:
+===================
+
+  Reproducible random numbers for a (run, shard), built on the numpy
+  Philox (counter-based) bit generator.  The Philox key is derived from
+  (runNumber, shard) through a numpy SeedSequence; the 256 bit counter is
+  divided between the streams:
+
+    counter word 3 = event  : the stream of event "event" (2^192 blocks)
+    counter word 3 = 2^64-1 : the stream of the shard as a whole, used by
+                              random/uniforms/generator; jumps move it on in
+                              steps of 2^128 blocks
+
+  The numbers of an event depend on (run, shard, event) alone, so the same
+  event is generated identically whether it is generated on its own
+  (eventGenerator) or as one row of a vectorised batch (eventUniforms,
+  which evaluates Philox4x64-10 on the counters of all the events at once
+  and reproduces eventGenerator(event).random(nDraws) bit for bit).
+  eventDraws wraps eventUniforms for a batch generator: each call
+  random(n) gives the next draw of every event of the batch, so a batch
+  generator making the same calls gives every event the same numbers
+  whatever the batch size or shard.  startEvent does the same for code
+  drawing one number at a time (Simulation.getRandom).
+
+  The event stream fixes the numbers of an event, not the use made of
+  them: the event by event generator takes them one at a time in the
+  order its objects ask for them, eventBatch takes them column by column
+  in its own fixed order.  The same (run, event) is therefore a different
+  event in the two generators; they agree in distribution only.  Within
+  one generator an event is bit for bit the same whatever the batch size
+  or the shard.
+
+  Dependencies:
+   - numpy
+
+  Class attributes:
+  -----------------
+  __bufferSize : Number of uniforms drawn at a time for random()
+
+  Instance attributes:
+  --------------------
+  _runNumber : Run number (None if the stream was seeded from entropy)
+  _shard     : Shard number
+  _key       : Philox key, two uint64
+  _gen       : numpy Generator of the shard stream
+  _buffer    : Block of uniforms handed out by random()
+  _bufferPnt : Position of the next uniform in _buffer
+
+  Methods:
+  --------
+  Built-in methods __init__, __repr__ and __str__.
+      __init__ : Creates the stream for (runNumber, shard).  With
+                 runNumber=None the key is taken from fresh entropy
+      __repr__ : One liner with call.
+      __str__  : Dump of run, shard and key
+
+  Get/set methods:
+      runNumber : Returns the run number
+      shard     : Returns the shard number
+      key       : Returns a copy of the Philox key
+
+  Stream methods:
+      random         : One uniform in [0, 1) from the shard stream
+      uniforms       : Array of n uniforms from the shard stream, continuing
+                       the sequence of random()
+      generator      : numpy Generator of the shard stream (shares its state)
+      jump           : Moves the shard stream on by nJumps*2^128 blocks
+      advance        : Moves the shard stream on by delta blocks
+      startEvent     : Points the shard stream (random, uniforms, generator)
+                       at the start of the stream of one event
+      eventGenerator : Fresh numpy Generator of the stream of one event
+      eventUniforms  : (len(events), nDraws) array; row i is
+                       eventGenerator(events[i]).random(firstDraw+nDraws)[firstDraw:]
+                       (optional argument firstDraw, default 0)
+      eventDraws     : eventDraws instance for the events of a batch
+
+Class eventDraws:
+=================
+
+  Stand-in for the numpy Generator of a batch generator: random(n), n the
+  number of events of the batch, returns draw k (k = number of calls so
+  far) of the stream of every event, computed four draws at a time with
+  eventUniforms.
+
+  Methods:
+      __init__(stream, events) : the RandomStream and the event numbers
+      random(n)                : next draw of each event, array of n
+      nDraws()                 : number of draws made
+
+Created on Sun 18Oct26: Version history:
+----------------------------------------------
+ 1.2: 18Oct26: Document that the batch and event by event generators use the
+      event streams in different orders
+ 1.1: 18Oct26: eventDraws and startEvent, event streams for the batch and
+      event by event generators; eventUniforms firstDraw
+ 1.0: 18Oct26: First implementation
+
+@author: PaulKyberd
+"""
+
+import numpy as np
+
+#  Philox4x64-10 constants
+_M0 = np.uint64(0xD2E7470EE14C6C93)
+_M1 = np.uint64(0xCA5A826395121157)
+_W0 = 0x9E3779B97F4A7C15
+_W1 = 0xBB67AE8584CAA73B
+_mask32 = np.uint64(0xFFFFFFFF)
+_shift32 = np.uint64(32)
+_shift11 = np.uint64(11)
+
+#.. high and low 64 bits of the 128 bit product a*b, a an array of uint64
+def _mulhilo(a, b):
+    aLo = a & _mask32
+    aHi = a >> _shift32
+    bLo = b & _mask32
+    bHi = b >> _shift32
+    p0 = aLo*bLo
+    p1 = aLo*bHi
+    p2 = aHi*bLo
+    p3 = aHi*bHi
+    mid = (p0 >> _shift32) + (p1 & _mask32) + (p2 & _mask32)
+    return p3 + (p1 >> _shift32) + (p2 >> _shift32) + (mid >> _shift32), a*b
+
+def _philox(ctr, key):
+    c0, c1, c2, c3 = ctr
+    k0, k1 = int(key[0]), int(key[1])
+    for i in range(10):
+        hi0, lo0 = _mulhilo(c0, _M0)
+        hi1, lo1 = _mulhilo(c2, _M1)
+        c0, c1, c2, c3 = hi1 ^ c1 ^ np.uint64(k0), lo1, hi0 ^ c3 ^ np.uint64(k1), lo0
+        k0 = (k0 + _W0) & 0xFFFFFFFFFFFFFFFF
+        k1 = (k1 + _W1) & 0xFFFFFFFFFFFFFFFF
+    return c0, c1, c2, c3
+
+class RandomStream:
+
+    __bufferSize = 4096
+
+#--------  "Built-in methods":
+    def __init__(self, runNumber=None, shard=0):
+        self._runNumber = runNumber
+        self._shard     = shard
+        if runNumber is None:
+            seq = np.random.SeedSequence()
+        else:
+            seq = np.random.SeedSequence([int(runNumber), int(shard)])
+        self._key = seq.generate_state(2, np.uint64)
+        self._gen = np.random.Generator(np.random.Philox(key=self._key, counter=np.array([0, 0, 0, 0xFFFFFFFFFFFFFFFF], dtype=np.uint64)))
+        self._buffer    = np.empty(0)
+        self._bufferPnt = 0
+
+        return
+
+    def __repr__(self):
+        return "RandomStream(" + str(self._runNumber) + ", " + str(self._shard) + ")"
+
+    def __str__(self):
+        return "RandomStream: run = %s, shard = %i, Philox key = (%i, %i)" % \
+               (self._runNumber, self._shard, self._key[0], self._key[1])
+
+#--------  "Get methods" only
+    def runNumber(self):
+        return self._runNumber
+
+    def shard(self):
+        return self._shard
+
+    def key(self):
+        return self._key.copy()
+
+#--------  Shard stream
+    def random(self):
+        if self._bufferPnt >= len(self._buffer):
+            self._buffer    = self._gen.random(RandomStream.__bufferSize)
+            self._bufferPnt = 0
+        ran = self._buffer[self._bufferPnt]
+        self._bufferPnt = self._bufferPnt + 1
+        return float(ran)
+
+    def uniforms(self, n):
+        nBuffered = min(n, len(self._buffer) - self._bufferPnt)
+        ran = np.empty(n)
+        ran[:nBuffered] = self._buffer[self._bufferPnt:self._bufferPnt+nBuffered]
+        self._bufferPnt = self._bufferPnt + nBuffered
+        ran[nBuffered:] = self._gen.random(n - nBuffered)
+        return ran
+
+    def generator(self):
+        return self._gen
+
+    def jump(self, nJumps=1):
+        self._gen.bit_generator.state = self._gen.bit_generator.jumped(nJumps).state
+        self._buffer    = np.empty(0)
+        self._bufferPnt = 0
+
+    def advance(self, delta):
+        self._gen.bit_generator.advance(delta)
+        self._buffer    = np.empty(0)
+        self._bufferPnt = 0
+
+    def startEvent(self, event):
+        self._gen.bit_generator.state = np.random.Philox(key=self._key, counter=np.array([0, 0, 0, int(event)], dtype=np.uint64)).state
+        self._buffer    = np.empty(0)
+        self._bufferPnt = 0
+
+#--------  Event streams
+    def eventGenerator(self, event):
+        return np.random.Generator(np.random.Philox(key=self._key, counter=np.array([0, 0, 0, int(event)], dtype=np.uint64)))
+
+    def eventUniforms(self, events, nDraws, firstDraw=0):
+        events = np.asarray(events, dtype=np.uint64)
+        firstBlock = firstDraw//4
+        nBlocks = (firstDraw + nDraws + 3)//4 - firstBlock
+        raw = np.empty((len(events), 4*nBlocks), dtype=np.uint64)
+        zero = np.zeros(len(events), dtype=np.uint64)
+#.. Philox increments the counter before it generates, so block j uses counter word 0 = j+1
+        for j in range(nBlocks):
+            out = _philox((zero + np.uint64(firstBlock+j+1), zero, zero, events), self._key)
+            for w in range(4):
+                raw[:, 4*j+w] = out[w]
+        offset = firstDraw - 4*firstBlock
+        return (raw[:, offset:offset+nDraws] >> _shift11) * (1.0/9007199254740992.0)
+
+    def eventDraws(self, events):
+        return eventDraws(self, events)
+
+class eventDraws:
+
+#--------  "Built-in methods":
+    def __init__(self, stream, events):
+        self._stream = stream
+        self._events = np.asarray(events, dtype=np.uint64)
+        self._nDraws = 0
+        self._block  = None
+
+        return
+
+    def __repr__(self):
+        return "eventDraws(stream, events)"
+
+    def __str__(self):
+        return "eventDraws: %i events, %i draws made, %s" % (len(self._events), self._nDraws, self._stream)
+
+    def nDraws(self):
+        return self._nDraws
+
+#.. the next draw of every event; four draws (one Philox block) are computed at a time
+    def random(self, n):
+        if n != len(self._events):
+            raise ValueError("eventDraws.random: every draw is made for all %i events, not %i" % (len(self._events), n))
+        k = self._nDraws%4
+        if k == 0:
+            self._block = self._stream.eventUniforms(self._events, 4, firstDraw=self._nDraws)
+        self._nDraws = self._nDraws + 1
+        return self._block[:, k].copy()
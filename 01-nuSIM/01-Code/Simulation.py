@@ -16,7 +16,7 @@ Class Simulation
   Packages loaded:
   ----------------
   "time"  : to get current date/time
-  "random": uniform random number generator
+  "RandomStream": reproducible uniform random number streams
       
   Instance attributes:
   --------------------
@@ -35,12 +35,30 @@ Class Simulation
       getRandomSeed: Returns random seed
   
   Simulation methods:
-      getRandom    : Returns uniformly distributed randum number
+      getRandom    : Returns uniformly distributed randum number from the
+                     current RandomStream
+      setRandomStream: Sets the RandomStream used by getRandom, e.g.
+                     RandomStream(runNumber, shard) for a reproducible run
+      getRandomStream: Returns the current RandomStream
       getParabolic : Generates a parabolic distributed random number from
-                     -p1 to p1 (p1 input)
+                     -p1 to p1 (p1 input), the closed-form root of the cubic
+                     cdf; agrees with the np.roots solution it replaced to
+                     1E-9 (to rounding, about 1E-15, in practice), not bit
+                     for bit
+      getParabolicArray: Vectorised parabolic distribution from -p1 to p1
+                     for an array of uniform random numbers (ran input)
 
 Created on Thu 10Jan21;11:04: Version history:
 ----------------------------------------------
+ 2.7: 18Oct26: The simulation modules are imported at module level again
+ 2.6: 18Oct26: print gives the version and the RandomStream counter
+ 2.5: 18Oct26: getRandom draws from a RandomStream (numpy Philox) in place
+      of the random module; add setRandomStream and getRandomStream.  The
+      Simulation class seeds it, as before, from the time.
+ 2.4: 18Oct26: Replace np.roots in getParabolic by the analytic
+      (trigonometric) root of the cubic; add getParabolicArray.  Import the
+      simulation modules when the Simulation class is used so the module
+      methods can be used without ROOT.
  2.3: KL: Dirty hack at line 136: run_type was not properly included.  I've
       set runType=1 to allow muon running.
  2.1: 08Jul21: Make pmu pbeam - to allow muon and pion running
@@ -52,7 +70,7 @@ Created on Thu 10Jan21;11:04: Version history:
 """
 
 #--------  Module dependencies
-import random as __Rnd
+import math
 import numpy as np
 import sys
 import nuSTORMPrdStrght as nuPrdStrt
@@ -62,29 +80,33 @@ import PionEventInstance as piEvtInst
 import ntupleMake as ntM 
 import plane as plane
 import Plots as plots
+import RandomStream as RStrm
+
+__Stream = RStrm.RandomStream()
 
 #--------  Module methods
 def getRandom():
-    return __Rnd.random()
+    return __Stream.random()
+
+def setRandomStream(stream):
+    global __Stream
+    __Stream = stream
+
+def getRandomStream():
+    return __Stream
 
 def getParabolic(p1):
     ran = getRandom()
-    a = np.array( [ 1., 0., (-3.*p1*p1), (2.*p1*p1*p1*(2.*ran - 1.)) ] )
-    r = np.roots(a)
-    isol = 0
-    for ri in r:
-        if not isinstance(ri, complex):
-            if ri >= -p1:
-                if ri <= p1:
-                    isol += 1
-                    p = ri
-    if isol != 1:
-        raiseException("nuSTORMPrdStrght.getParabolic; p multiply defined")
-    return p
+#..  Inverse of the cdf (x^3 - 3p1^2 x + 2p1^3)/(4p1^3) = ran: the root of the
+#    cubic in [-p1, p1] is 2p1 cos(arccos(1-2ran)/3 - 2pi/3)
+    return 2.*p1*math.cos(math.acos(1. - 2.*ran)/3. - 2.*math.pi/3.)
+
+def getParabolicArray(p1, ran):
+    ran = np.asarray(ran, dtype=float)
+    return 2.*p1*np.cos(np.arccos(1. - 2.*ran)/3. - 2.*np.pi/3.)
 
 #--------  Simulation class  --------
 class Simulation(object):
-    import random as __Rnd
     import time as __T
     __RandomSeed = __T.time()
 
@@ -97,7 +119,7 @@ class Simulation(object):
             print('-------------------')
             cls.__instance = super(Simulation, cls).__new__(cls)
             
-            cls.__Rnd.seed(int(cls.__RandomSeed))
+            setRandomStream(RStrm.RandomStream(int(cls.__RandomSeed)))
 
             cls._NEvt         = NEvt
             cls._pbeam        = pbeam
@@ -202,8 +224,9 @@ class Simulation(object):
 
 #--------  Utilities:
     def print(self):
-        print("    Simulation.print: version:", self.CdVrsn(self))
-        print("      state of random generator:", self.__Rnd.getstate()[0])
+        print("    Simulation.print: version:", self.CdVrsn())
+        print("      random stream:", getRandomStream())
+        print("      state of random generator:", getRandomStream().generator().bit_generator.state["state"]["counter"])
         print("      number of events to generate:", self._NEvt)
         print("      muon beam momentum setting:", self._pbeam)
         print("      nuSTORM specification file:", self._nufile)
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Class detectorPlanes:
+=====================
+
+  A set of detector planes intersected with many neutrino trajectories in
+  one call.  Each plane is given by the global position of the centre of
+  its front face, its normal (default +z, the near detector orientation of
+  class plane) and the half widths in local x and y of its acceptance.
+
+  For N trajectories (decay points and momenta, (N,3) arrays) and M planes
+  intersect returns (N,M) arrays: the hit in local co-ordinates of the
+  plane (x, y, z=0, as plane.findHitPosition*), the global hit, R and phi
+  (from the global x, y as in class plane), the flight distance, and masks
+  for hits inside the acceptance and for hits in front of the decay point
+  (class plane does not check the direction, so accepted does not either).
+  Adding a detector adds a column, not another pass over the events.
+
+  The local axes of a plane with normal n are u = y x n/|y x n| and
+  v = n x u, so for n = +z they are the global x and y.
+
+  Dependencies:
+   - numpy
+
+  Instance attributes:
+  --------------------
+  _names      : list of plane names
+  _positions  : (M,3) centres of the front faces, global co-ordinates (m)
+  _normals    : (M,3) unit normals
+  _uAxes      : (M,3) local x axes
+  _vAxes      : (M,3) local y axes
+  _halfWidths : (M,2) half widths of the acceptance in local x and y (m)
+
+  Methods:
+  --------
+  Built-in methods __init__, __repr__ and __str__.
+      __init__ : Creates an empty set of planes, or from the optional list
+                 of planes, each (name, position, halfWidths[, normal])
+      __repr__ : One liner with call.
+      __str__  : Dump of the planes
+
+  Get/set methods:
+      addPlane(name, position, halfWidths, normal=[0,0,1]) : adds a plane,
+                   halfWidths a number or [hx, hy]; returns its column
+      nPlanes    : number of planes
+      names      : list of plane names
+      index(name): column of the named plane
+      position(i), normal(i), halfWidths(i) : plane i
+      corners(i, halfWidths=None) : (4,3) global corners of the acceptance
+                   of plane i; halfWidths, if given, replaces its acceptance
+
+  General methods:
+      intersect(points, momenta, halfWidths=None) : intersects the N
+                   trajectories with every plane.  Returns a dictionary of
+                   (N,M) arrays, keys x, y, z (local hit), X, Y, Z (global
+                   hit), R, phi, ds (decay point to hit), forward and
+                   accepted.  halfWidths, if given, replaces the acceptance
+                   of the planes, (M,) or (M,2)
+
+Created on Sun 18Oct26: Version history:
+----------------------------------------------
+ 1.1: 18Oct26: corners of the acceptance
+ 1.0: 18Oct26: First implementation
+
+@author: PaulKyberd
+"""
+
+import numpy as np
+
+class detectorPlanes:
+
+#--------  "Built-in methods":
+    def __init__(self, planes=None):
+        self._names      = []
+        self._positions  = np.empty((0, 3))
+        self._normals    = np.empty((0, 3))
+        self._uAxes      = np.empty((0, 3))
+        self._vAxes      = np.empty((0, 3))
+        self._halfWidths = np.empty((0, 2))
+        if planes is not None:
+            for plane in planes:
+                self.addPlane(*plane)
+
+        return
+
+    def __repr__(self):
+        return "detectorPlanes(planes)"
+
+    def __str__(self):
+        lines = ["detectorPlanes: %i planes" % (self.nPlanes())]
+        for i, name in enumerate(self._names):
+            lines.append("    %s: centre (%g, %g, %g) m, normal (%g, %g, %g), half widths %g x %g m" % \
+                         ((name,) + tuple(self._positions[i]) + tuple(self._normals[i]) + tuple(self._halfWidths[i])))
+        return "\n".join(lines)
+
+#--------  "Get/set methods"
+    def addPlane(self, name, position, halfWidths, normal=(0., 0., 1.)):
+        n = np.asarray(normal, dtype=float)
+        n = n/np.linalg.norm(n)
+        u = np.cross([0., 1., 0.], n)
+        if np.linalg.norm(u) < 1E-12:
+            raise ValueError("detectorPlanes.addPlane: the normal must not be along y")
+        u = u/np.linalg.norm(u)
+        v = np.cross(n, u)
+        hw = np.broadcast_to(np.asarray(halfWidths, dtype=float), (2,))
+
+        self._names.append(name)
+        self._positions  = np.vstack((self._positions, np.asarray(position, dtype=float)))
+        self._normals    = np.vstack((self._normals, n))
+        self._uAxes      = np.vstack((self._uAxes, u))
+        self._vAxes      = np.vstack((self._vAxes, v))
+        self._halfWidths = np.vstack((self._halfWidths, hw))
+        return len(self._names) - 1
+
+    def nPlanes(self):
+        return len(self._names)
+
+    def names(self):
+        return list(self._names)
+
+    def index(self, name):
+        return self._names.index(name)
+
+    def position(self, i):
+        return self._positions[i].copy()
+
+    def normal(self, i):
+        return self._normals[i].copy()
+
+    def halfWidths(self, i):
+        return self._halfWidths[i].copy()
+
+    def corners(self, i, halfWidths=None):
+        hw = self._halfWidths[i] if halfWidths is None else np.broadcast_to(np.asarray(halfWidths, dtype=float), (2,))
+        return np.array([self._positions[i] + su*hw[0]*self._uAxes[i] + sv*hw[1]*self._vAxes[i]
+                         for su, sv in ((-1., -1.), (1., -1.), (1., 1.), (-1., 1.))])
+
+#--------  "General methods"
+    def intersect(self, points, momenta, halfWidths=None):
+        points  = np.atleast_2d(np.asarray(points, dtype=float))
+        momenta = np.atleast_2d(np.asarray(momenta, dtype=float))
+        if halfWidths is None:
+            hw = self._halfWidths
+        else:
+            hw = np.broadcast_to(np.asarray(halfWidths, dtype=float).reshape(self.nPlanes(), -1), (self.nPlanes(), 2))
+
+#.. distance along the momentum (in units of p) to each plane: ((C - P).n)/(p.n)
+        pn = momenta @ self._normals.T                                          # (N,M)
+        dn = np.sum(self._positions*self._normals, axis=1)[np.newaxis, :] - points @ self._normals.T
+        with np.errstate(divide='ignore', invalid='ignore'):
+            lam = dn/pn
+        X = points[:, 0:1] + momenta[:, 0:1]*lam
+        Y = points[:, 1:2] + momenta[:, 1:2]*lam
+        Z = points[:, 2:3] + momenta[:, 2:3]*lam
+
+        dX = X - self._positions[:, 0]
+        dY = Y - self._positions[:, 1]
+        dZ = Z - self._positions[:, 2]
+        x = dX*self._uAxes[:, 0] + dY*self._uAxes[:, 1] + dZ*self._uAxes[:, 2]
+        y = dX*self._vAxes[:, 0] + dY*self._vAxes[:, 1] + dZ*self._vAxes[:, 2]
+
+        with np.errstate(invalid='ignore'):
+            forward  = lam > 0.
+            accepted = (np.abs(x) < hw[:, 0]) & (np.abs(y) < hw[:, 1])
+        ds = np.sqrt((X - points[:, 0:1])**2 + (Y - points[:, 1:2])**2 + (Z - points[:, 2:3])**2)
+
+        return {"x": x, "y": y, "z": np.zeros_like(x), "X": X, "Y": Y, "Z": Z,
+                "R": np.sqrt(X*X + Y*Y), "phi": np.arctan2(Y, X), "ds": ds,
+                "forward": forward, "accepted": accepted}
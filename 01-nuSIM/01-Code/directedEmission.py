@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module directedEmission:
+========================
+
+  Emission of massless decay products toward a detector face, with the
+  weight that makes the detector flux unbiased.
+
+  In the rest frame of an unpolarised parent the direction of a neutrino
+  is isotropic and independent of its energy.  Seen from the decay point
+  the detector face lies inside a cone (the smallest cone about the
+  direction of the centre of the face that holds its corners; the face is
+  then inside it as long as the cone is narrower than a hemisphere).  A
+  Lorentz boost maps circles on the sphere of directions to circles, so
+  the rest frame image of the cone is a cap, found exactly from the images
+  of three points of the cone's edge.  The neutrino is emitted with its
+  rest frame energy in a direction drawn uniformly in that cap, boosted to
+  the lab, and carries the weight (1 - cos(cap angle))/2, the probability
+  of isotropic emission into the cap.  The mean of weight x (hit) is then
+  the probability that an isotropic neutrino hits the face.  Decay points
+  from which the cone is wider than a hemisphere are emitted isotropically
+  with weight 1.
+
+  Only neutrinos going toward the face are sampled, so a hit found by
+  extrapolating backward (which class plane and detectorPlanes accept) is
+  never produced.
+
+  Dependencies:
+   - numpy, LorentzBoost
+
+  Module methods:
+  ---------------
+    labCone       : Axis (N,3) and cos of the half angle (N,) of the cone
+                    from the points (N,3) that holds the corners (K,3)
+    restFrameCap  : Axis and cos of the half angle of the rest frame image
+                    of the lab cones, for parent velocities b (N,3)
+    capDirections : Unit vectors (N,3) uniform in the caps, from the
+                    uniforms u1, u2
+    capFraction   : Probability (1 - cosMax)/2 of isotropic emission into a cap
+    direct        : Re-emits the rest frame 4-momenta P (N,4) toward the face
+                    given by its centre and corners.  Returns the lab
+                    4-momenta and the weights
+
+Created on Sun 18Oct26: Version history:
+----------------------------------------------
+ 1.0: 18Oct26: First implementation
+
+@author: PaulKyberd
+"""
+
+import numpy as np
+import LorentzBoost as LB
+
+def _unit(v):
+    return v/np.linalg.norm(v, axis=-1, keepdims=True)
+
+#.. two unit vectors perpendicular to the (N,3) unit vectors a and to each other
+def _perpendiculars(a):
+    helper = np.where((np.abs(a[:, 0]) < 0.9)[:, np.newaxis], [1., 0., 0.], [0., 1., 0.])
+    e1 = _unit(np.cross(a, helper))
+    return e1, np.cross(a, e1)
+
+def labCone(points, centre, corners):
+    points = np.atleast_2d(np.asarray(points, dtype=float))
+    axis = _unit(np.asarray(centre, dtype=float) - points)
+    cosMax = np.ones(len(points))
+    for corner in np.asarray(corners, dtype=float):
+        cosMax = np.minimum(cosMax, np.sum(axis*_unit(corner - points), axis=1))
+    return axis, cosMax
+
+def restFrameCap(axis, cosMax, b):
+    b = np.broadcast_to(np.asarray(b, dtype=float), axis.shape)
+    sinMax = np.sqrt(np.maximum(1. - cosMax*cosMax, 0.))
+    e1, e2 = _perpendiculars(axis)
+    back = -b
+
+#.. images of the axis and of three points of the edge of the cone; massless, so E = |p| = 1
+    def image(d):
+        return _unit(LB.Boost(np.column_stack((np.ones(len(d)), d)), back)[:, 1:])
+    centre = image(axis)
+    edge = [image(cosMax[:, np.newaxis]*axis + sinMax[:, np.newaxis]*(np.cos(phi)*e1 + np.sin(phi)*e2))
+            for phi in (0., 2.*np.pi/3., 4.*np.pi/3.)]
+
+#.. the image circle is the section of the sphere by the plane through the three points,
+#   the cap is the side holding the image of the axis
+    normal = _unit(np.cross(edge[1] - edge[0], edge[2] - edge[0]))
+    cosStar = np.sum(normal*edge[0], axis=1)
+    flip = np.sum(normal*centre, axis=1) < cosStar
+    normal[flip] = -normal[flip]
+    cosStar[flip] = -cosStar[flip]
+    return normal, cosStar
+
+def capDirections(axis, cosMax, u1, u2):
+    cosTheta = 1. - np.asarray(u1)*(1. - cosMax)
+    sinTheta = np.sqrt(np.maximum(1. - cosTheta*cosTheta, 0.))
+    phi = 2.*np.pi*np.asarray(u2)
+    e1, e2 = _perpendiculars(axis)
+    return cosTheta[:, np.newaxis]*axis + \
+           sinTheta[:, np.newaxis]*(np.cos(phi)[:, np.newaxis]*e1 + np.sin(phi)[:, np.newaxis]*e2)
+
+def capFraction(cosMax):
+    return 0.5*(1. - np.asarray(cosMax))
+
+def direct(P, b, points, centre, corners, u1, u2):
+    P = np.atleast_2d(np.asarray(P, dtype=float))
+    b = np.broadcast_to(np.asarray(b, dtype=float), (len(P), 3))
+    axis, cosLab = labCone(points, centre, corners)
+
+#.. cones wider than a hemisphere (decay point close to the face): isotropic emission, weight 1
+    narrow = cosLab > 0.
+    axisStar = axis.copy()
+    cosStar = np.full(len(P), -1.)
+    if narrow.any():
+        axisStar[narrow], cosStar[narrow] = restFrameCap(axis[narrow], cosLab[narrow], b[narrow])
+
+    Pd = np.empty_like(P)
+    Pd[:, 0]  = P[:, 0]
+    Pd[:, 1:] = P[:, 0:1]*capDirections(axisStar, cosStar, u1, u2)
+    return LB.Boost(Pd, b), capFraction(cosStar)
@@ -0,0 +1,559 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Class eventBatch:
+=================
+
+  Generates a batch of nuSTORM events in one go.  The pions, their decays
+  and the decays of the muons are held as numpy arrays over the whole batch
+  and the tlDecay, beyondPS, decayPiInPS and decayMuons steps of
+  04-Studies/RunCmpltSimulation.py are applied as masks on those arrays.
+  The result is the event history, one record array per location, with the
+  same content as the event-by-event loop writes through eventHistory.fill.
+
+  Class attributes:
+  -----------------
+  __pimass     : pion mass (GeV)
+  __mumass     : muon mass (GeV)
+  __sol        : speed of light (m/s)
+  __forcedWindows : s windows of the forcedDecay modes, (sMin, sMax) from
+                 the transfer line and production straight lengths
+
+  Instance attributes:
+  --------------------
+  _geometry     : nuSTORMGeometry instance; optional i/p argument, built
+                  from nuSTRMCnst if not given
+  _flags        : dictionary of processing flags, keys as in the control file.
+                  Optional key forcedDecay ("none", "tl", "ps", "tlps"): the
+                  pion decays are forced into the transfer line, the production
+                  straight or both, and eventWeight of every location of the
+                  event is multiplied by the probability of a decay there
+  _pionMom      : central pion momentum (GeV)
+  _muonMom      : central muon momentum (GeV)
+  _runNumber    : run number written to every particle
+  _eventWeight  : weight given to every generated event
+  _planePos     : [x, y, z] of the detector front face (global co-ordinates)
+  _rsdPos       : [x, y, z] of the front face of the return straight detector,
+                  which faces -z; optional i/p argument rsdPosition (the
+                  rsdPosition entry of the control file).  Default None: there is
+                  no return straight detector and numuRSD/nueRSD stay empty, as
+                  in the event-by-event loop
+  _planes       : detectorPlanes instance with the detector plane (column 0)
+                  and, if _rsdPos is given, the return straight detector plane
+                  (column 1).  The muon decay neutrinos are intersected with all
+                  the planes in one call and fill numuDetector/nueDetector and
+                  numuRSD/nueRSD
+  _acceptance   : ringAcceptance for the central muon momentum
+  _directed     : flags["directedEmission"], default False.  The neutrinos of
+                  numuDetector and nueDetector are emitted again toward the
+                  detector face in the rest frame of their parent
+                  (directedEmission) and the event weight of the detector
+                  record is multiplied by the probability of that emission.
+                  The other locations are those of the unbiased decay
+  _stream       : RandomStream whose event streams drive the sampling; optional
+                  i/p argument, default the Simulation RandomStream when no rng is
+                  given.  Each batch draws through stream.eventDraws, so every event
+                  gets the numbers of its own stream (run, event) whatever the batch
+                  size or the shard that generates it.  The draws are used in the
+                  column order of generate, not in the order of the event by event
+                  loop, so an event differs from the one the loop makes for the
+                  same (run, event); the two agree in distribution
+  _rng          : generator used for all the sampling of the current batch: the
+                  eventDraws of the batch, or the numpy random Generator given as
+                  the optional i/p argument rng (then the events depend on the
+                  batching).  Outside generate, the generator of the stream
+  _RndmGen      : RandomGenerator instance, needed for pDistInput/psDistInput
+  _piDcy        : PionDecayBatch instance for the pion decays at rest
+  _muDcy        : MuonDecayBatch instance for the muon decays at rest
+  _psValues     : quantities from the last batch for the pion decay histograms
+
+  Methods:
+  --------
+  Built-in methods __init__, __repr__ and __str__.
+      __init__ : Takes the lattice constants, flags and run parameters
+      __repr__ : One liner with call.
+      __str__  : Dump of the batch parameters
+
+  Get/set methods:
+      muDcyCount   : number of muon decays generated so far
+      tlDcyCount   : number of pion decays in the transfer line
+      PSDcyCount   : number of pion decays in the production straight
+      byndPSCount  : number of pions lost beyond the production straight
+      absorbedCount: number of muons lost outside the ring acceptance
+      setRng       : sets the generator of the batch and of the decay classes
+      getPSValues  : dictionary of arrays (td, lifetime, t, s) for the pion
+                     decays in the production straight of the last batch
+
+  General methods:
+      generate     : Generates nEvents starting at event number firstEvent.
+                     Returns a dictionary of record arrays (dtype historyDtype)
+                     keyed by the eventHistory location name
+      forcedWindow : (sMin, sMax) of the forcedDecay mode, None if not forced
+      emptyHistory : Record array of n "none" particles as set by
+                     eventHistory.makeHistory
+
+  Module attributes:
+  ------------------
+  locations    : the eventHistory locations, in eventHistory order
+  historyDtype : numpy dtype of one location record, same order as the leaf
+                 list of the eventHistory branches; ParticleBlock.particleDtype,
+                 so ParticleBlock(records=history[location]) wraps a location
+
+Created on Sun 18Oct26: Version history:
+----------------------------------------------
+ 1.17: 18Oct26: The return straight detector is opt-in, at the rsdPosition given
+ 1.16: 18Oct26: Return straight detector plane, numuRSD and nueRSD filled from the muon decays
+ 1.15: 18Oct26: Events drawn from their own RandomStream event streams (stream argument);
+       the directedEmission numbers are drawn for every event of the batch
+ 1.14: 18Oct26: absorbedCount, muons lost outside the ring acceptance
+ 1.13: 18Oct26: Optional directedEmission of the detector neutrinos with solid-angle weights
+ 1.12: 18Oct26: Optional forcedDecay mode, pion decays forced into an s window with weights
+ 1.11: 18Oct26: Ring acceptance from ringAcceptance, constants computed once
+ 1.10: 18Oct26: Neutrinos extrapolated to the detector with detectorPlanes
+ 1.9: 18Oct26: Pion times from PionTimeDistribution.GenerateTimes, no rejection
+ 1.8: 18Oct26: Input momentum and phase space from the RandomGenerator array methods
+ 1.7: 18Oct26: Default rng is the generator of the Simulation RandomStream
+ 1.6: 18Oct26: historyDtype is ParticleBlock.particleDtype
+ 1.5: 18Oct26: Ring geometry from nuSTORMGeometry
+ 1.4: 18Oct26: Boosts from LorentzBoost
+ 1.3: 18Oct26: Pion decays and lifetimes from PionDecayBatch/MuonDecayBatch
+ 1.2: 18Oct26: Muon decays from MuonDecayBatch
+ 1.1: 18Oct26: GenerateParabolic uses Simulation.getParabolicArray
+ 1.0: 18Oct26: First implementation
+
+@author: PaulKyberd
+"""
+
+import sys
+import math
+import numpy as np
+from copy import deepcopy
+
+import PionConst as PionConst
+import MuonConst as MuonConst
+import Simulation as Simu
+import LorentzBoost as LB
+import nuSTORMGeometry as nuGeom
+import ParticleBlock as ParticleBlock
+import PionDecayBatch as PionDecayBatch
+import MuonDecayBatch as MuonDecayBatch
+import PionTimeDistribution as PionTimeDistribution
+import detectorPlanes as detectorPlanes
+import ringAcceptance as ringAcc
+import directedEmission as dirEm
+
+piCnst = PionConst.PionConst()
+muCnst = MuonConst.MuonConst()
+
+locations = ["target", "productionStraight", "prodStraightEnd", "pionDecay", "muonProduction", "piFlashNu",
+             "muonDecay", "eProduction", "numuProduction", "nueProduction", "numuDetector", "nueDetector",
+             "numuRSD", "nueRSD"]
+
+historyDtype = ParticleBlock.particleDtype
+
+#  pdg code and mass (GeV) as given by particle.nameToCode
+particleTypes = {
+    "pi+"     : (211, piCnst.mass()/1000.0),
+    "mu+"     : (-13, muCnst.mass()/1000.0),
+    "e+"      : (-11, 0.00511),
+    "nue"     : (12, 0.0),
+    "numu"    : (14, 0.0),
+    "numuBar" : (-14, 0.0),
+    "none"    : (0, 0.0)
+}
+
+class eventBatch:
+
+    __pimass     = piCnst.mass()/1000.
+    __mumass     = muCnst.mass()/1000.
+    __sol        = piCnst.SoL()
+
+    __forcedWindows = {
+        "tl"   : lambda tlLen, psLen: (0.0, tlLen),
+        "ps"   : lambda tlLen, psLen: (tlLen, tlLen + psLen),
+        "tlps" : lambda tlLen, psLen: (0.0, tlLen + psLen)
+    }
+
+    __Debug  = False
+
+#--------  "Built-in methods":
+    def __init__(self, nuSTRMCnst, flags, pionMom, muonMom, runNumber, eventWeight, planePosition, rng=None, RndmGen=None, geometry=None,
+                 stream=None, rsdPosition=None):
+
+        self._geometry      = nuGeom.nuSTORMGeometry(nuSTRMCnst) if geometry is None else geometry
+        self._tlCmplxLength = self._geometry.TrfLineCmplxLen()
+        self._sth           = math.sin(self._geometry.TrfLineCmplxAng())
+        self._cth           = math.cos(self._geometry.TrfLineCmplxAng())
+        self._psLength      = self._geometry.ProdStrghtLen()
+        self._piAcc         = nuSTRMCnst.piAcc()
+        self._muAcc         = nuSTRMCnst.muAcc()
+        self._r             = math.sqrt(nuSTRMCnst.epsilon()*nuSTRMCnst.beta())/1000.
+        self._rp            = math.sqrt(nuSTRMCnst.epsilon()/nuSTRMCnst.beta())
+        self._timeDist      = PionTimeDistribution.PionTimeDistribution(nuSTRMCnst.delT0(), nuSTRMCnst.delT1(), nuSTRMCnst.delT2())
+
+        self._flags       = dict(flags)
+        self._pionMom     = pionMom
+        self._muonMom     = muonMom
+        self._runNumber   = runNumber
+        self._eventWeight = eventWeight
+        self._planePos    = list(planePosition)
+        self._rsdPos      = None if rsdPosition is None else list(rsdPosition)
+        self._planes      = detectorPlanes.detectorPlanes([("detector", self._planePos, 0.0)])
+        if self._rsdPos is not None:
+            self._planes.addPlane("RSD", self._rsdPos, 0.0, (0., 0., -1.))
+        self._acceptance  = ringAcc.ringAcceptance(self._muAcc, muonMom)
+        self._directed    = self._flags.get("directedEmission", False)
+        self._stream      = Simu.getRandomStream() if (stream is None and rng is None) else stream
+        self._rng         = self._stream.generator() if rng is None else rng
+        self._RndmGen     = RndmGen
+        self._piDcy       = PionDecayBatch.PionDecayBatch(rng=self._rng)
+        self._muDcy       = MuonDecayBatch.MuonDecayBatch(rng=self._rng)
+
+        if ((self._flags["pDistInput"] or self._flags["psDistInput"]) and self._RndmGen is None):
+            raise Exception("eventBatch: pDistInput and psDistInput need a RandomGenerator instance")
+        if self._flags.get("forcedDecay", "none") not in ["none"] + list(eventBatch.__forcedWindows):
+            raise Exception("eventBatch: forcedDecay must be none, tl, ps or tlps")
+
+        self._tlDcyCount  = 0
+        self._byndPSCount = 0
+        self._PSDcyCount  = 0
+        self._muDcyCount  = 0
+        self._absorbedCount = 0
+        self._psValues    = {}
+
+        return
+
+    def __repr__(self):
+        return "eventBatch(nuSTRMCnst, flags, pionMom, muonMom, runNumber, eventWeight, planePosition)"
+
+    def __str__(self):
+        return "eventBatch: run number %i, pion momentum %g GeV, muon momentum %g GeV, event weight %g, \n" \
+               "    detector plane at (%g, %g, %g), flags %s" % \
+               (self._runNumber, self._pionMom, self._muonMom, self._eventWeight, \
+                self._planePos[0], self._planePos[1], self._planePos[2], self._flags)
+
+#--------  Event generation:
+    def generate(self, firstEvent, nEvents):
+
+        n  = nEvents
+        ev = np.arange(firstEvent, firstEvent+n, dtype=np.int32)
+        if self._stream is not None:
+            self.setRng(self._stream.eventDraws(ev))
+        history = {location: self.emptyHistory(n) for location in locations}
+
+        tlLen  = self._tlCmplxLength
+        psLen  = self._psLength
+        w      = self._eventWeight
+        c      = eventBatch.__sol
+        piMass = eventBatch.__pimass
+
+#.. pion at the target, in transfer line local co-ordinates
+        if (self._flags["pDistInput"]):
+            pPion = self._RndmGen.getRandomArray(n, self._rng)
+        else:
+            pPion = self._pionMom + self.GenerateParabolic(self._pionMom*self._piAcc, n)
+
+        if (self._flags["psDistInput"]):
+            xl, xpl = self._RndmGen.getRandom2DxArray(n, self._rng)
+            yl, ypl = self._RndmGen.getRandom2DyArray(n, self._rng)
+        elif (self._flags["pencilBeam"]):
+            xl  = np.zeros(n)
+            yl  = np.zeros(n)
+            xpl = np.zeros(n)
+            ypl = np.zeros(n)
+        else:
+            xl  = self.GenerateParabolic(self._r, n)
+            yl  = self.GenerateParabolic(self._r, n)
+            xpl = self.GenerateParabolic(self._rp, n)
+            ypl = self.GenerateParabolic(self._rp, n)
+
+        pzl = np.sqrt(pPion**2/(1+xpl**2+ypl**2))
+        pxl = pzl*xpl
+        pyl = pzl*ypl
+        zl  = np.full(n, -tlLen)
+        Epi = np.sqrt(pPion**2 + piMass**2)
+
+        if (self._flags["tEqualsZero"]):
+            t = np.zeros(n)
+        else:
+            t = self.GenerateTime(n)*1E9
+
+#.. pion lifetime; with forcedDecay the decays are forced into the s window and
+#   the event carries the probability of a decay there
+        window = self.forcedWindow()
+        if window is None:
+            lifetime = self._piDcy.GenerateLifetime(n)
+        else:
+            lifetime, pWindow = self._piDcy.GenerateForcedLifetime(window[0]*piMass/(pPion*c), window[1]*piMass/(pPion*c))
+            w = w*pWindow
+
+        allEvents = np.ones(n, dtype=bool)
+        xg, yg, zg, pxg, pyg, pzg = self.tltoGlbl(xl, yl, zl, pxl, pyl, pzl)
+        self._set(history["target"], allEvents, ev, 0.0, xg, yg, zg, pxg, pyg, pzg, t, w, "pi+")
+
+#.. pion decay: decay point and muon and neutrino in the nuSTORM frame
+        P_mu, P_numu, costheta = self.decayPions(n)
+        sd = pPion*c*lifetime/piMass
+
+        BeamPos, theta = self.BeamDir(sd)
+        xd = xl + BeamPos[0]
+        yd = yl + BeamPos[1]
+        zd = BeamPos[2]
+        DirCos = self.rotate(theta, xpl, ypl)
+        b = (pPion/Epi)[:, np.newaxis]*DirCos
+        P_mu   = LB.Boost(P_mu/1000., b)
+        P_numuRest = P_numu/1000.
+        P_numu = LB.Boost(P_numuRest, b)
+        pMu = np.sqrt(P_mu[:, 1]**2 + P_mu[:, 2]**2 + P_mu[:, 3]**2)
+
+#.. muon decay: every muon is decayed, it is only stored where it is needed
+        muLifetime = self._muDcy.GenerateLifetime(n)
+        P_e, P_nue, P_nmu = self.decayMuons(n)
+        sMu = pMu*c*muLifetime/eventBatch.__mumass + sd
+        BeamPosMu, thetaMu = self.BeamDir(sMu)
+        x   = self.GenerateParabolic(self._r, n)
+        y   = self.GenerateParabolic(self._r, n)
+        xp  = self.GenerateParabolic(self._rp, n)
+        yp  = self.GenerateParabolic(self._rp, n)
+        muX = x + BeamPosMu[0]
+        muY = y + BeamPosMu[1]
+        muZ = BeamPosMu[2]
+        Pb  = pMu[:, np.newaxis]*self.rotate(thetaMu, xp, yp)
+        Emu = np.sqrt(pMu**2 + eventBatch.__mumass**2)
+        bMu = Pb/Emu[:, np.newaxis]
+        P_nueRest = P_nue/1000.
+        P_nmuRest = P_nmu/1000.
+        P_e   = LB.Boost(P_e/1000., bMu)
+        P_nue = LB.Boost(P_nueRest, bMu)
+        P_nmu = LB.Boost(P_nmuRest, bMu)
+
+#.. the directedEmission numbers of the four detector extrapolations are drawn last, for every event,
+#   whichever decays the batch holds, so the draws of an event do not depend on its batch
+        if self._directed:
+            ranDir = [(self._rng.random(n), self._rng.random(n)) for i in range(4)]
+        else:
+            ranDir = [None]*4
+
+
+#.. decay in the transfer line
+        tlMask = np.logical_and(self._flags["tlFlag"], sd < tlLen)
+        if tlMask.any():
+            self._tlDcyCount = self._tlDcyCount + np.count_nonzero(tlMask)
+            self._set(history["productionStraight"], tlMask, ev, tlLen, 0.0, 0.0, 0.0, 0.0, 0.0, 0.01, 0.0, 0.0, "none")
+            td = lifetime*1E9 + t
+            xdg, ydg, zdg, pxdg, pydg, pzdg = self.tltoGlbl(xd, yd, zd - tlLen, pxl, pyl, pzl)
+            self._set(history["pionDecay"], tlMask, ev, sd, xdg, ydg, zdg, pxdg, pydg, pzdg, td, w, "pi+")
+            xdg, ydg, zdg, pxnu, pynu, pznu = self.tltoGlbl(xd, yd, zd - tlLen, P_numu[:, 1], P_numu[:, 2], P_numu[:, 3])
+            self._set(history["piFlashNu"], tlMask, ev, sd, xdg, ydg, zdg, pxnu, pynu, pznu, td, w, "numu")
+            xdg, ydg, zdg, pxmu, pymu, pzmu = self.tltoGlbl(xd, yd, zd - tlLen, P_mu[:, 1], P_mu[:, 2], P_mu[:, 3])
+            self._set(history["muonProduction"], tlMask, ev, sd, xdg, ydg, zdg, pxmu, pymu, pzmu, td, w, "mu+")
+            bg = np.column_stack(self.tltoGlbl(0.0, 0.0, 0.0, b[:, 0], b[:, 1], b[:, 2])[3:])
+            self._detector([history["numuDetector"]], tlMask, ev, sd, xdg, ydg, zdg, pxnu, pynu, pznu, td, t, w, 100.0, "numu", flash=True,
+                           rest=P_numuRest, boost=bg, ran=ranDir[0])
+#  pions which reach the end of the transfer line, the local co-ordinates are now the global ones
+        psStart = np.logical_not(tlMask)
+        te = t + 1E9*tlLen*Epi/(c*pPion)
+        self._set(history["productionStraight"], psStart, ev, tlLen, xl, yl, 0.0, pxl, pyl, pzl, te, w, "pi+")
+
+#.. decay beyond the end of the production straight
+        lstMask = np.logical_and(self._flags["lstFlag"], sd > tlLen + psLen)
+        if lstMask.any():
+            self._byndPSCount = self._byndPSCount + np.count_nonzero(lstMask)
+            sEnd = tlLen + psLen
+            tEnd = t + sEnd/(pPion*c/Epi)
+            self._set(history["prodStraightEnd"], lstMask, ev, sEnd, xl, yl, psLen, pxl, pyl, pzl, tEnd, w, "pi+")
+            td = lifetime*1E9 + t
+            self._set(history["pionDecay"], lstMask, ev, sd, 0.0, 0.0, 0.0, 0.0, 0.0, 0.01, td, w, "none")
+            self._set(history["piFlashNu"], lstMask, ev, sd, 0.0, 0.0, 0.0, 0.0, 0.0, 0.01, td, 0.0, "none")
+            self._set(history["muonProduction"], lstMask, ev, sd, 0.0, 0.0, 0.0, 0.0, 0.0, 0.01, td, 0.0, "none")
+
+#.. decay in the production straight
+        psMask = np.logical_and(self._flags["psFlag"], np.logical_and(sd >= tlLen, sd <= tlLen + psLen))
+        self._psValues = {}
+        if psMask.any():
+            self._PSDcyCount = self._PSDcyCount + np.count_nonzero(psMask)
+            zdp = sd - tlLen
+            piLifetime = lifetime*1E9*Epi/piMass
+            td = piLifetime + t
+            self._set(history["pionDecay"], psMask, ev, sd, xd, yd, zdp, pxl, pyl, pzl, td, w, "pi+")
+            self._psValues = {"td": td[psMask], "lifetime": piLifetime[psMask], "t": t[psMask], "s": sd[psMask]}
+            self._set(history["muonProduction"], psMask, ev, sd, xd, yd, zdp, P_mu[:, 1], P_mu[:, 2], P_mu[:, 3], td, w, "mu+")
+#  extrapolate the muon to the end of the production straight
+            sEnd = tlLen + psLen
+            tEnd = td + np.abs(psLen - zdp)/(pMu*c/P_mu[:, 0])
+            muEnd = np.logical_and(psMask, sMu > sEnd)
+            self._set(history["prodStraightEnd"], muEnd, ev, sEnd, xd, yd, psLen, P_mu[:, 1], P_mu[:, 2], P_mu[:, 3], tEnd, w, "mu+")
+            noEnd = np.logical_and(psMask, np.logical_not(sMu > sEnd))
+            self._set(history["prodStraightEnd"], noEnd, ev, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.01, 0.0, 0.0, "none")
+            self._set(history["piFlashNu"], psMask, ev, sd, xd, yd, zdp, P_numu[:, 1], P_numu[:, 2], P_numu[:, 3], td, w, "numu")
+            if (self._flags["flashAtDetector"]):
+                self._detector([history["numuDetector"]], psMask, ev, sd, xd, yd, zdp, P_numu[:, 1], P_numu[:, 2], P_numu[:, 3], td, t, w, 10.0, "numu", flash=True,
+                               rest=P_numuRest, boost=b, ran=ranDir[1])
+
+#.. muon decays for muons produced in the transfer line or the production straight
+        muMask = np.logical_and(self._flags["muDcyFlag"], np.logical_or(tlMask, psMask))
+        if muMask.any():
+            if self._muonMom == 0.:
+                print("ERROR: Muon central momentum is 0.! Interrupting simulation...")
+                sys.exit()
+            Absorbed = self.Absorption(xd, yd, P_mu, self._muonMom)
+            lost = np.logical_and(muMask, Absorbed)
+            self._absorbedCount = self._absorbedCount + np.count_nonzero(lost)
+            self._set(history["muonDecay"], lost, ev, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.01, 0.0, 0.0, "none")
+            inPS = np.logical_and(self._flags["PSMuons"], np.logical_and(lost, sMu < tlLen + psLen))
+            inRing = np.logical_and(self._flags["ringMuons"], np.logical_and(muMask, np.logical_not(Absorbed)))
+            muDcy = np.logical_or(inPS, inRing)
+            self._muDcyCount = self._muDcyCount + np.count_nonzero(muDcy)
+            tDcy = (lifetime + muLifetime)*1E9 + t
+            self._set(history["muonDecay"], muDcy, ev, sMu, muX, muY, muZ, Pb[:, 0], Pb[:, 1], Pb[:, 2], tDcy, w, "mu+")
+            self._set(history["eProduction"], muDcy, ev, sMu, muX, muY, muZ, P_e[:, 1], P_e[:, 2], P_e[:, 3], tDcy, w, "e+")
+            self._set(history["numuProduction"], muDcy, ev, sMu, muX, muY, muZ, P_nmu[:, 1], P_nmu[:, 2], P_nmu[:, 3], tDcy, w, "numuBar")
+            self._set(history["nueProduction"], muDcy, ev, sMu, muX, muY, muZ, P_nue[:, 1], P_nue[:, 2], P_nue[:, 3], tDcy, w, "nue")
+            self._detector([history["numuDetector"], history["numuRSD"]][:self._planes.nPlanes()], muDcy, ev, sMu, muX, muY, muZ, P_nmu[:, 1], P_nmu[:, 2], P_nmu[:, 3], tDcy, t, w, 2.5, "numu",
+                           rest=P_nmuRest, boost=bMu, ran=ranDir[2])
+            self._detector([history["nueDetector"], history["nueRSD"]][:self._planes.nPlanes()], muDcy, ev, sMu, muX, muY, muZ, P_nue[:, 1], P_nue[:, 2], P_nue[:, 3], tDcy, t, w, 2.5, "nue",
+                           rest=P_nueRest, boost=bMu, ran=ranDir[3])
+
+        return history
+
+#.. Empty history as set by eventHistory.makeHistory
+    def emptyHistory(self, n):
+        rec = np.zeros(n, dtype=historyDtype)
+        rec["runNumber"] = -1
+        rec["eventNumber"] = -1
+        rec["pz"] = 0.01
+        return rec
+
+#.. Set the particles at one location for the events in mask; values are scalars or arrays over the batch
+    def _set(self, rec, mask, ev, s, x, y, z, px, py, pz, t, weight, particleType):
+        pdgCode, mass = particleTypes[particleType]
+        rec["runNumber"][mask] = self._runNumber
+        rec["eventNumber"][mask] = ev[mask]
+        rec["pdgCode"][mask] = pdgCode
+        rec["mass"][mask] = mass
+        for field, value in (("x", x), ("y", y), ("z", z), ("s", s), ("px", px), ("py", py), ("pz", pz), \
+                             ("t", t), ("eventWeight", weight)):
+            if np.ndim(value) == 0:
+                rec[field][mask] = value
+            else:
+                rec[field][mask] = value[mask]
+
+#.. Extrapolate neutrinos from the decay point to the detector planes and apply the acceptance cut;
+#   recs holds the record of each plane, detector first then the return straight detector, so one
+#   intersect call fills them all.  The return straight detector takes only the neutrinos going toward it.
+#   With directedEmission the neutrino of the detector is emitted again from its rest frame momentum,
+#   rest, toward the detector face and the weight multiplied by the probability of emission into the cap
+    def _detector(self, recs, mask, ev, sDcy, xDcy, yDcy, zDcy, px, py, pz, tDcy, t, weight, halfWidth, particleType, flash=False,
+                  rest=None, boost=None, ran=None):
+        n = len(mask)
+        halfWidths = [halfWidth]*self._planes.nPlanes()
+        points  = np.column_stack(np.broadcast_arrays(xDcy, yDcy, zDcy, np.zeros(n))[:3])
+        momenta = np.column_stack(np.broadcast_arrays(px, py, pz, np.zeros(n))[:3])
+        hits = self._planes.intersect(points, momenta, halfWidths=halfWidths)
+        for i, rec in enumerate(recs):
+            nuPx, nuPy, nuPz, nuW = px, py, pz, weight
+            nuX = hits["x"][:, i]
+            nuY = hits["y"][:, i]
+            accepted = hits["accepted"][:, i]
+            if i == 0:
+                if self._directed and rest is not None:
+                    Pd, wd = dirEm.direct(rest, boost, points, self._planes.position(0), self._planes.corners(0, halfWidths=halfWidth),
+                                          ran[0], ran[1])
+                    nuPx, nuPy, nuPz = Pd[:, 1], Pd[:, 2], Pd[:, 3]
+                    nuW = weight*wd
+                    dHits = self._planes.intersect(points, Pd[:, 1:4], halfWidths=halfWidths)
+                    nuX = dHits["x"][:, 0]
+                    nuY = dHits["y"][:, 0]
+                    accepted = dHits["accepted"][:, 0]
+#  the detector keeps the flight distance of the event by event loop, to the local hit
+                dsNu = np.sqrt((xDcy-nuX)**2 + (yDcy-nuY)**2 + zDcy**2)
+            else:
+                dsNu = hits["ds"][:, i]
+                accepted = np.logical_and(accepted, hits["forward"][:, i])
+            sNu = sDcy + dsNu
+#  the pion flash and the muon decays use different time calculations
+            if flash:
+                tNu = tDcy + dsNu*1E9/eventBatch.__sol + t
+            else:
+                tNu = tDcy + sNu/eventBatch.__sol + t
+            eW = np.where(accepted, nuW, 0.0)
+            self._set(rec, mask, ev, sNu, nuX, nuY, 0.0, nuPx, nuPy, nuPz, tNu, eW, particleType)
+
+#.. transform x,y,z and px,py,pz co-ordinates from the transfer line local co-ordinates to the global ones
+    def tltoGlbl(self, xl, yl, zl, pxl, pyl, pzl):
+
+        xg = xl - zl*self._sth
+        yg = yl
+        zg = zl*self._cth
+
+        pxg = pxl*self._cth + pzl*self._sth
+        pyg = pyl
+        pzg = pzl*self._cth - pxl*self._sth
+
+        return xg, yg, zg, pxg, pyg, pzg
+
+#.. Beam position and angle with respect to the z axis at path length s, for the whole batch
+    def BeamDir(self, s):
+        return self._geometry.BeamDirArray(s)
+
+#.. Direction cosines from x', y' rotated about the y axis through theta
+    def rotate(self, theta, xp, yp):
+        zp = np.sqrt(1. - xp**2 - yp**2)
+        cth = np.cos(theta)
+        sth = np.sin(theta)
+        return np.stack((cth*xp + sth*zp, yp, -sth*xp + cth*zp), axis=1)
+
+#.. Pion decays at rest (MeV), (n,4) arrays from PionDecayBatch
+    def decayPions(self, n):
+        P_mu, P_numu, cTheta, phi = self._piDcy.decaypion(n)
+        return P_mu, P_numu, cTheta
+
+#.. Muon decays at rest (MeV), (n,4) arrays from MuonDecayBatch
+    def decayMuons(self, n):
+        P_e, P_nue, P_numu, costheta, cosphi = self._muDcy.decaymuon(n)
+        return P_e, P_nue, P_numu
+
+#.. s window (m) the pion decays are forced into, None for unbiased decays
+    def forcedWindow(self):
+        forced = self._flags.get("forcedDecay", "none")
+        if forced == "none":
+            return None
+        return eventBatch.__forcedWindows[forced](self._tlCmplxLength, self._psLength)
+
+#.. Parabolic distribution between -p1 and p1, closed-form inverse cdf as Simulation.getParabolic
+    def GenerateParabolic(self, p1, n):
+        return Simu.getParabolicArray(p1, self._rng.random(n))
+
+#.. Time of the pion at the target (s); flat within the bunches of the extraction, from PionTimeDistribution
+    def GenerateTime(self, n):
+        return self._timeDist.GenerateTimes(n, self._rng)
+
+#.. Ring acceptance as NeutrinoEventInstance.Absorption; returns True where the muon is lost
+    def Absorption(self, Mux, Muy, P_mu, mup0):
+        if mup0 != self._acceptance.mup0():
+            self._acceptance = ringAcc.ringAcceptance(self._muAcc, mup0)
+        return self._acceptance.absorbed(Mux, Muy, P_mu[:, 1], P_mu[:, 2], P_mu[:, 3])
+
+#--------  get/set methods:
+    def muDcyCount(self):
+        return self._muDcyCount
+
+    def tlDcyCount(self):
+        return self._tlDcyCount
+
+    def PSDcyCount(self):
+        return self._PSDcyCount
+
+    def byndPSCount(self):
+        return self._byndPSCount
+
+    def absorbedCount(self):
+        return self._absorbedCount
+
+    def setRng(self, rng):
+        self._rng = rng
+        self._piDcy.setRng(rng)
+        self._muDcy.setRng(rng)
+
+    def getPSValues(self):
+        return deepcopy(self._psValues)
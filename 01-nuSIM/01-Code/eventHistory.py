@@ -31,12 +31,83 @@ Methods:
 
   Generation, calcution methods and utilities:
 
-   	outFile(fileName)	: Name and open a file for output
-   	inFile(fileName)	: Name and open a file for input
+   	outFile(fileName)	: Name and open a file for output; the tree is created in the file
+   	inFile(fileName, treeName="eventHistory"): Name and open a file for input, reading
+							  the event history tree treeName
 		readNext()			: read next entry in the root file
 		addParticle(location, par): add particle par at location to the history
 		findParticle(location, par): return particle par at location from the history
-
+		fillBatch(history)	: buffer a batch of events from eventBatch.generate; written in
+							  bulk each time chunkSize events are buffered
+		flush()				: write the buffered events to the tree
+		setChunkSize(n)		: number of events buffered before a bulk write (default 100000)
+		readArrays(locations, fields, first, nEntries, chunkSize, weighted):
+							  generator over the entries in chunks of chunkSize; yields a dict
+							  {location: {field: numpy array}} for the requested locations (default
+							  all) and fields (default all), plus the field "entry" with the entry
+							  numbers.  Only the requested branches are read.  With weighted=True
+							  each location keeps only the entries with eventWeight > 0
+		getArrays(...)		: as readArrays but returns the chunks joined into one dict
+		autoSave()			: flush and save the tree header now, so the entries so far can be read
+							  even if the job dies
+		schema()			: schema of the input file (after inFile) or of the output
+		writeSummary(values, name): writes a one entry tree "runSummary" of the numbers in the
+							  dictionary values (e.g. the event counts of a skimmed run) to the output file
+		getSummary(name)	: the numbers of the summary tree of the input file, {} if there is none
+
+  Schemas: 1 - a branch per location with the full record (run, event, pdgCode, x, ..., mass) of
+		each location, present or not, written by default and read by the per-location readers
+		(e.g. 02-nuAnalysis nuAnalysis.cpp).  2 (opt-in, schema=2) - a header branch with the run and
+		event number and a bitmask of the locations present (any field other than the mass differs
+		from the empty record, so "none" particles carrying s, t or a weight are kept), a count
+		nPresent, and a variable length array [nPresent] per field holding only the present
+		locations; the mass is derived from the pdgCode.  The present locations of an event share
+		the run and event number of the header, as both generators write them.  inFile recognises
+		either; readNext, readArrays and getArrays return the same particles and records from both
+		(absent locations as makeHistory sets them)
+
+  __init__(chunkSize, basketSize, autoFlush, autoSave, schema): basketSize is the buffer (bytes) of
+		each branch; autoFlush and autoSave are as TTree::SetAutoFlush and SetAutoSave - negative
+		values are bytes (default flush the baskets every 30 MB, save the header every 300 MB
+		written), positive values a number of entries
+
+
+Version 2.2 									18/10/2026
+inFile takes the name of the event history tree (treeName, default "eventHistory")
+
+Version 2.1 									18/10/2026
+Schema 1 is written by default again, schema 2 is opt-in, so the readers of the per-location
+branches keep working; readNext of a schema 2 file reads into a one entry buffer
+
+Version 2.0 									18/10/2026
+Schema 2 keeps every location whose record differs from the empty one, not only those with a
+pdgCode, so the "none" records with data (pions lost beyond the production straight, the
+production straight point of transfer line decays) read back as in schema 1
+
+Version 1.9 									18/10/2026
+Add writeSummary and getSummary: a one entry run summary tree next to the event history
+
+Version 1.8 									18/10/2026
+Schema 2: run and event number once per entry, only the locations that occurred stored (presence
+bitmask and variable length arrays), mass from the pdgCode; written by default, schema=1 writes
+the old layout, and v1 files are still read
+
+Version 1.7 									18/10/2026
+The tree is created in the output file (it was created in memory before the file was opened, so
+every basket was held until write); the baskets are written out as they fill and the header is
+saved every autoSave, so memory does not grow with the number of events and a partial file is
+readable.  Basket size, AutoFlush and AutoSave are arguments of the constructor; add autoSave
+
+Version 1.6 									18/10/2026
+Add readArrays and getArrays: columnar reads of the tree into numpy arrays, chunk by chunk
+
+Version 1.5 									18/10/2026
+fillBatch buffers the batches in a numpy array with the leaf layout of the branches
+and writes chunkSize events at a time with a compiled fill loop; add flush, setChunkSize
+
+Version 1.4 									18/10/2026
+Add fillBatch to write the output of the batched event generator
+fill reads px, py, pz from the particle directly rather than through p()
 
 Version 1.3 									29/06/2022
 Entries for numu and nue on the return straight detector
@@ -69,6 +140,45 @@ import particle as particle
 import MuonConst as MuonConst
 import PionConst as PionConst
 import NeutrinoEventInstance as nuEvtInst
+import eventBatch as eventBatch
+import ParticleBlock as ParticleBlock
+
+#  one location in memory as the leaf list 'run/I:event:pdgCode:x/F:y:z:s:px:py:pz:t:eventWeight:mass'
+#  and the structs below lay it out - 3 Int_t followed by 10 Float_t
+leafDtype = np.dtype([("runNumber", np.int32), ("eventNumber", np.int32), ("pdgCode", np.int32),
+                      ("x", np.float32), ("y", np.float32), ("z", np.float32), ("s", np.float32),
+                      ("px", np.float32), ("py", np.float32), ("pz", np.float32), ("t", np.float32),
+                      ("eventWeight", np.float32), ("mass", np.float32)])
+
+#  bulk fill: copy each event of a buffer [nEvents][nLocations] of records into the branch
+#  structs (addresses in dest) and fill the tree, all without returning to python
+ROOT.gInterpreter.Declare(
+"Long64_t eventHistoryBulkFill(TTree* tree, Long_t buffer, Long_t dest, Long64_t nEvents, Int_t nLocations, Int_t recordSize) {\
+   const char* src = reinterpret_cast<const char*>(buffer);\
+   void** to = reinterpret_cast<void**>(dest);\
+   for (Long64_t i = 0; i < nEvents; ++i) {\
+      for (Int_t j = 0; j < nLocations; ++j) {\
+         memcpy(to[j], src + (i*nLocations + j)*recordSize, recordSize);\
+      }\
+      tree->Fill();\
+   }\
+   return nEvents;\
+}" );
+
+#  bulk read: the inverse - read entries first to first+nEntries-1 and copy the structs
+#  (addresses in src) into a buffer [nEntries][nLocations] of records
+ROOT.gInterpreter.Declare(
+"Long64_t eventHistoryBulkRead(TTree* tree, Long_t src, Long_t buffer, Long64_t first, Long64_t nEntries, Int_t nLocations, Int_t recordSize) {\
+   void** from = reinterpret_cast<void**>(src);\
+   char* to = reinterpret_cast<char*>(buffer);\
+   for (Long64_t i = 0; i < nEntries; ++i) {\
+      tree->GetEntry(first + i);\
+      for (Int_t j = 0; j < nLocations; ++j) {\
+         memcpy(to + (i*nLocations + j)*recordSize, from[j], recordSize);\
+      }\
+   }\
+   return nEntries;\
+}" );
 
 gROOT.ProcessLine(
 "struct target {\
@@ -310,18 +420,115 @@ gROOT.ProcessLine(
 };" );
 
 
+#  Schema 2: one entry per event holds the branches
+#    header   'runNumber/I:eventNumber/I:present/i' - present has bit j set if location j (eventBatch.locations
+#             order) occurred, i.e. its record, mass aside, differs from emptyRecord
+#    nPresent 'nPresent/I'                         - number of locations present
+#    one branch per field of v2Fields, e.g. 'x[nPresent]/F', holding the present locations in order
+#  the mass is not stored, it follows from the pdgCode; absent locations read back as the empty record.
+#  schemaVersion is the newest schema, defaultSchema the one written unless schema is given
+schemaVersion = 2
+defaultSchema = 1
+v2Fields = ["pdgCode", "x", "y", "z", "s", "px", "py", "pz", "t", "eventWeight"]
+v2Offsets = np.array([leafDtype.fields[field][1] for field in v2Fields], dtype=np.int64)
+emptyRecord = np.zeros(1, dtype=leafDtype)
+emptyRecord["runNumber"] = -1
+emptyRecord["eventNumber"] = -1
+emptyRecord["pz"] = 0.01
+pdgMass = {abs(code): mass for code, mass in eventBatch.particleTypes.values()}
+pdgMass[13] = MuonConst.MuonConst().mass()/1000.
+pdgMass[211] = PionConst.PionConst().mass()/1000.
+
+#  mass (GeV) of each pdgCode of an array
+def massOf(pdgCode):
+	pdgCode = np.abs(np.asarray(pdgCode))
+	mass = np.zeros(pdgCode.shape, dtype=leafDtype["mass"])
+	for code, value in pdgMass.items():
+		mass[pdgCode == code] = value
+	return mass
+
+#  schema 2 bulk fill: for each event of the buffer [nEvents][nLocations] of records set the header and copy
+#  the fields (offsets in the record) of the present locations into the arrays of the branches (addresses in
+#  fields), then fill.  Every field is 4 bytes; run and event number are the first two of the record and
+#  the mass, not compared, the last
+ROOT.gInterpreter.Declare(
+"Long64_t eventHistoryBulkFillV2(TTree* tree, Long_t buffer, Long64_t nEvents, Int_t nLocations, Int_t recordSize,\
+                                 Long_t header, Long_t count, Long_t fields, Long_t offsets, Int_t nFields, Long_t empty) {\
+   const char* src = reinterpret_cast<const char*>(buffer);\
+   const char* emptyRec = reinterpret_cast<const char*>(empty);\
+   Int_t* hdr = reinterpret_cast<Int_t*>(header);\
+   Int_t* nPresent = reinterpret_cast<Int_t*>(count);\
+   char** to = reinterpret_cast<char**>(fields);\
+   const Long64_t* off = reinterpret_cast<const Long64_t*>(offsets);\
+   for (Long64_t i = 0; i < nEvents; ++i) {\
+      UInt_t present = 0;\
+      Int_t n = 0;\
+      hdr[0] = -1;\
+      hdr[1] = -1;\
+      for (Int_t j = 0; j < nLocations; ++j) {\
+         const char* rec = src + (i*nLocations + j)*recordSize;\
+         if (memcmp(rec, emptyRec, recordSize - sizeof(Float_t)) == 0) continue;\
+         if (n == 0) memcpy(hdr, rec, 2*sizeof(Int_t));\
+         present |= (1u << j);\
+         for (Int_t k = 0; k < nFields; ++k) memcpy(to[k] + 4*n, rec + off[k], 4);\
+         ++n;\
+      }\
+      hdr[2] = static_cast<Int_t>(present);\
+      *nPresent = n;\
+      tree->Fill();\
+   }\
+   return nEvents;\
+}" );
+
+#  schema 2 bulk read: the inverse - absent locations are set to the empty record and the mass is left to python
+ROOT.gInterpreter.Declare(
+"Long64_t eventHistoryBulkReadV2(TTree* tree, Long_t buffer, Long64_t first, Long64_t nEntries, Int_t nLocations, Int_t recordSize,\
+                                 Long_t header, Long_t fields, Long_t offsets, Int_t nFields, Long_t empty) {\
+   char* dest = reinterpret_cast<char*>(buffer);\
+   const Int_t* hdr = reinterpret_cast<const Int_t*>(header);\
+   char** from = reinterpret_cast<char**>(fields);\
+   const Long64_t* off = reinterpret_cast<const Long64_t*>(offsets);\
+   const char* emptyRec = reinterpret_cast<const char*>(empty);\
+   for (Long64_t i = 0; i < nEntries; ++i) {\
+      tree->GetEntry(first + i);\
+      UInt_t present = static_cast<UInt_t>(hdr[2]);\
+      Int_t n = 0;\
+      for (Int_t j = 0; j < nLocations; ++j) {\
+         char* rec = dest + (i*nLocations + j)*recordSize;\
+         memcpy(rec, emptyRec, recordSize);\
+         if (!(present & (1u << j))) continue;\
+         memcpy(rec, hdr, 2*sizeof(Int_t));\
+         for (Int_t k = 0; k < nFields; ++k) memcpy(rec + off[k], from[k] + 4*n, 4);\
+         ++n;\
+      }\
+   }\
+   return nEntries;\
+}" );
+
+
 class eventHistory:
-	Version = 1.3
+	Version = 2.2
 	__Validated__ = False
 
 # built in methods
-	def __init__(self ):
+	def __init__(self, chunkSize=100000, basketSize=32000, autoFlush=-30000000, autoSave=-300000000, schema=defaultSchema):
+		if schema not in (1, 2):
+			raise ValueError("eventHistory: no schema " + str(schema))
+		self._schema = schema
+		self._inSchema = None
+		self._chunkSize = chunkSize
+		self._basketSize = basketSize
+		self._autoFlush = autoFlush
+		self._autoSave = autoSave
+		self._buffer = None
+		self._entryBuffer = None
+		self._nBuffered = 0
 		self._outputFilename = "null"
 		self._inputFilename = "null"
 		self._eHTree = "null"
 		self._runNum = -1
 		self._particles = [None]*14
-		self.evTree = TTree('eventHistory', 'nuStorm Event')
+		self.evTree = None
 		self._entryPnt = 0
 
 	def __repr__(self):
@@ -358,13 +565,31 @@ class eventHistory:
 	def outFile(self, fileName ):
 		self._outputFilename = fileName
 		self._outTFile = TFile( self._outputFilename, 'RECREATE', 'event History' )
+		self._outTFile.cd()
+		self._makeTree()
+
+#  The output tree, in the current directory (the output file once outFile has been called)
+	def _makeTree(self):
+		self.evTree = TTree('eventHistory', 'nuStorm Event')
+		self.evTree.SetAutoFlush(self._autoFlush)
+		self.evTree.SetAutoSave(self._autoSave)
 
 #  Name and open a file for input
-	def inFile(self, fileName ):
+	def inFile(self, fileName, treeName="eventHistory"):
 		self._inputFilename = fileName
 		self._inTFile = TFile( self._inputFilename, 'READ', 'event History' )
 
-		self._eHTree = self._inTFile.Get("eventHistory")
+		self._eHTree = self._inTFile.Get(treeName)
+#  schema 2 files have the header branch
+		if self._eHTree.GetBranch("header"):
+			self._inSchema = 2
+			self._makeV2Arrays()
+			self._eHTree.SetBranchAddress('header', self._v2Header)
+			self._eHTree.SetBranchAddress('nPresent', self._v2Count)
+			for field in v2Fields:
+				self._eHTree.SetBranchAddress(field, self._v2Arrays[field])
+			return
+		self._inSchema = 1
 		self.target = ROOT.target()
 		self._eHTree.SetBranchAddress('target', self.target)
 		self.productionStraight = ROOT.productionStraight()
@@ -393,6 +618,15 @@ class eventHistory:
 		self._eHTree.SetBranchAddress("numuRSD", self.numuRSD)
 		self.nueRSD = ROOT.nueRSD()
 		self._eHTree.SetBranchAddress("nueRSD", self.nueRSD)
+# addresses of the structs, in eventBatch.locations order, for the bulk read
+		structs = [self.target, self.productionStraight, self.prodStraightEnd, self.pionDecay, self.muonProduction,
+			self.piFlashProd, self.muonDecay, self.eProduction, self.numuProduction, self.nueProduction,
+			self.numuDetector, self.nueDetector, self.numuRSD, self.nueRSD]
+		self._inStructAddresses = np.array([addressof(struct) for struct in structs], dtype=np.uint64)
+
+#  Schema of the input file if one has been opened, otherwise the schema written
+	def schema(self):
+		return self._inSchema if self._inSchema is not None else self._schema
 
 	def getEntries(self):
 		return self._eHTree.GetEntries()
@@ -414,6 +648,18 @@ class eventHistory:
 #			print (self.pionDecay.runNumber)
 #			print (self.pionDecay.eventNumber)
 
+		if self._inSchema == 2:
+			if self._entryBuffer is None:
+				self._entryBuffer = np.empty((1, len(eventBatch.locations)), dtype=leafDtype)
+			self._readV2(self._entryPnt, 1, self._entryBuffer)
+			for j, location in enumerate(eventBatch.locations):
+				rec = self._entryBuffer[0, j]
+				self.addParticle(location, particle.particle(int(rec["runNumber"]), int(rec["eventNumber"]), float(rec["s"]),
+					float(rec["x"]), float(rec["y"]), float(rec["z"]), float(rec["px"]), float(rec["py"]), float(rec["pz"]),
+					float(rec["t"]), float(rec["eventWeight"]), int(rec["pdgCode"])))
+			self._entryPnt = self._entryPnt + 1
+			return
+
 		self._eHTree.GetEntry(self._entryPnt)
 
 		pTar = particle.particle(self.target.runNumber, self.target.eventNumber, self.target.s,
@@ -479,42 +725,88 @@ class eventHistory:
 
 	def rootStructure(self):
 # Define the root data structure
+		if self.evTree is None:
+			self._makeTree()
+		if self._schema == 2:
+			self._makeV2Arrays()
+			self.evTree.Branch('header', self._v2Header, 'runNumber/I:eventNumber/I:present/i', self._basketSize)
+			self.evTree.Branch('nPresent', self._v2Count, 'nPresent/I', self._basketSize)
+			for field in v2Fields:
+				self.evTree.Branch(field, self._v2Arrays[field], field + '[nPresent]/' + ('I' if field == 'pdgCode' else 'F'),
+					self._basketSize)
+			self.makeHistory()
+			return
 		self.target = ROOT.target()
-		self.evTree.Branch('target', self.target, 'run/I:event:pdgCode:x/F:y:z:s:px:py:pz:t:eventWeight:mass')
+		self.evTree.Branch('target', self.target, 'run/I:event:pdgCode:x/F:y:z:s:px:py:pz:t:eventWeight:mass', self._basketSize)
 		self.productionStraight = ROOT.productionStraight()
-		self.evTree.Branch('productionStraight', self.productionStraight, 'run/I:event:pdgCode:x/F:y:z:s:px:py:pz:t:eventWeight:mass')
+		self.evTree.Branch('productionStraight', self.productionStraight, 'run/I:event:pdgCode:x/F:y:z:s:px:py:pz:t:eventWeight:mass', self._basketSize)
 		self.prodStraightEnd = ROOT.prodStraightEnd()
-		self.evTree.Branch('prodStraightEnd', self.prodStraightEnd, 'run/I:event:pdgCode:x/F:y:z:s:px:py:pz:t:eventWeight:mass')
+		self.evTree.Branch('prodStraightEnd', self.prodStraightEnd, 'run/I:event:pdgCode:x/F:y:z:s:px:py:pz:t:eventWeight:mass', self._basketSize)
 		self.pionDecay = ROOT.pionDecay()
-		self.evTree.Branch('pionDecay', self.pionDecay, 'run/I:event:pdgCode:x/F:y:z:s:px:py:pz:t:eventWeight:mass')
+		self.evTree.Branch('pionDecay', self.pionDecay, 'run/I:event:pdgCode:x/F:y:z:s:px:py:pz:t:eventWeight:mass', self._basketSize)
 		self.muonProduction = ROOT.muonProduction()
-		self.evTree.Branch('muonProduction', self.muonProduction, 'run/I:event:pdgCode:x/F:y:z:s:px:py:pz:t:eventWeight:mass')
+		self.evTree.Branch('muonProduction', self.muonProduction, 'run/I:event:pdgCode:x/F:y:z:s:px:py:pz:t:eventWeight:mass', self._basketSize)
 		self.piFlashNu = ROOT.piFlashNu()
-		self.evTree.Branch('piFlashNu', self.piFlashNu, 'run/I:event:pdgCode:x/F:y:z:s:px:py:pz:t:eventWeight:mass')
+		self.evTree.Branch('piFlashNu', self.piFlashNu, 'run/I:event:pdgCode:x/F:y:z:s:px:py:pz:t:eventWeight:mass', self._basketSize)
 		self.muonDecay = ROOT.muonDecay()
-		self.evTree.Branch('muonDecay', self.muonDecay, 'run/I:event:pdgCode:x/F:y:z:s:px:py:pz:t:eventWeight:mass')
+		self.evTree.Branch('muonDecay', self.muonDecay, 'run/I:event:pdgCode:x/F:y:z:s:px:py:pz:t:eventWeight:mass', self._basketSize)
 		self.eProduction = ROOT.eProduction()
-		self.evTree.Branch('eProduction', self.eProduction, 'run/I:event:pdgCode:x/F:y:z:s:px:py:pz:t:eventWeight:mass')
+		self.evTree.Branch('eProduction', self.eProduction, 'run/I:event:pdgCode:x/F:y:z:s:px:py:pz:t:eventWeight:mass', self._basketSize)
 		self.numuProduction = ROOT.numuProduction()
-		self.evTree.Branch('numuProduction', self.numuProduction, 'run/I:event:pdgCode:x/F:y:z:s:px:py:pz:t:eventWeight:mass')
+		self.evTree.Branch('numuProduction', self.numuProduction, 'run/I:event:pdgCode:x/F:y:z:s:px:py:pz:t:eventWeight:mass', self._basketSize)
 		self.nueProduction = ROOT.nueProduction()
-		self.evTree.Branch('nueProduction', self.nueProduction, 'run/I:event:pdgCode:x/F:y:z:s:px:py:pz:t:eventWeight:mass')
+		self.evTree.Branch('nueProduction', self.nueProduction, 'run/I:event:pdgCode:x/F:y:z:s:px:py:pz:t:eventWeight:mass', self._basketSize)
 		self.numuDetector = ROOT.numuDetector()
-		self.evTree.Branch('numuDetector', self.numuDetector, 'run/I:event:pdgCode:x/F:y:z:s:px:py:pz:t:eventWeight:mass')
+		self.evTree.Branch('numuDetector', self.numuDetector, 'run/I:event:pdgCode:x/F:y:z:s:px:py:pz:t:eventWeight:mass', self._basketSize)
 		self.nueDetector = ROOT.nueDetector()
-		self.evTree.Branch('nueDetector', self.nueDetector, 'run/I:event:pdgCode:x/F:y:z:s:px:py:pz:t:eventWeight:mass')
+		self.evTree.Branch('nueDetector', self.nueDetector, 'run/I:event:pdgCode:x/F:y:z:s:px:py:pz:t:eventWeight:mass', self._basketSize)
 		self.numuRSD = ROOT.numuRSD()
-		self.evTree.Branch('numuRSD', self.numuRSD, 'run/I:event:pdgCode:x/F:y:z:s:px:py:pz:t:eventWeight:mass')
+		self.evTree.Branch('numuRSD', self.numuRSD, 'run/I:event:pdgCode:x/F:y:z:s:px:py:pz:t:eventWeight:mass', self._basketSize)
 		self.nueRSD = ROOT.nueRSD()
-		self.evTree.Branch('nueRSD', self.nueRSD, 'run/I:event:pdgCode:x/F:y:z:s:px:py:pz:t:eventWeight:mass')
+		self.evTree.Branch('nueRSD', self.nueRSD, 'run/I:event:pdgCode:x/F:y:z:s:px:py:pz:t:eventWeight:mass', self._basketSize)
+# addresses of the structs, in eventBatch.locations order, for the bulk fill
+		structs = [self.target, self.productionStraight, self.prodStraightEnd, self.pionDecay, self.muonProduction,
+			self.piFlashNu, self.muonDecay, self.eProduction, self.numuProduction, self.nueProduction,
+			self.numuDetector, self.nueDetector, self.numuRSD, self.nueRSD]
+		self._structAddresses = np.array([addressof(struct) for struct in structs], dtype=np.uint64)
 # and create the history array
 		self.makeHistory()
 
+#  Schema 2 branch buffers: the header (run, event, presence bits), the count and one array per field
+	def _makeV2Arrays(self):
+		self._v2Header = np.zeros(3, dtype=np.int32)
+		self._v2Count = np.zeros(1, dtype=np.int32)
+		self._v2Arrays = {field: np.zeros(len(eventBatch.locations), dtype=leafDtype[field]) for field in v2Fields}
+		self._v2Addresses = np.array([self._v2Arrays[field].ctypes.data for field in v2Fields], dtype=np.uint64)
+
+#  Read n schema 2 entries from first into buffer [n][locations] as full records
+	def _readV2(self, first, n, buffer):
+		ROOT.eventHistoryBulkReadV2(self._eHTree, buffer.ctypes.data, first, n, len(eventBatch.locations), leafDtype.itemsize,
+			self._v2Header.ctypes.data, self._v2Addresses.ctypes.data, v2Offsets.ctypes.data, len(v2Fields),
+			emptyRecord.ctypes.data)
+		buffer["mass"][:n] = massOf(buffer["pdgCode"][:n])
+
 #  Close the output file
 	def outFileClose(self ):
 		self._outTFile.Close()
 
 	def fill(self):
+#  schema 2: the event goes into the fillBatch buffer
+		if self._schema == 2:
+			if self._buffer is None:
+				self._buffer = np.empty((self._chunkSize, len(eventBatch.locations)), dtype=leafDtype)
+			row = self._buffer[self._nBuffered]
+			for j, par in enumerate(self._particles):
+				row[j] = (par.run(), par.event(), par.pdgCode(), par.x(), par.y(), par.z(), par.s(), par.px(), par.py(),
+					par.pz(), par.t(), par.weight(), par.mass())
+			self._nBuffered = self._nBuffered + 1
+			if self._nBuffered == self._chunkSize:
+				self.flush()
+			return
+
+#  keep the events in order if fillBatch has been used
+		if self._nBuffered > 0:
+			self.flush()
 
 # target
 		partPnt = 0
@@ -525,9 +817,9 @@ class eventHistory:
 		self.target.y = self._particles[0].y()
 		self.target.z = self._particles[0].z()
 		self.target.s = self._particles[0].s()
-		self.target.px = self._particles[0].p()[1][0]
-		self.target.py = self._particles[0].p()[1][1]
-		self.target.pz = self._particles[0].p()[1][2]
+		self.target.px = self._particles[0].px()
+		self.target.py = self._particles[0].py()
+		self.target.pz = self._particles[0].pz()
 		self.target.t = self._particles[0].t()
 		self.target.eventWeight = self._particles[0].weight()
 		self.target.mass = self._particles[0].mass()
@@ -541,9 +833,9 @@ class eventHistory:
 		self.productionStraight.y = self._particles[partPnt].y()
 		self.productionStraight.z = self._particles[partPnt].z()
 		self.productionStraight.s = self._particles[partPnt].s()
-		self.productionStraight.px = self._particles[partPnt].p()[1][0]
-		self.productionStraight.py = self._particles[partPnt].p()[1][1]
-		self.productionStraight.pz = self._particles[partPnt].p()[1][2]
+		self.productionStraight.px = self._particles[partPnt].px()
+		self.productionStraight.py = self._particles[partPnt].py()
+		self.productionStraight.pz = self._particles[partPnt].pz()
 		self.productionStraight.t = self._particles[partPnt].t()
 		self.productionStraight.eventWeight = self._particles[partPnt].weight()
 		self.productionStraight.mass = self._particles[partPnt].mass()
@@ -557,9 +849,9 @@ class eventHistory:
 		self.prodStraightEnd.y = self._particles[partPnt].y()
 		self.prodStraightEnd.z = self._particles[partPnt].z()
 		self.prodStraightEnd.s = self._particles[partPnt].s()
-		self.prodStraightEnd.px = self._particles[partPnt].p()[1][0]
-		self.prodStraightEnd.py = self._particles[partPnt].p()[1][1]
-		self.prodStraightEnd.pz = self._particles[partPnt].p()[1][2]
+		self.prodStraightEnd.px = self._particles[partPnt].px()
+		self.prodStraightEnd.py = self._particles[partPnt].py()
+		self.prodStraightEnd.pz = self._particles[partPnt].pz()
 		self.prodStraightEnd.t = self._particles[partPnt].t()
 		self.prodStraightEnd.eventWeight = self._particles[partPnt].weight()
 		self.prodStraightEnd.mass = self._particles[partPnt].mass()
@@ -573,9 +865,9 @@ class eventHistory:
 		self.pionDecay.y = self._particles[partPnt].y()
 		self.pionDecay.z = self._particles[partPnt].z()
 		self.pionDecay.s = self._particles[partPnt].s()
-		self.pionDecay.px = self._particles[partPnt].p()[1][0]
-		self.pionDecay.py = self._particles[partPnt].p()[1][1]
-		self.pionDecay.pz = self._particles[partPnt].p()[1][2]
+		self.pionDecay.px = self._particles[partPnt].px()
+		self.pionDecay.py = self._particles[partPnt].py()
+		self.pionDecay.pz = self._particles[partPnt].pz()
 		self.pionDecay.t = self._particles[partPnt].t()
 		self.pionDecay.eventWeight = self._particles[partPnt].weight()
 		self.pionDecay.mass = self._particles[partPnt].mass()
@@ -589,9 +881,9 @@ class eventHistory:
 		self.muonProduction.y = self._particles[partPnt].y()
 		self.muonProduction.z = self._particles[partPnt].z()
 		self.muonProduction.s = self._particles[partPnt].s()
-		self.muonProduction.px = self._particles[partPnt].p()[1][0]
-		self.muonProduction.py = self._particles[partPnt].p()[1][1]
-		self.muonProduction.pz = self._particles[partPnt].p()[1][2]
+		self.muonProduction.px = self._particles[partPnt].px()
+		self.muonProduction.py = self._particles[partPnt].py()
+		self.muonProduction.pz = self._particles[partPnt].pz()
 		self.muonProduction.t = self._particles[partPnt].t()
 		self.muonProduction.eventWeight = self._particles[partPnt].weight()
 		self.muonProduction.mass = self._particles[partPnt].mass()
@@ -605,9 +897,9 @@ class eventHistory:
 		self.piFlashNu.y = self._particles[partPnt].y()
 		self.piFlashNu.z = self._particles[partPnt].z()
 		self.piFlashNu.s = self._particles[partPnt].s()
-		self.piFlashNu.px = self._particles[partPnt].p()[1][0]
-		self.piFlashNu.py = self._particles[partPnt].p()[1][1]
-		self.piFlashNu.pz = self._particles[partPnt].p()[1][2]
+		self.piFlashNu.px = self._particles[partPnt].px()
+		self.piFlashNu.py = self._particles[partPnt].py()
+		self.piFlashNu.pz = self._particles[partPnt].pz()
 		self.piFlashNu.t = self._particles[partPnt].t()
 		self.piFlashNu.eventWeight = self._particles[partPnt].weight()
 		self.piFlashNu.mass = self._particles[partPnt].mass()
@@ -621,9 +913,9 @@ class eventHistory:
 		self.muonDecay.y = self._particles[partPnt].y()
 		self.muonDecay.z = self._particles[partPnt].z()
 		self.muonDecay.s = self._particles[partPnt].s()
-		self.muonDecay.px = self._particles[partPnt].p()[1][0]
-		self.muonDecay.py = self._particles[partPnt].p()[1][1]
-		self.muonDecay.pz = self._particles[partPnt].p()[1][2]
+		self.muonDecay.px = self._particles[partPnt].px()
+		self.muonDecay.py = self._particles[partPnt].py()
+		self.muonDecay.pz = self._particles[partPnt].pz()
 		self.muonDecay.t = self._particles[partPnt].t()
 		self.muonDecay.eventWeight = self._particles[partPnt].weight()
 		self.muonDecay.mass = self._particles[partPnt].mass()
@@ -637,9 +929,9 @@ class eventHistory:
 		self.eProduction.y = self._particles[partPnt].y()
 		self.eProduction.z = self._particles[partPnt].z()
 		self.eProduction.s = self._particles[partPnt].s()
-		self.eProduction.px = self._particles[partPnt].p()[1][0]
-		self.eProduction.py = self._particles[partPnt].p()[1][1]
-		self.eProduction.pz = self._particles[partPnt].p()[1][2]
+		self.eProduction.px = self._particles[partPnt].px()
+		self.eProduction.py = self._particles[partPnt].py()
+		self.eProduction.pz = self._particles[partPnt].pz()
 		self.eProduction.t = self._particles[partPnt].t()
 		self.eProduction.eventWeight = self._particles[partPnt].weight()
 		self.eProduction.mass = self._particles[partPnt].mass()
@@ -653,9 +945,9 @@ class eventHistory:
 		self.numuProduction.y = self._particles[partPnt].y()
 		self.numuProduction.z = self._particles[partPnt].z()
 		self.numuProduction.s = self._particles[partPnt].s()
-		self.numuProduction.px = self._particles[partPnt].p()[1][0]
-		self.numuProduction.py = self._particles[partPnt].p()[1][1]
-		self.numuProduction.pz = self._particles[partPnt].p()[1][2]
+		self.numuProduction.px = self._particles[partPnt].px()
+		self.numuProduction.py = self._particles[partPnt].py()
+		self.numuProduction.pz = self._particles[partPnt].pz()
 		self.numuProduction.t = self._particles[partPnt].t()
 		self.numuProduction.eventWeight = self._particles[partPnt].weight()
 		self.numuProduction.mass = self._particles[partPnt].mass()
@@ -669,9 +961,9 @@ class eventHistory:
 		self.nueProduction.y = self._particles[partPnt].y()
 		self.nueProduction.z = self._particles[partPnt].z()
 		self.nueProduction.s = self._particles[partPnt].s()
-		self.nueProduction.px = self._particles[partPnt].p()[1][0]
-		self.nueProduction.py = self._particles[partPnt].p()[1][1]
-		self.nueProduction.pz = self._particles[partPnt].p()[1][2]
+		self.nueProduction.px = self._particles[partPnt].px()
+		self.nueProduction.py = self._particles[partPnt].py()
+		self.nueProduction.pz = self._particles[partPnt].pz()
 		self.nueProduction.t = self._particles[partPnt].t()
 		self.nueProduction.eventWeight = self._particles[partPnt].weight()
 		self.nueProduction.mass = self._particles[partPnt].mass()
@@ -685,9 +977,9 @@ class eventHistory:
 		self.numuDetector.y = self._particles[partPnt].y()
 		self.numuDetector.z = self._particles[partPnt].z()
 		self.numuDetector.s = self._particles[partPnt].s()
-		self.numuDetector.px = self._particles[partPnt].p()[1][0]
-		self.numuDetector.py = self._particles[partPnt].p()[1][1]
-		self.numuDetector.pz = self._particles[partPnt].p()[1][2]
+		self.numuDetector.px = self._particles[partPnt].px()
+		self.numuDetector.py = self._particles[partPnt].py()
+		self.numuDetector.pz = self._particles[partPnt].pz()
 		self.numuDetector.t = self._particles[partPnt].t()
 		self.numuDetector.eventWeight = self._particles[partPnt].weight()
 		self.numuDetector.mass = self._particles[partPnt].mass()
@@ -701,9 +993,9 @@ class eventHistory:
 		self.nueDetector.y = self._particles[partPnt].y()
 		self.nueDetector.z = self._particles[partPnt].z()
 		self.nueDetector.s = self._particles[partPnt].s()
-		self.nueDetector.px = self._particles[partPnt].p()[1][0]
-		self.nueDetector.py = self._particles[partPnt].p()[1][1]
-		self.nueDetector.pz = self._particles[partPnt].p()[1][2]
+		self.nueDetector.px = self._particles[partPnt].px()
+		self.nueDetector.py = self._particles[partPnt].py()
+		self.nueDetector.pz = self._particles[partPnt].pz()
 		self.nueDetector.t = self._particles[partPnt].t()
 		self.nueDetector.eventWeight = self._particles[partPnt].weight()
 		self.nueDetector.mass = self._particles[partPnt].mass()
@@ -717,9 +1009,9 @@ class eventHistory:
 		self.numuRSD.y = self._particles[partPnt].y()
 		self.numuRSD.z = self._particles[partPnt].z()
 		self.numuRSD.s = self._particles[partPnt].s()
-		self.numuRSD.px = self._particles[partPnt].p()[1][0]
-		self.numuRSD.py = self._particles[partPnt].p()[1][1]
-		self.numuRSD.pz = self._particles[partPnt].p()[1][2]
+		self.numuRSD.px = self._particles[partPnt].px()
+		self.numuRSD.py = self._particles[partPnt].py()
+		self.numuRSD.pz = self._particles[partPnt].pz()
 		self.numuRSD.t = self._particles[partPnt].t()
 		self.numuRSD.eventWeight = self._particles[partPnt].weight()
 		self.numuRSD.mass = self._particles[partPnt].mass()
@@ -733,9 +1025,9 @@ class eventHistory:
 		self.nueRSD.y = self._particles[partPnt].y()
 		self.nueRSD.z = self._particles[partPnt].z()
 		self.nueRSD.s = self._particles[partPnt].s()
-		self.nueRSD.px = self._particles[partPnt].p()[1][0]
-		self.nueRSD.py = self._particles[partPnt].p()[1][1]
-		self.nueRSD.pz = self._particles[partPnt].p()[1][2]
+		self.nueRSD.px = self._particles[partPnt].px()
+		self.nueRSD.py = self._particles[partPnt].py()
+		self.nueRSD.pz = self._particles[partPnt].pz()
 		self.nueRSD.t = self._particles[partPnt].t()
 		self.nueRSD.eventWeight = self._particles[partPnt].weight()
 		self.nueRSD.mass = self._particles[partPnt].mass()
@@ -750,9 +1042,148 @@ class eventHistory:
 		self.makeHistory()
 
 
-#  Write the root structure out to the file
+#  Fill a whole batch of events - history is a dictionary of record arrays (eventBatch.historyDtype)
+#  keyed by location, one entry per event. The structures are set directly, no particles are created
+	def fillBatch(self, history):
+		nEvents = len(history[eventBatch.locations[0]])
+		if self._buffer is None:
+			self._buffer = np.empty((self._chunkSize, len(eventBatch.locations)), dtype=leafDtype)
+
+		first = 0
+		while first < nEvents:
+			n = min(self._chunkSize - self._nBuffered, nEvents - first)
+			for j, location in enumerate(eventBatch.locations):
+				records = history[location]
+				if isinstance(records, ParticleBlock.ParticleBlock):
+					records = records.records()
+				chunk = self._buffer[self._nBuffered:self._nBuffered+n, j]
+				for field in leafDtype.names:
+					chunk[field] = records[field][first:first+n]
+			self._nBuffered = self._nBuffered + n
+			first = first + n
+			if self._nBuffered == self._chunkSize:
+				self.flush()
+
+#  Write the buffered events to the tree
+	def flush(self):
+		if (self._nBuffered > 0) and (self._schema == 2):
+			ROOT.eventHistoryBulkFillV2(self.evTree, self._buffer.ctypes.data, self._nBuffered, len(eventBatch.locations),
+				leafDtype.itemsize, self._v2Header.ctypes.data, self._v2Count.ctypes.data, self._v2Addresses.ctypes.data,
+				v2Offsets.ctypes.data, len(v2Fields), emptyRecord.ctypes.data)
+			self._nBuffered = 0
+		elif self._nBuffered > 0:
+			ROOT.eventHistoryBulkFill(self.evTree, self._buffer.ctypes.data, self._structAddresses.ctypes.data,
+				self._nBuffered, len(eventBatch.locations), leafDtype.itemsize)
+			self._nBuffered = 0
+
+#  Read the tree into numpy arrays, chunkSize entries at a time
+	def readArrays(self, locations=None, fields=None, first=0, nEntries=None, chunkSize=100000, weighted=False):
+		if locations is None:
+			locations = eventBatch.locations
+		if fields is None:
+			fields = leafDtype.names
+		for location in locations:
+			if location not in eventBatch.locations:
+				raise ValueError("eventHistory.readArrays: unknown location " + str(location))
+		for field in fields:
+			if field not in leafDtype.names:
+				raise ValueError("eventHistory.readArrays: unknown field " + str(field))
+
+		last = self._eHTree.GetEntries()
+		if nEntries is not None:
+			last = min(last, first + nEntries)
+		index = [eventBatch.locations.index(location) for location in locations]
+		if self._inSchema == 2:
+#  every location is in the same branches: read the header and the requested fields for all of them
+			branches = ["header", "nPresent"] + [field for field in v2Fields if (field in fields) or \
+				((field == "pdgCode") and ("mass" in fields))]
+			column = index
+			buffer = np.empty((min(chunkSize, max(last - first, 0)), len(eventBatch.locations)), dtype=leafDtype)
+		else:
+			branches = locations
+			column = list(range(len(locations)))
+			src = np.ascontiguousarray(self._inStructAddresses[index])
+			buffer = np.empty((min(chunkSize, max(last - first, 0)), len(locations)), dtype=leafDtype)
+
+#  only the requested branches are read from the file
+		self._eHTree.SetBranchStatus("*", 0)
+		for branch in branches:
+			self._eHTree.SetBranchStatus(branch, 1)
+		try:
+			for start in range(first, last, chunkSize):
+				n = min(chunkSize, last - start)
+				if self._inSchema == 2:
+					self._readV2(start, n, buffer)
+				else:
+					ROOT.eventHistoryBulkRead(self._eHTree, src.ctypes.data, buffer.ctypes.data, start, n,
+						len(locations), leafDtype.itemsize)
+				entry = np.arange(start, start + n)
+				chunk = {}
+				for j, location in enumerate(locations):
+					records = buffer[:n, column[j]]
+					if weighted:
+						keep = records["eventWeight"] > 0.0
+						records = records[keep]
+						chunk[location] = {"entry": entry[keep]}
+					else:
+						chunk[location] = {"entry": entry}
+					for field in fields:
+						chunk[location][field] = records[field].copy()
+				yield chunk
+		finally:
+			self._eHTree.SetBranchStatus("*", 1)
+
+#  Read the tree into numpy arrays in one go
+	def getArrays(self, locations=None, fields=None, first=0, nEntries=None, chunkSize=100000, weighted=False):
+		if locations is None:
+			locations = eventBatch.locations
+		if fields is None:
+			fields = leafDtype.names
+		chunks = list(self.readArrays(locations, fields, first, nEntries, chunkSize, weighted))
+		arrays = {}
+		for location in locations:
+			arrays[location] = {}
+			for field in ("entry",) + tuple(fields):
+				if len(chunks) > 0:
+					arrays[location][field] = np.concatenate([chunk[location][field] for chunk in chunks])
+				else:
+					arrays[location][field] = np.empty(0, dtype=np.int64 if field == "entry" else leafDtype[field])
+		return arrays
+
+#  Number of events buffered by fillBatch before they are written
+	def setChunkSize(self, chunkSize):
+		self.flush()
+		self._chunkSize = chunkSize
+		self._buffer = None
+
+#  Write the root structure out to the file, replacing the header saved by AutoSave
 	def write(self):
-		self.evTree.Write()
+		self.flush()
+		self.evTree.Write("", ROOT.TObject.kOverwrite)
+
+#  Save the tree header now - the entries written so far can then be read from the file
+	def autoSave(self):
+		self.flush()
+		self.evTree.AutoSave("SaveSelf")
+
+#  Write a one entry tree of numbers to the output file
+	def writeSummary(self, values, name="runSummary"):
+		self._outTFile.cd()
+		tree = TTree(name, "nuStorm run summary")
+		buffers = {}
+		for key, value in values.items():
+			buffers[key] = array.array('d', [float(value)])
+			tree.Branch(key, buffers[key], key + "/D")
+		tree.Fill()
+		tree.Write("", ROOT.TObject.kOverwrite)
+
+#  The numbers of the summary tree of the input file
+	def getSummary(self, name="runSummary"):
+		tree = self._inTFile.Get(name)
+		if not tree:
+			return {}
+		tree.GetEntry(0)
+		return {branch.GetName(): getattr(tree, branch.GetName()) for branch in tree.GetListOfBranches()}
 
 # Cd allows to change directory back to output file after
 # potentially having opened another root file
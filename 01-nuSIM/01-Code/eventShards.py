@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module eventShards:
+===================
+
+  Utilities for splitting a run into shards which can be generated in
+  parallel (a process pool or a job array) and merged afterwards.
+
+  Shard k of a run generates the contiguous block of events given by
+  shardRanges, numbered as in the unsharded run, so the shard outputs
+  merged in shard order have contiguous event numbers.  The random stream
+  of a shard is derived from (runNumber, shardId) alone, so a shard is
+  reproducible whichever process or job runs it, and the streams of
+  different shards are independent.
+
+  Dependencies:
+   - numpy; ROOT and runSummary for mergeShards and mergeSummaries only
+
+  Module methods:
+  ---------------
+    shardRanges       : Splits nEvents into nShards contiguous blocks.
+                        Returns a list of (firstEvent, nEvents)
+    shardSeedSequence : numpy SeedSequence for (runNumber, shardId)
+    shardStream       : RandomStream for (runNumber, shardId)
+    shardRng          : numpy random Generator of the shard RandomStream
+    shardFileName     : Name of the output file of a shard
+    mergeShards       : Merges the eventHistory trees of the shard files,
+                        in order, into one file.  Returns the number of
+                        entries
+    mergeSummaries    : Merges the run summary trees (runSummary) of the shard
+                        files and writes the merged summary to the merged
+                        file.  Returns its values
+
+Created on Sun 18Oct26: Version history:
+----------------------------------------------
+ 1.4: 18Oct26: seedGlobals removed, the global generators are not seeded
+ 1.3: 18Oct26: mergeSummaries merges runSummary instances
+ 1.2: 18Oct26: mergeSummaries
+ 1.1: 18Oct26: Shard random numbers from RandomStream
+ 1.0: 18Oct26: First implementation
+
+@author: PaulKyberd
+"""
+
+import os
+import numpy as np
+import RandomStream as RStrm
+
+def shardRanges(nEvents, nShards):
+    if nShards < 1:
+        raise ValueError("eventShards.shardRanges: nShards must be at least 1")
+    nBase, nExtra = divmod(nEvents, nShards)
+    ranges = []
+    firstEvent = 0
+    for shardId in range(nShards):
+        n = nBase + (1 if shardId < nExtra else 0)
+        ranges.append((firstEvent, n))
+        firstEvent = firstEvent + n
+    return ranges
+
+def shardSeedSequence(runNumber, shardId):
+    return np.random.SeedSequence([int(runNumber), int(shardId)])
+
+def shardStream(runNumber, shardId):
+    return RStrm.RandomStream(runNumber, shardId)
+
+def shardRng(runNumber, shardId):
+    return shardStream(runNumber, shardId).generator()
+
+def shardFileName(fileName, shardId):
+    root, ext = os.path.splitext(fileName)
+    return root + "_shard" + str(shardId) + ext
+
+def mergeShards(shardFiles, outFileName, treeName="eventHistory"):
+    import ROOT
+    chain = ROOT.TChain(treeName)
+    for shardFile in shardFiles:
+        chain.Add(shardFile)
+    nEntries = chain.GetEntries()
+    chain.Merge(outFileName, "fast")
+    return nEntries
+
+def mergeSummaries(shardFiles, outFileName, treeName="runSummary"):
+    import ROOT
+    from array import array
+    import runSummary as runSummary
+    summary = runSummary.sumSummaries(shardFiles, treeName)
+    if summary is None:
+        return {}
+    values = summary.values()
+    outFile = ROOT.TFile(outFileName, "UPDATE")
+    tree = ROOT.TTree(treeName, "nuStorm run summary")
+    buffers = {}
+    for name, value in values.items():
+        buffers[name] = array('d', [value])
+        tree.Branch(name, buffers[name], name + "/D")
+    tree.Fill()
+    tree.Write("", ROOT.TObject.kOverwrite)
+    outFile.Close()
+    return values
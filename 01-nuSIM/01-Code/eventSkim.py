@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Class eventSkim:
+================
+
+  Event selection for a skimmed event history: only the events that pass
+  the predicate are written, the others are only counted, so the number
+  of events generated (and with it the normalisation) is still known.
+
+  The predicate is given in the control file as the "skim" entry, a term
+  or a list of terms of which any must hold:
+      "none"             : no skim, every event is written (the default)
+      "detectorWeight"   : eventWeight > 0 at any of numuDetector,
+                           nueDetector, numuRSD, nueRSD
+      "muonDecayed"      : a muon decay is recorded (muonDecay present),
+                           whether or not the muon is absorbed in the ring;
+                           with PSMuons this includes absorbed muons that
+                           decay in the production straight
+      "weight:<location>"  : eventWeight > 0 at location
+      "present:<location>" : a particle (pdgCode != 0) at location
+
+  Dependencies:
+   - numpy, eventBatch (locations), ParticleBlock
+
+  Class attributes:
+  -----------------
+  __named : the named terms as lists of (kind, location)
+
+  Instance attributes:
+  --------------------
+  _spec      : the skim entry as given
+  _terms     : list of (kind, location), kind "weight" or "present"
+  _nEvents   : number of events offered
+  _nSelected : number of events that passed
+
+  Methods:
+  --------
+  Built-in methods __init__, __repr__ and __str__.
+      __init__ : Skim from the control file entry (string or list of strings)
+      __repr__ : One liner with call.
+      __str__  : Predicate and counts
+
+  Get/set methods:
+      active()    : True unless the skim is "none"
+      nEvents()   : events offered to select/keep
+      nSelected() : events that passed
+      nSkipped()  : events that failed
+      summary()   : {"nEvents", "nSelected", "nSkipped"} for the run summary
+
+  General methods:
+      select(history) : boolean mask of the events of a batch (dictionary of
+                        record arrays keyed by location) that pass; counted
+      apply(history)  : the batch with only the events that pass
+      keep(eH)        : True if the event held by the eventHistory eH passes;
+                        counted
+
+Created on Sun 18Oct26: Version history:
+----------------------------------------------
+ 1.1: 18Oct26: "muonNotAbsorbed" renamed "muonDecayed", it does not test the absorption
+ 1.0: 18Oct26: First implementation
+
+@author: PaulKyberd
+"""
+
+import numpy as np
+import eventBatch as eventBatch
+import ParticleBlock as ParticleBlock
+
+class eventSkim:
+
+    __named = {
+        "detectorWeight"  : [("weight", "numuDetector"), ("weight", "nueDetector"),
+                             ("weight", "numuRSD"), ("weight", "nueRSD")],
+        "muonDecayed"     : [("present", "muonDecay")]
+    }
+
+#--------  "Built-in methods":
+    def __init__(self, spec="none"):
+        self._spec = spec
+        specs = [spec] if isinstance(spec, str) else list(spec)
+        self._terms = []
+        for term in specs:
+            if term == "none":
+                continue
+            if term in eventSkim.__named:
+                self._terms.extend(eventSkim.__named[term])
+                continue
+            kind, sep, location = term.partition(":")
+            if (sep != ":") or (kind not in ("weight", "present")) or (location not in eventBatch.locations):
+                raise ValueError("eventSkim: unknown skim term " + str(term))
+            self._terms.append((kind, location))
+
+        self._nEvents   = 0
+        self._nSelected = 0
+
+        return
+
+    def __repr__(self):
+        return "eventSkim(spec)"
+
+    def __str__(self):
+        return "eventSkim: %s, %i events, %i selected, %i skipped" % \
+               (self._spec, self._nEvents, self._nSelected, self.nSkipped())
+
+#--------  "Get methods"
+    def active(self):
+        return len(self._terms) > 0
+
+    def nEvents(self):
+        return self._nEvents
+
+    def nSelected(self):
+        return self._nSelected
+
+    def nSkipped(self):
+        return self._nEvents - self._nSelected
+
+    def summary(self):
+        return {"nEvents": self._nEvents, "nSelected": self._nSelected, "nSkipped": self.nSkipped()}
+
+#--------  Selection
+    def select(self, history):
+        nEvents = len(history[eventBatch.locations[0]])
+        if not self.active():
+            mask = np.ones(nEvents, dtype=bool)
+        else:
+            mask = np.zeros(nEvents, dtype=bool)
+            for kind, location in self._terms:
+                records = history[location]
+                if isinstance(records, ParticleBlock.ParticleBlock):
+                    records = records.records()
+                if kind == "weight":
+                    mask = np.logical_or(mask, records["eventWeight"] > 0.)
+                else:
+                    mask = np.logical_or(mask, records["pdgCode"] != 0)
+        self._nEvents   = self._nEvents + nEvents
+        self._nSelected = self._nSelected + int(np.count_nonzero(mask))
+        return mask
+
+    def apply(self, history):
+        mask = self.select(history)
+        if mask.all():
+            return history
+        return {location: records[mask] for location, records in history.items()}
+
+    def keep(self, eH):
+        passed = not self.active()
+        for kind, location in self._terms:
+            par = eH.findParticle(location)
+            if (kind == "weight") and (par.weight() > 0.):
+                passed = True
+            elif (kind == "present") and (par.pdgCode() != 0):
+                passed = True
+        self._nEvents = self._nEvents + 1
+        if passed:
+            self._nSelected = self._nSelected + 1
+        return passed
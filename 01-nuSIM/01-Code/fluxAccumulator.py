@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Class fluxAccumulator:
+======================
+
+  Weighted neutrino spectra at the detector locations of the event history,
+  accumulated in memory batch by batch, so a flux run need not write the
+  event history.  For every location and flavour (from pdgCode) each
+  quantity (energy, x, y, t, ...) is histogrammed with np.bincount: the sum
+  of the weights and of the squared weights per bin, with under and
+  overflow in the first and last entries.  Only particles that are present
+  (pdgCode != 0) and carry a positive eventWeight are filled.  Accumulators
+  with the same binning (e.g. from the shards of a run) merge exactly.
+  ROOT is only needed by write, which converts the histograms to TH1D and
+  stores them with a one entry summary tree.
+
+  Dependencies:
+   - numpy; ROOT for write
+
+  Class attributes:
+  -----------------
+  __quantities : functions returning each quantity from a record array
+                 (ParticleBlock.particleDtype); E is |p| (GeV), massless
+  __defaultHistograms : binning [nBins, lower, upper] of each quantity
+
+  Instance attributes:
+  --------------------
+  _locations  : locations accumulated
+  _histograms : binning {quantity: [nBins, lower, upper]}
+  _edges      : bin edges of each quantity
+  _sumW       : {(location, flavour, quantity): sum of weights per bin}
+  _sumW2      : {(location, flavour, quantity): sum of squared weights per bin}
+  _nEntries   : {(location, flavour): number of particles filled}
+  _nEvents    : number of events seen by fill
+
+  Methods:
+  --------
+  Built-in methods __init__, __repr__ and __str__.
+      __init__ : Optional locations (default numuDetector, nueDetector,
+                 numuRSD, nueRSD) and histograms (binning dictionary, e.g.
+                 the fluxHistograms section of the control file; quantities
+                 not given keep the default binning)
+      __repr__ : One liner with call.
+      __str__  : Dump of the entries and weights per location and flavour
+
+  Get/set methods:
+      nEvents                     : number of events filled
+      keys                        : list of (location, flavour) filled
+      nEntries(location, flavour) : number of particles filled
+      sumWeights(location, flavour): total weight
+      histogram(location, flavour, quantity): (edges, sumW, sumW2), sumW and
+                                    sumW2 with under and overflow first and last
+
+  General methods:
+      fill(history) : fills from a dictionary of record arrays keyed by
+                      location, as eventBatch.generate returns
+      merge(other)  : adds the contents of another fluxAccumulator
+      write(fileName, summary=None): writes the TH1D histograms, named
+                      "<location>:<flavour>:<quantity>", and a TTree
+                      "fluxSummary" with nEvents and the numbers in the
+                      dictionary summary, to a new ROOT file
+
+  Module attributes:
+  ------------------
+  flavours : pdgCode -> flavour name
+
+Created on Sun 18Oct26: Version history:
+----------------------------------------------
+ 1.0: 18Oct26: First implementation
+
+@author: PaulKyberd
+"""
+
+import numpy as np
+
+flavours = {14: "numu", -14: "numuBar", 12: "nue", -12: "nueBar"}
+
+class fluxAccumulator:
+
+    __quantities = {
+        "E" : lambda rec: np.sqrt(rec["px"].astype(float)**2 + rec["py"].astype(float)**2 + rec["pz"].astype(float)**2),
+        "x" : lambda rec: rec["x"],
+        "y" : lambda rec: rec["y"],
+        "s" : lambda rec: rec["s"],
+        "t" : lambda rec: rec["t"]
+    }
+
+    __defaultHistograms = {
+        "E" : [100, 0.0, 10.0],
+        "x" : [100, -5.0, 5.0],
+        "y" : [100, -5.0, 5.0],
+        "t" : [110, 0.0, 11000.0]
+    }
+
+#--------  "Built-in methods":
+    def __init__(self, locations=None, histograms=None):
+        self._locations  = ["numuDetector", "nueDetector", "numuRSD", "nueRSD"] if locations is None else list(locations)
+        self._histograms = dict(fluxAccumulator.__defaultHistograms)
+        if histograms is not None:
+            self._histograms.update(histograms)
+        for quantity in self._histograms:
+            if quantity not in fluxAccumulator.__quantities:
+                raise ValueError("fluxAccumulator: no quantity " + quantity)
+        self._edges = {q: np.linspace(lower, upper, nBins + 1) for q, (nBins, lower, upper) in self._histograms.items()}
+
+        self._sumW     = {}
+        self._sumW2    = {}
+        self._nEntries = {}
+        self._nEvents  = 0
+
+        return
+
+    def __repr__(self):
+        return "fluxAccumulator(locations, histograms)"
+
+    def __str__(self):
+        lines = ["fluxAccumulator: %i events, quantities %s" % (self._nEvents, list(self._histograms))]
+        for location, flavour in self.keys():
+            lines.append("    %s %s: %i entries, weight %g" % \
+                         (location, flavour, self.nEntries(location, flavour), self.sumWeights(location, flavour)))
+        return "\n".join(lines)
+
+#--------  "Get methods"
+    def nEvents(self):
+        return self._nEvents
+
+    def keys(self):
+        return sorted(self._nEntries)
+
+    def nEntries(self, location, flavour):
+        return self._nEntries.get((location, flavour), 0)
+
+    def sumWeights(self, location, flavour):
+        quantity = next(iter(self._histograms))
+        if (location, flavour, quantity) not in self._sumW:
+            return 0.0
+        return float(self._sumW[(location, flavour, quantity)].sum())
+
+    def histogram(self, location, flavour, quantity):
+        nBins = self._histograms[quantity][0]
+        sumW  = self._sumW.get((location, flavour, quantity), np.zeros(nBins + 2))
+        sumW2 = self._sumW2.get((location, flavour, quantity), np.zeros(nBins + 2))
+        return self._edges[quantity].copy(), sumW.copy(), sumW2.copy()
+
+#--------  Accumulation
+    def fill(self, history):
+        self._nEvents = self._nEvents + len(history[self._locations[0]])
+        for location in self._locations:
+            rec = history[location]
+            weight = rec["eventWeight"].astype(float)
+            present = np.logical_and(rec["pdgCode"] != 0, weight > 0.)
+            for pdgCode, flavour in flavours.items():
+                mask = np.logical_and(present, rec["pdgCode"] == pdgCode)
+                nFill = np.count_nonzero(mask)
+                if nFill == 0:
+                    continue
+                key = (location, flavour)
+                self._nEntries[key] = self._nEntries.get(key, 0) + nFill
+                w = weight[mask]
+                selected = rec[mask]
+                for quantity, (nBins, lower, upper) in self._histograms.items():
+                    value = np.asarray(fluxAccumulator.__quantities[quantity](selected), dtype=float)
+#  bin 0 is the underflow, nBins+1 the overflow
+                    iBin = np.clip(np.floor((value - lower)*(nBins/(upper - lower))).astype(np.int64) + 1, 0, nBins + 1)
+                    self._add((location, flavour, quantity), np.bincount(iBin, weights=w, minlength=nBins + 2),
+                              np.bincount(iBin, weights=w*w, minlength=nBins + 2))
+
+    def _add(self, key, sumW, sumW2):
+        if key in self._sumW:
+            self._sumW[key]  = self._sumW[key] + sumW
+            self._sumW2[key] = self._sumW2[key] + sumW2
+        else:
+            self._sumW[key]  = sumW
+            self._sumW2[key] = sumW2
+
+    def merge(self, other):
+        if other._histograms != self._histograms:
+            raise ValueError("fluxAccumulator.merge: the binning is not the same")
+        self._nEvents = self._nEvents + other._nEvents
+        for key, n in other._nEntries.items():
+            self._nEntries[key] = self._nEntries.get(key, 0) + n
+        for key in other._sumW:
+            self._add(key, other._sumW[key].copy(), other._sumW2[key].copy())
+
+#--------  Output
+    def write(self, fileName, summary=None):
+        import ROOT
+        from array import array
+
+        outFile = ROOT.TFile(fileName, "RECREATE", "neutrino flux histograms")
+        for location, flavour, quantity in sorted(self._sumW):
+            nBins, lower, upper = self._histograms[quantity]
+            name = location + ":" + flavour + ":" + quantity
+            hist = ROOT.TH1D(name, name, nBins, lower, upper)
+            hist.Sumw2()
+            sumW  = self._sumW[(location, flavour, quantity)]
+            sumW2 = self._sumW2[(location, flavour, quantity)]
+            for i in range(nBins + 2):
+                hist.SetBinContent(i, sumW[i])
+                hist.SetBinError(i, np.sqrt(sumW2[i]))
+            hist.SetEntries(self._nEntries[(location, flavour)])
+            hist.Write()
+
+        values = {"nEvents": self._nEvents}
+        if summary is not None:
+            values.update(summary)
+        tree = ROOT.TTree("fluxSummary", "flux run summary")
+        buffers = {}
+        for key, value in values.items():
+            buffers[key] = array('d', [float(value)])
+            tree.Branch(key, buffers[key], key + "/D")
+        tree.Fill()
+        tree.Write()
+        outFile.Close()
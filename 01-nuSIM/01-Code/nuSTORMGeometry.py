@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Class nuSTORMGeometry:
+======================
+
+  Frozen, precomputed description of the nuSTORM lattice geometry.  Built
+  once per run from nuSTORMConst (and the nuSTORMPrdStrght instance used for
+  the transverse phase space) and passed to the event instances, so that the
+  per-event code reads plain floats instead of calling the nuSTORMConst get
+  methods (each of which returns a deepcopy) and rebuilding the rotation
+  matrices.  Once constructed the instance cannot be modified.
+
+  The ring is described by s_ring = s - length of transfer line complex:
+    s_ring <= 0                       : transfer line complex
+    0 < where <= PS                   : production straight
+    PS < where <= PS+Arc              : first arc
+    PS+Arc < where <= 2PS+Arc         : return straight
+    2PS+Arc < where                   : second arc
+  where = s_ring mod Circumference for s_ring > 0.
+
+  The ring sections are held in a table (SectionTable): the where at the
+  start of each section, the beam position and direction there and the
+  curvature of the section.  The position at any where is found from the
+  section alone, so the beam position after any number of turns costs the
+  same as one in the first turn, and arrays of s are done in one step.
+
+  Class attributes:
+  -----------------
+  None
+
+  Instance attributes:
+  --------------------
+  _TrfLineCmplxLen : Length of the transfer line complex (m)
+  _TrfLineCmplxAng : Angle of the transfer line complex to z (rad)
+  _ProdStrghtLen   : Length of the production straight (m)
+  _Circumference   : Ring circumference (m)
+  _ArcLen          : Length of one arc (m)
+  _ArcRad          : Radius of the arcs (m)
+  _SectionBounds   : numpy array of where at the ends of the ring sections
+  _SectionTable    : numpy record array, one row per ring section (production
+                     straight, first arc, return straight, second arc):
+                     start (where), x, z, theta of the beam at the start,
+                     sinTheta, cosTheta and curvature (1/ArcRad on the arcs,
+                     0 on the straights)
+  _SectionRows     : _SectionTable as a list of tuples, for the scalar BeamDir
+  _SectionStarts   : list of the where at the start of each ring section
+  _RSection        : Rotation matrices (R, Rinv) of the transfer line,
+                     production straight and return straight (read only)
+  _nuStrt          : nuSTORMPrdStrght instance (or None)
+
+  Methods:
+  --------
+  Built-in methods __init__, __setattr__, __repr__ and __str__.
+      __init__    : Takes a nuSTORMConst instance and, optionally, the
+                    nuSTORMPrdStrght instance
+      __setattr__ : Refuses to set attributes once constructed
+      __repr__    : One liner with call.
+      __str__     : Dump of the geometry
+
+  Get/set methods (plain floats, no copies):
+      TrfLineCmplxLen, TrfLineCmplxAng, ProdStrghtLen, Circumference, ArcLen,
+      ArcRad, SectionBounds, SectionTable, prdStrght
+
+  General methods:
+      RotationY    : Rotation about the y axis through theta.  Returns R, Rinv
+      BeamDir      : Beam position and direction at s.  Returns
+                     R, Rinv, [x, y, z], theta as the BeamDir methods of the
+                     event-instance classes
+      BeamDirArray : BeamDir for a numpy array of s.  Returns (x, y, z), theta
+      ringPosition : Beam position and direction in the ring at s_ring (float
+                     or numpy array), taken mod Circumference.  Returns
+                     x, z, theta
+
+Created on Sun 18Oct26: Version history:
+----------------------------------------------
+ 1.1: 18Oct26: Ring positions from the section table (ringPosition)
+ 1.0: 18Oct26: First implementation
+
+@author: PaulKyberd
+"""
+
+import math
+import bisect
+import numpy as np
+
+class nuSTORMGeometry:
+
+#--------  "Built-in methods":
+    def __init__(self, nuSTRMCnst, nuStrt=None):
+
+        self._TrfLineCmplxLen = float(nuSTRMCnst.TrfLineCmplxLen())
+        self._TrfLineCmplxAng = float(nuSTRMCnst.TrfLineCmplxAng())*math.pi/180.
+        self._ProdStrghtLen   = float(nuSTRMCnst.ProdStrghtLen())
+        self._Circumference   = float(nuSTRMCnst.Circumference())
+        self._ArcLen          = float(nuSTRMCnst.ArcLen())
+        self._ArcRad          = self._ArcLen/math.pi
+
+        PS  = self._ProdStrghtLen
+        Arc = self._ArcLen
+        self._SectionBounds = np.array([0., PS, PS+Arc, 2.*PS+Arc, 2.*PS+2.*Arc])
+        self._SectionBounds.flags.writeable = False
+
+        ArcRad = self._ArcRad
+        self._SectionTable = np.array([
+            (0.,          0.,        0., 0.,      0.,  1., 0.),
+            (PS,          0.,        PS, 0.,      0.,  1., 1./ArcRad),
+            (PS+Arc,      2.*ArcRad, PS, math.pi, 0., -1., 0.),
+            (2.*PS+Arc,   2.*ArcRad, 0., math.pi, 0., -1., 1./ArcRad)],
+            dtype=[("start", "f8"), ("x", "f8"), ("z", "f8"), ("theta", "f8"),
+                   ("sinTheta", "f8"), ("cosTheta", "f8"), ("curvature", "f8")])
+        self._SectionTable.flags.writeable = False
+        self._SectionRows   = self._SectionTable.tolist()
+        self._SectionStarts = [row[0] for row in self._SectionRows]
+
+        self._RSection = {"tl" : self.RotationY(self._TrfLineCmplxAng),
+                          "ps" : self.RotationY(0.),
+                          "rs" : self.RotationY(math.pi)}
+        for R, Rinv in self._RSection.values():
+            R.flags.writeable    = False
+            Rinv.flags.writeable = False
+
+        self._nuStrt = nuStrt
+
+        self._frozen = True
+
+        return
+
+    def __setattr__(self, name, value):
+        if getattr(self, "_frozen", False):
+            raise AttributeError("nuSTORMGeometry is frozen, cannot set " + name)
+        object.__setattr__(self, name, value)
+
+    def __repr__(self):
+        return "nuSTORMGeometry(nuSTRMCnst, nuStrt)"
+
+    def __str__(self):
+        return "nuSTORMGeometry: transfer line complex length=%g m, angle=%g rad, \n" \
+               "    production straight length=%g m, circumference=%g m, arc length=%g m, arc radius=%g m" % \
+               (self._TrfLineCmplxLen, self._TrfLineCmplxAng, self._ProdStrghtLen, \
+                self._Circumference, self._ArcLen, self._ArcRad)
+
+#--------  "Get methods" only
+    def TrfLineCmplxLen(self):
+        return self._TrfLineCmplxLen
+
+    def TrfLineCmplxAng(self):
+        return self._TrfLineCmplxAng
+
+    def ProdStrghtLen(self):
+        return self._ProdStrghtLen
+
+    def Circumference(self):
+        return self._Circumference
+
+    def ArcLen(self):
+        return self._ArcLen
+
+    def ArcRad(self):
+        return self._ArcRad
+
+    def SectionBounds(self):
+        return self._SectionBounds
+
+    def SectionTable(self):
+        return self._SectionTable
+
+    def prdStrght(self):
+        return self._nuStrt
+
+#--------  Geometry methods
+#.. R = rotation with respect to y axis through theta angle
+    @staticmethod
+    def RotationY(theta):
+        c = math.cos(theta)
+        s = math.sin(theta)
+        R    = np.array([[ c, 0., s], [0., 1., 0.], [-s, 0., c]])
+        Rinv = np.array([[ c, 0.,-s], [0., 1., 0.], [ s, 0., c]])
+        return R, Rinv
+
+    def BeamDir(self, s):
+        s_ring = s - self._TrfLineCmplxLen
+        if (s_ring <= 0.):
+            where = s_ring
+        else:
+            where = s_ring%self._Circumference
+
+        if (0. >= where):
+            theta   = self._TrfLineCmplxAng
+            BeamPos = [-math.sin(theta)*where, 0., math.cos(theta)*where]
+            R, Rinv = self._RSection["tl"]
+        else:
+            iSec = bisect.bisect_left(self._SectionStarts, where) - 1
+            start, x0, z0, theta0, sin0, cos0, k = self._SectionRows[iSec]
+            d = where - start
+            if (k == 0.):
+                theta   = theta0
+                BeamPos = [x0 + d*sin0, 0., z0 + d*cos0]
+                R, Rinv = self._RSection["ps" if iSec == 0 else "rs"]
+            else:
+                theta   = theta0 + k*d
+                BeamPos = [x0 + (cos0 - math.cos(theta))/k, 0., z0 + (math.sin(theta) - sin0)/k]
+                R, Rinv = self.RotationY(theta)
+
+        return R, Rinv, BeamPos, theta
+
+    def BeamDirArray(self, s):
+        s_ring = s - self._TrfLineCmplxLen
+        where  = np.where(s_ring <= 0., s_ring, np.mod(s_ring, self._Circumference))
+        tl     = where <= 0.
+
+        x, z, theta = self.ringPosition(where)
+        y = np.zeros(len(s))
+
+        theta[tl] = self._TrfLineCmplxAng
+        z[tl]     = math.cos(self._TrfLineCmplxAng)*where[tl]
+        x[tl]     = -math.sin(self._TrfLineCmplxAng)*where[tl]
+
+        return (x, y, z), theta
+
+#.. section of each where from the section bounds, then the position along the section
+    def ringPosition(self, s_ring):
+        where = np.mod(np.asarray(s_ring, dtype=float), self._Circumference)
+        iSec  = np.clip(np.searchsorted(self._SectionBounds, where, side="left") - 1, 0, 3)
+        sec   = self._SectionTable[iSec]
+
+        d      = where - sec["start"]
+        theta  = sec["theta"] + sec["curvature"]*d
+        curved = sec["curvature"] != 0.
+        k      = np.where(curved, sec["curvature"], 1.)
+        x = sec["x"] + np.where(curved, (sec["cosTheta"] - np.cos(theta))/k, d*sec["sinTheta"])
+        z = sec["z"] + np.where(curved, (np.sin(theta) - sec["sinTheta"])/k, d*sec["cosTheta"])
+
+        return x, z, theta
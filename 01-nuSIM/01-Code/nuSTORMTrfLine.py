@@ -100,6 +100,8 @@ Class nuSTORMTrfLine:
 
 Created on Mo 01Nov21. Version history:
 ----------------------------------------
+ 1.1: 18Oct26: GenerateDcyTime takes its random number from Simulation.getRandom
+               (the run RandomStream) rather than the numpy global generator.
  1.0: 01Nov21: First implementation
 
 @author: MarvinPfaff
@@ -175,7 +177,7 @@ class nuSTORMTrfLine(object):
         return x, y, xp, yp
 
     def GenerateDcyTime(self,gamma):
-        t = np.random.exponential(scale=gamma*self.__piLifetime)
+        t = -np.log(1. - Simu.getRandom())*gamma*self.__piLifetime
         return t
 
     def Calculatet(self,s,s_final,t_i,v):
@@ -55,6 +55,9 @@ Class nuSTORMTrfLineCmplx:
                      Uniform distribution generated over bunch length, with certain bunch
                      spacing between bunches. Overall duration is defined as extraction
                      length.
+      GenerateTimes: GenerateTime for n particles, returns an array (s).  Optional
+                     argument rng -- numpy Generator
+      TimeDistribution: PionTimeDistribution of the bunch structure, built once
       GenerateTrans: Generate transverse phase space (x, y, xp, yp) given
                      representative emittance and beta.  Parabolic distributions
                      generated.
@@ -106,6 +109,12 @@ Class nuSTORMTrfLineCmplx:
 
 Created on Mo 01Nov21. Version history:
 ----------------------------------------
+ 1.4: 18Oct26: Build the PionTimeDistribution once and keep it (TimeDistribution);
+               add GenerateTimes for arrays of times.
+ 1.3: 18Oct26: GenerateDcyTime takes its random number from Simulation.getRandom
+               (the run RandomStream) rather than the numpy global generator.
+ 1.2: 18Oct26: Drop the unused eventHistory import; the instance is passed in
+               so the module no longer pulls in ROOT.
  1.1: 22Nov21: Update to accommodate multiple bunches by importing PionTimeDistribution class,
                generating bunch structure over certain extraction length.
  1.0: 01Nov21: First implementation
@@ -124,7 +133,6 @@ import PionEventInstance as PionEventInstance
 import PionTimeDistribution as PionTimeDistribution
 import particle as particle
 import Simulation as Simu
-import eventHistory as eventHistory
 
 piCnst = PionConst.PionConst()
 muCnst = MuonConst.MuonConst()
@@ -173,9 +181,17 @@ class nuSTORMTrfLineCmplx(object):
         return p
 
     def GenerateTime(self):
-        ptd= PionTimeDistribution.PionTimeDistribution(self._delT0,self._delT1,self._delT2)
-        t = ptd.GenerateTime()
-        return t
+        return self.TimeDistribution().GenerateTime()
+
+    def GenerateTimes(self, n, rng=None):
+        return self.TimeDistribution().GenerateTimes(n, rng)
+
+#.. the bunch time sampler is built once, on first use, and kept by the singleton
+    def TimeDistribution(self):
+        cls = type(self)
+        if getattr(cls, "_ptd", None) is None:
+            cls._ptd = PionTimeDistribution.PionTimeDistribution(self._delT0,self._delT1,self._delT2)
+        return cls._ptd
 
     def GenerateTrans(self,s):
         r  = np.sqrt(self._epsilon*self._beta) / 1000.
@@ -187,7 +203,7 @@ class nuSTORMTrfLineCmplx(object):
         return x, y, xp, yp
 
     def GenerateDcyTime(self,gamma):
-        t = np.random.exponential(scale=gamma*self.__piLifetime)
+        t = -np.log(1. - Simu.getRandom())*gamma*self.__piLifetime
         return t
 
     def Calculatet(self,s,s_final,t_i,v):
@@ -10,12 +10,15 @@ Class pion:
 
   --np       : numpy class
       
-  Instance attributes:
+  Instance attributes (held in __slots__ as plain floats and ints):
   --------------------
-  _TrcSpcCrd: Trace space (s, x, y, z, x', y') in numpy array - what are s and z?
+  _s, _x, _y, _z, _xp, _yp: Trace space (s, x, y, z, x', y')
   _t        : time in nanoseconds
-  _p        : Pion 4 momentum: (E, array(px, py, pz)), GeV
-  _weight   : not sure how to define
+  _E, _px, _py, _pz: 4 momentum, GeV
+  _mass     : mass, GeV
+  _lifetime : lifetime, s
+  _eventWeight: event weight
+  _runNum, _eventNum: run and event number
   _PDG      : PDG code - so we track particle v anti-particle and any new stuff
     
   Methods:
@@ -26,11 +29,17 @@ Class pion:
       __str__  : Dump of values of decay
 
   Get/set methods:
-  
+      run, event, pdgCode, t, weight, mass, s, x, y, z, xp, yp, E, px, py, pz:
+                   return the value; plain numbers, no copy is made
+      p          : 4 momentum as [E, array(px, py, pz)], built on each call
+      traceSpace : traceSpace instance, built on each call
+
   General methods:
 
 Created on Tue 29Aug21;21:35: Version history:
 ----------------------------------------------
+ 2.2: 18Oct26: Hold the particle in __slots__ as plain floats; accessors
+               return the values without deepcopy; add E, px, py, pz
  2.1: 12Nov21: Add a 'none' particle to help with the eventHistory
  2.0: 24Sep21: Unify all the particles and just distinguish with a pdg code
  1.1: 21Sep21: Add a constructor with the momentum vector
@@ -41,7 +50,6 @@ Created on Tue 29Aug21;21:35: Version history:
 
 import math, sys
 import numpy as np
-from copy import deepcopy
 import traceSpace
 import MuonConst as mC
 import PionConst as piC
@@ -50,6 +58,9 @@ muCnst  = mC.MuonConst()
 piCnst  = piC.PionConst()
     
 class particle:
+    __slots__ = ("_runNum", "_eventNum", "_PDG", "_mass", "_lifetime", "_E", "_px", "_py", "_pz",
+                 "_s", "_x", "_y", "_z", "_xp", "_yp", "_t", "_eventWeight")
+
     __Debug  = False
     
 #--------  "Built-in methods":
@@ -79,10 +90,16 @@ class particle:
             else:
                 sys.exit("Unrecognised particle type variable ")
  # fill variables
-            p = np.array([px, py, pz])
-            E = math.sqrt(px*px + py*py + pz*pz + self._mass*self._mass)
-            self._p = np.array([E, p],dtype=object)
-            self._TrcSpc = traceSpace.traceSpace(s, x, y, z, px/pz, py/pz)
+            self._E = math.sqrt(px*px + py*py + pz*pz + self._mass*self._mass)
+            self._px = px
+            self._py = py
+            self._pz = pz
+            self._s = s
+            self._x = x
+            self._y = y
+            self._z = z
+            self._xp = px/pz
+            self._yp = py/pz
             self._t = t
             self._eventWeight = eventWeight
             self._runNum = runNum
@@ -108,8 +125,16 @@ class particle:
                 sys.exit("Unrecognised particle type variable ")
 
 # fill variables
-            self._p = p
-            self._TrcSpc = traceSpace.traceSpace(s, x, y, z, p[1][0]/p[1][2], p[1][1]/p[1][2])
+            self._E = p[0]
+            self._px = p[1][0]
+            self._py = p[1][1]
+            self._pz = p[1][2]
+            self._s = s
+            self._x = x
+            self._y = y
+            self._z = z
+            self._xp = p[1][0]/p[1][2]
+            self._yp = p[1][1]/p[1][2]
             self._t = t
             self._eventWeight = eventWeight
             self._runNum = runNum
@@ -205,8 +230,8 @@ class particle:
     def __str__(self):
         return "particle: E (GeV) = %g, p (GeV) = (%g  %g  %g),  mass = %g, t = %g, s = %g,\n x = %g, y = %g, z = %g, x' = %g, y' = %g, \
 eventweight = %g, run = %g, event = %g, PDG=%g" % \
-                  (self._p[0], self._p[1][0],  self._p[1][1], self._p[1][2],self._mass, self._t, self._TrcSpc.s(), self._TrcSpc.x(), 
-                    self._TrcSpc.y(), self._TrcSpc.z(), self._TrcSpc.xp() ,self._TrcSpc.yp(), self._eventWeight, self._runNum, self._eventNum, self._PDG )
+                  (self._E, self._px,  self._py, self._pz,self._mass, self._t, self._s, self._x, 
+                    self._y, self._z, self._xp ,self._yp, self._eventWeight, self._runNum, self._eventNum, self._PDG )
 
 # Override the __eq__ method
     def __eq__(self, comp):
@@ -215,29 +240,29 @@ eventweight = %g, run = %g, event = %g, PDG=%g" % \
         equals = True
         n = 0
         if isinstance(comp, self.__class__):
-            if (abs(self._p[0] - comp._p[0]) > delta):
+            if (abs(self._E - comp._E) > delta):
                 equals = False
-            if (abs(self._p[1][0] - comp._p[1][0]) > delta):
+            if (abs(self._px - comp._px) > delta):
                 equals = False
-            if (abs(self._p[1][1] - comp._p[1][1]) > delta):
+            if (abs(self._py - comp._py) > delta):
                 equals = False
-            if (abs(self._p[1][2] - comp._p[1][2]) > delta):
+            if (abs(self._pz - comp._pz) > delta):
                 equals = False
             if (abs(self._mass - comp._mass) > delta):
                 equals = False
             if (abs(self._t - comp._t) > delta):
                 equals = False
-            if (abs(self._TrcSpc.s() - comp._TrcSpc.s()) > delta):
+            if (abs(self._s - comp._s) > delta):
                 equals = False
-            if (abs(self._TrcSpc.x() - comp._TrcSpc.x()) > delta):
+            if (abs(self._x - comp._x) > delta):
                 equals = False
-            if (abs(self._TrcSpc.y() - comp._TrcSpc.y()) > delta):
+            if (abs(self._y - comp._y) > delta):
                 equals = False
-            if (abs(self._TrcSpc.z() - comp._TrcSpc.z()) > delta):
+            if (abs(self._z - comp._z) > delta):
                 equals = False
-            if (abs(self._TrcSpc.xp() - comp._TrcSpc.xp()) > delta):
+            if (abs(self._xp - comp._xp) > delta):
                 equals = False
-            if (abs(self._TrcSpc.yp() - comp._TrcSpc.yp()) > delta):
+            if (abs(self._yp - comp._yp) > delta):
                 equals = False
             if (abs(self._eventWeight - comp._eventWeight) >delta):
                 equals = False
@@ -260,43 +285,55 @@ eventweight = %g, run = %g, event = %g, PDG=%g" % \
     
 #--------  get/set methods:
     def run(self):
-        return deepcopy(self._runNum)
+        return self._runNum
 
     def event(self):
-        return deepcopy(self._eventNum)
+        return self._eventNum
 
     def pdgCode(self):
-        return deepcopy(self._PDG)
+        return self._PDG
 
     def p(self):
-        return deepcopy(self._p)
+        return [self._E, np.array([self._px, self._py, self._pz])]
 
     def traceSpace(self):
-        return deepcopy(self._TrcSpc)
+        return traceSpace.traceSpace(self._s, self._x, self._y, self._z, self._xp, self._yp)
 
     def t(self):
-        return deepcopy(self._t)
+        return self._t
 
     def weight(self):
-        return deepcopy(self._eventWeight)
+        return self._eventWeight
 
     def mass(self):
-        return deepcopy(self._mass)
+        return self._mass
 
     def s(self):
-        return deepcopy(self._TrcSpc.s())
+        return self._s
 
     def x(self):
-        return deepcopy(self._TrcSpc.x())
+        return self._x
 
     def y(self):
-        return deepcopy(self._TrcSpc.y())
+        return self._y
 
     def z(self):
-        return deepcopy(self._TrcSpc.z())
+        return self._z
 
     def xp(self):
-        return deepcopy(self._TrcSpc.xp())
+        return self._xp
 
     def yp(self):
-        return deepcopy(self._TrcSpc.yp())
+        return self._yp
+
+    def E(self):
+        return self._E
+
+    def px(self):
+        return self._px
+
+    def py(self):
+        return self._py
+
+    def pz(self):
+        return self._pz
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Class ringAcceptance:
+=====================
+
+  Acceptance of the nuSTORM ring for muons produced in the transfer line
+  and the production straight, as applied by
+  NeutrinoEventInstance.Absorption:
+
+    - transverse acceptance: an ellipse in (x, x') and the rounded
+      triangle f(y, y') < 1 in the scaled (y, y') plane;
+    - dynamic (momentum) acceptance: the emittances in x and y at the
+      quadrupole must not exceed epsilon(|p - p0|/p0), flat at
+      epsilon_max up to epsilon_kink then falling linearly to zero at
+      muAcc.  No dynamic cut is made for a central momentum p0 of zero.
+
+  The constants of the triangle and of epsilon(dp) depend only on muAcc
+  and the central muon momentum, so they are computed once, when the
+  instance is created.  accepted/absorbed take arrays of muons and return
+  boolean masks; isAbsorbed is the one-muon form used by
+  NeutrinoEventInstance.
+
+  Dependencies:
+   - numpy
+
+  Class attributes:
+  -----------------
+  __n          : power of the rounding of the triangle
+  __epsMax     : maximum emittance (m)
+  __betaSept   : beta at the septum (m)
+  __DSept      : dispersion at the septum (m)
+  __betaXQuad  : beta_x at the quadrupole (m)
+  __betaYQuad  : beta_y at the quadrupole (m)
+
+  Instance attributes:
+  --------------------
+  _muAcc       : momentum acceptance of the ring (fraction of p0)
+  _mup0        : central muon momentum (GeV)
+  _cosK, _sinK : cos and sin of the three angles 2 pi i/3 of the triangle
+  _epsKink     : momentum spread at which the dynamic acceptance starts to fall
+  _a, _eps0    : slope and intercept of the falling part, epsilon = eps0 - a*dp
+
+  Methods:
+  --------
+  Built-in methods __init__, __repr__ and __str__.
+      __init__ : Takes muAcc and the central muon momentum
+      __repr__ : One liner with call.
+      __str__  : Dump of the constants
+
+  Get/set methods:
+      muAcc, mup0, epsKink
+
+  General methods:
+      epsilon(dp)      : dynamic acceptance (m) for the momentum spreads dp
+      triangle(y, yp)  : rounded triangle function of the scaled y, y'
+      accepted(x, y, px, py, pz) : mask of the muons inside the acceptance;
+                         (x, y) position (m), (px, py, pz) momentum (GeV)
+      absorbed(x, y, px, py, pz) : not accepted
+      isAbsorbed(x, y, px, py, pz): absorbed for one muon, returns a bool
+
+Created on Sun 18Oct26: Version history:
+----------------------------------------------
+ 1.0: 18Oct26: First implementation, from NeutrinoEventInstance.Absorption
+
+@author: PaulKyberd
+"""
+
+import math
+import numpy as np
+
+class ringAcceptance:
+
+    __n         = 4.8
+    __epsMax    = 0.001
+    __betaSept  = 8.03
+    __DSept     = 1.36
+    __betaXQuad = 19.98
+    __betaYQuad = 22.96
+
+#--------  "Built-in methods":
+    def __init__(self, muAcc, mup0):
+        self._muAcc = muAcc
+        self._mup0  = mup0
+
+        k = np.array([2*math.pi*i/3 for i in (1, 2, 3)])
+        self._cosK = np.cos(k)
+        self._sinK = np.sin(k)
+
+        self._epsKink = muAcc - math.sqrt(ringAcceptance.__epsMax*ringAcceptance.__betaSept)/ringAcceptance.__DSept
+        self._a       = ringAcceptance.__epsMax/(muAcc - self._epsKink)
+        self._eps0    = self._a*muAcc
+
+        return
+
+    def __repr__(self):
+        return "ringAcceptance(muAcc, mup0)"
+
+    def __str__(self):
+        return "ringAcceptance: muAcc = %g, p0 = %g GeV, epsilon_kink = %g, epsilon = %g - %g*dp above the kink" % \
+               (self._muAcc, self._mup0, self._epsKink, self._eps0, self._a)
+
+#--------  "Get methods" only
+    def muAcc(self):
+        return self._muAcc
+
+    def mup0(self):
+        return self._mup0
+
+    def epsKink(self):
+        return self._epsKink
+
+#--------  General methods
+    def epsilon(self, dp):
+        dp = np.asarray(dp, dtype=float)
+        flat    = np.logical_and(dp >= 0., dp < self._epsKink)
+        falling = np.logical_and(dp >= self._epsKink, dp <= self._muAcc)
+        return np.where(flat, ringAcceptance.__epsMax, np.where(falling, self._eps0 - self._a*dp, 0.))
+
+    def triangle(self, y, yp):
+        y  = np.asarray(y, dtype=float)[..., np.newaxis]
+        yp = np.asarray(yp, dtype=float)[..., np.newaxis]
+        return 0.1*np.sum(np.abs(-y*self._cosK - yp*self._sinK - 1./3.)**ringAcceptance.__n, axis=-1)
+
+    def accepted(self, x, y, px, py, pz):
+        x  = np.asarray(x, dtype=float)
+        y  = np.asarray(y, dtype=float)
+        px = np.asarray(px, dtype=float)
+        py = np.asarray(py, dtype=float)
+        pz = np.asarray(pz, dtype=float)
+        xp = px/pz
+        yp = py/pz
+
+        transverse = np.logical_and(x*x/(0.05*0.05) + xp*xp/(0.004*0.004) < 1.,
+                                    self.triangle(y*2.5/0.15, yp*2./0.006) < 1.0)
+        if self._mup0 == 0.:
+            return transverse
+
+        eps = self.epsilon(np.abs(np.sqrt(px*px + py*py + pz*pz) - self._mup0)/self._mup0)
+        bX = ringAcceptance.__betaXQuad
+        bY = ringAcceptance.__betaYQuad
+        dynamic = np.logical_and(x*x/bX + bX*xp*xp <= eps, y*y/bY + bY*yp*yp <= eps)
+        return np.logical_and(transverse, dynamic)
+
+    def absorbed(self, x, y, px, py, pz):
+        return np.logical_not(self.accepted(x, y, px, py, pz))
+
+    def isAbsorbed(self, x, y, px, py, pz):
+        return bool(self.absorbed(x, y, px, py, pz))
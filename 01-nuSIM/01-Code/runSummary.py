@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Class runSummary:
+=================
+
+  Summary of a run, kept while the events are generated and written to
+  the output file next to the event history as the one entry TTree
+  "runSummary", so the normalisation of a run is known without reading
+  the history again.  It holds:
+      - the numbers of events generated in each decay category (pion
+        decays in the transfer line, in the production straight, beyond
+        the production straight, muon decays) and of absorbed muons
+      - the summed eventWeight per detector location and flavour
+      - the wall-clock time of each stage of the run and events/second
+      - any further counts given with setCounts (e.g. the skim counts)
+  Everything but the rate is a sum, so the summaries of many runs (or of
+  the shards of a run) merge by adding them up; the rate is recomputed
+  from the summed events and times, so for merged runs it is the mean
+  rate of one process.
+
+  The summary is written as a flat dictionary of numbers (values):
+      nEvents, <category>Count, ...          : counts
+      sumW_<location>_<flavour>              : summed weights
+      time_<stage>                           : wall-clock seconds
+      eventsPerSecond                        : nEvents / summed stage times
+      runNumber                              : run number (not summed)
+  and fromValues rebuilds the summary from such a dictionary.
+
+  Dependencies:
+   - numpy, time, fluxAccumulator (flavours), ParticleBlock; ROOT for
+     readSummary and sumSummaries only
+
+  Instance attributes:
+  --------------------
+  _runNumber : run number
+  _locations : detector locations whose weights are summed
+  _counts    : {name: count}, nEvents and the decay categories first
+  _sumW      : {(location, flavour): summed eventWeight}
+  _time      : {stage: wall-clock seconds}
+  _start     : {stage: time.perf_counter() at start} of the running stages
+
+  Methods:
+  --------
+  Built-in methods __init__, __repr__ and __str__.
+      __init__ : Optional run number and detector locations (default
+                 numuDetector, nueDetector, numuRSD, nueRSD)
+      __repr__ : One liner with call.
+      __str__  : Dump of the counts, weights and times
+
+  Get/set methods:
+      runNumber()                    : run number
+      nEvents()                      : number of events generated
+      count(name)                    : a count, 0 if not set
+      setCounts(counts)              : sets counts from a dictionary, e.g.
+                                       eventSkim.summary()
+      setCategories(generator)       : sets the decay category and absorbed
+                                       counts from the get methods of an
+                                       eventBatch (or normalisation) instance
+      sumWeights(location, flavour)  : summed eventWeight
+      time(stage)                    : wall-clock seconds of a stage
+      eventsPerSecond()              : nEvents / summed stage times
+      values()                       : flat dictionary, as written
+
+  General methods:
+      start(stage), stop(stage) : time a stage; repeated start/stop pairs
+                                  add up
+      fill(history)   : counts the events and sums the detector weights of
+                        a batch, a dictionary of record arrays (or
+                        ParticleBlocks) keyed by location
+      fillEvent(eH)   : as fill for the event held by the eventHistory eH
+      merge(other)    : adds another summary
+
+  Module methods:
+  ---------------
+      fromValues(values)        : runSummary from the dictionary of values
+      readSummary(fileName, treeName="runSummary"): runSummary from the
+                                  summary tree of a file, None if absent
+      sumSummaries(fileNames, treeName="runSummary"): the summaries of the
+                                  files merged
+
+  Module attributes:
+  ------------------
+  categories : the decay category counts, as named by the eventBatch get
+               methods
+
+Created on Sun 18Oct26: Version history:
+----------------------------------------------
+ 1.0: 18Oct26: First implementation
+
+@author: PaulKyberd
+"""
+
+import time
+import numpy as np
+import fluxAccumulator as fluxAccumulator
+import ParticleBlock as ParticleBlock
+
+categories = ["tlDcyCount", "PSDcyCount", "byndPSCount", "muDcyCount", "absorbedCount"]
+
+class runSummary:
+
+#--------  "Built-in methods":
+    def __init__(self, runNumber=0, locations=None):
+        self._runNumber = runNumber
+        self._locations = ["numuDetector", "nueDetector", "numuRSD", "nueRSD"] if locations is None else list(locations)
+        self._counts = {"nEvents": 0}
+        for name in categories:
+            self._counts[name] = 0
+        self._sumW  = {}
+        for location in self._locations:
+            for flavour in fluxAccumulator.flavours.values():
+                self._sumW[(location, flavour)] = 0.0
+        self._time  = {}
+        self._start = {}
+
+        return
+
+    def __repr__(self):
+        return "runSummary(runNumber, locations)"
+
+    def __str__(self):
+        lines = ["runSummary: run %i, %i events, %g s, %g events/s" % \
+                 (self._runNumber, self.nEvents(), sum(self._time.values()), self.eventsPerSecond())]
+        lines.append("    counts: " + ", ".join("%s %i" % (name, n) for name, n in self._counts.items()))
+        for (location, flavour), sumW in self._sumW.items():
+            if sumW != 0.:
+                lines.append("    %s %s: weight %g" % (location, flavour, sumW))
+        lines.append("    times: " + ", ".join("%s %.3f s" % (stage, t) for stage, t in self._time.items()))
+        return "\n".join(lines)
+
+#--------  "Get/set methods"
+    def runNumber(self):
+        return self._runNumber
+
+    def nEvents(self):
+        return self._counts["nEvents"]
+
+    def count(self, name):
+        return self._counts.get(name, 0)
+
+    def setCounts(self, counts):
+        for name, n in counts.items():
+            self._counts[name] = int(n)
+
+    def setCategories(self, generator):
+        for name in categories:
+            self._counts[name] = int(getattr(generator, name)())
+
+    def sumWeights(self, location, flavour):
+        return self._sumW.get((location, flavour), 0.0)
+
+    def time(self, stage):
+        return self._time.get(stage, 0.0)
+
+    def eventsPerSecond(self):
+        total = sum(self._time.values())
+        if total <= 0.:
+            return 0.0
+        return self.nEvents()/total
+
+    def values(self):
+        values = {"runNumber": self._runNumber}
+        values.update(self._counts)
+        for (location, flavour), sumW in self._sumW.items():
+            values["sumW_" + location + "_" + flavour] = sumW
+        for stage, t in self._time.items():
+            values["time_" + stage] = t
+        values["eventsPerSecond"] = self.eventsPerSecond()
+        return values
+
+#--------  Timing
+    def start(self, stage):
+        self._start[stage] = time.perf_counter()
+
+    def stop(self, stage):
+        self._time[stage] = self._time.get(stage, 0.0) + time.perf_counter() - self._start.pop(stage)
+
+#--------  Accumulation
+    def fill(self, history):
+        for location in self._locations:
+            rec = history[location]
+            if isinstance(rec, ParticleBlock.ParticleBlock):
+                rec = rec.records()
+            weight = rec["eventWeight"].astype(float)
+            for pdgCode, flavour in fluxAccumulator.flavours.items():
+                mask = np.logical_and(rec["pdgCode"] == pdgCode, weight > 0.)
+                self._sumW[(location, flavour)] = self._sumW[(location, flavour)] + float(weight[mask].sum())
+        self._counts["nEvents"] = self._counts["nEvents"] + len(history[next(iter(history))])
+
+    def fillEvent(self, eH):
+        for location in self._locations:
+            par = eH.findParticle(location)
+            flavour = fluxAccumulator.flavours.get(par.pdgCode())
+            if (flavour is not None) and (par.weight() > 0.):
+                self._sumW[(location, flavour)] = self._sumW[(location, flavour)] + par.weight()
+        self._counts["nEvents"] = self._counts["nEvents"] + 1
+
+    def merge(self, other):
+        for name, n in other._counts.items():
+            self._counts[name] = self._counts.get(name, 0) + n
+        for key, sumW in other._sumW.items():
+            self._sumW[key] = self._sumW.get(key, 0.0) + sumW
+        for stage, t in other._time.items():
+            self._time[stage] = self._time.get(stage, 0.0) + t
+
+def fromValues(values):
+    summary = runSummary(int(values.get("runNumber", 0)), locations=[])
+    for name, value in values.items():
+        if (name == "runNumber") or (name == "eventsPerSecond"):
+            continue
+        if name.startswith("sumW_"):
+            location, flavour = name[len("sumW_"):].split("_")
+            summary._sumW[(location, flavour)] = float(value)
+        elif name.startswith("time_"):
+            summary._time[name[len("time_"):]] = float(value)
+        else:
+            summary._counts[name] = int(round(value))
+    summary._locations = sorted(set(location for location, flavour in summary._sumW))
+    return summary
+
+def readSummary(fileName, treeName="runSummary"):
+    import ROOT
+    inFile = ROOT.TFile(fileName, "READ")
+    tree = inFile.Get(treeName)
+    summary = None
+    if tree:
+        tree.GetEntry(0)
+        summary = fromValues({branch.GetName(): getattr(tree, branch.GetName()) for branch in tree.GetListOfBranches()})
+    inFile.Close()
+    return summary
+
+def sumSummaries(fileNames, treeName="runSummary"):
+    total = None
+    for fileName in fileNames:
+        summary = readSummary(fileName, treeName)
+        if summary is None:
+            continue
+        if total is None:
+            total = summary
+        else:
+            total.merge(summary)
+    return total
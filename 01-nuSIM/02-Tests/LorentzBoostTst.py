@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test script for LorentzBoost module
+===================================
+
+  Assumes that nuSim code is in python path.
+
+  Script checks the boost against the explicit formula for a boost along z,
+  the invariance of the mass, the inverse boost, and that a batch boost
+  gives the same result as boosting the 4-vectors one at a time.
+
+Version history:
+----------------------------------------------
+ 1.0: 18Oct26: First version
+
+"""
+
+import sys
+import numpy as np
+import LorentzBoost as LB
+
+##! Start:
+
+nTests = 0
+testFails = 0
+descriptions=[]
+testStatus=[]
+testTitle = "LorentzBoost"
+
+print("========  ", testTitle, ": tests start  ========")
+
+rng = np.random.default_rng(99)
+nVec = 100000
+m = 0.105658
+p3 = rng.normal(0., 0.05, (nVec, 3))
+P = np.empty((nVec, 4))
+P[:, 0]  = np.sqrt(m**2 + np.sum(p3**2, axis=1))
+P[:, 1:] = p3
+b = rng.normal(0., 1., (nVec, 3))
+b = b*(0.999*rng.random(nVec)/np.linalg.norm(b, axis=1))[:, np.newaxis]
+
+##! Boost along z ############################################################################################
+descString = "Boost along z against gamma(E + beta pz), gamma(pz + beta E)"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+beta = 0.8
+gamma = 1./np.sqrt(1. - beta**2)
+Pz = LB.Boost(P, np.array([0., 0., beta]))
+if (np.abs(Pz[:, 0] - gamma*(P[:, 0] + beta*P[:, 3])).max() > 1E-12) or \
+   (np.abs(Pz[:, 3] - gamma*(P[:, 3] + beta*P[:, 0])).max() > 1E-12) or \
+   (np.abs(Pz[:, 1:3] - P[:, 1:3]).max() > 0.):
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+nTests = nTests + 1
+
+##! Mass invariant and inverse boost #########################################################################
+descString = "Mass invariant; boost by -b undoes boost by b"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+Pb = LB.Boost(P, b)
+mb = np.sqrt(np.abs(Pb[:, 0]**2 - np.sum(Pb[:, 1:]**2, axis=1)))
+Pback = LB.Boost(Pb, -b)
+if (np.abs(mb - m).max() > 1E-6) or (np.abs(Pback - P).max() > 1E-9):
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed", np.abs(mb - m).max(), np.abs(Pback - P).max())
+nTests = nTests + 1
+
+##! Batch against one at a time ##############################################################################
+descString = "Batch boost equals boosting 4-vectors singly; BoostVector"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+failed = False
+for i in range(100):
+    if np.abs(LB.Boost(P[i], b[i]) - Pb[i]).max() > 1E-15:
+        failed = True
+Ppi = np.array([8.0, 0.5, 0.0, np.sqrt(8.0**2 - 0.5**2 - 0.13957**2)])
+if np.abs(LB.Boost(np.array([0.13957, 0., 0., 0.]), LB.BoostVector(Ppi)) - Ppi).max() > 1E-10:
+    failed = True
+if failed:
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+nTests = nTests + 1
+
+##! Rotations ################################################################################################
+descString = "Rotations orthogonal, preserve energy and |p|, list conversions"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+phi = rng.random(nVec)*2.*np.pi
+theta = rng.random(nVec)*np.pi
+R = np.matmul(LB.RotationZ(phi), LB.RotationY(theta))
+Pr = LB.Rotate(P, R)
+RRt = np.matmul(R, np.transpose(R, (0, 2, 1)))
+failed = np.abs(RRt - np.eye(3)).max() > 1E-12
+failed = failed or (np.abs(Pr[:, 0] - P[:, 0]).max() > 0.)
+failed = failed or (np.abs(np.linalg.norm(Pr[:, 1:], axis=1) - np.linalg.norm(P[:, 1:], axis=1)).max() > 1E-12)
+ez = LB.Rotate(np.array([1., 0., 0., 1.]), LB.RotationY(np.pi/2.))
+failed = failed or (np.abs(ez - np.array([1., 1., 0., 0.])).max() > 1E-12)
+v = LB.from4Vector(P[0])
+failed = failed or (np.abs(LB.to4Vector(v) - P[0]).max() > 0.)
+if failed:
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+nTests = nTests + 1
+
+##! Complete:
+print()
+print("========  LorentzBoost:tests complete  ========")
+print ("\nNumber of tests is ", nTests, " number of fails is ", testFails)
+if testFails == 0:
+    sys.exit(0)
+else:
+    sys.exit(1)
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test script for MuonDecayBatch class
+====================================
+
+  Assumes that nuSim code is in python path.
+
+  Script checks conservation laws and the energy spectra of a large batch of
+  decays, compares with the event-by-event MuonDecay class and reports the
+  time taken by each.
+
+Version history:
+----------------------------------------------
+ 1.0: 18Oct26: First version
+
+"""
+
+import sys
+import time
+import numpy as np
+import MuonConst as muCnst
+import MuonDecay as md
+import MuonDecayBatch as mdb
+
+##! Start:
+
+nTests = 0
+testFails = 0
+descriptions=[]
+testStatus=[]
+testTitle = "MuonDecayBatch"
+
+print("========  ", testTitle, ": tests start  ========")
+
+mc = muCnst.MuonConst()
+mo2 = mc.mass()/2.
+
+##! Create instance and print out #############################################################################
+descString = "Create MuonDecayBatch and print"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+Dcy = mdb.MuonDecayBatch(rng=np.random.default_rng(1234))
+print("    __str__:", Dcy)
+print("    --repr__", repr(Dcy))
+nTests = nTests + 1
+
+##! Conservation laws ########################################################################################
+descString = "Energy and momentum conserved and decay products massless"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+nDcy = 1000000
+t0 = time.time()
+v_e, v_nue, v_numu, costheta, cosphi = Dcy.decaymuon(nDcy)
+tBatch = (time.time() - t0)/nDcy
+dE = np.abs(v_e[:, 0] + v_nue[:, 0] + v_numu[:, 0] - mc.mass())
+dP = np.abs(v_e[:, 1:] + v_nue[:, 1:] + v_numu[:, 1:])
+dM = 0.
+for v in (v_e, v_nue, v_numu):
+    dM = max(dM, np.abs(v[:, 0] - np.linalg.norm(v[:, 1:], axis=1)).max())
+if (dE.max() > 1E-9) or (dP.max() > 1E-6) or (dM > 1E-9):
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed", dE.max(), dP.max(), dM)
+nTests = nTests + 1
+
+##! Energy spectra ###########################################################################################
+descString = "Mean scaled energies: e and numu 0.7 (x^2(3-2x)); nue 0.6 (x^2(1-x))"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+means = [np.mean(v_e[:, 0])/mo2, np.mean(v_nue[:, 0])/mo2, np.mean(v_numu[:, 0])/mo2]
+print("    means:", means)
+if (abs(means[0] - 0.7) > 0.002) or (abs(means[1] - 0.6) > 0.002) or (abs(means[2] - 0.7) > 0.002):
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+nTests = nTests + 1
+
+##! Compare with MuonDecay ###################################################################################
+descString = "Compare with event-by-event MuonDecay"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+nScalar = 5000
+t0 = time.time()
+Enue = np.empty(nScalar)
+cosScalar = np.empty(nScalar)
+for i in range(nScalar):
+    sDcy = md.MuonDecay()
+    Enue[i] = sDcy.get4vnue()[0]
+    cosScalar[i] = sDcy.getcostheta()
+tScalar = (time.time() - t0)/nScalar
+print("    MuonDecay:", 1E6*tScalar, " us per decay; MuonDecayBatch:", 1E6*tBatch, \
+      " us per decay; speed-up ", tScalar/tBatch)
+#  agree within 5 standard deviations of the scalar sample
+if (abs(np.mean(Enue) - np.mean(v_nue[:, 0])) > 5.*np.std(Enue)/np.sqrt(nScalar)) or \
+   (abs(np.mean(cosScalar) - np.mean(costheta)) > 5.*np.std(cosScalar)/np.sqrt(nScalar)):
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+if (tBatch > tScalar):
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed: batch slower than MuonDecay")
+nTests = nTests + 1
+
+##! Lifetimes ################################################################################################
+descString = "Lifetime mean and cut off at Tmax"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+lt = Dcy.GenerateLifetime(nDcy)
+ltCut = Dcy.GenerateLifetime(nDcy, Tmax=mc.lifetime())
+if (abs(np.mean(lt)/mc.lifetime() - 1.) > 0.01) or (ltCut.max() > mc.lifetime()):
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+nTests = nTests + 1
+
+##! Complete:
+print()
+print("========  MuonDecayBatch:tests complete  ========")
+print ("\nNumber of tests is ", nTests, " number of fails is ", testFails)
+if testFails == 0:
+    sys.exit(0)
+else:
+    sys.exit(1)
@@ -48,6 +48,8 @@ print()
 print("NeutrinoEventInstanceTest:", NeutrinoEventInstanceTest, \
       "Test get/set methods.")
 print("    Muon momentum (GeV):", nuEI.getpmu())
+print("    Geometry shared by instances of the same file:", \
+      nuEvtInst.NeutrinoEventInstance(5., filename)._geometry is nuEI._geometry)
 
 ##! Test methods by which neutrino-creation event is generated:
 NeutrinoEventInstanceTest = 3
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test script for ParticleBlock class
+===================================
+
+  Assumes that nuSim code is in python path.
+
+  Script fills a block from particle instances, checks the columns against
+  the particle get methods and that particles read back compare equal.
+
+Version history:
+----------------------------------------------
+ 1.0: 18Oct26: First version
+
+"""
+
+import sys
+import time
+import numpy as np
+import particle as particle
+import ParticleBlock as ParticleBlock
+
+##! Start:
+
+nTests = 0
+testFails = 0
+descriptions=[]
+testStatus=[]
+testTitle = "ParticleBlock"
+
+print("========  ", testTitle, ": tests start  ========")
+
+rng = np.random.default_rng(7)
+nPart = 1000
+types = ["pi+", "mu+", "e+", "nue", "numuBar"]
+parts = []
+for i in range(nPart):
+    parts.append(particle.particle(42, i, 10.*rng.random(), rng.normal(), rng.normal(), 20.*rng.random(),
+                                   0.1*rng.normal(), 0.1*rng.normal(), 1. + 4.*rng.random(), 100.*rng.random(),
+                                   rng.random(), types[i%len(types)]))
+
+##! Create instance and print out #############################################################################
+descString = "Create ParticleBlock and print"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+block = ParticleBlock.ParticleBlock.fromParticles(parts)
+print("    __str__:", block)
+print("    --repr__", repr(block))
+if (len(block) != nPart) or not block.records().flags['C_CONTIGUOUS']:
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+nTests = nTests + 1
+
+##! Columns agree with the particles #########################################################################
+descString = "Columns agree with the particle get methods"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+failed = False
+for name in ["run", "event", "pdgCode", "s", "x", "y", "z", "px", "py", "pz", "t", "weight", "mass", "E", "xp", "yp"]:
+    column = getattr(block, name)()
+    values = np.array([getattr(par, name)() for par in parts])
+    if np.abs(column - values).max() > 1E-12:
+        failed = True
+        print("    column ", name, " differs")
+if failed:
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+nTests = nTests + 1
+
+##! Read back ################################################################################################
+descString = "Particles read back from the block compare equal; slices are blocks"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+failed = False
+for i in range(nPart):
+    if block[i] != parts[i]:
+        failed = True
+sub = block[block.pdgCode() == -13]
+if (not isinstance(sub, ParticleBlock.ParticleBlock)) or (len(sub) != nPart//len(types)):
+    failed = True
+if failed:
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+nTests = nTests + 1
+
+##! Accessor timing ##########################################################################################
+descString = "particle accessors return plain values"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+par = parts[0]
+if not (isinstance(par.x(), float) and isinstance(par.px(), float) and isinstance(par.run(), int)):
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+nCall = 100000
+t0 = time.time()
+for i in range(nCall):
+    par.x(); par.px(); par.py(); par.pz(); par.weight()
+print("    five accessor calls: ", 1E6*(time.time() - t0)/nCall, " us")
+nTests = nTests + 1
+
+##! Complete:
+print()
+print("========  ParticleBlock:tests complete  ========")
+print ("\nNumber of tests is ", nTests, " number of fails is ", testFails)
+if testFails == 0:
+    sys.exit(0)
+else:
+    sys.exit(1)
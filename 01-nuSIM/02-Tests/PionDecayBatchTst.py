@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test script for PionDecayBatch class
+====================================
+
+  Assumes that nuSim code is in python path.
+
+  Script checks conservation laws and the angular distributions of a large
+  batch of decays, compares with the event-by-event PionDecay class and
+  reports the time taken by each.
+
+Version history:
+----------------------------------------------
+ 1.0: 18Oct26: First version
+ 1.1: 18Oct26: Forced lifetimes
+
+"""
+
+import sys
+import time
+import numpy as np
+import PionConst as piCnst
+import PionDecay as pd
+import PionDecayBatch as pdb
+
+##! Start:
+
+nTests = 0
+testFails = 0
+descriptions=[]
+testStatus=[]
+testTitle = "PionDecayBatch"
+
+print("========  ", testTitle, ": tests start  ========")
+
+pc = piCnst.PionConst()
+
+##! Create instance and print out #############################################################################
+descString = "Create PionDecayBatch and print"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+Dcy = pdb.PionDecayBatch(rng=np.random.default_rng(4321))
+print("    __str__:", Dcy)
+print("    --repr__", repr(Dcy))
+nTests = nTests + 1
+
+##! Conservation laws ########################################################################################
+descString = "Energy and momentum conserved, muon along (cos(theta), phi)"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+nDcy = 1000000
+t0 = time.time()
+v_mu, v_numu, costheta, phi = Dcy.decaypion(nDcy)
+tBatch = (time.time() - t0)/nDcy
+dE = np.abs(v_mu[:, 0] + v_numu[:, 0] - pc.mass())
+dP = np.abs(v_mu[:, 1:] + v_numu[:, 1:])
+pMu = np.linalg.norm(v_mu[:, 1:], axis=1)
+dDir = np.abs(v_mu[:, 3]/pMu - costheta)
+if (dE.max() > 1E-4) or (dP.max() > 0.) or (np.abs(pMu - Dcy.getpStar()).max() > 1E-9) or (dDir.max() > 1E-12):
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+if not (v_mu.flags['C_CONTIGUOUS'] and v_numu.flags['C_CONTIGUOUS']):
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed: arrays not contiguous")
+nTests = nTests + 1
+
+##! Isotropy #################################################################################################
+descString = "Decays isotropic: cos(theta) flat in [-1, 1], phi flat in [0, 2pi]"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+if (abs(np.mean(costheta)) > 0.001) or (abs(np.var(costheta) - 1./3.) > 0.001) or \
+   (abs(np.mean(phi) - np.pi) > 0.003) or (phi.min() < 0.) or (phi.max() > 2.*np.pi):
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+nTests = nTests + 1
+
+##! Compare with PionDecay ###################################################################################
+descString = "Compare with event-by-event PionDecay"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+nScalar = 20000
+t0 = time.time()
+E_mu = np.empty(nScalar)
+for i in range(nScalar):
+    sDcy = pd.PionDecay()
+    E_mu[i] = sDcy.get4vmu()[0]
+tScalar = (time.time() - t0)/nScalar
+print("    PionDecay:", 1E6*tScalar, " us per decay; PionDecayBatch:", 1E9*tBatch, \
+      " ns per decay; speed-up ", tScalar/tBatch)
+if (np.abs(E_mu - Dcy.getEmu()).max() > 1E-9):
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+if (tBatch > tScalar):
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed: batch slower than PionDecay")
+nTests = nTests + 1
+
+##! Lifetimes ################################################################################################
+descString = "Lifetime mean and cut off at Tmax"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+lt = Dcy.GenerateLifetime(1000000)
+ltCut = Dcy.GenerateLifetime(1000000, Tmax=pc.lifetime())
+if (abs(np.mean(lt)/pc.lifetime() - 1.) > 0.01) or (ltCut.max() > pc.lifetime()):
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+nTests = nTests + 1
+
+##! Forced lifetimes #########################################################################################
+descString = "Forced lifetimes lie in the window and the weights are its probability"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+tau = pc.lifetime()
+tMin = np.full(1000000, 0.5*tau)
+tMax = np.full(1000000, 2.0*tau)
+ltF, wF = Dcy.GenerateForcedLifetime(tMin, tMax)
+pWindow = np.mean(np.logical_and(lt >= 0.5*tau, lt <= 2.0*tau))
+#  mean of the exponential truncated to [a, b]
+a, b = 0.5*tau, 2.0*tau
+meanTrunc = tau + (a*np.exp(-a/tau) - b*np.exp(-b/tau))/(np.exp(-a/tau) - np.exp(-b/tau))
+if (ltF.min() < a) or (ltF.max() > b) or (abs(wF[0] - pWindow) > 0.002) or \
+   (abs(np.mean(ltF)/meanTrunc - 1.) > 0.002):
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+nTests = nTests + 1
+
+##! Complete:
+print()
+print("========  PionDecayBatch:tests complete  ========")
+print ("\nNumber of tests is ", nTests, " number of fails is ", testFails)
+if testFails == 0:
+    sys.exit(0)
+else:
+    sys.exit(1)
@@ -80,6 +80,29 @@ plt.title('Pion time distribution III')
 plt.savefig('Scratch/PionTimeDistribution3.pdf')
 plt.close()
 
+##! Batches of times, no rejection:
+PionTimeDistributionTst = 4
+print()
+print("PionTimeDistributionTest:", PionTimeDistributionTst, " Batches of timestamps sampled directly in the bunches.")
+#  extraction of 10.501 us with 7 ns period: 1500 full bunches and the last cut to 1 ns
+ptd = PTD.PionTimeDistribution(t_bunch, t_spacing, 10.501)
+period = (t_bunch + t_spacing)*1E-9
+t = ptd.GenerateTimes(1000000, np.random.default_rng(4))
+inBunch = np.fmod(t, period) < t_bunch*1E-9
+if not inBunch.all() or (t.min() < 0.) or (t.max() >= 10.501E-6):
+    raise Exception("PionTimeDistribution: times outside the bunches or the extraction")
+#  uniform over the bunch time: full bunches get 2 ns worth, the cut last bunch 1 ns
+bunch = np.floor(t/period).astype(int)
+counts = np.bincount(bunch)
+expected = len(t)*np.append(np.full(len(counts)-1, t_bunch), 1.0)/(t_bunch*(len(counts)-1) + 1.0)
+if (len(counts) != 1501) or (np.abs(counts - expected).max() > 6.*np.sqrt(expected.max())):
+    raise Exception("PionTimeDistribution: times not uniform over the bunches")
+#  the scalar and array methods are the same map of the uniforms
+u = np.random.default_rng(5).random(1000)
+if not np.array_equal(ptd.mapTimes(u), ptd.GenerateTimes(1000, np.random.default_rng(5))):
+    raise Exception("PionTimeDistribution: GenerateTimes and mapTimes differ")
+print("    ", len(t), " times in ", len(counts), " bunches")
+
 ##! Complete:
 print()
 print("========  PionTimeDistribution: tests complete  ========")
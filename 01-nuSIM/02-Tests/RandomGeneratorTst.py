@@ -77,6 +77,42 @@ plt.title('Random phase space distribution in y')
 plt.savefig('Scratch/RndmGen_yPS_rndm.pdf')
 plt.close()
 
+##! Check the cumulative tables and the array methods:
+RandomGeneratorTest = 3
+print()
+print("RandomGeneratorTest:", RandomGeneratorTest, " check cumulative tables and array methods.")
+
+#  1D: a histogram with empty bins; sampled fractions per bin match the contents and
+#  values are linear in the uniform inside a bin as in TH1::GetRandom
+edges = np.array([0., 1., 2., 4., 5., 8.])
+contents = np.array([1., 0., 3., 0., 4.])
+table = Rndm.table1D(edges, contents)
+r = np.random.default_rng(1).random(400000)
+v = Rndm.sample1D(table, r)
+counts, _ = np.histogram(v, bins=edges)
+if (np.abs(counts/len(v) - contents/contents.sum()).max() > 0.005):
+    raise Exception("RandomGenerator: 1D table sampling does not follow the bin contents")
+if (np.abs(Rndm.sample1D(table, [0.0625, 0.3125]) - [0.5, 3.0]) > 1E-12).any():
+    raise Exception("RandomGenerator: 1D in-bin interpolation is not linear in the uniform")
+
+#  2D: cell fractions match the contents[ix, iy], y flat in a cell
+xEdges = np.array([-1., 0., 2.])
+yEdges = np.array([0., 0.5, 1., 3.])
+contents2D = np.array([[1., 2., 0.], [0., 3., 4.]])
+table2D = Rndm.table2D(xEdges, yEdges, contents2D)
+r1, r2 = np.random.default_rng(2).random((2, 400000))
+xs, ys = Rndm.sample2D(table2D, r1, r2)
+counts2D, _, _ = np.histogram2d(xs, ys, bins=[xEdges, yEdges])
+if (np.abs(counts2D/len(xs) - contents2D/contents2D.sum()).max() > 0.005):
+    raise Exception("RandomGenerator: 2D table sampling does not follow the cell contents")
+
+#  array methods agree with the histograms the scalar methods sample
+pArr = RndmGen.getRandomArray(200000)
+xArr, xpArr = RndmGen.getRandom2DxArray(200000)
+if (abs(np.mean(pArr) - np.mean(p)) > 0.01) or (abs(np.std(xArr) - np.std(x)) > 0.01):
+    raise Exception("RandomGenerator: array and scalar methods differ")
+print("    cache of the tables:", RndmGen.getCacheFilename())
+
 ##! Complete:
 print()
 print("========  RandomGenerator: tests complete  ========")
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test script for RandomStream class
+==================================
+
+  Assumes that nuSim code is in python path.
+
+  Script checks that the streams are reproducible, that the vectorised
+  event streams agree with the event-at-a-time ones, and times them
+
+Version history:
+----------------------------------------------
+ 1.0: 18Oct26: First version
+ 1.1: 18Oct26: firstDraw, eventDraws and startEvent
+
+"""
+
+import sys
+import timeit
+import numpy as np
+import RandomStream as RStrm
+import Simulation as Simu
+
+##! Start:
+
+nTests = 0
+testFails = 0
+descriptions=[]
+testStatus=[]
+testTitle = "RandomStream"
+
+print("========  ", testTitle, ": tests start  ========")
+
+##! Create instance and print out #############################################################################
+descString = "Create RandomStream and print"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+stream = RStrm.RandomStream(42, 3)
+print("    __str__:", stream)
+print("    --repr__", repr(stream))
+nTests = nTests + 1
+
+##! Reproducible and independent ##############################################################################
+descString = "Streams are reproducible for (run, shard) and differ between them"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+failed = False
+a = RStrm.RandomStream(42, 3).uniforms(1000)
+if not np.array_equal(a, RStrm.RandomStream(42, 3).uniforms(1000)):
+    failed = True
+for run, shard in [(42, 4), (43, 3)]:
+    b = RStrm.RandomStream(run, shard).uniforms(1000)
+    if np.array_equal(a, b) or abs(np.corrcoef(a, b)[0, 1]) > 0.15:
+        failed = True
+if (a.min() < 0.0) or (a.max() >= 1.0) or (abs(a.mean() - 0.5) > 0.05):
+    failed = True
+#  one at a time, in arrays and through the generator give the same sequence
+stream = RStrm.RandomStream(42, 3)
+mixed = np.array([stream.random() for i in range(10)] + list(stream.uniforms(5000)) + [stream.random()])
+if not np.array_equal(mixed, RStrm.RandomStream(42, 3).uniforms(5011)):
+    failed = True
+if not np.array_equal(RStrm.RandomStream(42, 3).generator().random(100), a[:100]):
+    failed = True
+if failed:
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+nTests = nTests + 1
+
+##! Event streams #############################################################################################
+descString = "Vectorised event streams agree with event-at-a-time streams"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+failed = False
+stream = RStrm.RandomStream(42, 3)
+events = np.array([0, 1, 2, 17, 123456, 2**40])
+batch = stream.eventUniforms(events, 11)
+for i, event in enumerate(events):
+    if not np.array_equal(batch[i], stream.eventGenerator(event).random(11)):
+        failed = True
+#  an event's numbers do not depend on the batch it is in or on the shard stream
+stream.uniforms(1000)
+if not np.array_equal(stream.eventUniforms([17], 11)[0], batch[3]):
+    failed = True
+if np.array_equal(batch[0], batch[1]):
+    failed = True
+#  later draws, the draws of a batch one at a time and the stream started at an event
+if not np.array_equal(stream.eventUniforms(events, 6, firstDraw=5), batch[:, 5:]):
+    failed = True
+draws = stream.eventDraws(events)
+if not np.array_equal(np.column_stack([draws.random(len(events)) for i in range(11)]), batch) or draws.nDraws() != 11:
+    failed = True
+stream.startEvent(17)
+if not np.array_equal(np.array([stream.random() for i in range(11)]), batch[3]):
+    failed = True
+if failed:
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+nTests = nTests + 1
+
+##! Jump ahead ################################################################################################
+descString = "Jump and advance move the shard stream on"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+failed = False
+stream = RStrm.RandomStream(42, 3)
+gen = stream.generator()
+stream.jump()
+jumped = gen.random(100)
+if np.array_equal(jumped, a[:100]):
+    failed = True
+stream = RStrm.RandomStream(42, 3)
+stream.advance(1)
+#  one Philox block is four 64 bit words, i.e. four uniforms
+if not np.array_equal(stream.uniforms(96), a[4:100]):
+    failed = True
+if failed:
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+nTests = nTests + 1
+
+##! Simulation uses the stream ################################################################################
+descString = "Simulation.getRandom draws from the RandomStream set"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+Simu.setRandomStream(RStrm.RandomStream(42, 3))
+if not np.array_equal([Simu.getRandom() for i in range(100)], a[:100]):
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+nTests = nTests + 1
+
+##! Benchmark #################################################################################################
+descString = "Benchmark scalar and array uniforms"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+nCall = 100000
+stream = RStrm.RandomStream(42, 3)
+tScalar = timeit.timeit(lambda: stream.random(), number=nCall)
+tArray  = timeit.timeit(lambda: stream.uniforms(nCall), number=1)
+tEvents = timeit.timeit(lambda: stream.eventUniforms(np.arange(nCall), 8), number=1)
+print("    ", nCall, " uniforms: random() ", tScalar, " s, uniforms(n) ", tArray, " s")
+print("    ", nCall, " events x 8 uniforms: eventUniforms ", tEvents, " s")
+nTests = nTests + 1
+
+##! Complete:
+print()
+print("========  RandomStream:tests complete  ========")
+print ("\nNumber of tests is ", nTests, " number of fails is ", testFails)
+if testFails == 0:
+    sys.exit(0)
+else:
+    sys.exit(1)
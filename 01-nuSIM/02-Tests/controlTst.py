@@ -10,15 +10,26 @@ Test script for control class
 Version history:
 ----------------------------------------------
  1.0: 07Jan22: Test the class
+ 1.1: 18Oct26: Run numbers reserved by concurrent processes are unique
+ 1.2: 18Oct26: eventWeight and detectorPosition entries
+ 1.3: 18Oct26: rsdPosition entry
 
 
 """
 
 import sys
 import os
+import tempfile
+import json
+import multiprocessing
 import numpy as np
 import control
 
+#  reserve run numbers from a separate process
+def reserve(n):
+    con = control.control("02-Tests/referenceOutput/PSPiFlash.dict")
+    return list(con.reserveRunNumbers(n))
+
 ##! Start:
 
 nTests = 0
@@ -62,6 +73,10 @@ if (con.muDcyFlag()):
     print (f"muDcyFlag is true")
 else:
     print (f"muDcyFlag is false")
+#  forcedDecay, directedEmission, fluxOnly, fluxHistograms and skim are optional, not set in the reference file
+if (con.forcedDecay() != "none") or (con.directedEmission()) or (con.fluxOnly()) or (con.fluxHistograms() is not None) or \
+   (con.skim() != "none"):
+    testFails = testFails + 1
 
 
 ##! Test equality : ##################################################################
@@ -80,6 +95,61 @@ print(f"number of Events to generate is {con.nEvents()}")
 
 
 
+##! Concurrent run number reservation : ##################################################################
+descString = "Run numbers reserved by concurrent processes are unique"
+descriptions.append(descString)
+print(f"{testTitle} :   {descString}")
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as studyDir:
+        os.environ['StudyDir'] = studyDir
+        with open(os.path.join(studyDir, "runNumber"), "w") as rN:
+            rN.write("100")
+        blocks = [1, 3, 1, 5] * 10
+        with multiprocessing.Pool(8) as pool:
+            reserved = pool.map(reserve, blocks)
+        allNumbers = sorted(runNum for block in reserved for runNum in block)
+        fail = (allNumbers != list(range(101, 101 + sum(blocks))))
+        for block, n in zip(reserved, blocks):
+            if block != list(range(block[0], block[0] + n)):
+                fail = True
+        con = control.control("02-Tests/referenceOutput/PSPiFlash.dict")
+        if con.runNumber() != 100 + sum(blocks):
+            fail = True
+#  a reserved run number is kept by the instance
+        runNum = con.runNumber(True)
+        reserve(1)
+        if (runNum != 101 + sum(blocks)) or (con.runNumber() != runNum):
+            fail = True
+    if fail:
+        print(f"{descriptions[nTests]} ..... failed")
+        testFails = testFails + 1
+nTests = nTests + 1
+
+##! Event weight and detector position : ##################################################################
+descString = "eventWeight, detectorPosition and rsdPosition from the control file, with their defaults"
+descriptions.append(descString)
+print(f"{testTitle} :   {descString}")
+
+fail = (con.eventWeight() != 50) or (con.detectorPosition() != [0.0, 0.0, 50.0]) or (con.rsdPosition() is not None)
+with tempfile.TemporaryDirectory() as dictDir:
+    dictFile = os.path.join(dictDir, "position.dict")
+    with open("02-Tests/referenceOutput/PSPiFlash.dict") as ref:
+        info = json.load(ref)
+    info["eventWeight"] = 12.5
+    info["detectorPosition"] = [1, -2, 300]
+    info["rsdPosition"] = [361, 0, 130]
+    with open(dictFile, "w") as out:
+        json.dump(info, out)
+    conPos = control.control(dictFile)
+    if (conPos.eventWeight() != 12.5) or (conPos.detectorPosition() != [1.0, -2.0, 300.0]) or \
+       (conPos.rsdPosition() != [361.0, 0.0, 130.0]):
+        fail = True
+if fail:
+    print(f"{descriptions[nTests]} ..... failed")
+    testFails = testFails + 1
+nTests = nTests + 1
+
 ##! Complete:
 print()
 print(f"========  {testTitle}:tests complete  ========")
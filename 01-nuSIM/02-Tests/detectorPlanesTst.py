@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test script for detectorPlanes class
+====================================
+
+  Assumes that nuSim code is in python path.
+
+  Script checks the intersections with a plane perpendicular to z against the
+  calculation of plane.findHitPosition*, then a plane facing backwards and
+  several planes at once
+
+Version history:
+----------------------------------------------
+ 1.0: 18Oct26: First version
+
+"""
+
+import sys
+import math
+import numpy as np
+import detectorPlanes as detectorPlanes
+
+##! Start:
+
+nTests = 0
+testFails = 0
+descriptions=[]
+testStatus=[]
+testTitle = "detectorPlanes"
+
+print("========  ", testTitle, ": tests start  ========")
+
+rng = np.random.default_rng(11)
+n = 10000
+points = np.column_stack((rng.normal(0., 0.5, n), rng.normal(0., 0.5, n), rng.uniform(0., 180., n)))
+momenta = np.column_stack((rng.normal(0., 0.05, n), rng.normal(0., 0.05, n), rng.uniform(0.5, 5., n)))
+
+##! Create instance and print out #############################################################################
+descString = "Create detectorPlanes and print"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+planes = detectorPlanes.detectorPlanes([("nearDetector", [0.2, -0.1, 230.], 2.5)])
+print("    __str__:", planes)
+print("    --repr__", repr(planes))
+nTests = nTests + 1
+
+##! Plane along z agrees with plane.findHitPosition ##########################################################
+descString = "Intersection with a plane along z as plane.findHitPosition"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+failed = False
+hits = planes.intersect(points, momenta)
+pos = [0.2, -0.1, 230.]
+for i in range(0, n, 97):
+    deltaZ = pos[2] - points[i, 2]
+    xPnt = points[i, 0] + momenta[i, 0]*deltaZ/momenta[i, 2]
+    yPnt = points[i, 1] + momenta[i, 1]*deltaZ/momenta[i, 2]
+    expected = [xPnt - pos[0], yPnt - pos[1], 0.0, math.sqrt(xPnt*xPnt + yPnt*yPnt), math.atan2(yPnt, xPnt)]
+    found = [hits["x"][i, 0], hits["y"][i, 0], hits["z"][i, 0], hits["R"][i, 0], hits["phi"][i, 0]]
+    if (np.abs(np.array(found) - expected) > 1E-9).any():
+        failed = True
+    accepted = (abs(xPnt - pos[0]) < 2.5) and (abs(yPnt - pos[1]) < 2.5)
+    if accepted != hits["accepted"][i, 0]:
+        failed = True
+if not hits["forward"].all() or (np.abs(hits["Z"] - 230.) > 1E-9).any():
+    failed = True
+if failed:
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+nTests = nTests + 1
+
+##! Several planes ############################################################################################
+descString = "Several planes in one call, including one facing backwards"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+failed = False
+planes.addPlane("farDetector", [0., 0., 500.], [4., 3.])
+iRSD = planes.addPlane("returnStraightDetector", [10., 0., -50.], 2.5, normal=[0., 0., -1.])
+if (planes.nPlanes() != 3) or (planes.index("returnStraightDetector") != iRSD) or (iRSD != 2):
+    failed = True
+hits = planes.intersect(points, momenta)
+if hits["x"].shape != (n, 3):
+    failed = True
+#  each column is the same as that plane on its own
+for i, name in enumerate(planes.names()):
+    alone = detectorPlanes.detectorPlanes([(name, planes.position(i), planes.halfWidths(i), planes.normal(i))])
+    hitsAlone = alone.intersect(points, momenta)
+    for key in ["x", "y", "R", "phi", "ds", "accepted", "forward"]:
+        if not np.array_equal(hits[key][:, i], hitsAlone[key][:, 0]):
+            failed = True
+#  backward plane: behind the decays, local x is minus the global x offset, no hit is forward
+if hits["forward"][:, iRSD].any():
+    failed = True
+if (np.abs(hits["x"][:, iRSD] + (hits["X"][:, iRSD] - 10.)) > 1E-9).any():
+    failed = True
+if (np.abs(hits["y"][:, iRSD] - hits["Y"][:, iRSD]) > 1E-9).any():
+    failed = True
+#  a tilted plane: hits lie in the plane and the flight distance is |lambda p|
+planes.addPlane("tilted", [0., 0., 300.], 5., normal=[0.3, 0., 1.])
+hits = planes.intersect(points, momenta)
+normal = planes.normal(3)
+inPlane = (hits["X"][:, 3] - 0.)*normal[0] + hits["Y"][:, 3]*normal[1] + (hits["Z"][:, 3] - 300.)*normal[2]
+if (np.abs(inPlane) > 1E-9).any():
+    failed = True
+#  acceptance override
+hits = planes.intersect(points, momenta, halfWidths=[100., 100., 100., 100.])
+if not hits["accepted"][:, 0].all():
+    failed = True
+if failed:
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+nTests = nTests + 1
+
+##! Complete:
+print()
+print("========  detectorPlanes:tests complete  ========")
+print ("\nNumber of tests is ", nTests, " number of fails is ", testFails)
+if testFails == 0:
+    sys.exit(0)
+else:
+    sys.exit(1)
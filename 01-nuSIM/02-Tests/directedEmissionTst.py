@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test script for directedEmission module
+=======================================
+
+  Assumes that nuSim code is in python path.
+
+  Script checks that the rest frame cap holds every isotropic neutrino that
+  hits the face, and that the weighted directed hits give the hit
+  probability of isotropic emission
+
+Version history:
+----------------------------------------------
+ 1.0: 18Oct26: First version
+
+"""
+
+import sys
+import numpy as np
+import LorentzBoost as LB
+import directedEmission as dirEm
+import detectorPlanes as detectorPlanes
+
+##! Start:
+
+nTests = 0
+testFails = 0
+descriptions=[]
+testStatus=[]
+testTitle = "directedEmission"
+
+print("========  ", testTitle, ": tests start  ========")
+
+rng = np.random.default_rng(17)
+planes = detectorPlanes.detectorPlanes([("detector", [1.0, 0.0, 230.], 2.5)])
+centre = planes.position(0)
+corners = planes.corners(0)
+
+#  isotropic massless decay products of energy E in the rest frame
+def isotropic(E):
+    cosTheta = 1. - 2.*rng.random(len(E))
+    phi = 2.*np.pi*rng.random(len(E))
+    sinTheta = np.sqrt(1. - cosTheta*cosTheta)
+    return np.column_stack((E, E*sinTheta*np.cos(phi), E*sinTheta*np.sin(phi), E*cosTheta))
+
+#  parents: decay points along the straight, velocities close to +z
+nParent = 5
+points = np.column_stack((rng.normal(0., 0.05, nParent), rng.normal(0., 0.05, nParent), np.linspace(0., 180., nParent)))
+beta = np.array([0.5, 0.9, 0.99, 0.999, 0.9995])
+dirs = np.column_stack((rng.normal(0., 0.003, nParent), rng.normal(0., 0.003, nParent), np.ones(nParent)))
+b = beta[:, np.newaxis]*dirs/np.linalg.norm(dirs, axis=1, keepdims=True)
+
+##! Corners ###################################################################################################
+descString = "Corners of the detector face"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+if (np.abs(np.sort(corners[:, 0]) - [-1.5, -1.5, 3.5, 3.5]).max() > 1E-12) or (np.abs(corners[:, 2] - 230.).max() > 1E-12):
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+nTests = nTests + 1
+
+##! Cap holds the face ########################################################################################
+descString = "Rest frame cap holds every isotropic neutrino that hits the face"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+failed = False
+n = 200000
+for i in range(nParent):
+    P = isotropic(np.full(n, 0.03))
+    Plab = LB.Boost(P, b[i])
+    hits = planes.intersect(np.tile(points[i], (n, 1)), Plab[:, 1:])
+    hit = np.logical_and(hits["accepted"][:, 0], hits["forward"][:, 0])
+    axis, cosLab = dirEm.labCone(points[i:i+1], centre, corners)
+    axisStar, cosStar = dirEm.restFrameCap(axis, cosLab, b[i:i+1])
+    inCap = P[:, 1:] @ axisStar[0]/0.03 >= cosStar[0] - 1E-12
+    if not inCap[hit].all():
+        failed = True
+if failed:
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+nTests = nTests + 1
+
+##! Unbiased ##################################################################################################
+descString = "Weighted directed hits agree with isotropic emission"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+failed = False
+for i in range(nParent):
+    P = isotropic(np.full(n, 0.03))
+    hitsIso = planes.intersect(np.tile(points[i], (n, 1)), LB.Boost(P, b[i])[:, 1:])
+    hitIso = np.logical_and(hitsIso["accepted"][:, 0], hitsIso["forward"][:, 0])
+    pIso = np.mean(hitIso)
+    Pd, w = dirEm.direct(P, b[i], np.tile(points[i], (n, 1)), centre, corners, rng.random(n), rng.random(n))
+    hitsDir = planes.intersect(np.tile(points[i], (n, 1)), Pd[:, 1:])
+    wHit = w*np.logical_and(hitsDir["accepted"][:, 0], hitsDir["forward"][:, 0])
+    pDir = np.mean(wHit)
+    err = np.sqrt(pIso*(1. - pIso)/n + np.var(wHit)/n)
+    print("    beta ", beta[i], ": isotropic ", pIso, " directed ", pDir, " +- ", err, \
+          " hits ", np.count_nonzero(hitIso), " / ", np.count_nonzero(wHit))
+    if abs(pDir - pIso) > 4.*err:
+        failed = True
+#  directed energies are kept in the rest frame
+    if np.abs(LB.Boost(Pd, -b[i])[:, 0] - 0.03).max() > 1E-9:
+        failed = True
+if failed:
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+nTests = nTests + 1
+
+##! Complete:
+print()
+print("========  directedEmission:tests complete  ========")
+print ("\nNumber of tests is ", nTests, " number of fails is ", testFails)
+if testFails == 0:
+    sys.exit(0)
+else:
+    sys.exit(1)
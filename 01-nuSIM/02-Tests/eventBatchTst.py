@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test script for eventBatch class
+=================================
+
+  Assumes that nuSim code is in python path and nuSIMPATH is set.
+
+  Script generates a batch of events and checks the decay kinematics and the
+  consistency of the event history built from it
+
+Version history:
+----------------------------------------------
+ 1.0: 18Oct26: First version
+ 1.1: 18Oct26: Forced decays
+ 1.2: 18Oct26: Directed emission
+ 1.3: 18Oct26: Events independent of the batch size and the shard split
+ 1.4: 18Oct26: Return straight detector
+ 1.5: 18Oct26: The return straight detector only at an rsdPosition given
+
+"""
+
+import sys
+import numpy as np
+import math as mt
+import nuSTORMConst
+import MuonConst as mC
+import PionConst as piC
+import eventBatch as eventBatch
+import RandomStream as RStrm
+import nuSTORMGeometry as nuGeom
+
+##! Start:
+
+nTests = 0
+testFails = 0
+descriptions=[]
+testStatus=[]
+testTitle = "eventBatch"
+
+print("========  ", testTitle, ": tests start  ========")
+
+nuSTRMCnst = nuSTORMConst.nuSTORMConst()
+muCnst = mC.MuonConst()
+piCnst = piC.PionConst()
+tlLen = nuSTRMCnst.TrfLineCmplxLen()
+psLen = nuSTRMCnst.ProdStrghtLen()
+
+flags = {"tlFlag": True, "psFlag": True, "lstFlag": True, "muDcyFlag": True, "flashAtDetector": True,
+         "PSMuons": True, "ringMuons": True, "tEqualsZero": False, "pencilBeam": False,
+         "pDistInput": False, "psDistInput": False}
+
+##! Create instance and print out #############################################################################
+descString = "Create eventBatch and print"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+batch = eventBatch.eventBatch(nuSTRMCnst, flags, 5.0, 3.8, 42, 50.0, [0.0, 0.0, 50.0], rng=np.random.default_rng(42))
+print("    __str__:", batch)
+print("    --repr__", repr(batch))
+nTests = nTests + 1
+
+##! Pion decays at rest ######################################################################################
+descString = "Pion decays at rest conserve energy and momentum"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+P_mu, P_numu, cTheta = batch.decayPions(10000)
+dE = np.abs(P_mu[:, 0] + P_numu[:, 0] - piCnst.mass())
+dP = np.abs(P_mu[:, 1:] + P_numu[:, 1:])
+if (dE.max() > 1E-4) or (dP.max() > 1E-9):
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+nTests = nTests + 1
+
+##! Muon decays at rest ######################################################################################
+descString = "Muon decays at rest conserve energy and momentum"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+P_e, P_nue, P_numu = batch.decayMuons(10000)
+dE = np.abs(P_e[:, 0] + P_nue[:, 0] + P_numu[:, 0] - muCnst.mass())
+dP = np.abs(P_e[:, 1:] + P_nue[:, 1:] + P_numu[:, 1:])
+if (dE.max() > 1E-6) or (dP.max() > 1E-6):
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+#  mean electron energy fraction for the spectrum 2f^3 - f^4 is 0.7
+meanFe = np.mean(P_e[:, 0])/(muCnst.mass()/2.)
+if abs(meanFe - 0.7) > 0.01:
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed: mean electron energy fraction ", meanFe)
+nTests = nTests + 1
+
+##! Parabolic distribution ###################################################################################
+descString = "Parabolic distribution range and variance"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+p = batch.GenerateParabolic(0.5, 100000)
+if (np.abs(p).max() > 0.5) or (abs(np.var(p) - 0.25/5.) > 0.002):
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+nTests = nTests + 1
+
+##! Generate a batch #########################################################################################
+descString = "Generate a batch and check the event history"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+nEvents = 20000
+history = batch.generate(1000, nEvents)
+failed = False
+for location in eventBatch.locations:
+    if (len(history[location]) != nEvents):
+        failed = True
+target = history["target"]
+if not np.array_equal(target["eventNumber"], np.arange(1000, 1000+nEvents)):
+    failed = True
+if not (target["runNumber"] == 42).all():
+    failed = True
+pionDecay = history["pionDecay"]
+inPS = pionDecay["pdgCode"] == 211
+inPS = np.logical_and(inPS, pionDecay["s"] >= tlLen)
+if (pionDecay["s"][inPS] > tlLen + psLen).any():
+    failed = True
+if (np.count_nonzero(inPS) != batch.PSDcyCount()):
+    failed = True
+muonDecay = history["muonDecay"]
+if (np.count_nonzero(muonDecay["pdgCode"] == -13) != batch.muDcyCount()):
+    failed = True
+numuDetector = history["numuDetector"]
+hit = numuDetector["eventWeight"] > 0.0
+if (np.abs(numuDetector["x"][hit]) >= 100.0).any():
+    failed = True
+if failed:
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+nTests = nTests + 1
+
+##! Forced decays ############################################################################################
+descString = "Decays forced into the production straight, weights give the unbiased rate"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+failed = False
+forcedFlags = dict(flags, forcedDecay="ps")
+forced = eventBatch.eventBatch(nuSTRMCnst, forcedFlags, 5.0, 3.8, 42, 50.0, [0.0, 0.0, 50.0], rng=np.random.default_rng(7))
+if forced.forcedWindow() != (tlLen, tlLen + psLen):
+    failed = True
+fHistory = forced.generate(0, nEvents)
+fDecay = fHistory["pionDecay"]
+if (forced.PSDcyCount() != nEvents) or (forced.tlDcyCount() != 0) or (forced.byndPSCount() != 0):
+    failed = True
+if (fDecay["s"] < tlLen).any() or (fDecay["s"] > tlLen + psLen).any():
+    failed = True
+#  every location of an event has the same weight, the target included
+if not np.array_equal(fHistory["target"]["eventWeight"], fDecay["eventWeight"]):
+    failed = True
+#  weighted forced decays estimate the unbiased weight in the straight
+wForced   = np.sum(fDecay["eventWeight"].astype(float))
+wUnbiased = np.sum(pionDecay["eventWeight"][inPS].astype(float))
+print("    weight of decays in the production straight: forced ", wForced, " unbiased ", wUnbiased)
+if abs(wForced/wUnbiased - 1.) > 0.05:
+    failed = True
+try:
+    eventBatch.eventBatch(nuSTRMCnst, dict(flags, forcedDecay="ring"), 5.0, 3.8, 42, 50.0, [0.0, 0.0, 50.0])
+    failed = True
+except Exception:
+    pass
+if failed:
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+nTests = nTests + 1
+
+##! Directed emission ########################################################################################
+descString = "Directed emission to the detector agrees with unbiased emission"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+#  the same events (same seed) with and without directed emission; detector downstream of the straight
+failed = False
+dirFlags = dict(flags, tlFlag=False, lstFlag=False, ringMuons=False, forcedDecay="ps")
+sums = {}
+for directed in (False, True):
+    dBatch = eventBatch.eventBatch(nuSTRMCnst, dict(dirFlags, directedEmission=directed), 5.0, 3.8, 42, 50.0,
+                                   [0.0, 0.0, psLen + 50.0], rng=np.random.default_rng(3))
+    dHistory = dBatch.generate(0, 50000)
+    for location in ["numuDetector", "nueDetector"]:
+        wts = dHistory[location]["eventWeight"].astype(float)
+        sums[(directed, location)] = (wts.sum(), np.sqrt(np.sum(wts*wts)), np.count_nonzero(wts > 0.))
+#  only the detector records change
+    if not directed:
+        unbiased = dHistory
+    elif not np.array_equal(dHistory["numuProduction"], unbiased["numuProduction"]):
+        failed = True
+for location in ["numuDetector", "nueDetector"]:
+    (sU, eU, nU), (sD, eD, nD) = sums[(False, location)], sums[(True, location)]
+    print("    ", location, ": unbiased ", sU, " +- ", eU, " (", nU, " hits), directed ", sD, " +- ", eD, " (", nD, " hits)")
+    if (abs(sD - sU) > 4.*np.sqrt(eU*eU + eD*eD)) or (nD < nU):
+        failed = True
+if failed:
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+nTests = nTests + 1
+
+##! Batch size and shards ####################################################################################
+descString = "Events drawn from their RandomStream do not depend on the batch size or the shard split"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+#  batches of the events [first, last) from a fresh generator, as one shard would make them
+def shardHistory(shardFlags, first, last, batchSize):
+    gen = eventBatch.eventBatch(nuSTRMCnst, shardFlags, 5.0, 3.8, 42, 50.0, [0.0, 0.0, 50.0], stream=RStrm.RandomStream(42))
+    batches = [gen.generate(i, min(batchSize, last-i)) for i in range(first, last, batchSize)]
+    return {location: np.concatenate([b[location] for b in batches]) for location in eventBatch.locations}
+
+failed = False
+dirFlags = dict(flags)
+dirFlags["directedEmission"] = True
+for shardFlags in (flags, dirFlags):
+    whole = shardHistory(shardFlags, 0, 3000, 3000)
+    small = shardHistory(shardFlags, 0, 3000, 700)
+    shard0 = shardHistory(shardFlags, 0, 1500, 400)
+    shard1 = shardHistory(shardFlags, 1500, 3000, 400)
+    for location in eventBatch.locations:
+        split = np.concatenate([shard0[location], shard1[location]])
+        if not (np.array_equal(whole[location], small[location]) and np.array_equal(whole[location], split)):
+            failed = True
+            print("    ", location, " differs")
+#  and the numbers of one event are those of its own stream
+stream = RStrm.RandomStream(42)
+draws = stream.eventDraws([7, 2999])
+first = [draws.random(2) for i in range(6)]
+for i, event in enumerate([7, 2999]):
+    if not np.array_equal(np.array([d[i] for d in first]), stream.eventGenerator(event).random(6)):
+        failed = True
+if failed:
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+nTests = nTests + 1
+
+##! Return straight detector ##################################################################################
+descString = "Muon decay neutrinos fill the return straight detector from one intersect with both planes"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+failed = False
+#  without an rsdPosition there is no return straight detector, as in the event by event loop
+noRsdHistory = eventBatch.eventBatch(nuSTRMCnst, flags, 5.0, 3.8, 42, 50.0, [0.0, 0.0, 50.0], rng=np.random.default_rng(5)).generate(0, 20000)
+for location in ["numuRSD", "nueRSD"]:
+    if (noRsdHistory[location]["pdgCode"] != 0).any():
+        failed = True
+rsdZ = psLen - 50.0
+rsdBatch = eventBatch.eventBatch(nuSTRMCnst, flags, 5.0, 3.8, 42, 50.0, [0.0, 0.0, 50.0], rng=np.random.default_rng(5),
+                                 rsdPosition=[2.*nuGeom.nuSTORMGeometry(nuSTRMCnst).ArcRad(), 0.0, rsdZ])
+rsdHistory = rsdBatch.generate(0, 100000)
+muonDecay = rsdHistory["muonDecay"]
+nHits = 0
+for location in ["numuRSD", "nueRSD"]:
+    rec = rsdHistory[location]
+    hit = rec["eventWeight"] > 0.
+    nHits = nHits + np.count_nonzero(hit)
+#  only neutrinos of muon decays in front of the detector, going toward it, and inside its acceptance
+    if (muonDecay["pdgCode"][hit] == 0).any() or (muonDecay["pz"][hit] >= 0.).any() or (muonDecay["z"][hit] <= rsdZ).any():
+        failed = True
+    if (np.abs(rec["x"][hit]) >= 2.5).any() or (np.abs(rec["y"][hit]) >= 2.5).any():
+        failed = True
+#  every muon decay has an RSD record, hit or not, and the RSD records nothing else
+    if not np.array_equal(rec["pdgCode"] != 0, muonDecay["pdgCode"] != 0):
+        failed = True
+print("    ", nHits, " neutrinos in the return straight detector")
+if nHits == 0:
+    failed = True
+if failed:
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+nTests = nTests + 1
+
+##! Complete:
+print()
+print("========  eventBatch:tests complete  ========")
+print ("\nNumber of tests is ", nTests, " number of fails is ", testFails)
+if testFails == 0:
+    sys.exit(0)
+else:
+    sys.exit(1)
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test script comparing the batched and the event by event generation
+====================================================================
+
+  Assumes that nuSim code and 04-Studies are in python path and nuSIMPATH
+  is set.
+
+  Script runs 04-Studies/RunCmpltSimulation.py twice with the same flags,
+  once event by event (--batchSize 0) and once with the eventBatch
+  generator, and checks that the two runs agree within their statistical
+  errors in:
+      - the fractions of events in each decay category
+      - the mean and RMS of s, p and t at pionDecay and muonDecay
+      - the summed detector weights per flavour at numuDetector,
+        nueDetector, numuRSD and nueRSD (the control file has no
+        rsdPosition, so the return straight detector is empty in both)
+  The runs have different run numbers, so the comparison is of the
+  distributions, not of the events.
+
+Version history:
+----------------------------------------------
+ 1.0: 18Oct26: First version
+ 1.1: 18Oct26: Compare all four detector locations again
+
+"""
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import subprocess
+import numpy as np
+import eventHistory as eventHistory
+import fluxAccumulator as fluxAccumulator
+import runSummary as runSummary
+
+#  agreement within nSigma of the combined statistical error
+nSigma = 5.0
+def agree(a, ea, b, eb):
+    return abs(a - b) <= nSigma*np.sqrt(ea*ea + eb*eb) + 1E-12
+
+##! Start:
+
+nTests = 0
+testFails = 0
+descriptions=[]
+testStatus=[]
+testTitle = "eventBatchVsEvent"
+
+print("========  ", testTitle, ": tests start  ========")
+
+nuSIMPATH = os.getenv("nuSIMPATH", ".")
+nEvents = 4000
+studyName = "batchVsEvent"
+control = {"description": "batched against event by event generation",
+           "flags": {"tlFlag": "True", "psFlag": "True", "lstFlag": "True", "muDcyFlag": "True", "flashAtDetector": "True",
+                     "PSMuons": "False", "ringMuons": "True", "tEqualsZero": "False", "pencilBeam": "False",
+                     "pDistInput": "False", "psDistInput": "False"},
+           "files": {"rootFile": "someFile.root", "logFile": "normalisation", "plotsDict": "none"},
+           "study": studyName, "printLimit": 0, "PPi": 5.0, "PMu": 3.8, "runNumber": "runNumber", "nEvents": nEvents,
+           "eventWeight": 50.0, "detectorPosition": [0.0, 0.0, 50.0]}
+
+studyDir = tempfile.mkdtemp()
+os.makedirs(os.path.join(studyDir, studyName))
+with open(os.path.join(studyDir, studyName, "batchVsEvent.dict"), "w") as dictFile:
+    json.dump(control, dictFile, indent=4)
+env = dict(os.environ, StudyDir=studyDir, StudyName=studyName)
+
+##! Run both generators ########################################################################################
+descString = "RunCmpltSimulation event by event and batched"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+failed = False
+arrays = {}
+summaries = {}
+fields = ["pdgCode", "s", "px", "py", "pz", "t"]
+for run, batchSize in [(1, 0), (2, 1000)]:
+    command = [sys.executable, os.path.join(nuSIMPATH, "04-Studies/RunCmpltSimulation.py"), "--dict", "batchVsEvent",
+               "--run", str(run), "--batchSize", str(batchSize)]
+    result = subprocess.run(command, cwd=nuSIMPATH, env=env, stdout=subprocess.DEVNULL)
+    if result.returncode != 0:
+        failed = True
+        continue
+    fileName = os.path.join(studyDir, studyName, "normalisation" + str(run) + ".root")
+    eH = eventHistory.eventHistory()
+    eH.inFile(fileName)
+    arrays[batchSize] = eH.getArrays(locations=["pionDecay", "muonDecay"], fields=fields)
+    del eH
+    summaries[batchSize] = runSummary.readSummary(fileName)
+if failed or (summaries[0] is None) or (summaries[1000] is None):
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+    print("\nNumber of tests is ", nTests + 1, " number of fails is ", testFails)
+    sys.exit(1)
+nTests = nTests + 1
+
+##! Decay categories ###########################################################################################
+descString = "Decay category fractions agree"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+failed = False
+for name in runSummary.categories:
+    f = {}
+    e = {}
+    for batchSize, summary in summaries.items():
+        f[batchSize] = summary.count(name)/summary.nEvents()
+        e[batchSize] = np.sqrt(max(f[batchSize]*(1. - f[batchSize]), 1./summary.nEvents())/summary.nEvents())
+    print("    ", name, ": event by event ", f[0], ", batched ", f[1000])
+    if not agree(f[0], e[0], f[1000], e[1000]):
+        failed = True
+if failed:
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+nTests = nTests + 1
+
+##! Kinematics at the decays ###################################################################################
+descString = "Mean and RMS of s, p and t at pionDecay and muonDecay agree"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+failed = False
+for location in ["pionDecay", "muonDecay"]:
+    values = {}
+    for batchSize, arr in arrays.items():
+        rec = arr[location]
+        keep = rec["pdgCode"] != 0
+        p = np.sqrt(rec["px"].astype(float)**2 + rec["py"].astype(float)**2 + rec["pz"].astype(float)**2)
+        values[batchSize] = {"s": rec["s"][keep].astype(float), "p": p[keep], "t": rec["t"][keep].astype(float)}
+    for quantity in ["s", "p", "t"]:
+        x0 = values[0][quantity]
+        x1 = values[1000][quantity]
+        if (len(x0) < 100) or (len(x1) < 100):
+            failed = True
+            continue
+        print("    ", location, quantity, ": mean ", x0.mean(), x1.mean(), ", rms ", x0.std(), x1.std())
+        if not agree(x0.mean(), x0.std()/np.sqrt(len(x0)), x1.mean(), x1.std()/np.sqrt(len(x1))):
+            failed = True
+        if not agree(x0.std(), x0.std()/np.sqrt(2.*len(x0)), x1.std(), x1.std()/np.sqrt(2.*len(x1))):
+            failed = True
+if failed:
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+nTests = nTests + 1
+
+##! Detector weights ###########################################################################################
+descString = "Summed detector weights per event agree"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+#  every hit carries the same eventWeight, so the error of a sum is the weight times the square root of the hits
+failed = False
+total = 0.
+eventWeight = control["eventWeight"]
+for location in ["numuDetector", "nueDetector", "numuRSD", "nueRSD"]:
+    for flavour in fluxAccumulator.flavours.values():
+        w = {}
+        e = {}
+        for batchSize, summary in summaries.items():
+            sumW = summary.sumWeights(location, flavour)
+            w[batchSize] = sumW/summary.nEvents()
+            e[batchSize] = np.sqrt(max(sumW, eventWeight)*eventWeight)/summary.nEvents()
+        total = total + w[0] + w[1000]
+        if (w[0] > 0.) or (w[1000] > 0.):
+            print("    ", location, flavour, ": event by event ", w[0], ", batched ", w[1000])
+        if not agree(w[0], e[0], w[1000], e[1000]):
+            failed = True
+if total <= 0.:
+    failed = True
+if failed:
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+nTests = nTests + 1
+
+##! Complete:
+shutil.rmtree(studyDir)
+print()
+print("========  eventBatchVsEvent:tests complete  ========")
+print ("\nNumber of tests is ", nTests, " number of fails is ", testFails)
+if testFails == 0:
+    sys.exit(0)
+else:
+    sys.exit(1)
@@ -13,6 +13,26 @@ Test script for eventHistory class
 
     @author  Paul Kyberd
 
+    @version    1.8
+    @date       18 October 2026
+    Schema 1 is the default
+
+    @version    1.7
+    @date       18 October 2026
+    Schema 1 and schema 2 round trip of generated events with "none" records holding data
+
+    @version    1.6
+    @date       18 October 2026
+    Write the same sparse batch with schema 1 and schema 2 and compare what is read back
+
+    @version    1.5
+    @date       18 October 2026
+    Write a tree that lives in the output file and read it after an AutoSave, before it is closed
+
+    @version    1.4
+    @date       18 October 2026
+    Write batches with fillBatch in chunks and read them back, also with readArrays and getArrays
+
     @version    1.3
     @date       01 July 2022
     Add numuRSD and nueRSD
@@ -39,6 +59,10 @@ import csv                          # so I can read a synthetic data file
 # nuStorm imports
 import eventHistory as eventHistory
 import particle as particle
+import eventBatch as eventBatch
+import ParticleBlock as ParticleBlock
+import numpy as np
+import nuSTORMConst
 
 ##! Start:
 nTests = 0
@@ -302,6 +326,273 @@ obj.addParticle("nueRSD", testParticle13)
 obj.display()
 
 del obj
+##! fillBatch: buffered bulk writes #######################################################################
+descString = "fillBatch writes buffered batches that read back event by event"
+descriptions.append(descString)
+
+print(testTitle, ": ",  descString)
+
+#  7 events in batches of 4 and 3 with a chunk size of 3, so a flush happens within each batch and at write
+nEvents = 7
+rng = np.random.default_rng(7)
+history = {}
+for location in eventBatch.locations:
+    block = ParticleBlock.ParticleBlock(nEvents)
+    rec = block.records()
+    rec["runNumber"] = 99
+    rec["eventNumber"] = np.arange(nEvents)
+    rec["pdgCode"] = -13
+    for field in ["x", "y", "z", "s", "px", "py", "pz", "t", "eventWeight"]:
+        rec[field] = rng.random(nEvents)
+    rec["mass"] = 105.66
+    rec["eventWeight"][::3] = 0.0
+    history[location] = block
+
+obj = eventHistory.eventHistory(chunkSize=3)
+obj.outFile("testBatchFile.root")
+obj.rootStructure()
+obj.fillBatch({location: history[location][0:4] for location in eventBatch.locations})
+obj.fillBatch({location: history[location][4:nEvents] for location in eventBatch.locations})
+obj.write()
+obj.outFileClose()
+del obj
+
+objRd = eventHistory.eventHistory()
+objRd.inFile("testBatchFile.root")
+testFlag = (objRd.getEntries() == nEvents)
+for event in range(nEvents):
+    objRd.readNext()
+    for location in eventBatch.locations:
+        rootPart = objRd.findParticle(location)
+        rec = history[location].records()[event]
+        if (rootPart.event() != event) or (rootPart.run() != 99):
+            testFlag = False
+        for value, expected in [(rootPart.x(), rec["x"]), (rootPart.s(), rec["s"]), (rootPart.px(), rec["px"]),
+                                (rootPart.t(), rec["t"]), (rootPart.weight(), rec["eventWeight"])]:
+            if abs(value - expected) > 1E-6:
+                testFlag = False
+
+if testFlag == False:
+    print(descriptions[nTests], " ..... failed")
+    testFails = testFails + 1
+nTests = nTests + 1
+
+##! readArrays and getArrays: columnar reads ##################################################################
+descString = "readArrays and getArrays return the batch as numpy arrays"
+descriptions.append(descString)
+
+print(testTitle, ": ",  descString)
+
+testFlag = True
+arrays = objRd.getArrays(["muonDecay", "nueDetector"], ["eventNumber", "x", "eventWeight"], chunkSize=2)
+for location in ["muonDecay", "nueDetector"]:
+    rec = history[location].records()
+    if not np.array_equal(arrays[location]["entry"], np.arange(nEvents)):
+        testFlag = False
+    if not np.array_equal(arrays[location]["eventNumber"], rec["eventNumber"]):
+        testFlag = False
+    if (np.abs(arrays[location]["x"] - rec["x"]) > 1E-6).any():
+        testFlag = False
+if ("target" in arrays) or ("px" in arrays["muonDecay"]):
+    testFlag = False
+
+#  weighted: only the entries with eventWeight > 0, a sub-range read in chunks of 2
+nChunks = 0
+for chunk in objRd.readArrays(["numuDetector"], ["eventWeight"], first=1, nEntries=5, chunkSize=2, weighted=True):
+    nChunks = nChunks + 1
+    rec = history["numuDetector"].records()
+    entry = chunk["numuDetector"]["entry"]
+    if (entry < 1).any() or (entry > 5).any() or (rec["eventWeight"][entry] <= 0.0).any():
+        testFlag = False
+    if (np.abs(chunk["numuDetector"]["eventWeight"] - rec["eventWeight"][entry]) > 1E-6).any():
+        testFlag = False
+if nChunks != 3:
+    testFlag = False
+arrays = objRd.getArrays(["numuDetector"], weighted=True)
+if len(arrays["numuDetector"]["x"]) != np.count_nonzero(history["numuDetector"].records()["eventWeight"] > 0.0):
+    testFlag = False
+
+if testFlag == False:
+    print(descriptions[nTests], " ..... failed")
+    testFails = testFails + 1
+nTests = nTests + 1
+
+del objRd
+
+##! Tree in the output file, readable before it is closed #####################################################
+descString = "Tree is written to the output file and AutoSave leaves a readable partial file"
+descriptions.append(descString)
+
+print(testTitle, ": ",  descString)
+
+#  small baskets and an AutoSave every 3 entries; the file is read while the writer still has it open
+obj = eventHistory.eventHistory(chunkSize=2, basketSize=4000, autoFlush=3, autoSave=3)
+obj.outFile("testAutoSaveFile.root")
+obj.rootStructure()
+testFlag = (obj.evTree.GetDirectory().GetName() == "testAutoSaveFile.root")
+obj.fillBatch({location: history[location][0:5] for location in eventBatch.locations})
+obj.autoSave()
+partial = eventHistory.eventHistory()
+partial.inFile("testAutoSaveFile.root")
+if partial.getEntries() != 5:
+    testFlag = False
+arrays = partial.getArrays(["numuDetector"], ["eventNumber"])
+if not np.array_equal(arrays["numuDetector"]["eventNumber"], np.arange(5)):
+    testFlag = False
+del partial
+obj.fillBatch({location: history[location][5:nEvents] for location in eventBatch.locations})
+obj.write()
+obj.outFileClose()
+del obj
+
+objRd = eventHistory.eventHistory()
+objRd.inFile("testAutoSaveFile.root")
+if objRd.getEntries() != nEvents:
+    testFlag = False
+if objRd._inTFile.GetListOfKeys().GetSize() != 1:
+    testFlag = False
+arrays = objRd.getArrays(["muonDecay"], ["eventNumber", "x"])
+if not np.array_equal(arrays["muonDecay"]["eventNumber"], np.arange(nEvents)) or \
+   (np.abs(arrays["muonDecay"]["x"] - history["muonDecay"].records()["x"]) > 1E-6).any():
+    testFlag = False
+
+if testFlag == False:
+    print(descriptions[nTests], " ..... failed")
+    testFails = testFails + 1
+nTests = nTests + 1
+
+del objRd
+
+##! Schema 2 and schema 1 files hold the same events ##########################################################
+descString = "Schema 2 (sparse) and schema 1 files read back the same records"
+descriptions.append(descString)
+
+print(testTitle, ": ",  descString)
+
+#  a location is absent (empty record, pdgCode 0) in about half of the events
+nSparse = 20000
+sparse = {}
+for j, location in enumerate(eventBatch.locations):
+    rec = np.zeros(nSparse, dtype=eventBatch.historyDtype)
+    present = rng.random(nSparse) < (0.9 if j == 0 else 0.5)
+    rec["runNumber"] = np.where(present, 99, -1)
+    rec["eventNumber"] = np.where(present, np.arange(nSparse), -1)
+    rec["pdgCode"] = np.where(present, [211, -13, 14, -11, 12][j % 5], 0)
+    for field in ["x", "y", "z", "s", "px", "py", "t", "eventWeight"]:
+        rec[field] = np.where(present, rng.random(nSparse), 0.0)
+    rec["pz"] = np.where(present, 1.0 + rng.random(nSparse), 0.01)
+    rec["mass"] = eventHistory.massOf(rec["pdgCode"])
+    sparse[location] = rec
+
+testFlag = True
+#  schema 1, the per-location branches, is written unless schema 2 is asked for
+if eventHistory.eventHistory().schema() != 1:
+    testFlag = False
+sizes = {}
+for schema in [1, 2]:
+    fileName = "testSchema" + str(schema) + ".root"
+    obj = eventHistory.eventHistory(schema=schema)
+    obj.outFile(fileName)
+    obj.rootStructure()
+    obj.fillBatch(sparse)
+    obj.write()
+    obj.outFileClose()
+    del obj
+    sizes[schema] = Path(fileName).stat().st_size
+
+readers = {}
+arrays = {}
+for schema in [1, 2]:
+    readers[schema] = eventHistory.eventHistory()
+    readers[schema].inFile("testSchema" + str(schema) + ".root")
+    if readers[schema].schema() != schema:
+        testFlag = False
+    arrays[schema] = readers[schema].getArrays(chunkSize=7000)
+for location in eventBatch.locations:
+    for field in eventHistory.leafDtype.names:
+        if not np.array_equal(arrays[1][location][field], arrays[2][location][field]):
+            print("    ", location, field, " differs")
+            testFlag = False
+        expected = sparse[location][field].astype(eventHistory.leafDtype[field])
+        if not np.array_equal(arrays[2][location][field], expected):
+            testFlag = False
+#  event by event: absent locations come back as "none" particles
+for event in range(5):
+    readers[2].readNext()
+    for location in eventBatch.locations:
+        if readers[2].findParticle(location).pdgCode() != sparse[location]["pdgCode"][event]:
+            testFlag = False
+print("    file size schema 1 ", sizes[1], " bytes, schema 2 ", sizes[2], " bytes")
+if sizes[2] >= sizes[1]:
+    testFlag = False
+del readers
+
+if testFlag == False:
+    print(descriptions[nTests], " ..... failed")
+    testFails = testFails + 1
+nTests = nTests + 1
+
+##! Schema 2 keeps the "none" records that hold data ############################################################
+descString = "Schema 1 and schema 2 round trip of generated events with beyondPS and transfer line decays"
+descriptions.append(descString)
+
+print(testTitle, ": ",  descString)
+
+#  pions lost beyond the production straight leave "none" records with s, t and a weight at pionDecay, and
+#  transfer line decays a "none" record with s at productionStraight
+flags = {"tlFlag": True, "psFlag": True, "lstFlag": True, "muDcyFlag": True, "flashAtDetector": True,
+         "PSMuons": True, "ringMuons": True, "tEqualsZero": False, "pencilBeam": False,
+         "pDistInput": False, "psDistInput": False}
+batch = eventBatch.eventBatch(nuSTORMConst.nuSTORMConst(), flags, 5.0, 3.8, 77, 50.0, [0.0, 0.0, 50.0],
+                              rng=np.random.default_rng(7))
+generated = batch.generate(0, 20000)
+testFlag = True
+if not ((generated["pionDecay"]["pdgCode"] == 0) & (generated["pionDecay"]["eventWeight"] > 0.)).any():
+    testFlag = False
+if not ((generated["productionStraight"]["pdgCode"] == 0) & (generated["productionStraight"]["s"] > 0.)).any():
+    testFlag = False
+for schema in [1, 2]:
+    obj = eventHistory.eventHistory(schema=schema)
+    obj.outFile("testRoundTrip" + str(schema) + ".root")
+    obj.rootStructure()
+    obj.fillBatch(generated)
+    obj.write()
+    obj.outFileClose()
+    del obj
+
+readers = {}
+for schema in [1, 2]:
+    readers[schema] = eventHistory.eventHistory()
+    readers[schema].inFile("testRoundTrip" + str(schema) + ".root")
+for weighted in [False, True]:
+    arrays = {schema: readers[schema].getArrays(weighted=weighted) for schema in [1, 2]}
+    for location in eventBatch.locations:
+        for field in ("entry",) + eventHistory.leafDtype.names:
+            if not np.array_equal(arrays[1][location][field], arrays[2][location][field]):
+                print("    ", location, field, " differs, weighted ", weighted)
+                testFlag = False
+        if not weighted:
+            for field in ["runNumber", "eventNumber", "pdgCode", "s", "t", "eventWeight"]:
+                expected = generated[location][field].astype(eventHistory.leafDtype[field])
+                if not np.array_equal(arrays[2][location][field], expected):
+                    testFlag = False
+#  and event by event
+for event in range(200):
+    readers[1].readNext()
+    readers[2].readNext()
+    for location in eventBatch.locations:
+        p1 = readers[1].findParticle(location)
+        p2 = readers[2].findParticle(location)
+        if (p1.run(), p1.event(), p1.pdgCode(), p1.s(), p1.t(), p1.weight()) != \
+           (p2.run(), p2.event(), p2.pdgCode(), p2.s(), p2.t(), p2.weight()):
+            testFlag = False
+del readers
+
+if testFlag == False:
+    print(descriptions[nTests], " ..... failed")
+    testFails = testFails + 1
+nTests = nTests + 1
+
 ##! tests complete ########################################################################################
 
 print()
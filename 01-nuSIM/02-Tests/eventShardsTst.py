@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test script for eventShards module
+==================================
+
+  Assumes that nuSim code is in python path.
+
+  Script checks that the shards cover the run with contiguous event numbers
+  and that the per-shard random streams are reproducible and independent
+
+Version history:
+----------------------------------------------
+ 1.0: 18Oct26: First version
+ 1.1: 18Oct26: The global generators are no longer seeded
+
+"""
+
+import sys
+import numpy as np
+import eventShards as eventShards
+
+##! Start:
+
+nTests = 0
+testFails = 0
+descriptions=[]
+testStatus=[]
+testTitle = "eventShards"
+
+print("========  ", testTitle, ": tests start  ========")
+
+##! Shard ranges #############################################################################################
+descString = "Shard ranges are contiguous and cover the run"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+failed = False
+for nEvents, nShards in [(1000, 1), (1000, 7), (5, 8), (0, 3), (100003, 16)]:
+    ranges = eventShards.shardRanges(nEvents, nShards)
+    if len(ranges) != nShards:
+        failed = True
+    nextEvent = 0
+    for firstEvent, n in ranges:
+        if firstEvent != nextEvent:
+            failed = True
+        nextEvent = firstEvent + n
+    if nextEvent != nEvents:
+        failed = True
+    sizes = [n for firstEvent, n in ranges]
+    if max(sizes) - min(sizes) > 1:
+        failed = True
+try:
+    eventShards.shardRanges(10, 0)
+    failed = True
+except ValueError:
+    pass
+if failed:
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+nTests = nTests + 1
+
+##! Shard random streams #####################################################################################
+descString = "Shard random streams are reproducible and independent"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+failed = False
+a = eventShards.shardRng(42, 3).random(1000)
+b = eventShards.shardRng(42, 3).random(1000)
+if not np.array_equal(a, b):
+    failed = True
+c = eventShards.shardRng(42, 4).random(1000)
+d = eventShards.shardRng(43, 3).random(1000)
+if np.array_equal(a, c) or np.array_equal(a, d):
+    failed = True
+#  streams of different shards are uncorrelated
+if abs(np.corrcoef(a, c)[0, 1]) > 0.15 or abs(np.corrcoef(a, d)[0, 1]) > 0.15:
+    failed = True
+if failed:
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+nTests = nTests + 1
+
+##! Shard file names #########################################################################################
+descString = "Shard file names"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+if eventShards.shardFileName("Scratch/normalisation12.root", 3) != "Scratch/normalisation12_shard3.root":
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+nTests = nTests + 1
+
+##! Complete:
+print()
+print("========  eventShards:tests complete  ========")
+print ("\nNumber of tests is ", nTests, " number of fails is ", testFails)
+if testFails == 0:
+    sys.exit(0)
+else:
+    sys.exit(1)
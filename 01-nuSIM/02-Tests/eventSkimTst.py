@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test script for eventSkim class
+===============================
+
+  Assumes that nuSim code is in python path.
+
+  Script selects batches of the eventBatch generator with the skim terms
+  and checks the masks, the event by event selection and the counts kept
+  for the run summary
+
+Version history:
+----------------------------------------------
+ 1.0: 18Oct26: First version
+ 1.1: 18Oct26: muonNotAbsorbed is now muonDecayed
+
+"""
+
+import sys
+import numpy as np
+import nuSTORMConst
+import eventBatch as eventBatch
+import ParticleBlock as ParticleBlock
+import eventSkim as eventSkim
+
+#  one event of a batch, looked at as eventHistory.findParticle would
+class batchEvent:
+    def __init__(self, history, i):
+        self._history = history
+        self._i = i
+    def findParticle(self, location):
+        return ParticleBlock.ParticleBlock(records=self._history[location])[self._i]
+
+##! Start:
+
+nTests = 0
+testFails = 0
+descriptions=[]
+testStatus=[]
+testTitle = "eventSkim"
+
+print("========  ", testTitle, ": tests start  ========")
+
+nuSTRMCnst = nuSTORMConst.nuSTORMConst()
+flags = {"tlFlag": True, "psFlag": True, "lstFlag": True, "muDcyFlag": True, "flashAtDetector": True,
+         "PSMuons": True, "ringMuons": True, "tEqualsZero": False, "pencilBeam": False,
+         "pDistInput": False, "psDistInput": False}
+batch = eventBatch.eventBatch(nuSTRMCnst, flags, 5.0, 3.8, 42, 50.0, [0.0, 0.0, 50.0], rng=np.random.default_rng(23))
+histories = [batch.generate(first, 5000) for first in (0, 5000)]
+detectors = ["numuDetector", "nueDetector", "numuRSD", "nueRSD"]
+
+##! Create instance and print out #############################################################################
+descString = "Create eventSkim and print"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+skim = eventSkim.eventSkim("detectorWeight")
+print("    __str__:", skim)
+print("    --repr__", repr(skim))
+nTests = nTests + 1
+
+##! Detector weight ###########################################################################################
+descString = "detectorWeight keeps the events with weight at a detector and counts the rest"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+failed = False
+nPassed = 0
+for history in histories:
+    expected = np.zeros(len(history["target"]), dtype=bool)
+    for location in detectors:
+        expected = np.logical_or(expected, history[location]["eventWeight"] > 0.)
+    nPassed = nPassed + np.count_nonzero(expected)
+    skimmed = skim.apply(history)
+    if any(len(skimmed[location]) != np.count_nonzero(expected) for location in eventBatch.locations):
+        failed = True
+    if not np.array_equal(skimmed["target"]["eventNumber"], history["target"]["eventNumber"][expected]):
+        failed = True
+if (skim.nEvents() != 10000) or (skim.nSelected() != nPassed) or (skim.nSkipped() != 10000 - nPassed):
+    failed = True
+if skim.summary() != {"nEvents": 10000, "nSelected": nPassed, "nSkipped": 10000 - nPassed}:
+    failed = True
+print("    ", nPassed, " of 10000 events selected")
+if (nPassed == 0) or (nPassed == 10000):
+    failed = True
+#  ParticleBlocks as fillBatch takes them
+blocks = {location: ParticleBlock.ParticleBlock(records=histories[0][location]) for location in eventBatch.locations}
+if not np.array_equal(eventSkim.eventSkim("detectorWeight").select(blocks), eventSkim.eventSkim("detectorWeight").select(histories[0])):
+    failed = True
+if failed:
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+nTests = nTests + 1
+
+##! Terms #####################################################################################################
+descString = "Named and location terms, lists of terms and no skim"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+failed = False
+history = histories[1]
+muon = history["muonDecay"]["pdgCode"] != 0
+if not np.array_equal(eventSkim.eventSkim("muonDecayed").select(history), muon):
+    failed = True
+if not np.array_equal(eventSkim.eventSkim("present:muonDecay").select(history), muon):
+    failed = True
+either = np.logical_or(history["nueDetector"]["eventWeight"] > 0., muon)
+if not np.array_equal(eventSkim.eventSkim(["weight:nueDetector", "muonDecayed"]).select(history), either):
+    failed = True
+noSkim = eventSkim.eventSkim()
+if noSkim.active() or not noSkim.select(history).all() or (noSkim.apply(history) is not history):
+    failed = True
+for bad in ["detector", "weight:nowhere", "mass:target", "muonNotAbsorbed"]:
+    try:
+        eventSkim.eventSkim(bad)
+        failed = True
+    except ValueError:
+        pass
+if failed:
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+nTests = nTests + 1
+
+##! Event by event ############################################################################################
+descString = "keep agrees with the batch selection event by event"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+failed = False
+mask = eventSkim.eventSkim(["detectorWeight", "muonDecayed"]).select(history)
+skim = eventSkim.eventSkim(["detectorWeight", "muonDecayed"])
+for i in range(0, len(mask), 10):
+    if skim.keep(batchEvent(history, i)) != mask[i]:
+        failed = True
+if (skim.nEvents() != len(range(0, len(mask), 10))) or (skim.nSelected() != np.count_nonzero(mask[::10])):
+    failed = True
+if failed:
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+nTests = nTests + 1
+
+##! Complete:
+print()
+print("========  eventSkim:tests complete  ========")
+print ("\nNumber of tests is ", nTests, " number of fails is ", testFails)
+if testFails == 0:
+    sys.exit(0)
+else:
+    sys.exit(1)
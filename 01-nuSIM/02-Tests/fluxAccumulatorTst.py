@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test script for fluxAccumulator class
+=====================================
+
+  Assumes that nuSim code is in python path.
+
+  Script fills the spectra from batches of the eventBatch generator and
+  checks them against np.histogram of the same records, and checks that
+  accumulators filled separately merge to the same spectra
+
+Version history:
+----------------------------------------------
+ 1.0: 18Oct26: First version
+
+"""
+
+import sys
+import numpy as np
+import nuSTORMConst
+import eventBatch as eventBatch
+import fluxAccumulator as fluxAccumulator
+
+##! Start:
+
+nTests = 0
+testFails = 0
+descriptions=[]
+testStatus=[]
+testTitle = "fluxAccumulator"
+
+print("========  ", testTitle, ": tests start  ========")
+
+nuSTRMCnst = nuSTORMConst.nuSTORMConst()
+flags = {"tlFlag": True, "psFlag": True, "lstFlag": True, "muDcyFlag": True, "flashAtDetector": True,
+         "PSMuons": True, "ringMuons": True, "tEqualsZero": False, "pencilBeam": False,
+         "pDistInput": False, "psDistInput": False}
+batch = eventBatch.eventBatch(nuSTRMCnst, flags, 5.0, 3.8, 42, 50.0, [0.0, 0.0, 50.0], rng=np.random.default_rng(42))
+histories = [batch.generate(first, 10000) for first in (0, 10000, 20000)]
+
+##! Create instance and print out #############################################################################
+descString = "Create fluxAccumulator and print"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+flux = fluxAccumulator.fluxAccumulator(histograms={"E": [50, 0.0, 5.0], "s": [100, 0.0, 1000.0]})
+for history in histories:
+    flux.fill(history)
+print("    __str__:", flux)
+print("    --repr__", repr(flux))
+nTests = nTests + 1
+
+##! Spectra agree with np.histogram ###########################################################################
+descString = "Spectra agree with np.histogram of the records"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+failed = False
+if (flux.nEvents() != 30000) or (len(flux.keys()) == 0):
+    failed = True
+for location, flavour in flux.keys():
+    pdgCode = [code for code, name in fluxAccumulator.flavours.items() if name == flavour][0]
+    rec = np.concatenate([history[location] for history in histories])
+    rec = rec[np.logical_and(rec["pdgCode"] == pdgCode, rec["eventWeight"] > 0.)]
+    w = rec["eventWeight"].astype(float)
+    E = np.sqrt(rec["px"].astype(float)**2 + rec["py"].astype(float)**2 + rec["pz"].astype(float)**2)
+    edges, sumW, sumW2 = flux.histogram(location, flavour, "E")
+    ref, refEdges = np.histogram(E, bins=50, range=(0.0, 5.0), weights=w)
+    if not np.allclose(sumW[1:-1], ref, rtol=1E-9, atol=1E-6):
+        failed = True
+#  under and overflow keep the rest of the weight
+    if abs(sumW.sum() - w.sum()) > 1E-6*w.sum() or abs(sumW[-1] - w[E >= 5.0].sum()) > 1E-6*w.sum():
+        failed = True
+    if abs(sumW2.sum() - np.sum(w*w)) > 1E-6*np.sum(w*w):
+        failed = True
+    if (flux.nEntries(location, flavour) != len(rec)) or abs(flux.sumWeights(location, flavour) - w.sum()) > 1E-6*w.sum():
+        failed = True
+    print("    ", location, flavour, ": ", len(rec), " entries, weight ", w.sum())
+if failed:
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+nTests = nTests + 1
+
+##! Merge #####################################################################################################
+descString = "Merged accumulators equal one accumulator filled with all the batches"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+failed = False
+parts = []
+for history in histories:
+    part = fluxAccumulator.fluxAccumulator(histograms={"E": [50, 0.0, 5.0], "s": [100, 0.0, 1000.0]})
+    part.fill(history)
+    parts.append(part)
+merged = parts[0]
+for part in parts[1:]:
+    merged.merge(part)
+if (merged.nEvents() != flux.nEvents()) or (merged.keys() != flux.keys()):
+    failed = True
+for location, flavour in flux.keys():
+    if merged.nEntries(location, flavour) != flux.nEntries(location, flavour):
+        failed = True
+    for quantity in ["E", "x", "y", "s", "t"]:
+        a = flux.histogram(location, flavour, quantity)
+        b = merged.histogram(location, flavour, quantity)
+        if not (np.allclose(a[1], b[1], rtol=1E-12) and np.allclose(a[2], b[2], rtol=1E-12)):
+            failed = True
+try:
+    merged.merge(fluxAccumulator.fluxAccumulator())
+    failed = True
+except ValueError:
+    pass
+if failed:
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+nTests = nTests + 1
+
+##! Complete:
+print()
+print("========  fluxAccumulator:tests complete  ========")
+print ("\nNumber of tests is ", nTests, " number of fails is ", testFails)
+if testFails == 0:
+    sys.exit(0)
+else:
+    sys.exit(1)
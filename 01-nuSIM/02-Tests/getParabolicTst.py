@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test script for Simulation.getParabolic
+=======================================
+
+  Assumes that nuSim code is in python path and nuSIMPATH is set.
+
+  Checks the closed-form parabolic sampler against the np.roots solution it
+  replaced: the two must agree to 1E-9 for every value (they agree to
+  rounding, about 1E-15).  The scalar and vectorised versions must agree to
+  1E-14.  The timings of the three versions are printed for information
+  only, they are not part of the pass/fail of the tests.
+
+Version history:
+----------------------------------------------
+ 1.0: 18Oct26: First version
+ 1.1: 18Oct26: Timings printed only, not a test
+
+"""
+
+import sys
+import random
+import timeit
+import numpy as np
+import Simulation as Simu
+import RandomStream as RStrm
+
+#.. Previous implementation: root of the cubic in [-p1, p1] from np.roots
+def getParabolicRoots(p1, ran):
+    a = np.array( [ 1., 0., (-3.*p1*p1), (2.*p1*p1*p1*(2.*ran - 1.)) ] )
+    r = np.roots(a)
+    r = r[np.abs(r.imag) < 1E-9].real
+    return r[np.abs(r) <= p1*(1. + 1E-9)][0]
+
+##! Start:
+
+nTests = 0
+testFails = 0
+descriptions=[]
+testStatus=[]
+testTitle = "getParabolic"
+
+print("========  ", testTitle, ": tests start  ========")
+
+##! Closed form agrees with np.roots #########################################################################
+descString = "Closed form agrees with np.roots solution"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+p1 = 0.25
+ran = np.random.default_rng(12345).random(2000)
+old = np.array([getParabolicRoots(p1, u) for u in ran])
+new = Simu.getParabolicArray(p1, ran)
+if np.abs(old - new).max() > 1E-9:
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed: max difference ", np.abs(old - new).max())
+nTests = nTests + 1
+
+##! Scalar and array versions agree ##########################################################################
+descString = "Scalar getParabolic and getParabolicArray agree"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+Simu.setRandomStream(RStrm.RandomStream(7))
+scalar = np.array([Simu.getParabolic(p1) for i in range(1000)])
+uniform = RStrm.RandomStream(7).uniforms(1000)
+if np.abs(scalar - Simu.getParabolicArray(p1, uniform)).max() > 1E-14:
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+if (np.abs(scalar).max() > p1):
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed: value outside [-p1, p1]")
+nTests = nTests + 1
+
+##! Timings, for information ################################################################################
+print(testTitle, ": ",  "Timings of np.roots, scalar closed form and array closed form (not a test)")
+
+nCall = 20000
+tRoots  = timeit.timeit(lambda: getParabolicRoots(p1, random.random()), number=nCall)
+tScalar = timeit.timeit(lambda: Simu.getParabolic(p1), number=nCall)
+tArray  = timeit.timeit(lambda: Simu.getParabolicArray(p1, np.random.random(nCall)), number=1)
+print("    np.roots          : ", 1E6*tRoots/nCall, " us per value")
+print("    closed form scalar: ", 1E6*tScalar/nCall, " us per value; speed-up ", tRoots/tScalar)
+print("    closed form array : ", 1E6*tArray/nCall, " us per value; speed-up ", tRoots/tArray)
+
+##! Complete:
+print()
+print("========  getParabolic:tests complete  ========")
+print ("\nNumber of tests is ", nTests, " number of fails is ", testFails)
+if testFails == 0:
+    sys.exit(0)
+else:
+    sys.exit(1)
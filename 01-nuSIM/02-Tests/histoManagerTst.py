@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test script for the numpy histograms of histoManager
+====================================================
+
+  Assumes that nuSim code and 12-examples are in python path.
+
+  Script checks the array fills of npHist1D and npHist2D against
+  np.histogram and against filling a value at a time, that managers
+  filled separately merge to the same histograms, and that
+  histsCreate.histsFillArrays fills as histsFill does event by event
+
+Version history:
+----------------------------------------------
+ 1.0: 18Oct26: First version
+ 1.1: 18Oct26: NaN values go to the overflow bin; the numpy backend is asked for
+
+"""
+
+import os
+import sys
+import timeit
+import numpy as np
+import particle as particle
+import histoManager as histoManager
+import histsCreate as histsCreate
+
+##! Start:
+
+nTests = 0
+testFails = 0
+descriptions=[]
+testStatus=[]
+testTitle = "histoManager"
+
+print("========  ", testTitle, ": tests start  ========")
+
+rng = np.random.default_rng(11)
+n = 20000
+x = rng.normal(0., 1.5, n)
+y = rng.normal(1., 2.0, n)
+w = rng.uniform(0., 2., n)
+
+##! Array fill ################################################################################################
+descString = "Array fill agrees with np.histogram and with a value at a time"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+failed = False
+hm = histoManager.histoManager(backend="numpy")
+h1 = hm.book("array fill", 50, -4.0, 4.0)
+h1.fill(x, w)
+ref, edges = np.histogram(x, bins=50, range=(-4.0, 4.0), weights=w)
+if not np.allclose(h1.sumW[1:-1], ref, rtol=1E-12):
+    failed = True
+if abs(h1.sumW[0] - w[x < -4.0].sum()) > 1E-9 or abs(h1.sumW[-1] - w[x >= 4.0].sum()) > 1E-9:
+    failed = True
+hOne = hm.book("one at a time", 50, -4.0, 4.0)
+for i in range(n):
+    hOne.Fill(x[i], w[i])
+if not (np.allclose(hOne.sumW, h1.sumW, rtol=1E-12) and np.allclose(hOne.sumW2, h1.sumW2, rtol=1E-12)):
+    failed = True
+if (h1.GetEntries() != n) or (hOne.GetEntries() != n) or (h1.GetBinContent(26) != h1.sumW[26]):
+    failed = True
+#  NaN values are counted in the overflow bin, as ROOT does, and in no other bin
+hNaN = hm.book("NaN fill", 50, -4.0, 4.0)
+xNaN = np.where(np.arange(n) % 10 == 0, np.nan, x)
+hNaN.fill(xNaN, w)
+hNaN.Fill(np.nan, 1.0)
+keep = ~np.isnan(xNaN)
+ref, edges = np.histogram(xNaN[keep], bins=50, range=(-4.0, 4.0), weights=w[keep])
+if not np.allclose(hNaN.sumW[1:-1], ref, rtol=1E-12) or (hNaN.GetEntries() != n + 1):
+    failed = True
+if abs(hNaN.sumW[-1] - w[keep & (xNaN >= 4.0)].sum() - w[~keep].sum() - 1.0) > 1E-9:
+    failed = True
+
+h2 = hm.book2("array fill 2D", 20, -4.0, 4.0, 30, -5.0, 7.0)
+h2.FillN(n, x, y, w)
+ref2, xEdges, yEdges = np.histogram2d(x, y, bins=[20, 30], range=[[-4.0, 4.0], [-5.0, 7.0]], weights=w)
+if not np.allclose(h2.sumW[1:-1, 1:-1], ref2, rtol=1E-12) or abs(h2.sumW.sum() - w.sum()) > 1E-9:
+    failed = True
+h2One = hm.book2("one at a time 2D", 20, -4.0, 4.0, 30, -5.0, 7.0)
+for i in range(0, n, 7):
+    h2One.Fill(x[i], y[i], w[i])
+ref2, xEdges, yEdges = np.histogram2d(x[::7], y[::7], bins=[20, 30], range=[[-4.0, 4.0], [-5.0, 7.0]], weights=w[::7])
+if not np.allclose(h2One.sumW[1:-1, 1:-1], ref2, rtol=1E-12):
+    failed = True
+if failed:
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+nTests = nTests + 1
+
+##! Merge #####################################################################################################
+descString = "Merged managers equal one manager filled with all the values"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+failed = False
+def booked():
+    hm = histoManager.histoManager(backend="numpy")
+    hm.book("x", 40, -4.0, 4.0)
+    hm.book2("x v y", 20, -4.0, 4.0, 20, -5.0, 7.0)
+    return hm
+whole = booked()
+whole.hists[0].fill(x, w)
+whole.hists[1].fill(x, y, w)
+merged = booked()
+for part in np.array_split(np.arange(n), 4):
+    hmPart = booked()
+    hmPart.hists[0].fill(x[part], w[part])
+    hmPart.hists[1].fill(x[part], y[part], w[part])
+    merged.merge(hmPart)
+for hWhole, hMerged in zip(whole.hists, merged.hists):
+    if not (np.allclose(hWhole.sumW, hMerged.sumW, rtol=1E-12) and np.allclose(hWhole.sumW2, hMerged.sumW2, rtol=1E-12)):
+        failed = True
+    if hWhole.GetEntries() != hMerged.GetEntries():
+        failed = True
+try:
+    merged.merge(histoManager.histoManager(backend="numpy"))
+    failed = True
+except ValueError:
+    pass
+if failed:
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+nTests = nTests + 1
+
+##! histsFillArrays ###########################################################################################
+descString = "histsFillArrays fills as histsFill event by event"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+failed = False
+plotsDict = os.path.join(os.getenv("nuSIMPATH", "."), "04-Studies/plotsPSMuDcy.dict")
+nEvt = 3000
+t0 = rng.uniform(0., 50., nEvt)
+arrays = {"x": rng.normal(0., 2.0, nEvt), "y": rng.normal(0., 2.0, nEvt), "z": np.full(nEvt, 230.),
+          "px": rng.normal(0., 0.02, nEvt), "py": rng.normal(0., 0.02, nEvt), "pz": rng.uniform(0.5, 4.0, nEvt),
+          "s": rng.uniform(0., 300., nEvt), "t": t0 + rng.uniform(0., 1000., nEvt),
+          "eventWeight": np.where(rng.random(nEvt) < 0.3, 0., rng.uniform(0., 2., nEvt))}
+hCEvent = histsCreate.histsCreate(histoManager.histoManager(backend="numpy"), plotsDict)
+hCArray = histsCreate.histsCreate(histoManager.histoManager(backend="numpy"), plotsDict)
+for location in ["target", "numuDetector"]:
+    hCEvent.histAdd(location)
+    hCArray.histAdd(location)
+
+def fillEvents():
+    for i in range(nEvt):
+        hCEvent.histsFill("target", particle.particle(1, i, 0., 0., 0., 0., 0., 0., 5., t0[i], 1., 211))
+        hCEvent.histsFill("numuDetector", particle.particle(1, i, arrays["s"][i], arrays["x"][i], arrays["y"][i],
+            arrays["z"][i], arrays["px"][i], arrays["py"][i], arrays["pz"][i], arrays["t"][i], arrays["eventWeight"][i], 14))
+def fillArrays():
+    target = {"x": np.zeros(nEvt), "y": np.zeros(nEvt), "z": np.zeros(nEvt), "px": np.zeros(nEvt), "py": np.zeros(nEvt),
+              "pz": np.full(nEvt, 5.), "s": np.zeros(nEvt), "t": t0, "eventWeight": np.ones(nEvt)}
+    hCArray.histsFillArrays("target", target, t0)
+    hCArray.histsFillArrays("numuDetector", arrays, t0)
+tEvent = timeit.timeit(fillEvents, number=1)
+tArray = timeit.timeit(fillArrays, number=1)
+print("    ", nEvt, " events: event at a time ", tEvent, " s, arrays ", tArray, " s")
+for hEvent, hArray in zip(hCEvent._hm.hists, hCArray._hm.hists):
+    if not (np.allclose(hEvent.sumW, hArray.sumW, rtol=1E-9) and hEvent.GetEntries() == hArray.GetEntries()):
+        print("    ", hEvent.GetTitle(), " differs")
+        failed = True
+if (hCEvent._NZWeight != hCArray._NZWeight) or (hCEvent._zeroWeight != hCArray._zeroWeight):
+    failed = True
+if failed:
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+nTests = nTests + 1
+
+##! Complete:
+print()
+print("========  histoManager:tests complete  ========")
+print ("\nNumber of tests is ", nTests, " number of fails is ", testFails)
+if testFails == 0:
+    sys.exit(0)
+else:
+    sys.exit(1)
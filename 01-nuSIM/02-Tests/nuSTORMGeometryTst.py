@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test script for nuSTORMGeometry class
+=====================================
+
+  Assumes that nuSim code is in python path and nuSIMPATH is set.
+
+  Script checks the cached constants against nuSTORMConst, that the
+  instance cannot be modified, and that the scalar and array beam
+  positions agree and are continuous round the ring, and that the ring
+  positions from the section table agree with walking round the ring
+  section by section, out to many turns.
+
+Version history:
+----------------------------------------------
+ 1.1: 18Oct26: ringPosition against the section by section walk
+ 1.0: 18Oct26: First version
+
+"""
+
+import sys
+import math
+import time
+import numpy as np
+import nuSTORMConst
+import nuSTORMGeometry as nuGeom
+
+##! Start:
+
+nTests = 0
+testFails = 0
+descriptions=[]
+testStatus=[]
+testTitle = "nuSTORMGeometry"
+
+print("========  ", testTitle, ": tests start  ========")
+
+nuSTRMCnst = nuSTORMConst.nuSTORMConst()
+
+##! Create instance and print out #############################################################################
+descString = "Create nuSTORMGeometry, print and compare with nuSTORMConst"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+geom = nuGeom.nuSTORMGeometry(nuSTRMCnst)
+print("    __str__:", geom)
+print("    --repr__", repr(geom))
+if (geom.TrfLineCmplxLen() != nuSTRMCnst.TrfLineCmplxLen()) or \
+   (geom.ProdStrghtLen() != nuSTRMCnst.ProdStrghtLen()) or \
+   (geom.Circumference() != nuSTRMCnst.Circumference()) or \
+   (geom.ArcLen() != nuSTRMCnst.ArcLen()) or \
+   (abs(geom.ArcRad() - nuSTRMCnst.ArcLen()/math.pi) > 1E-12) or \
+   (abs(geom.TrfLineCmplxAng() - nuSTRMCnst.TrfLineCmplxAng()*math.pi/180.) > 1E-12):
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+nTests = nTests + 1
+
+##! Frozen ###################################################################################################
+descString = "Instance is frozen"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+failed = False
+try:
+    geom._ArcLen = 1.
+    failed = True
+except AttributeError:
+    pass
+try:
+    geom.SectionBounds()[0] = 1.
+    failed = True
+except ValueError:
+    pass
+if failed:
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+nTests = nTests + 1
+
+##! Scalar and array beam positions agree ####################################################################
+descString = "BeamDir and BeamDirArray agree over two turns"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+tlLen = geom.TrfLineCmplxLen()
+s = np.linspace(-0.5*tlLen, tlLen + 2.*geom.Circumference(), 10001)
+(x, y, z), theta = geom.BeamDirArray(s)
+failed = False
+for i in range(len(s)):
+    R, Rinv, BeamPos, th = geom.BeamDir(s[i])
+    if (abs(BeamPos[0] - x[i]) > 1E-9) or (abs(BeamPos[2] - z[i]) > 1E-9) or (abs(th - theta[i]) > 1E-12):
+        failed = True
+    if np.abs(R.dot(Rinv) - np.eye(3)).max() > 1E-12:
+        failed = True
+if failed:
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+nTests = nTests + 1
+
+##! Continuity ###############################################################################################
+descString = "Beam position continuous at the section boundaries"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+failed = False
+for bound in geom.SectionBounds()[:-1]:
+    R0, Rinv0, pos0, th0 = geom.BeamDir(tlLen + bound - 1E-7)
+    R1, Rinv1, pos1, th1 = geom.BeamDir(tlLen + bound + 1E-7)
+    if np.abs(np.array(pos0) - np.array(pos1)).max() > 1E-5:
+        failed = True
+        print("    discontinuity at ", bound, pos0, pos1)
+if failed:
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+nTests = nTests + 1
+
+##! Section table against the walk round the ring ###########################################################
+descString = "ringPosition agrees with walking round the ring section by section"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+#.. reference: subtract the section lengths until the path length is used up
+def walk(pathLength):
+    PS  = geom.ProdStrghtLen()
+    Arc = geom.ArcLen()
+    Rad = geom.ArcRad()
+    sectionLengths = [PS, Arc, PS, Arc]
+    sectionPnt = 0
+    while pathLength > sectionLengths[sectionPnt]:
+        pathLength = pathLength - sectionLengths[sectionPnt]
+        sectionPnt = (sectionPnt+1)%4
+    d = pathLength
+    if (sectionPnt == 0):
+        return 0., d, 0.
+    elif (sectionPnt == 1):
+        theta = d/Rad
+        return Rad - Rad*math.cos(theta), PS + Rad*math.sin(theta), theta
+    elif (sectionPnt == 2):
+        return 2.*Rad, PS - d, math.pi
+    theta = math.pi + d/Rad
+    return Rad - Rad*math.cos(theta), Rad*math.sin(theta), theta
+
+failed = False
+sRing = np.random.default_rng(5).uniform(0., 60000., 2000)
+t0 = time.perf_counter()
+xRef, zRef, thRef = np.array([walk(sr) for sr in sRing]).T
+tWalk = time.perf_counter() - t0
+t0 = time.perf_counter()
+x, z, theta = geom.ringPosition(sRing)
+tTable = time.perf_counter() - t0
+print("    ", len(sRing), " path lengths: walk ", tWalk, " s, section table ", tTable, " s")
+#.. the walk accumulates rounding over the turns
+if (np.abs(x - xRef).max() > 1E-6) or (np.abs(z - zRef).max() > 1E-6) or (np.abs(theta - thRef).max() > 1E-8):
+    failed = True
+x1, z1, theta1 = geom.ringPosition(sRing[7])
+if (abs(x1 - x[7]) > 1E-12) or (abs(z1 - z[7]) > 1E-12) or (abs(theta1 - theta[7]) > 1E-12):
+    failed = True
+for i in range(0, len(sRing), 50):
+    R, Rinv, BeamPos, th = geom.BeamDir(geom.TrfLineCmplxLen() + sRing[i])
+    if (abs(BeamPos[0] - x[i]) > 1E-9) or (abs(BeamPos[2] - z[i]) > 1E-9) or (abs(th - theta[i]) > 1E-12):
+        failed = True
+if failed:
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+nTests = nTests + 1
+
+##! Complete:
+print()
+print("========  nuSTORMGeometry:tests complete  ========")
+print ("\nNumber of tests is ", nTests, " number of fails is ", testFails)
+if testFails == 0:
+    sys.exit(0)
+else:
+    sys.exit(1)
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test script for ringAcceptance class
+====================================
+
+  Assumes that nuSim code is in python path.
+
+  Script checks the acceptance masks against the event-at-a-time
+  calculation that NeutrinoEventInstance.Absorption made before it used
+  ringAcceptance, and times the two
+
+Version history:
+----------------------------------------------
+ 1.0: 18Oct26: First version
+
+"""
+
+import sys
+import math
+import timeit
+import numpy as np
+import ringAcceptance as ringAcc
+
+#  Absorption as NeutrinoEventInstance 1.8 had it, for one muon
+def AbsorptionRef(x, y, px, py, pz, muAcc, mup0):
+    n = 4.8
+    Mup = np.sqrt(px**2+py**2+pz**2)
+    Mup_spread = abs(Mup-mup0)/mup0 if mup0 != 0. else 0.
+    Mux = x
+    Muxp = px/pz
+    muy = y
+    muyp = py/pz
+    Muy = y*2.5/0.15
+    Muyp = muyp*2./0.006
+    def k(i):
+        return (2*math.pi*i)/3
+    def g(t):
+        return (abs(t-(1./3.)))**n
+    def f(x,y):
+        return 0.1*g(-x*math.cos(k(1))-y*math.sin(k(1)))+0.1*g(-x*math.cos(k(2))-y*math.sin(k(2)))+0.1*g(-x*math.cos(k(3))-y*math.sin(k(3)))
+    def epsilon(x):
+        epsilon_max = 0.001
+        epsilon_kink = muAcc-np.sqrt(epsilon_max*8.03)/1.36
+        a = epsilon_max/(muAcc-epsilon_kink)
+        epsilon0 = a*muAcc
+        return np.heaviside(x,1)*np.heaviside(epsilon_kink-x,0)*epsilon_max+np.heaviside(x-epsilon_kink,1)*np.heaviside(muAcc-x,1)*(epsilon0-a*x)
+    def emittance(x,xp,beta):
+        return x*x/beta+beta*xp*xp
+    noDynAccCutFlag = (mup0 == 0.)
+    if ((Mux*Mux/(0.05*0.05))+(Muxp*Muxp/(0.004*0.004)) < 1.) and (f(Muy, Muyp) < 1.0) and ((noDynAccCutFlag) or ((emittance(Mux,Muxp,19.98) <= epsilon(Mup_spread)) and (emittance(muy,muyp,22.96) <= epsilon(Mup_spread)))):
+        return False
+    return True
+
+##! Start:
+
+nTests = 0
+testFails = 0
+descriptions=[]
+testStatus=[]
+testTitle = "ringAcceptance"
+
+print("========  ", testTitle, ": tests start  ========")
+
+muAcc = 0.16
+mup0 = 3.8
+rng = np.random.default_rng(5)
+n = 20000
+x  = rng.normal(0., 0.03, n)
+y  = rng.normal(0., 0.03, n)
+pz = mup0*(1. + rng.normal(0., 0.1, n))
+px = pz*rng.normal(0., 0.002, n)
+py = pz*rng.normal(0., 0.002, n)
+
+##! Create instance and print out #############################################################################
+descString = "Create ringAcceptance and print"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+acc = ringAcc.ringAcceptance(muAcc, mup0)
+print("    __str__:", acc)
+print("    --repr__", repr(acc))
+nTests = nTests + 1
+
+##! Agrees with event-at-a-time Absorption ####################################################################
+descString = "Masks agree with the event-at-a-time Absorption"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+failed = False
+for p0 in [mup0, 0.]:
+    acc = ringAcc.ringAcceptance(muAcc, p0)
+    absorbed = acc.absorbed(x, y, px, py, pz)
+    ref = np.array([AbsorptionRef(x[i], y[i], px[i], py[i], pz[i], muAcc, p0) for i in range(n)])
+    if not np.array_equal(absorbed, ref):
+        failed = True
+    if not np.array_equal(acc.accepted(x, y, px, py, pz), np.logical_not(ref)):
+        failed = True
+    for i in range(0, n, 401):
+        if acc.isAbsorbed(x[i], y[i], px[i], py[i], pz[i]) != ref[i]:
+            failed = True
+    print("    p0 = ", p0, ": fraction accepted ", 1. - ref.mean())
+    if ref.all() or not ref.any():
+        failed = True
+if failed:
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+nTests = nTests + 1
+
+##! Dynamic acceptance ########################################################################################
+descString = "Dynamic acceptance is flat to the kink and zero beyond muAcc"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+acc = ringAcc.ringAcceptance(muAcc, mup0)
+eps = acc.epsilon([0., acc.epsKink()/2., acc.epsKink(), muAcc, muAcc*1.01])
+if (abs(eps[0] - 0.001) > 1E-12) or (abs(eps[1] - 0.001) > 1E-12) or (abs(eps[2] - 0.001) > 1E-9) or \
+   (abs(eps[3]) > 1E-12) or (eps[4] != 0.):
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+nTests = nTests + 1
+
+##! Benchmark #################################################################################################
+descString = "Benchmark array and event-at-a-time acceptance"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+tArray = timeit.timeit(lambda: acc.absorbed(x, y, px, py, pz), number=1)
+tLoop  = timeit.timeit(lambda: [AbsorptionRef(x[i], y[i], px[i], py[i], pz[i], muAcc, mup0) for i in range(n)], number=1)
+print("    ", n, " muons: array ", tArray, " s, event at a time ", tLoop, " s")
+nTests = nTests + 1
+
+##! Complete:
+print()
+print("========  ringAcceptance:tests complete  ========")
+print ("\nNumber of tests is ", nTests, " number of fails is ", testFails)
+if testFails == 0:
+    sys.exit(0)
+else:
+    sys.exit(1)
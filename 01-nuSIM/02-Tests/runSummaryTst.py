@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test script for runSummary class
+================================
+
+  Assumes that nuSim code is in python path.
+
+  Script fills run summaries from batches of the eventBatch generator and
+  checks the counts and detector weights against the records and the
+  generator, the stage times, the event by event fill, and that summaries
+  merge and are rebuilt from their values
+
+Version history:
+----------------------------------------------
+ 1.0: 18Oct26: First version
+
+"""
+
+import sys
+import time
+import numpy as np
+import nuSTORMConst
+import eventBatch as eventBatch
+import ParticleBlock as ParticleBlock
+import fluxAccumulator as fluxAccumulator
+import runSummary as runSummary
+
+#  one event of a batch, looked at as eventHistory.findParticle would
+class batchEvent:
+    def __init__(self, history, i):
+        self._history = history
+        self._i = i
+    def findParticle(self, location):
+        return ParticleBlock.ParticleBlock(records=self._history[location])[self._i]
+
+##! Start:
+
+nTests = 0
+testFails = 0
+descriptions=[]
+testStatus=[]
+testTitle = "runSummary"
+
+print("========  ", testTitle, ": tests start  ========")
+
+nuSTRMCnst = nuSTORMConst.nuSTORMConst()
+#  without PSMuons every muon is either absorbed or decays in the ring
+flags = {"tlFlag": True, "psFlag": True, "lstFlag": True, "muDcyFlag": True, "flashAtDetector": True,
+         "PSMuons": False, "ringMuons": True, "tEqualsZero": False, "pencilBeam": False,
+         "pDistInput": False, "psDistInput": False}
+batch = eventBatch.eventBatch(nuSTRMCnst, flags, 5.0, 3.8, 42, 50.0, [0.0, 0.0, 50.0], rng=np.random.default_rng(31))
+summary = runSummary.runSummary(42)
+histories = []
+for first in (0, 5000, 10000):
+    summary.start("generate")
+    histories.append(batch.generate(first, 5000))
+    summary.stop("generate")
+    summary.start("fill")
+    summary.fill(histories[-1])
+    summary.stop("fill")
+summary.setCategories(batch)
+detectors = ["numuDetector", "nueDetector", "numuRSD", "nueRSD"]
+
+##! Create instance and print out #############################################################################
+descString = "Create runSummary and print"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+print("    __str__:", summary)
+print("    --repr__", repr(summary))
+nTests = nTests + 1
+
+##! Counts and weights ########################################################################################
+descString = "Counts and detector weights agree with the generator and the records"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+failed = False
+if (summary.nEvents() != 15000) or (summary.runNumber() != 42):
+    failed = True
+for name in runSummary.categories:
+    if summary.count(name) != getattr(batch, name)():
+        failed = True
+if (summary.count("absorbedCount") == 0) or \
+   (summary.count("muDcyCount") + summary.count("absorbedCount") != summary.count("tlDcyCount") + summary.count("PSDcyCount")):
+    failed = True
+totalW = 0.
+for location in detectors:
+    rec = np.concatenate([history[location] for history in histories])
+    for pdgCode, flavour in fluxAccumulator.flavours.items():
+        w = rec["eventWeight"][np.logical_and(rec["pdgCode"] == pdgCode, rec["eventWeight"] > 0.)].astype(float)
+        if abs(summary.sumWeights(location, flavour) - w.sum()) > 1E-9*max(w.sum(), 1.):
+            failed = True
+        totalW = totalW + w.sum()
+if totalW <= 0.:
+    failed = True
+summary.setCounts({"nSelected": 1234})
+if (summary.count("nSelected") != 1234) or (summary.values()["nSelected"] != 1234):
+    failed = True
+if failed:
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+nTests = nTests + 1
+
+##! Times #####################################################################################################
+descString = "Stage times add up and give the events per second"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+failed = False
+timed = runSummary.runSummary()
+for i in range(2):
+    timed.start("sleep")
+    time.sleep(0.02)
+    timed.stop("sleep")
+if (timed.time("sleep") < 0.04) or (timed.time("sleep") > 1.0) or (timed.eventsPerSecond() != 0.):
+    failed = True
+if (summary.time("generate") <= 0.) or (summary.time("fill") <= 0.):
+    failed = True
+rate = 15000/(summary.time("generate") + summary.time("fill"))
+if abs(summary.eventsPerSecond() - rate) > 1E-9*rate or summary.values()["eventsPerSecond"] != summary.eventsPerSecond():
+    failed = True
+print("    ", summary.eventsPerSecond(), " events/s")
+if failed:
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+nTests = nTests + 1
+
+##! Merge and values ##########################################################################################
+descString = "Merged summaries add up and are rebuilt from their values"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+failed = False
+merged = runSummary.runSummary(42)
+for history in histories:
+    part = runSummary.runSummary(42)
+    part.fill(history)
+    part.setCounts({"nSelected": 10})
+    merged.merge(part)
+if (merged.nEvents() != summary.nEvents()) or (merged.count("nSelected") != 30):
+    failed = True
+for location in detectors:
+    for flavour in fluxAccumulator.flavours.values():
+        if abs(merged.sumWeights(location, flavour) - summary.sumWeights(location, flavour)) > 1E-9*max(summary.sumWeights(location, flavour), 1.):
+            failed = True
+rebuilt = runSummary.fromValues(summary.values())
+if rebuilt.values() != summary.values():
+    failed = True
+rebuilt.merge(runSummary.fromValues(summary.values()))
+if (rebuilt.nEvents() != 30000) or (rebuilt.runNumber() != 42) or abs(rebuilt.eventsPerSecond() - summary.eventsPerSecond()) > 1E-9*rate:
+    failed = True
+if failed:
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+nTests = nTests + 1
+
+##! Event by event ############################################################################################
+descString = "fillEvent agrees with the batch fill"
+descriptions.append(descString)
+print(testTitle, ": ",  descString)
+
+failed = False
+history = histories[0]
+byEvent = runSummary.runSummary()
+byBatch = runSummary.runSummary()
+byBatch.fill({location: records[:500] for location, records in history.items()})
+for i in range(500):
+    byEvent.fillEvent(batchEvent(history, i))
+if byEvent.nEvents() != 500:
+    failed = True
+for location in detectors:
+    for flavour in fluxAccumulator.flavours.values():
+        if abs(byEvent.sumWeights(location, flavour) - byBatch.sumWeights(location, flavour)) > 1E-6*max(byBatch.sumWeights(location, flavour), 1.):
+            failed = True
+if failed:
+    testFails = testFails + 1
+    print(descriptions[nTests], " ..... failed")
+nTests = nTests + 1
+
+##! Complete:
+print()
+print("========  runSummary:tests complete  ========")
+print ("\nNumber of tests is ", nTests, " number of fails is ", testFails)
+if testFails == 0:
+    sys.exit(0)
+else:
+    sys.exit(1)
@@ -17,3 +17,24 @@ cd $nuSIMPATH
 02-Tests/SimulationTst.py
 02-Tests/RunSimulation.py
 02-Tests/FluxCalcOutline.py
+02-Tests/eventBatchTst.py
+02-Tests/getParabolicTst.py
+02-Tests/MuonDecayBatchTst.py
+02-Tests/PionDecayBatchTst.py
+02-Tests/LorentzBoostTst.py
+02-Tests/nuSTORMGeometryTst.py
+02-Tests/ParticleBlockTst.py
+02-Tests/eventShardsTst.py
+02-Tests/RandomStreamTst.py
+02-Tests/detectorPlanesTst.py
+02-Tests/ringAcceptanceTst.py
+02-Tests/directedEmissionTst.py
+02-Tests/fluxAccumulatorTst.py
+02-Tests/histoManagerTst.py
+02-Tests/eventSkimTst.py
+02-Tests/runSummaryTst.py
+02-Tests/eventBatchVsEventTst.py
+02-Tests/controlTst.py
+02-Tests/RandomGeneratorTst.py
+02-Tests/eventHistoryTst.py
+02-Tests/PionTimeDistributionTst.py
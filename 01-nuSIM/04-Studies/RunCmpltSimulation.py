@@ -13,6 +13,34 @@ Model for calculating normalised numbers
     @author  Paul Kyberd
 
 
+    Add the batched event generator: with --batchSize > 0 the events are generated
+    batchSize at a time as numpy arrays by eventBatch and written with eventHistory.fillBatch;
+    build the lattice geometry (nuSTORMGeometry) once and pass it to the event instances;
+    --chunkSize sets how many batched events eventHistory buffers before a bulk write;
+    the random numbers come from RandomStream(runNumber) so a run can be reproduced; each event draws
+    from its own stream (runNumber, event), so the events do not depend on --batchSize (the batched
+    and the event by event generators use the stream in different orders, so --batchSize 0 gives
+    other events with the same distributions);
+    the optional forcedDecay flag forces the pion decays into the transfer line and/or
+    the production straight (batched generator only), eventWeight carries the compensating weight;
+    the optional directedEmission flag emits the detector neutrinos toward the detector face with
+    solid-angle weights (batched generator only); with the optional fluxOnly flag no event history
+    is written, the detector spectra are accumulated by fluxAccumulator and written to flux<run>.root;
+    the event history tree is written to the file as it fills: --basketSize, --autoFlush and --autoSave
+    set its branch buffers and flush/save intervals (negative values bytes, positive values entries);
+    the event history is written with schema 1, a branch per location, or with the compact schema 2
+    if --schema 2 is given;
+    with the optional skim entry of the control file only the events passing it (eventSkim) are written,
+    the counts of events generated, written and skipped go to the runSummary tree of the output file;
+    the runSummary tree (runSummary) also holds the events generated per decay category, the absorbed
+    muons, the summed weights per detector and flavour and the wall-clock time per stage, so runs are
+    normalised by adding up their summaries; a flux-only run writes them to its fluxSummary tree;
+    the event weight and the detector position come from the optional eventWeight and
+    detectorPosition entries of the control file (default 50 and [0, 0, 50])
+    @version    1.5
+    @date       18 October 2026
+    @author     Paul Kyberd
+
     change the initialisation of plane to allow the definition of the position in 
     x,y and z
     @version    1.4
@@ -56,6 +84,7 @@ import logging
 import PionConst as PC
 import MuonConst as MC
 import nuSTORMConst
+import nuSTORMGeometry as nuGeom
 import control
 import histoManager
 import nuSTORMPrdStrght as nuPrdStrt
@@ -66,6 +95,12 @@ import RandomGenerator as Rndm
 import plane as plane
 import particle as particle
 import eventHistory as eventHistory
+import eventBatch as eventBatch
+import fluxAccumulator as fluxAccumulator
+import eventSkim as eventSkim
+import runSummary as runSummary
+import Simulation as Simu
+import RandomStream as RStrm
 
 class normalisation:
 
@@ -75,10 +110,12 @@ class normalisation:
         self._byndPSCount = 0
         self._PSDcyCount = 0
         self._muDcyCount = 0
+        self._absorbedCount = 0
         self._tlAngle = tlCmplxAngle*math.pi/180.0
         self._sth = math.sin(self._tlAngle)
         self._cth = math.cos(self._tlAngle)
         self._mup0 = muonMom
+        self._geometry = nuGeom.nuSTORMGeometry(nuSTORMConst.nuSTORMConst())
 
 # transform x,y,z and px,py,pz co-ordinates from the transfer line local co-ordinates to the
 # global ones
@@ -220,36 +257,11 @@ class normalisation:
 #
     def ring(self, pathLength):
 
-      arcRadius = 50.0
-      sectionLengths=[180.0, arcRadius*math.pi, 180.0, arcRadius*math.pi]
-
-      sectionPnt = 0
-      while pathLength > 0.0:
-        pathLength = pathLength - sectionLengths[sectionPnt]
-        sectionPnt = (sectionPnt+1)%4
-
-      sectionPnt = (sectionPnt-1)%4
-      decayPnt = pathLength + sectionLengths[sectionPnt]
-      if (sectionPnt == 0):
-        theta = 0.0
-        zpos = 0.0 + decayPnt
-        deltaX = 0.0
-        direction = 0.0
-      elif (sectionPnt == 2):
-        theta = -math.pi
-        zpos = 180.0 - decayPnt
-        deltaX = -2*arcRadius
-        direction = math.pi
-      elif (sectionPnt == 1):
-        theta = decayPnt/arcRadius - 0.5*math.pi
-        zpos = 180.0 + arcRadius*math.cos(theta)
-        deltaX = 0.0 - arcRadius - arcRadius*math.sin(theta)
-        direction = 2.0*math.pi - decayPnt/arcRadius
-      elif (sectionPnt == 3):
-        theta = decayPnt/arcRadius + 0.5*math.pi
-        zpos = 0.0 + arcRadius*math.cos(theta)
-        deltaX = -arcRadius - arcRadius*math.sin(theta)
-        direction = math.pi - decayPnt/arcRadius
+# position in the ring from the section table of nuSTORMGeometry; pathLength may be a numpy array.
+# Here the ring bends toward -x and direction is measured the other way round from theta
+      x, zpos, theta = self._geometry.ringPosition(pathLength)
+      deltaX = -x
+      direction = np.mod(-theta, 2.0*math.pi)
 
       return deltaX, zpos, direction
 
@@ -369,6 +381,7 @@ class normalisation:
       if (Absorbed):
         testParticle = particle.particle(runNumber, event, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.01, 0.0, 0.0,   "none")
         eH.addParticle("muonDecay", testParticle)
+        self._absorbedCount = self._absorbedCount + 1
         if (self._muDcyCount < printLimit): print ("absorbed")
         if (PSMuonsFlag):
           muTSC = nuEvt.getTraceSpaceCoord()
@@ -534,6 +547,18 @@ class normalisation:
     def muDcyCount(self):
         return deepcopy(self._muDcyCount)
 
+    def tlDcyCount(self):
+        return deepcopy(self._tlDcyCount)
+
+    def PSDcyCount(self):
+        return deepcopy(self._PSDcyCount)
+
+    def byndPSCount(self):
+        return deepcopy(self._byndPSCount)
+
+    def absorbedCount(self):
+        return deepcopy(self._absorbedCount)
+
 
 if __name__ == "__main__" :
 
@@ -556,6 +581,12 @@ if __name__ == "__main__" :
     parser.add_argument('--p0', help='Select central pion momentum to be generated. If no central pion momentum is specified pion momentum from dictionary is used.',default='0.')
     parser.add_argument('--Mup0', help='Select central muon momentum to be stored in the ring. If no central muon momentum is specified muon momentum from dictionary is used.',default='0.')
     parser.add_argument('--inputFile', help='Specify root file with input histograms. Default: Scratch/target.root',default='Scratch/target.root')
+    parser.add_argument('--batchSize', help='Generate the events in batches of this size with the vectorised generator. Default: 0, one event at a time.',default='0')
+    parser.add_argument('--chunkSize', help='Number of batched events buffered before they are written to the tree. Default: 100000',default='100000')
+    parser.add_argument('--basketSize', help='Buffer size in bytes of each event history branch. Default: 32000',default='32000')
+    parser.add_argument('--autoFlush', help='Baskets flushed every autoFlush bytes (<0) or entries (>0). Default: -30000000',default='-30000000')
+    parser.add_argument('--autoSave', help='Tree header saved every autoSave bytes (<0) or entries (>0). Default: -300000000',default='-300000000')
+    parser.add_argument('--schema', help='Event history schema: 1 a full record per location, 2 compact. Default: 1',default='1')
     args = parser.parse_args()
 
     StudyDir = os.getenv('StudyDir')
@@ -588,6 +619,8 @@ if __name__ == "__main__" :
     if int(args.run) != 0:
         ctrlInst.setRunNumber(int(args.run))
     runNumber = ctrlInst.runNumber(True)
+# every random number of the run comes from the stream of the run number
+    Simu.setRandomStream(RStrm.RandomStream(runNumber))
 
 
 #       logfile initialisation
@@ -618,6 +651,11 @@ if __name__ == "__main__" :
     pencilBeamFlag = ctrlInst.pencilBeam()
     pDistInputFlag = ctrlInst.pDistInput()
     psDistInputFlag = ctrlInst.psDistInput()
+    forcedDecay = ctrlInst.forcedDecay()
+    directedEmission = ctrlInst.directedEmission()
+    fluxOnly = ctrlInst.fluxOnly()
+    skim = eventSkim.eventSkim(ctrlInst.skim())
+    summary = runSummary.runSummary(runNumber)
 
     print (f"Processing flags -- tlflag: {tlFlag} / psFlag: {psFlag} / lstFlag: {lstFlag} / muDcyFlag: {muDcyFlag} / FlshAtDetFlg: \
         {FlshAtDetFlg} / PSMuonsFlag: {PSMuonsFlag} / ringMuonsFlag: {ringMuonsFlag} / pencilBeamFlag: {pencilBeamFlag} / tEqualsZeroFlag: \
@@ -626,6 +664,7 @@ if __name__ == "__main__" :
         tlFlag, psFlag, lstFlag, muDcyFlag, FlshAtDetFlg, PSMuonsFlag, ringMuonsFlag)
     logging.info("     tEqualsZero: %s", tEqualsZeroFlag)
     logging.info("     pencilBeam: %s, pDistInput: %s, psDistInput: %s", pencilBeamFlag, pDistInputFlag, psDistInputFlag)
+    logging.info("     forcedDecay: %s, directedEmission: %s, fluxOnly: %s, skim: %s", forcedDecay, directedEmission, fluxOnly, ctrlInst.skim())
 
 # get constants
     piCnst  = PC.PionConst()
@@ -634,7 +673,7 @@ if __name__ == "__main__" :
 
 # initialise run number, number of events to generate, central pion momentum, and event weight
     printLimit = ctrlInst.printLimit()
-    crossSection = 50
+    crossSection = ctrlInst.eventWeight()
     nEvents = ctrlInst.nEvents()
     eventWeight = crossSection
     logging.info("Run Number: %s,  nEvents: %s,  pion central momentum: %s,  muon central momentum: %s", runNumber, nEvents, pionMom, muonMom)
@@ -667,146 +706,213 @@ if __name__ == "__main__" :
     psLength = nuSTRMCnst.ProdStrghtLen()
     detectorPosZ = nuSTRMCnst.HallWallDist()
     nuTrLnCmplx = nuTrfLineCmplx.nuSTORMTrfLineCmplx(trfCmplxFile)
+# lattice geometry - built once and given to every event instance
+    geometry = nuGeom.nuSTORMGeometry(nuSTRMCnst, nuPrdStrt.nuSTORMPrdStrght(filename))
 # set up the detector front face
-    zPlPos = 50.0
-    xPlPos = 0.0
-    yPlPos = 0.0
+    xPlPos, yPlPos, zPlPos = ctrlInst.detectorPosition()
     position = [xPlPos, yPlPos, zPlPos]
     fluxPlane = plane.plane(position)
 #    fluxPlane = plane.plane(psLength, detectorPosZ)
+# flux-only run: the detector spectra are accumulated in memory, no event history is written
+    if (fluxOnly):
+        flux = fluxAccumulator.fluxAccumulator(histograms=ctrlInst.fluxHistograms())
+        fluxFilename = os.path.join(StudyDir, StudyName, 'flux' + str(ctrlInst.runNumber()) + '.root')
+        logging.info("Flux-only run, flux histograms: %s", fluxFilename)
+    else:
 # set up the event history - instantiate
-    eH = eventHistory.eventHistory()
-    eH.outFile(outFilename)
-    eH.cd()
+        eH = eventHistory.eventHistory(chunkSize=int(args.chunkSize), basketSize=int(args.basketSize),
+                                       autoFlush=int(args.autoFlush), autoSave=int(args.autoSave), schema=int(args.schema))
+        eH.outFile(outFilename)
+        eH.cd()
 # create the root structure to write to
-    eH.rootStructure()
+        eH.rootStructure()
 # initialise the python arrays to something sensible
-    eH.makeHistory()
+        eH.makeHistory()
+
+    batchSize = int(args.batchSize)
+    logging.info("Batch size: %s", batchSize)
+# the forced decays, the directed emission, the flux-only run and the return straight detector are only made by the batched generator
+    if (((forcedDecay != "none") or directedEmission or fluxOnly or (ctrlInst.rsdPosition() is not None)) and (batchSize == 0)):
+        print("ERROR: forcedDecay, directedEmission, fluxOnly and rsdPosition need the batched generator (--batchSize > 0)! Interrupting simulation...")
+        sys.exit()
+
+# batched event loop - the whole batch is generated as arrays and written in one call
+if (batchSize > 0):
+    flags = {"tlFlag": tlFlag, "psFlag": psFlag, "lstFlag": lstFlag, "muDcyFlag": muDcyFlag, "flashAtDetector": FlshAtDetFlg,
+             "PSMuons": PSMuonsFlag, "ringMuons": ringMuonsFlag, "tEqualsZero": tEqualsZeroFlag, "pencilBeam": pencilBeamFlag,
+             "pDistInput": pDistInputFlag, "psDistInput": psDistInputFlag, "forcedDecay": forcedDecay,
+             "directedEmission": directedEmission}
+    batchGen = eventBatch.eventBatch(nuSTRMCnst, flags, pionMom, muonMom, runNumber, eventWeight, position,
+                                     stream=Simu.getRandomStream(), RndmGen=RndmGen, geometry=geometry,
+                                     rsdPosition=ctrlInst.rsdPosition())
+    for firstEvent in range(0, nEvents, batchSize):
+        summary.start("generate")
+        history = batchGen.generate(firstEvent, min(batchSize, nEvents-firstEvent))
+        summary.stop("generate")
+        summary.start("fill")
+        summary.fill(history)
+        if (fluxOnly):
+            flux.fill(history)
+        else:
+            eH.fillBatch(skim.apply(history))
+        summary.stop("fill")
+        psValues = batchGen.getPSValues()
+        if (len(psValues) > 0):
+            nFill = len(psValues["td"])
+            if (psValues["td"] < 150.0).any():
+                print ("error in the time: ", np.count_nonzero(psValues["td"] < 150.0), " pion decays")
+            hTotal.FillN(nFill, psValues["td"], np.ones(nFill))
+            hLifetime.FillN(nFill, psValues["lifetime"], np.ones(nFill))
+            hStarttime.FillN(nFill, psValues["t"], np.ones(nFill))
+            hS.FillN(nFill, psValues["s"], np.ones(nFill))
+        print ("events generated: ", firstEvent + len(history["target"]))
+    print()
+    print(batchGen.muDcyCount()," neutrinos have been created.")
+    summary.setCategories(batchGen)
 
 # event loop
-for event in range(nEvents):
+else:
+    summary.start("generate")
+    for event in range(nEvents):
+# every random number of the event from its own stream, (runNumber, event)
+        Simu.getRandomStream().startEvent(event)
 # generate a pion
-    pi = piEvtInst.PionEventInstance(pionMom)
+        pi = piEvtInst.PionEventInstance(pionMom, geometry=geometry)
 # set its values
-    tsc = pi.getLclTraceSpaceCoord()
-    if __mainPrint:
-        print (f"----> main:(1) tsc is {tsc}")
-    s = tsc[0]
-    zl= tsc[3]
-
-    if (pDistInputFlag):
-        pPion = RndmGen.getRandom()
-    else:
-        pPion = pi.getppiGen()
-
-    if (psDistInputFlag):
-        xl, xpl = RndmGen.getRandom2Dx()
-        yl, ypl = RndmGen.getRandom2Dy()
-    elif (pencilBeamFlag):
-        xl = 0.0
-        yl = 0.0
-        xpl = 0.0
-        ypl = 0.0
-    else:
-        xl = tsc[1]
-        yl = tsc[2]
-        xpl = tsc[4]
-        ypl = tsc[5]
-
-    pzl = np.sqrt(pPion**2/(1+xpl**2+ypl**2))
-    pxl = pzl*xpl
-    pyl = pzl*ypl
-
-    if (tEqualsZeroFlag):
-        t = 0.0
-    else:
-        t = nuTrLnCmplx.GenerateTime()*1E9
+        tsc = pi.getLclTraceSpaceCoord()
+        if __mainPrint:
+            print (f"----> main:(1) tsc is {tsc}")
+        s = tsc[0]
+        zl= tsc[3]
+
+        if (pDistInputFlag):
+            pPion = RndmGen.getRandom()
+        else:
+            pPion = pi.getppiGen()
+
+        if (psDistInputFlag):
+            xl, xpl = RndmGen.getRandom2Dx()
+            yl, ypl = RndmGen.getRandom2Dy()
+        elif (pencilBeamFlag):
+            xl = 0.0
+            yl = 0.0
+            xpl = 0.0
+            ypl = 0.0
+        else:
+            xl = tsc[1]
+            yl = tsc[2]
+            xpl = tsc[4]
+            ypl = tsc[5]
+
+        pzl = np.sqrt(pPion**2/(1+xpl**2+ypl**2))
+        pxl = pzl*xpl
+        pyl = pzl*ypl
+
+        if (tEqualsZeroFlag):
+            t = 0.0
+        else:
+            t = nuTrLnCmplx.GenerateTime()*1E9
 # transform to the global system
-    xg, yg, zg, pxg, pyg, pzg = normInst.tltoGlbl(xl, yl, zl, pxl, pyl, pzl)
+        xg, yg, zg, pxg, pyg, pzg = normInst.tltoGlbl(xl, yl, zl, pxl, pyl, pzl)
 #  pion at target is a point source but with a momentum spread
-    pionTarget = particle.particle(runNumber, event, s, xg, yg, zg, pxg, pyg, pzg, t, eventWeight, "pi+")
-    eH.addParticle('target', pionTarget)
+        pionTarget = particle.particle(runNumber, event, s, xg, yg, zg, pxg, pyg, pzg, t, eventWeight, "pi+")
+        eH.addParticle('target', pionTarget)
 
 # generate a pion
-    if ((pDistInputFlag) or (psDistInputFlag) or (pencilBeamFlag)):
-        pi = piEvtInst.PionEventInstance(particleTar=pionTarget)
-        tsc = pi.getLclTraceSpaceCoord()
-        if __mainPrint:
-            print (f"----> main:(2) tsc is {tsc}")
+        if ((pDistInputFlag) or (psDistInputFlag) or (pencilBeamFlag)):
+            pi = piEvtInst.PionEventInstance(particleTar=pionTarget, geometry=geometry)
+            tsc = pi.getLclTraceSpaceCoord()
+            if __mainPrint:
+                print (f"----> main:(2) tsc is {tsc}")
 
 # get the decay length - in the transfer line, in the production straight - or lost beyond the straight
-    lifetime = pi.getLifetime()
-    pathLength = lifetime*pPion*c/piMass
+        lifetime = pi.getLifetime()
+        pathLength = lifetime*pPion*c/piMass
 
 # get the muon momentum
-    mu = pi.getmu4mmtm()
-    eMu  = mu[0]
-    pxMu = mu[1][0]
-    pyMu = mu[1][1]
-    pzMu = mu[1][2]
-    pMu  = math.sqrt(pxMu*pxMu + pyMu*pyMu + pzMu*pzMu)
+        mu = pi.getmu4mmtm()
+        eMu  = mu[0]
+        pxMu = mu[1][0]
+        pyMu = mu[1][1]
+        pzMu = mu[1][2]
+        pMu  = math.sqrt(pxMu*pxMu + pyMu*pyMu + pzMu*pzMu)
 # and decay the muon
-    if __mainPrint:
-        print (f"----> main: tsc for neutrinoEventInstance is {pi.getTraceSpaceCoord()}")
+        if __mainPrint:
+            print (f"----> main: tsc for neutrinoEventInstance is {pi.getTraceSpaceCoord()}")
 
-    nuEvt = nuEvtInst.NeutrinoEventInstance(pMu,pi.getTraceSpaceCoord())
+        nuEvt = nuEvtInst.NeutrinoEventInstance(pMu,pi.getTraceSpaceCoord(),geometry=geometry)
 
-    Absorbed = nuEvt.Absorption(pi.getTraceSpaceCoord(), pi.getmu4mmtm(), pi.getcostheta(), muonMom)
+        Absorbed = nuEvt.Absorption(pi.getTraceSpaceCoord(), pi.getmu4mmtm(), pi.getcostheta(), muonMom)
 
 # decay in the transferline
-    if ((tlFlag) and (pathLength < tlCmplxLength)):
-      normInst.tlDecay()
-      if (muDcyFlag):normInst.decayMuons()
-    else:
+        if ((tlFlag) and (pathLength < tlCmplxLength)):
+          normInst.tlDecay()
+          if (muDcyFlag):normInst.decayMuons()
+        else:
 # pion reaches end of transfer line just write out a new pion with altered s and z - all other pions must do this
 # the magnets bend the beam so that the local co-ordinates are now the global ones
-      se = tlCmplxLength
-      ze = 0.0
+          se = tlCmplxLength
+          ze = 0.0
 # t = d/(beta*c)
-      Epion = math.sqrt(pPion**2 + piMass**2)
-      te = t + 1E9*se*Epion/(c*pPion)
+          Epion = math.sqrt(pPion**2 + piMass**2)
+          te = t + 1E9*se*Epion/(c*pPion)
 # x local is the same as before.
-      pionPS = particle.particle(runNumber, event, se, xl, yl, ze, pxl, pyl, pzl, te, eventWeight, "pi+")
-      eH.addParticle("productionStraight", pionPS)
+          pionPS = particle.particle(runNumber, event, se, xl, yl, ze, pxl, pyl, pzl, te, eventWeight, "pi+")
+          eH.addParticle("productionStraight", pionPS)
 # decay beyond the end of the production straight
-    if ((lstFlag) and (pathLength > tlCmplxLength + psLength)):
-        normInst.beyondPS()
+        if ((lstFlag) and (pathLength > tlCmplxLength + psLength)):
+            normInst.beyondPS()
 
 # decay in the production straight
-    if ((psFlag) and (pathLength >= tlCmplxLength) and (pathLength <= tlCmplxLength + psLength)):
-        normInst.decayPiInPS()
+        if ((psFlag) and (pathLength >= tlCmplxLength) and (pathLength <= tlCmplxLength + psLength)):
+            normInst.decayPiInPS()
 # decay the muons
-        if (muDcyFlag): normInst.decayMuons()
+            if (muDcyFlag): normInst.decayMuons()
 
 
 
-#  write to the root structure
-    eH.fill()
+#  write to the root structure - if the event passes the skim
+        summary.fillEvent(eH)
+        if skim.keep(eH):
+            eH.fill()
 # tell the user what is happening
-    if (event < 10):
-        print ("event number is ", event)
-        print (pi)
-        print (tsc)
-        print (pionTarget)
-    elif ((event <100) and (event%10 ==0)):
-        print ("event number is ", event)
-    elif ((event <1000) and (event%100 ==0)):
-        print ("event number is ", event)
-    elif ((event < 10000) and (event%1000 ==0)):
-        print ("event number is ", event)
-    elif ((event < 100000) and (event%10000 ==0)):
-        print ("event number is ", event)
-    else:
-        if (event%100000 ==0): print ("event number is ", event)
-
-    if (event == nEvents-1):
-        print()
-        print(normInst.muDcyCount()," neutrinos have been created.")
-
+        if (event < 10):
+            print ("event number is ", event)
+            print (pi)
+            print (tsc)
+            print (pionTarget)
+        elif ((event <100) and (event%10 ==0)):
+            print ("event number is ", event)
+        elif ((event <1000) and (event%100 ==0)):
+            print ("event number is ", event)
+        elif ((event < 10000) and (event%1000 ==0)):
+            print ("event number is ", event)
+        elif ((event < 100000) and (event%10000 ==0)):
+            print ("event number is ", event)
+        else:
+            if (event%100000 ==0): print ("event number is ", event)
+
+        if (event == nEvents-1):
+            print()
+            print(normInst.muDcyCount()," neutrinos have been created.")
+    summary.stop("generate")
+    summary.setCategories(normInst)
 
 # Write to the root output file and close
-eH.write()
-eH.outFileClose()
+if (fluxOnly):
+    flux.write(fluxFilename, summary=summary.values())
+    print(flux)
+else:
+    summary.start("write")
+    eH.write()
+    summary.stop("write")
+    summary.setCounts(skim.summary())
+    eH.writeSummary(summary.values())
+    eH.outFileClose()
+    print(skim)
+    logging.info("%s", skim)
+print(summary)
+logging.info("%s", summary)
 # Write out histograms
 fileName = os.path.join(StudyDir, StudyName + "/Normalplots" + str(ctrlInst.runNumber()) + ".root")
 print(f"filename is {fileName}")
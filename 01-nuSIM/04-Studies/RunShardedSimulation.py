@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sharded version of the complete simulation
+==========================================
+
+    Assumes that nuSim code is in python path.
+
+    @file RunShardedSimulation.py
+
+    @brief   Splits the events of a run into shards, generates the shards in
+             parallel with the batched generator and merges the eventHistory
+             outputs into one file
+
+    The run number is taken (once) from the control file or from --run.  Shard k
+    generates the block of events eventShards.shardRanges(nEvents, nShards)[k], with
+    the event numbers of the unsharded run, so the merged file has contiguous event
+    numbers.  The events draw their random numbers from the event streams of
+    RandomStream(runNumber), so a shard gives the same events whether it runs in the
+    process pool here or as one job of a job array (--shard k), and the events of a run
+    are the same whatever the number of shards or the batch size.  The global generators
+    (random, numpy.random, ROOT.gRandom) are not seeded.
+
+    Process pool:  RunShardedSimulation.py --dict MuRingDcy --nShards 16 --nProcesses 8
+    Job array:     RunShardedSimulation.py --dict MuRingDcy --run 123 --nShards 16 --shard $TASK_ID
+                   RunShardedSimulation.py --dict MuRingDcy --run 123 --nShards 16 --merge
+
+    @author     Paul Kyberd
+
+    @version     1.3
+    @date        18 October 2026
+    the output files are in the study directory of --studyname, else of $StudyName, as in RunCmpltSimulation
+
+    @version     1.2
+    @date        18 October 2026
+    the shards no longer seed the global generators, everything is drawn from RandomStream(runNumber)
+
+    @version     1.1
+    @date        18 October 2026
+    --basketSize, --autoFlush, --autoSave and --schema set up the shard event history trees;
+    the shards apply the skim of the control file and their run summaries are added up on merging;
+    the run summaries (runSummary) hold the decay category and absorbed-muon counts, the detector
+    weights and the stage times of each shard; the event weight and the detector position are read
+    from the control file as in RunCmpltSimulation
+
+    @version     1.0
+    @date        18 October 2026
+
+"""
+
+import os, sys
+from datetime import datetime
+import argparse
+import multiprocessing
+import logging
+import control
+import eventShards as eventShards
+
+__version__ = 1.3
+
+#  Generate one shard and write it to its own eventHistory file
+def runShard(shardArgs):
+    controlFile, rootFilename, runNumber, pionMom, muonMom, inputFile, nShards, shardId, batchSize, chunkSize, treeSettings = shardArgs
+
+    import numpy as np
+    import nuSTORMConst
+    import nuSTORMGeometry as nuGeom
+    import nuSTORMPrdStrght as nuPrdStrt
+    import RandomGenerator as Rndm
+    import eventHistory as eventHistory
+    import eventBatch as eventBatch
+    import eventSkim as eventSkim
+    import runSummary as runSummary
+    import RandomStream as RStrm
+
+    ctrlInst = control.control(controlFile)
+    ctrlInst.setRunNumber(runNumber)
+    firstEvent, nEvents = eventShards.shardRanges(ctrlInst.nEvents(), nShards)[shardId]
+
+#  the events draw from their own streams of RandomStream(runNumber), so they do not depend on the
+#  shard split
+    stream = RStrm.RandomStream(runNumber)
+
+    nuSTRMCnst = nuSTORMConst.nuSTORMConst()
+    nuSIMPATH = os.getenv('nuSIMPATH')
+    filename  = os.path.join(nuSIMPATH, '11-Parameters/nuSTORM-PrdStrght-Params-v1.0.csv')
+    rootInputFilename = os.path.join(nuSIMPATH, inputFile)
+    shardFilename = eventShards.shardFileName(rootFilename, shardId)
+
+    histName = 'histP'+str(int(pionMom))+'GeV'
+    histName2Dx = 'histXPS'+str(int(pionMom))+'GeV'
+    histName2Dy = 'histYPS'+str(int(pionMom))+'GeV'
+    RndmGen = None
+    if (ctrlInst.pDistInput() or ctrlInst.psDistInput()):
+        RndmGen = Rndm.RandomGenerator(rootInputFilename, histName, histName2Dx, histName2Dy)
+    geometry = nuGeom.nuSTORMGeometry(nuSTRMCnst, nuPrdStrt.nuSTORMPrdStrght(filename))
+
+    flags = {"tlFlag": ctrlInst.tlFlag(), "psFlag": ctrlInst.psFlag(), "lstFlag": ctrlInst.lstFlag(),
+             "muDcyFlag": ctrlInst.muDcyFlag(), "flashAtDetector": ctrlInst.flashAtDetector(),
+             "PSMuons": ctrlInst.PSMuons(), "ringMuons": ctrlInst.ringMuons(), "tEqualsZero": ctrlInst.tEqualsZero(),
+             "pencilBeam": ctrlInst.pencilBeam(), "pDistInput": ctrlInst.pDistInput(), "psDistInput": ctrlInst.psDistInput(),
+             "forcedDecay": ctrlInst.forcedDecay(), "directedEmission": ctrlInst.directedEmission()}
+    eventWeight = ctrlInst.eventWeight()
+    position = ctrlInst.detectorPosition()
+    batchGen = eventBatch.eventBatch(nuSTRMCnst, flags, pionMom, muonMom, runNumber, eventWeight, position,
+                                     stream=stream, RndmGen=RndmGen, geometry=geometry,
+                                     rsdPosition=ctrlInst.rsdPosition())
+
+    eH = eventHistory.eventHistory(chunkSize=chunkSize, **treeSettings)
+    eH.outFile(shardFilename)
+    eH.cd()
+    eH.rootStructure()
+    skim = eventSkim.eventSkim(ctrlInst.skim())
+    summary = runSummary.runSummary(runNumber)
+    for first in range(firstEvent, firstEvent + nEvents, batchSize):
+        summary.start("generate")
+        history = batchGen.generate(first, min(batchSize, firstEvent + nEvents - first))
+        summary.stop("generate")
+        summary.start("fill")
+        summary.fill(history)
+        eH.fillBatch(skim.apply(history))
+        summary.stop("fill")
+    summary.start("write")
+    eH.write()
+    summary.stop("write")
+    summary.setCategories(batchGen)
+    summary.setCounts(skim.summary())
+    eH.writeSummary(summary.values())
+    eH.outFileClose()
+
+    print ("shard ", shardId, ": events ", firstEvent, " to ", firstEvent + nEvents - 1, ", ", batchGen.muDcyCount(),
+           " neutrinos have been created, written to ", shardFilename)
+    return shardFilename, nEvents, batchGen.muDcyCount()
+
+
+if __name__ == "__main__" :
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--dict', help='Select which run condition dictionary to use. Default: MuRingDcy[.dict]', default='MuRingDcy')
+    parser.add_argument('--run', help='Select which run number to use. If no run number is specified consecutive run number is used.', default='0')
+    parser.add_argument('--studyname', help='Select which study name to use. If no study name is specified study name from dictionary is used.', default='noName')
+    parser.add_argument('--p0', help='Select central pion momentum to be generated. If no central pion momentum is specified pion momentum from dictionary is used.',default='0.')
+    parser.add_argument('--Mup0', help='Select central muon momentum to be stored in the ring. If no central muon momentum is specified muon momentum from dictionary is used.',default='0.')
+    parser.add_argument('--inputFile', help='Specify root file with input histograms. Default: Scratch/target.root',default='Scratch/target.root')
+    parser.add_argument('--nShards', help='Number of shards the events are split into. Default: 1',default='1')
+    parser.add_argument('--nProcesses', help='Number of processes in the pool. Default: number of cpus',default='0')
+    parser.add_argument('--shard', help='Generate only this shard (job array); needs --run. Default: -1, all shards',default='-1')
+    parser.add_argument('--merge', help='Only merge the shard files of the run (job array); needs --run', action='store_true')
+    parser.add_argument('--keepShards', help='Keep the shard files after merging', action='store_true')
+    parser.add_argument('--batchSize', help='Number of events generated per call of the batched generator. Default: 100000',default='100000')
+    parser.add_argument('--chunkSize', help='Number of events buffered before they are written to the tree. Default: 100000',default='100000')
+    parser.add_argument('--basketSize', help='Buffer size in bytes of each event history branch. Default: 32000',default='32000')
+    parser.add_argument('--autoFlush', help='Baskets flushed every autoFlush bytes (<0) or entries (>0). Default: -30000000',default='-30000000')
+    parser.add_argument('--autoSave', help='Tree header saved every autoSave bytes (<0) or entries (>0). Default: -300000000',default='-300000000')
+    parser.add_argument('--schema', help='Event history schema: 1 a full record per location, 2 compact. Default: 1',default='1')
+    args = parser.parse_args()
+
+    StudyDir = os.getenv('StudyDir')
+    if args.studyname != "noName":
+        StudyName = args.studyname
+    else:
+        StudyName = os.getenv('StudyName')
+    controlFile = os.path.join(StudyDir, StudyName, args.dict+".dict")
+    ctrlInst = control.control(controlFile)
+
+    nShards = int(args.nShards)
+    shard = int(args.shard)
+    if ((shard >= 0) or args.merge) and (int(args.run) == 0):
+        sys.exit("RunShardedSimulation: --shard and --merge need the run number given with --run")
+# run number read (and incremented) once, here, and handed to every shard
+    if int(args.run) != 0:
+        ctrlInst.setRunNumber(int(args.run))
+    runNumber = ctrlInst.runNumber(True)
+
+    pionMom = float(args.p0) if float(args.p0) != 0. else ctrlInst.PPi()
+    muonMom = float(args.Mup0) if float(args.Mup0) != 0. else ctrlInst.PMu()
+
+    logging.basicConfig(filename=ctrlInst.logFile(), level=logging.INFO)
+    now = datetime.now()
+    dt_string = now.strftime("%d/%m/%Y %H:%M:%S")
+    print ("========  Sharded simulation run: start  ======== Version ", __version__)
+    logging.info("========  Sharded simulation run: start  ======== Version %s, ... %s", __version__, dt_string)
+    logging.info("Control File: %s, Run Number: %s, nEvents: %s, nShards: %s", controlFile, runNumber, ctrlInst.nEvents(), nShards)
+
+    rootFilename = os.path.join(StudyDir, StudyName, 'normalisation' + str(runNumber) + '.root')
+    shardFiles = [eventShards.shardFileName(rootFilename, shardId) for shardId in range(nShards)]
+    treeSettings = {"basketSize": int(args.basketSize), "autoFlush": int(args.autoFlush), "autoSave": int(args.autoSave),
+                    "schema": int(args.schema)}
+    shardArgs = [(controlFile, rootFilename, runNumber, pionMom, muonMom, args.inputFile, nShards, shardId, int(args.batchSize), int(args.chunkSize),
+                  treeSettings) for shardId in range(nShards)]
+
+    if (shard >= 0):
+        runShard(shardArgs[shard])
+    else:
+        if not args.merge:
+            nProcesses = int(args.nProcesses) if int(args.nProcesses) > 0 else os.cpu_count()
+#  spawn rather than fork: each shard sets up ROOT from scratch
+            with multiprocessing.get_context("spawn").Pool(min(nProcesses, nShards)) as pool:
+                for shardFilename, nEvents, nNeutrinos in pool.imap(runShard, shardArgs):
+                    logging.info("   %s: %s events, %s neutrinos", shardFilename, nEvents, nNeutrinos)
+        nEntries = eventShards.mergeShards(shardFiles, rootFilename)
+        summary = eventShards.mergeSummaries(shardFiles, rootFilename)
+        logging.info("Run summary %s", summary)
+        logging.info("Merged %s shards, %s entries, into %s", nShards, nEntries, rootFilename)
+        print ("Merged ", nShards, " shards, ", nEntries, " entries, into ", rootFilename)
+        if not args.keepShards:
+            for shardFile in shardFiles:
+                os.remove(shardFile)
+
+    print ("========  Sharded simulation run: end  ========")
+    logging.info("========  Sharded simulation run: end  ========")
+    sys.exit(0)
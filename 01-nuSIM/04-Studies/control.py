@@ -22,6 +22,30 @@ Class control:
       __str__  : Dump the conditions
 
   Get/set methods:
+      forcedDecay()        : s window the pion decays are forced into ("none", "tl",
+                             "ps" or "tlps"); optional flag, default "none"
+      directedEmission()   : detector neutrinos emitted toward the detector with
+                             solid-angle weights; optional flag, default False
+      fluxOnly()           : flux-only run, detector spectra accumulated in memory and
+                             no event history written; optional flag, default False
+      fluxHistograms()     : binning of the flux spectra, optional "fluxHistograms"
+                             section {quantity: [nBins, lower, upper]}, default None
+      skim()               : event selection of a skimmed run, optional "skim" entry
+                             (a term or a list of terms, see eventSkim), default "none"
+      eventWeight()        : weight of every generated event (the cross section of the
+                             normalisation), optional "eventWeight" entry, default 50
+      detectorPosition()   : [x, y, z] (m) of the centre of the detector front face,
+                             optional "detectorPosition" entry, default [0, 0, 50]
+      rsdPosition()        : [x, y, z] (m) of the centre of the return straight detector
+                             front face, optional "rsdPosition" entry, default None
+                             (no return straight detector)
+      setRunNumber(runNum) : use a fixed run number
+      runNumberFile()      : path of the run number file, $StudyDir/<runNumber key>
+      runNumber(inc)       : run number; with inc=True a new run number is reserved
+                             (reserveRunNumbers(1)) and kept by the instance
+      reserveRunNumbers(n) : atomically reserve a block of n consecutive run numbers
+                             from the run number file; returns them as a range and
+                             the instance keeps the first
 
   General methods:
 
@@ -32,10 +56,20 @@ Version history:
 
  1.1: 06Jun22: include central stored muon energy and the ability to set a static runNumber
 @author: MarvinPfaff
+
+ 1.2: 18Oct26: run numbers are reserved under an exclusive lock on the run number file
+               (reserveRunNumbers) so concurrent jobs never get the same number; the
+               reserved number is kept, later calls of runNumber() do not re-read the file
+ 1.3: 18Oct26: optional forcedDecay, directedEmission and fluxOnly flags, fluxHistograms section
+ 1.4: 18Oct26: optional skim entry
+ 1.5: 18Oct26: optional eventWeight and detectorPosition entries
+ 1.6: 18Oct26: optional rsdPosition entry
+@author: PaulKyberd
 """
 
 import math, sys
 import os
+import fcntl
 import json
 import numpy as np
 from copy import deepcopy
@@ -104,6 +138,41 @@ class control:
     def psDistInput(self):
         return (self._controlInfo["flags"]["psDistInput"] == "True")
 
+# Force the pion decays into a window of s: "none", "tl", "ps" or "tlps"; optional, default "none"
+    def forcedDecay(self):
+        return self._controlInfo["flags"].get("forcedDecay", "none")
+
+# Emit the detector neutrinos toward the detector with solid-angle weights; optional, default False
+    def directedEmission(self):
+        return (self._controlInfo["flags"].get("directedEmission", "False") == "True")
+
+# Accumulate the detector spectra in memory, no event history written; optional, default False
+    def fluxOnly(self):
+        return (self._controlInfo["flags"].get("fluxOnly", "False") == "True")
+
+# Binning of the flux spectra, {quantity: [nBins, lower, upper]}; optional, default None
+    def fluxHistograms(self):
+        return self._controlInfo.get("fluxHistograms", None)
+
+# Events written by a skimmed run (see eventSkim); optional, default "none"
+    def skim(self):
+        return self._controlInfo.get("skim", "none")
+
+# Weight of every generated event; optional, default 50
+    def eventWeight(self):
+        return self._controlInfo.get("eventWeight", 50)
+
+# Centre of the detector front face [x, y, z] (m); optional, default [0, 0, 50]
+    def detectorPosition(self):
+        return [float(x) for x in self._controlInfo.get("detectorPosition", [0.0, 0.0, 50.0])]
+
+# Centre of the return straight detector front face [x, y, z] (m); optional, default None
+    def rsdPosition(self):
+        position = self._controlInfo.get("rsdPosition", None)
+        if position is None:
+            return None
+        return [float(x) for x in position]
+
 # Add possibility to set static runNumber
     def setRunNumber(self, runNum):
         self._runNumber = runNum
@@ -112,29 +181,41 @@ class control:
         print("====================================")
         return True
 
+# run number file - in the studies directory, name given by the runNumber key word in the dictionary
+    def runNumberFile(self):
+        return os.path.join(os.environ['StudyDir'], self._controlInfo['runNumber'])
+
 # run number
     def runNumber(self, inc=False):
 
         if self._runNumber == 0:
-    # run number is read from a file, it is in the studies directory a sub directory given by the study name and
-    # a fileName given by the runNumber key word in the dictionary
-    #    rNFile = "102-studies/" + self._controlInfo['study'] + "/" +self._controlInfo['runNumber']
-            sDir =os.environ['StudyDir']
-#        rNFile = "102-studies/" + self._controlInfo['study'] + "/" +self._controlInfo['runNumber']
-            rNFile = sDir  + "/" +self._controlInfo['runNumber']
-            rN = open(rNFile, "r")
-            runNumber = int(rN.readline())
-            rN.close()
             if (inc):
-                runNumber = runNumber + 1
-                rN = open(rNFile, "w")
-                rN.write(str(runNumber))
-                rN.close()
+                runNumber = self.reserveRunNumbers(1)[0]
+            else:
+                with open(self.runNumberFile(), "r") as rN:
+                    fcntl.flock(rN, fcntl.LOCK_SH)
+                    runNumber = int(rN.readline())
         else:
             runNumber = self._runNumber
 
         return runNumber
 
+# reserve n consecutive run numbers - the file holds the last number reserved; read, update
+# and write it back holding an exclusive lock so that jobs launched together queue here
+    def reserveRunNumbers(self, n=1):
+        if n < 1:
+            raise ValueError("control.reserveRunNumbers: n must be at least 1")
+        with open(self.runNumberFile(), "r+") as rN:
+            fcntl.flock(rN, fcntl.LOCK_EX)
+            last = int(rN.readline())
+            rN.seek(0)
+            rN.truncate()
+            rN.write(str(last + n))
+            rN.flush()
+            os.fsync(rN.fileno())
+        self._runNumber = last + 1
+        return range(last + 1, last + n + 1)
+
 # number of events
     def nEvents(self):
         return self._controlInfo["nEvents"]
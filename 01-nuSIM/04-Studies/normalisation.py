@@ -49,6 +49,7 @@ import logging
 import PionConst as PC
 import MuonConst as MC
 import nuSTORMConst
+import nuSTORMGeometry as nuGeom
 import control
 import histoManager
 import nuSTORMPrdStrght as nuPrdStrt
@@ -72,6 +73,7 @@ class normalisation:
         self._sth = math.sin(self._tlAngle)
         self._cth = math.cos(self._tlAngle)
         self._mup0 = muonMom
+        self._geometry = nuGeom.nuSTORMGeometry(nuSTORMConst.nuSTORMConst())
 
 # transform x,y,z and px,py,pz co-ordinates from the transfer line local co-ordinates to the
 # global ones
@@ -193,36 +195,11 @@ class normalisation:
 #
     def ring(self, pathLength):
 
-      arcRadius = 50.0
-      sectionLengths=[180.0, arcRadius*math.pi, 180.0, arcRadius*math.pi]
-
-      sectionPnt = 0
-      while pathLength > 0.0:
-        pathLength = pathLength - sectionLengths[sectionPnt]
-        sectionPnt = (sectionPnt+1)%4
-
-      sectionPnt = (sectionPnt-1)%4
-      decayPnt = pathLength + sectionLengths[sectionPnt]
-      if (sectionPnt == 0):
-        theta = 0.0
-        zpos = 0.0 + decayPnt
-        deltaX = 0.0
-        direction = 0.0
-      elif (sectionPnt == 2):
-        theta = -math.pi
-        zpos = 180.0 - decayPnt
-        deltaX = -2*arcRadius
-        direction = math.pi
-      elif (sectionPnt == 1):
-        theta = decayPnt/arcRadius - 0.5*math.pi
-        zpos = 180.0 + arcRadius*math.cos(theta)
-        deltaX = 0.0 - arcRadius - arcRadius*math.sin(theta)
-        direction = 2.0*math.pi - decayPnt/arcRadius
-      elif (sectionPnt == 3):
-        theta = decayPnt/arcRadius + 0.5*math.pi
-        zpos = 0.0 + arcRadius*math.cos(theta)
-        deltaX = -arcRadius - arcRadius*math.sin(theta)
-        direction = math.pi - decayPnt/arcRadius
+# position in the ring from the section table of nuSTORMGeometry; pathLength may be a numpy array.
+# Here the ring bends toward -x and direction is measured the other way round from theta
+      x, zpos, theta = self._geometry.ringPosition(pathLength)
+      deltaX = -x
+      direction = np.mod(-theta, 2.0*math.pi)
 
       return deltaX, zpos, direction
 
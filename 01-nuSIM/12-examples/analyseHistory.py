@@ -12,8 +12,11 @@ Script for going through the eventHistory and making plots
 
     @author  Paul Kyberd
 
-    @version     1.0
-    @date        12 November 2021
+    @version     1.1
+    @date        18 October 2026
+
+    1.1: reads the history in chunks (eventHistory.readArrays) and fills the
+         numpy histograms of histoManager with whole arrays
 
 
 """
@@ -24,6 +27,7 @@ import sys, os
 from pathlib import Path            # checking for file existance
 import csv                          # so I can read a synthetic data file
 import math
+import numpy as np
 from datetime import datetime
 
 # nuStorm imports
@@ -36,7 +40,7 @@ import logging
 
 ##! Start:
 
-aHVersion = 1.0;
+aHVersion = 1.1;
 
 nTests = 0
 testFails = 0
@@ -101,8 +105,8 @@ print("start reading")
 #  get the first event fromnext event from root
 locRecord=[]
 locStatus=[]
-hm = histoManager.histoManager()
-hmDataOut = histoManager.histoManager()
+hm = histoManager.histoManager(backend="numpy")
+hmDataOut = histoManager.histoManager(backend="numpy")
 # common histograms at all the points in the history
 hC = histsCreate.histsCreate(hm, ctrlInst.plotsDict())
 hC.histAdd("target")
@@ -170,110 +174,36 @@ hUpper = 4.0
 eNueData = hmDataOut.book(hTitle, hBins, hLower, hUpper)
 
 
-for pnt in range(nEvent):
-# read an event
-    if (pnt%1000 == 0): print ("Event ", pnt)
-#    if (pnt > 100): break
-    objRd.readNext()
-#    objRd.display()
-    partTar = objRd.findParticle("target")
-    hC.histsFill("target", partTar)
-    if (dbgFlag): print ("target Particle is ", partTar)
-
-    partPS = objRd.findParticle("productionStraight")
-    hC.histsFill("productionStraight", partPS)
-    if (dbgFlag): print ("productionStraight Particle is ", partPS)
-
-    partPSEnd = objRd.findParticle("prodStraightEnd")
-    hC.histsFill("prodStraightEnd", partPSEnd)
-    if (dbgFlag): print ("prodStraightEnd Particle is ", partPSEnd)
-
-    partPD = objRd.findParticle("pionDecay")
-    hC.histsFill("pionDecay", partPD)
-    if (dbgFlag): print ("pionDecay Particle is ", partPD)
-
-    partMuonP = objRd.findParticle("muonProduction")
-    hC.histsFill("muonProduction", partMuonP)
-    if (dbgFlag): print ("muonProduction Particle is ", partMuonP)
-
-    partFlshNu = objRd.findParticle("piFlashNu")
-    hC.histsFill("piFlashNu", partFlshNu)
-    if (dbgFlag): print ("piFlashNu Particle is ", partFlshNu)
-
-    partMuonDecay = objRd.findParticle("muonDecay")
-    hC.histsFill("muonDecay", partMuonDecay)
-    if (dbgFlag): print ("muondecay Particle is ", partMuonDecay)
-
-    partEProd = objRd.findParticle("eProduction")
-    hC.histsFill("eProduction", partEProd)
-    if (dbgFlag): print ("eProduction Particle is ", partEProd)
-
-    partNumuProd = objRd.findParticle("numuProduction")
-    hC.histsFill("numuProduction", partNumuProd)
-    if (dbgFlag): print ("numuProduction Particle is ", partNumuProd)
-
-    partNueProd = objRd.findParticle("nueProduction")
-    hC.histsFill("nueProduction", partNueProd)
-    if (dbgFlag): print ("nueProduction Particle is ", partNueProd)
-
-    partNumuDetect = objRd.findParticle("numuDetector")
-    hC.histsFill("numuDetector", partNumuDetect)
-    if (dbgFlag): print ("numuProduction Particle is ", partNumuDetect)
-
-    partNueDetect = objRd.findParticle("nueDetector")
-    hC.histsFill("nueDetector", partNueDetect)
-    if (dbgFlag): print ("nueProduction Particle is ", partNueDetect)
+#  read the history a chunk of events at a time and fill the histograms with whole arrays
+histLocations = ["target", "productionStraight", "prodStraightEnd", "pionDecay", "muonProduction", "piFlashNu",
+                 "muonDecay", "eProduction", "numuProduction", "nueProduction", "numuDetector", "nueDetector"]
+for chunk in objRd.readArrays(locations=histLocations):
+    print ("Events ", chunk["target"]["entry"][0], " to ", chunk["target"]["entry"][-1])
+    t0 = chunk["target"]["t"]
+    for location in histLocations:
+        hC.histsFillArrays(location, chunk[location], t0)
 
 # some specfic analysis - neutrinos from muon decay if only muon decays in the ring are included
-    if (partNumuDetect.weight() > 0.0):
-      xs = partNumuProd.x()
-      ys = partNumuProd.y()
-      zs = partNumuProd.z()
-      xd = partNumuDetect.x()
-      yd = partNumuDetect.y()
-      zd = partNumuDetect.z()
-      dist = math.sqrt((xd-xs)*(xd-xs) + (yd-ys)*(yd-ys) +(zd-zs)*(zd-zs))
-      numuDist.Fill(dist)
-      if (abs(xd) < 2.5) and (abs(yd) < 2.5):
-        numuPx = partNumuDetect.p()[1][0]
-        numuPy = partNumuDetect.p()[1][1]
-        numuPz = partNumuDetect.p()[1][2]
-        numuE = math.sqrt(numuPx*numuPx + numuPy*numuPy + numuPz*numuPz )
-        eNumuData.Fill(numuE)
-    if (partNueDetect.weight() > 0.0):
-      xs = partNueProd.x()
-      ys = partNueProd.y()
-      zs = partNueProd.z()
-      xd = partNueDetect.x()
-      yd = partNueDetect.y()
-      zd = partNueDetect.z()
-      dist = math.sqrt((xd-xs)*(xd-xs) + (yd-ys)*(yd-ys) +(zd-zs)*(zd-zs))
-      nueDist.Fill(dist)
-      if (abs(xd) < 2.5) and (abs(yd) < 2.5):
-        nuePx = partNueDetect.p()[1][0]
-        nuePy = partNueDetect.p()[1][1]
-        nuePz = partNueDetect.p()[1][2]
-        nueE = math.sqrt(nuePx*nuePx + nuePy*nuePy + nuePz*nuePz )
-        eNueData.Fill(nueE)
+    for detect, prod, dist, eData in [("numuDetector", "numuProduction", numuDist, eNumuData),
+                                      ("nueDetector", "nueProduction", nueDist, eNueData)]:
+      det = chunk[detect]
+      src = chunk[prod]
+      sel = det["eventWeight"] > 0.0
+      dist.fill(np.sqrt((det["x"][sel]-src["x"][sel])**2 + (det["y"][sel]-src["y"][sel])**2 + (det["z"][sel]-src["z"][sel])**2))
+      inside = sel & (np.abs(det["x"]) < 2.5) & (np.abs(det["y"]) < 2.5)
+      eData.fill(np.sqrt(det["px"][inside]**2 + det["py"][inside]**2 + det["pz"][inside]**2))
 # Flash neutrinos - if only transfer line decays of the pion are included
-#    if (partNumuDetect.weight() > -1.0):
-    if (partNumuDetect.weight() > 0.0):
-      xs = partFlshNu.x()
-      ys = partFlshNu.y()
-      zs = partFlshNu.z()
-      xd = partNumuDetect.x()
-      yd = partNumuDetect.y()
-      zd = partNumuDetect.z()
-      dist = math.sqrt((xd-xs)*(xd-xs) + (yd-ys)*(yd-ys) +(zd-zs)*(zd-zs))
-      flashNumuDist.Fill(dist)
-      flashNumuSrcX.Fill(xs)
-      flashNumuSrcY.Fill(ys)
-      flashNumuSrcZ.Fill(zs)
-      p = partFlshNu.p()
-      flshNuSrcPX.Fill(p[1][0])
-      flshNuSrcPY.Fill(p[1][1])
-      flshNuSrcPZ.Fill(p[1][2])
-      arrivalT.Fill(partNumuDetect.t())
+    det = chunk["numuDetector"]
+    src = chunk["piFlashNu"]
+    sel = det["eventWeight"] > 0.0
+    flashNumuDist.fill(np.sqrt((det["x"][sel]-src["x"][sel])**2 + (det["y"][sel]-src["y"][sel])**2 + (det["z"][sel]-src["z"][sel])**2))
+    flashNumuSrcX.fill(src["x"][sel])
+    flashNumuSrcY.fill(src["y"][sel])
+    flashNumuSrcZ.fill(src["z"][sel])
+    flshNuSrcPX.fill(src["px"][sel])
+    flshNuSrcPY.fill(src["py"][sel])
+    flshNuSrcPZ.fill(src["pz"][sel])
+    arrivalT.fill(det["t"][sel])
 
 
 
@@ -1,8 +1,18 @@
 #!/usr/bin/env python
-#       histoManager.py                                    Version 2.0
+#       histoManager.py                                    Version 3.1
 #
 #     Paul Kyberd                                               29 October 2021
 #
+#  Version 3.1                                                  18 October 2026
+#  backend="root" is the default again, the array paths ask for backend="numpy";
+#  NaN values are counted in the overflow bin, as ROOT does
+#
+#  Version 3.0                                                  18 October 2026
+#  NumPy backend: the histograms are npHist1D/npHist2D, filled a value
+#  at a time (Fill, as TH1) or with whole arrays and weights (fill/FillN, np.bincount),
+#  merged exactly (Add, histoManager.merge) and only turned into ROOT TH1D/TH2D by
+#  histdo and histOutRoot.  backend="root" books ROOT histograms as before
+#
 #  Version 2.0                                                  29 October 2021
 #  Update to python3
 #
@@ -10,10 +20,153 @@
 # Attempt to get the booking and filling of histograms rather simpler to manage
 # ie go back to hbook
 #
-import ROOT
+import numpy as np
 from testUnit import testUnit
 from pathlib import Path
 
+#  bin numbers as ROOT's: 0 underflow, 1..nBins, nBins+1 overflow (NaN included, as TAxis::FindBin)
+def _binIndex(values, nBins, lower, upper):
+    values = np.asarray(values, dtype=float)
+    iBin = np.floor((values - lower)*(nBins/(upper - lower)))
+    iBin = np.where(values < lower, -1, np.where(values < upper, iBin, nBins))
+    return iBin.astype(np.int64) + 1
+
+class npHist1D():
+    """
+    1D histogram held as numpy arrays of the sums of weights and squared weights per bin
+    """
+
+    def __init__(self, name, title, bins, lower, upper):
+        self.name = name
+        self.title = title
+        self.bins = bins
+        self.lower = lower
+        self.upper = upper
+        self.sumW = np.zeros(bins + 2)
+        self.sumW2 = np.zeros(bins + 2)
+        self.entries = 0
+
+    def GetName(self):
+        return self.name
+
+    def GetTitle(self):
+        return self.title
+
+    def GetEntries(self):
+        return self.entries
+
+    def GetBinContent(self, i):
+        return self.sumW[i]
+
+    def GetSumOfWeights(self):
+        return self.sumW[1:-1].sum()
+
+    def Fill(self, x, w=1.0):
+        i = _binIndex(x, self.bins, self.lower, self.upper)
+        self.sumW[i] = self.sumW[i] + w
+        self.sumW2[i] = self.sumW2[i] + w*w
+        self.entries = self.entries + 1
+
+#  whole arrays; weights default to one
+    def fill(self, x, weights=None):
+        x = np.ravel(np.asarray(x, dtype=float))
+        w = np.ones(len(x)) if weights is None else np.broadcast_to(np.asarray(weights, dtype=float), x.shape)
+        i = _binIndex(x, self.bins, self.lower, self.upper)
+        self.sumW = self.sumW + np.bincount(i, weights=w, minlength=self.bins + 2)
+        self.sumW2 = self.sumW2 + np.bincount(i, weights=w*w, minlength=self.bins + 2)
+        self.entries = self.entries + len(x)
+
+#  as TH1::FillN(n, x, w)
+    def FillN(self, n, x, w=None):
+        self.fill(np.asarray(x)[:n], None if w is None else np.asarray(w)[:n])
+
+    def Add(self, other):
+        if (other.bins, other.lower, other.upper) != (self.bins, self.lower, self.upper):
+            raise ValueError("npHist1D.Add: " + self.name + " binning is not the same")
+        self.sumW = self.sumW + other.sumW
+        self.sumW2 = self.sumW2 + other.sumW2
+        self.entries = self.entries + other.entries
+
+    def toROOT(self):
+        import ROOT
+        hist = ROOT.TH1D(self.name, self.title, self.bins, self.lower, self.upper)
+        hist.Sumw2()
+        for i in range(self.bins + 2):
+            hist.SetBinContent(i, self.sumW[i])
+            hist.SetBinError(i, np.sqrt(self.sumW2[i]))
+        hist.SetEntries(self.entries)
+        return hist
+
+class npHist2D():
+    """
+    2D histogram held as numpy arrays, [ix, iy] with under and overflow in x and y
+    """
+
+    def __init__(self, name, title, bins1, lower1, upper1, bins2, lower2, upper2):
+        self.name = name
+        self.title = title
+        self.bins1, self.lower1, self.upper1 = bins1, lower1, upper1
+        self.bins2, self.lower2, self.upper2 = bins2, lower2, upper2
+        self.sumW = np.zeros((bins1 + 2, bins2 + 2))
+        self.sumW2 = np.zeros((bins1 + 2, bins2 + 2))
+        self.entries = 0
+
+    def GetName(self):
+        return self.name
+
+    def GetTitle(self):
+        return self.title
+
+    def GetEntries(self):
+        return self.entries
+
+    def GetBinContent(self, i, j):
+        return self.sumW[i, j]
+
+    def GetSumOfWeights(self):
+        return self.sumW[1:-1, 1:-1].sum()
+
+    def Fill(self, x, y, w=1.0):
+        self.fill([x], [y], [w])
+
+    def fill(self, x, y, weights=None):
+        x = np.ravel(np.asarray(x, dtype=float))
+        y = np.ravel(np.asarray(y, dtype=float))
+        w = np.ones(len(x)) if weights is None else np.broadcast_to(np.asarray(weights, dtype=float), x.shape)
+        i = _binIndex(x, self.bins1, self.lower1, self.upper1)*(self.bins2 + 2) + \
+            _binIndex(y, self.bins2, self.lower2, self.upper2)
+        size = (self.bins1 + 2)*(self.bins2 + 2)
+        self.sumW = self.sumW + np.bincount(i, weights=w, minlength=size).reshape(self.sumW.shape)
+        self.sumW2 = self.sumW2 + np.bincount(i, weights=w*w, minlength=size).reshape(self.sumW.shape)
+        self.entries = self.entries + len(x)
+
+#  as TH2::FillN(n, x, y, w)
+    def FillN(self, n, x, y, w=None):
+        self.fill(np.asarray(x)[:n], np.asarray(y)[:n], None if w is None else np.asarray(w)[:n])
+
+    def Add(self, other):
+        if (other.sumW.shape != self.sumW.shape) or \
+           ((other.lower1, other.upper1, other.lower2, other.upper2) != (self.lower1, self.upper1, self.lower2, self.upper2)):
+            raise ValueError("npHist2D.Add: " + self.name + " binning is not the same")
+        self.sumW = self.sumW + other.sumW
+        self.sumW2 = self.sumW2 + other.sumW2
+        self.entries = self.entries + other.entries
+
+    def toROOT(self):
+        import ROOT
+        hist = ROOT.TH2D(self.name, self.title, self.bins1, self.lower1, self.upper1, self.bins2, self.lower2, self.upper2)
+        hist.Sumw2()
+        for i in range(self.bins1 + 2):
+            for j in range(self.bins2 + 2):
+                hist.SetBinContent(i, j, self.sumW[i, j])
+                hist.SetBinError(i, j, np.sqrt(self.sumW2[i, j]))
+        hist.SetEntries(self.entries)
+        return hist
+
+#  ROOT histogram of h, converted if it is a numpy one
+def _root(h):
+    return h.toROOT() if isinstance(h, (npHist1D, npHist2D)) else h
+
 class histo():
     """
     Histogram class - facade
@@ -39,6 +192,7 @@ class histo():
 #
 #         Start by just doing a simple 1D
 
+        import ROOT
         self.Title = title
         name = title                                  # name must be unique .. put it equal to title
         self.histVar = ROOT.TH1D(name, title, bins, lower, upper)
@@ -47,6 +201,7 @@ class histo():
         self.histVar.Fill(value)
 
     def output(self):
+        import ROOT
         canvas = ROOT.TCanvas(self.Title, self.Title)
         self.histVar.Draw()
         canvas.Draw()
@@ -58,8 +213,9 @@ class histoManager:
     """
 
 
-    def __init__(self):
+    def __init__(self, backend="root"):
         self.Version = 1.0
+        self.backend = backend
         self.histNames = []
         self.hists=[]
         self.histParams=[]
@@ -86,7 +242,11 @@ class histoManager:
 
         self.Title = title
         name = title                                  # name must be unique .. put it equal to title
-        self.histVar = ROOT.TH1D(name, title, bins, lower, upper)
+        if self.backend == "numpy":
+            self.histVar = npHist1D(name, title, bins, lower, upper)
+        else:
+            import ROOT
+            self.histVar = ROOT.TH1D(name, title, bins, lower, upper)
         self.hists.append(self.histVar)
         self.histParams.append("")
         return self.histVar
@@ -99,17 +259,29 @@ class histoManager:
 
         self.Title = title
         name = title                                  # name must be unique .. put it equal to title
-        self.histVar = ROOT.TH2D(name, title, bins1, lower1, upper1, bins2, lower2, upper2 )
+        if self.backend == "numpy":
+            self.histVar = npHist2D(name, title, bins1, lower1, upper1, bins2, lower2, upper2)
+        else:
+            import ROOT
+            self.histVar = ROOT.TH2D(name, title, bins1, lower1, upper1, bins2, lower2, upper2 )
         self.hists.append(self.histVar)
         self.histParams.append("")
         return self.histVar
 
+#  add the histograms of another manager (e.g. from another worker), booked in the same order
+    def merge(self, other):
+        if [h.GetTitle() for h in other.hists] != [h.GetTitle() for h in self.hists]:
+            raise ValueError("histoManager.merge: the histograms booked are not the same")
+        for hist, otherHist in zip(self.hists, other.hists):
+            hist.Add(otherHist)
+
     def histdo(self,path):
 # Output all histos to screen and file
+        import ROOT
         hPnt = 0
         for i in range(len(self.hists)):
             hPnt = hPnt + 1
-            hCurr = self.hists[i]
+            hCurr = _root(self.hists[i])
             pCurr = self.histParams[i]
             title = hCurr.GetTitle()
             if pCurr == "m":
@@ -185,9 +357,10 @@ class histoManager:
 
 
     def histOutRoot(self, fileName):
+        import ROOT
         self.outfile = ROOT.TFile( fileName, 'RECREATE', 'ROOT file with Histograms' )
         for i in range(len(self.hists)):
-            hCurr = self.hists[i]
+            hCurr = _root(self.hists[i])
             hCurr.Write()
 
 
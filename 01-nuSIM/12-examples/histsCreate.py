@@ -2,17 +2,22 @@
 Model for calculating normalised numbers
 ========================================
 
-@date: 05 Jan 2022
+@date: 18 Oct 2026
 @author: Paul Kyberd
-@version: 2.0
+@version: 2.1
 
 @description: read in a the dictionary with the histogram values in from an external file
 
+  2.1: histsFillArrays fills the histograms of a location from arrays of
+       many events (eventHistory.readArrays) with a few array fills per
+       histogram in place of one Fill per event
+
 """
 
 from pathlib import Path
 import math
 import json
+import numpy as np
 
 class histsCreate():
 
@@ -194,6 +199,43 @@ class histsCreate():
 
 
 
+#  arrays: {field: array} for one location, as eventHistory.readArrays returns; t0: the target times
+#  of the same events.  Fills as histsFill would event by event
+    def histsFillArrays(self, location, arrays, t0):
+
+        pnt = self._locs.index(location)
+        hPnt = self._locsStart[pnt]
+
+        x = np.asarray(arrays["x"], dtype=float)
+        y = np.asarray(arrays["y"], dtype=float)
+        z = np.asarray(arrays["z"], dtype=float)
+        px = np.asarray(arrays["px"], dtype=float)
+        py = np.asarray(arrays["py"], dtype=float)
+        pz = np.asarray(arrays["pz"], dtype=float)
+        wt = np.asarray(arrays["eventWeight"], dtype=float)
+        s = np.asarray(arrays["s"], dtype=float)
+        t = np.asarray(arrays["t"], dtype=float)
+        t0 = np.broadcast_to(np.asarray(t0, dtype=float), t.shape)
+        if (len(t) > 0) and (location == 'target'):
+            self._t0 = t[-1]
+
+        nNonZero = int(np.count_nonzero(wt))
+        self._NZWeight[location] = self._NZWeight.get(location) + nNonZero
+        self._zeroWeight[location] = self._zeroWeight.get(location) + len(wt) - nNonZero
+
+        sel = wt > 0.0
+        values = [x, y, z, wt, s, t, t - t0, px, py]
+        for hoffset in range(len(values)):
+            self._hists[hPnt+hoffset].fill(values[hoffset][sel])
+        self._hists[hPnt+11].fill(pz[sel], t[sel])
+        if (location == 'productionStraight'):
+            self._count = self._count + int(np.count_nonzero(sel))
+
+        if ((location == 'numuDetector') or (location == "nueDetector")):
+            sel = sel & (np.abs(x) < 2.5) & (np.abs(y) < 2.5)
+        self._hists[hPnt+9].fill(pz[sel])
+        self._hists[hPnt+10].fill(np.sqrt(px[sel]*px[sel] + py[sel]*py[sel] + pz[sel]*pz[sel]))
+
     def summary(self, fileName):
 
         texHline = "\\hline\n"
@@ -1,7 +1,7 @@
 import ROOT
-import uproot
 import pandas as pd
-import awkward as ak
+import eventHistory
+import eventBatch
 
 def eventHistoryToDf(filepath,treeName='eventHistory', keysDict=[], eventWeight = False):
 
@@ -10,27 +10,29 @@ def eventHistoryToDf(filepath,treeName='eventHistory', keysDict=[], eventWeight
 
     Args:
         filepath (str): location of the root file 
-        treeName (str, optional): Tree to look for in the .root file. Defaults to eventHistory
-        keysDict (list, optional): keys (branches) of root files. Defaults to [] for all branches.
+        treeName (str, optional): Tree to look for in the .root file. Defaults to "eventHistory".
+            It must be an event history tree (schema 1 or 2, read through eventHistory.getArrays)
+        keysDict (list, optional): keys (locations) of root files. Defaults to [] for all locations.
         eventWeight (bool, optional): True only allows for recorded events. Defaults to False.
 
     Returns:
         dataframe: All recorded events. 
     """
-    file = uproot.open(filepath)
-    eventHistory = file[treeName]
+    eH = eventHistory.eventHistory()
+    eH.inFile(filepath, treeName)
 
     if not keysDict:
-        keys = eventHistory.keys()
+        keys = eventBatch.locations
     else:
         keys = keysDict
+    arrays = eH.getArrays(keys)
     df_list = []
     for i in keys:
-        awks = eventHistory[i].array()
-        df_loc = ak.to_dataframe(awks)
+        df_loc = pd.DataFrame(arrays[i]).set_index("entry")
+        df_loc = df_loc.rename(columns={"runNumber": "run", "eventNumber": "event"})
         if eventWeight:
             df_loc = df_loc[df_loc["eventWeight"]== 50]
         df_loc['loc'] = i
         df_list.append(df_loc)
     df = pd.concat(df_list)
-    return df 
\ No newline at end of file
+    return df